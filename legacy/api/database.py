@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 import asyncio
 
 from src.core.storage import get_storage
+from src.core.storage_codec import read_json_file
 from .models import LeaderboardEntry, ModelResult, GameReplay
 
 
@@ -124,10 +125,9 @@ async def get_game_replay(game_id: str) -> Optional[Dict[str, Any]]:
     # Fallback to looking for transcript files for backward compatibility
     transcripts_dir = Path("data/results")
     
-    for file in transcripts_dir.glob("*_transcripts.json"):
+    for file in transcripts_dir.glob("*_transcripts.json*"):
         try:
-            with open(file) as f:
-                transcripts = json.load(f)
+            transcripts = read_json_file(file)
             
             for transcript in transcripts:
                 if transcript.get("game_id") == game_id:
@@ -24,6 +24,7 @@ from src.core.logging_config import (
 )
 from src.core.types import Difficulty, ModelConfig
 from src.evaluation import EvaluationEngine
+from src.evaluation.checkpoint import JobCheckpoint, JOB_ID_PATTERN
 from src.tasks import TaskRepository, TaskGenerator
 from src.models import create_model
 
@@ -68,6 +69,11 @@ class EvaluationJobResponse(BaseModel):
     message: str
 
 
+class ResumeJobRequest(BaseModel):
+    """Request to resume an interrupted evaluation job."""
+    api_key: Optional[str] = None  # API keys are not stored in checkpoints
+
+
 class JobStatus(BaseModel):
     """Status of an evaluation job."""
     job_id: str
@@ -196,6 +202,63 @@ async def start_evaluation(
     )
 
 
+@router.post("/jobs/{job_id}/resume", response_model=EvaluationJobResponse)
+async def resume_evaluation(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    request: Optional[ResumeJobRequest] = None,
+    current_user: str = get_current_user()
+):
+    """Resume an interrupted evaluation job from its checkpoint."""
+    if not JOB_ID_PATTERN.fullmatch(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    checkpoint = JobCheckpoint(job_id)
+    spec = checkpoint.load_spec()
+    if spec is None:
+        raise HTTPException(status_code=404, detail="No checkpoint found for job")
+    if spec.get("status") == "completed":
+        raise HTTPException(status_code=409, detail="Job already completed")
+    if job_id in jobs and jobs[job_id].status in ("pending", "running"):
+        raise HTTPException(status_code=409, detail="Job is still running")
+    
+    num_games = len(spec["tasks"])
+    finished = len(checkpoint.finished_indexes())
+    model_name = spec["model"]["model_id"]
+    
+    logger.info(
+        f"Evaluation job resume requested",
+        extra={"job_id": job_id, "model": model_name, "finished_games": finished, "num_games": num_games}
+    )
+    
+    jobs[job_id] = JobStatus(
+        job_id=job_id,
+        status="pending",
+        progress=0.3 + 0.7 * finished / num_games,
+        message=f"Resuming evaluation of {model_name} ({finished}/{num_games} games finished)...",
+        started_at=datetime.utcnow()
+    )
+    
+    background_tasks.add_task(
+        run_evaluation_job,
+        job_id,
+        model_name,
+        spec["model"]["provider"],
+        num_games,
+        None,
+        None,
+        request.api_key if request else None,
+        True
+    )
+    
+    return EvaluationJobResponse(
+        job_id=job_id,
+        status="resumed",
+        model=model_name,
+        num_games=num_games,
+        message=f"Resuming with {num_games - finished} games left. Check job status for progress."
+    )
+
+
 @router.get("/jobs/{job_id}/status", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get the status of an evaluation job."""
@@ -333,10 +396,18 @@ async def run_evaluation_job(
     num_games: int,
     task_type: Optional[str],
     difficulty: Optional[str],
-    api_key: Optional[str]
+    api_key: Optional[str],
+    resume: bool = False
 ):
-    """Background task to run evaluation."""
+    """
+    Background task to run evaluation.
+    
+    Finished games and in-flight moves are checkpointed under the job ID;
+    with ``resume`` the model and tasks come from that checkpoint and only
+    the unfinished work is played.
+    """
     start_time = time.time()
+    checkpoint = JobCheckpoint(job_id)
     
     try:
         logger.info(
@@ -347,84 +418,98 @@ async def run_evaluation_job(
         jobs[job_id].status = "running"
         jobs[job_id].message = f"Evaluating {model_name}..."
         
-        # Create model config
-        logger.debug(
-            f"Creating model configuration",
-            extra={
-                "provider": model_provider,
-                "model_id": model_name,
-                "has_custom_key": bool(api_key),
-                "job_id": job_id,
-                "model": model_name
-            }
-        )
-        
-        model_config = ModelConfig(
-                name=model_name,
-                provider=model_provider,
-                model_id=model_name,
-                temperature=0,
-                max_tokens=1000,
-                additional_params={}
+        if resume:
+            model_config, tasks, _ = checkpoint.load_job()
+            if api_key:
+                model_config.additional_params["api_key"] = api_key
+            finished = len(checkpoint.finished_indexes())
+            checkpoint.update_status("running")
+            logger.info(
+                f"Resuming evaluation from checkpoint",
+                extra={"job_id": job_id, "model": model_name, "finished_games": finished, "num_tasks": len(tasks)}
             )
-            
-        # Add API key if provided
-        if api_key:
-            model_config.additional_params["api_key"] = api_key
-        
-        # Create model
-        try:
-            model = create_model(model_config)
-            logger.debug(f"Model created successfully", extra={"job_id": job_id, "model": model_name})
-        except Exception as model_error:
-            logger.error(
-                f"Failed to create model",
-                extra={"error_type": type(model_error).__name__, "job_id": job_id, "model": model_name},
-                exc_info=True
+        else:
+            # Create model config
+            logger.debug(
+                f"Creating model configuration",
+                extra={
+                    "provider": model_provider,
+                    "model_id": model_name,
+                    "has_custom_key": bool(api_key),
+                    "job_id": job_id,
+                    "model": model_name
+                }
             )
-            raise
-        
-        # Generate tasks for evaluation
-        logger.info(f"Generating tasks for evaluation", extra={"job_id": job_id, "model": model_name})
-        generator = TaskGenerator()
-        repository = TaskRepository()
-        
-        tasks = []
-        for i in range(num_games):
+            
+            model_config = ModelConfig(
+                    name=model_name,
+                    provider=model_provider,
+                    model_id=model_name,
+                    temperature=0,
+                    max_tokens=1000,
+                    additional_params={}
+                )
+            
+            # Add API key if provided
+            if api_key:
+                model_config.additional_params["api_key"] = api_key
+            
+            # Create model
             try:
-                # Convert difficulty
-                diff_enum = Difficulty.EXPERT
-                if difficulty:
-                    try:
-                        diff_enum = Difficulty(difficulty.lower())
-                    except ValueError:
-                        pass
+                model = create_model(model_config)
+                logger.debug(f"Model created successfully", extra={"job_id": job_id, "model": model_name})
+            except Exception as model_error:
+                logger.error(
+                    f"Failed to create model",
+                    extra={"error_type": type(model_error).__name__, "job_id": job_id, "model": model_name},
+                    exc_info=True
+                )
+                raise
+            
+            # Generate tasks for evaluation
+            logger.info(f"Generating tasks for evaluation", extra={"job_id": job_id, "model": model_name})
+            generator = TaskGenerator()
+            repository = TaskRepository()
+            
+            tasks = []
+            for i in range(num_games):
+                try:
+                    # Convert difficulty
+                    diff_enum = Difficulty.EXPERT
+                    if difficulty:
+                        try:
+                            diff_enum = Difficulty(difficulty.lower())
+                        except ValueError:
+                            pass
                 
-                # Generate task
-                if task_type == "static":
-                    task = generator.generate_static_task(difficulty=diff_enum)
-                elif task_type == "interactive":
-                    task = generator.generate_interactive_task(difficulty=diff_enum)
-                else:
-                    # Mix of both
-                    task = (generator.generate_static_task(difficulty=diff_enum) 
-                            if i % 2 == 0 else 
-                            generator.generate_interactive_task(difficulty=diff_enum))
+                    # Generate task
+                    if task_type == "static":
+                        task = generator.generate_static_task(difficulty=diff_enum)
+                    elif task_type == "interactive":
+                        task = generator.generate_interactive_task(difficulty=diff_enum)
+                    else:
+                        # Mix of both
+                        task = (generator.generate_static_task(difficulty=diff_enum) 
+                                if i % 2 == 0 else 
+                                generator.generate_interactive_task(difficulty=diff_enum))
                 
-                repository.save_task(task)
-                tasks.append(task)
+                    repository.save_task(task)
+                    tasks.append(task)
                 
-                # Update progress
-                jobs[job_id].progress = (i + 1) / num_games * 0.3  # First 30% for generation
-                jobs[job_id].message = f"Generated {i + 1}/{num_games} tasks..."
+                    # Update progress
+                    jobs[job_id].progress = (i + 1) / num_games * 0.3  # First 30% for generation
+                    jobs[job_id].message = f"Generated {i + 1}/{num_games} tasks..."
                 
-            except Exception as task_error:
-                logger.warning(f"Failed to generate task {i}: {str(task_error)}", extra={"job_id": job_id, "model": model_name})
-        
-        if not tasks:
-            raise Exception("Failed to generate any tasks")
-        
-        logger.info(f"Generated {len(tasks)} tasks, starting evaluation", extra={"job_id": job_id, "model": model_name, "num_tasks": len(tasks)})
+                except Exception as task_error:
+                    logger.warning(f"Failed to generate task {i}: {str(task_error)}", extra={"job_id": job_id, "model": model_name})
+            
+            if not tasks:
+                raise Exception("Failed to generate any tasks")
+            
+            logger.info(f"Generated {len(tasks)} tasks, starting evaluation", extra={"job_id": job_id, "model": model_name, "num_tasks": len(tasks)})
+            
+            # Checkpoint the job before any game is played, so it can be resumed
+            checkpoint.save_job(model_config, tasks, prompt_format="standard")
         
         # Create evaluation engine
         engine = EvaluationEngine()
@@ -438,7 +523,8 @@ async def run_evaluation_job(
                 model_config=model_config,
                 tasks=tasks,
                 prompt_format="standard",
-                verbose=False
+                verbose=False,
+                checkpoint=checkpoint
             )
             
         # Update progress
@@ -487,6 +573,9 @@ async def run_evaluation_job(
         jobs[job_id].status = "failed"
         jobs[job_id].message = f"Error: {str(e)}"
         jobs[job_id].completed_at = datetime.utcnow()
+        if checkpoint.exists():
+            checkpoint.update_status("failed", error=str(e))
+            jobs[job_id].message += f" (resume with POST /api/evaluation/jobs/{job_id}/resume)"
         
         log_evaluation_error(logger, job_id, e)
         
@@ -0,0 +1,346 @@
+"""Broadcast hub for live job events.
+
+Each job has one ``JobStream``: a ring buffer of its most recent events, each
+with a monotonically increasing ID. Publishing appends once and wakes the
+waiting subscribers; every subscriber keeps its own cursor into the buffer,
+so all viewers of a job see every event and a reconnecting client resumes
+from its ``Last-Event-ID``. A subscriber that falls further behind than the
+buffer holds is told how many events it missed.
+
+Streams are removed ``STREAM_LINGER_SECONDS`` after their last subscriber
+leaves (so a quick reconnect can still resume), and streams nobody ever
+subscribed to expire after ``STREAM_IDLE_SECONDS`` without events.
+
+What a subscriber actually receives goes through a ``DeliveryPolicy``:
+
+- consecutive partial reasoning chunks for the same move are merged, and
+  a subscriber gets at most one such frame per ``REASONING_COALESCE_MS``
+- board and metrics updates are "latest wins": a subscriber that is behind
+  only gets the newest one per game
+- each subscriber's backlog is bounded by ``SUBSCRIBER_BUFFER_SIZE``;
+  beyond that the oldest expendable events are dropped for that subscriber
+
+Publishers never wait on any of this, and every dropped or merged event is
+counted in ``EventHub.stats()``.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.core.logging_config import get_logger
+
+logger = get_logger("api.event_hub")
+
+EVENT_BUFFER_SIZE = int(os.environ.get("EVENT_BUFFER_SIZE", "1000"))
+STREAM_LINGER_SECONDS = float(os.environ.get("EVENT_STREAM_LINGER_SECONDS", "30"))
+STREAM_IDLE_SECONDS = float(os.environ.get("EVENT_STREAM_IDLE_SECONDS", "600"))
+SUBSCRIBER_BUFFER_SIZE = int(os.environ.get("EVENT_SUBSCRIBER_BUFFER_SIZE", "256"))
+REASONING_COALESCE_MS = int(os.environ.get("EVENT_REASONING_COALESCE_MS", "100"))
+
+# Event type names, as in event_streaming.EventType
+MOVE_REASONING = "move_reasoning"
+MOVE_THINKING = "move_thinking"
+BOARD_UPDATE = "board_update"
+METRICS_UPDATE = "metrics_update"
+
+# Drop reasons reported in stats
+DROP_REASONS = ("coalesced", "superseded", "overflow", "ring_overrun")
+
+
+def _initial_event_id() -> int:
+    """First ID of a new stream.
+
+    IDs within a stream are contiguous; starting from the clock means a
+    stream recreated for the same job (after cleanup or a restart) starts
+    above any ID a client may still hold.
+    """
+    return int(time.time() * 1000) * 1000
+
+
+class StreamEvent:
+    """One published event."""
+
+    __slots__ = ("id", "type", "timestamp", "data")
+
+    def __init__(self, event_id: int, event_type: str, timestamp: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.type = event_type
+        self.timestamp = timestamp
+        self.data = data
+
+
+class JobStream:
+    """Ring buffer of recent events for one job."""
+
+    def __init__(self, job_id: str, size: int = EVENT_BUFFER_SIZE):
+        self.job_id = job_id
+        self.events: Deque[StreamEvent] = deque(maxlen=size)
+        self.first_id = _initial_event_id()
+        self._next_id = self.first_id
+        self.subscribers = 0
+        self.last_activity = time.monotonic()
+        self._changed = asyncio.Event()
+        self._cleanup_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def last_id(self) -> int:
+        return self.events[-1].id if self.events else 0
+
+    def append(self, event_type: str, timestamp: str, data: Dict[str, Any]) -> StreamEvent:
+        event = StreamEvent(self._next_id, event_type, timestamp, data)
+        self._next_id += 1
+        self.events.append(event)
+        self.last_activity = time.monotonic()
+        # Wake everyone waiting on this generation, then start a new one
+        self._changed.set()
+        self._changed = asyncio.Event()
+        return event
+
+    def read_after(self, cursor: int) -> Tuple[List[StreamEvent], int]:
+        """Events with ID > cursor, and how many newer ones fell out of the buffer."""
+        if not self.events or cursor >= self.last_id:
+            return [], 0
+        oldest = self.events[0].id
+        if cursor < oldest - 1:
+            # A brand-new subscriber just gets the history, nothing was missed
+            missed = oldest - max(cursor + 1, self.first_id) if cursor else 0
+            return list(self.events), missed
+        start = cursor - oldest + 1
+        return list(itertools.islice(self.events, start, None)), 0
+
+    async def wait(self, cursor: int, timeout: float) -> bool:
+        """Wait until an event newer than cursor exists; False on timeout."""
+        if self.last_id > cursor:
+            return True
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+def is_partial_reasoning(event: StreamEvent) -> bool:
+    return event.type == MOVE_REASONING and bool(event.data.get("partial"))
+
+
+class DeliveryPolicy:
+    """Decides which of a subscriber's pending events are sent, and how."""
+
+    def __init__(self, max_buffer: int = SUBSCRIBER_BUFFER_SIZE,
+                 coalesce_ms: int = REASONING_COALESCE_MS,
+                 latest_wins: Tuple[str, ...] = (BOARD_UPDATE, METRICS_UPDATE),
+                 latest_wins_keys: Tuple[str, ...] = ("game_num", "player_id"),
+                 expendable: Tuple[str, ...] = (MOVE_THINKING, MOVE_REASONING, BOARD_UPDATE, METRICS_UPDATE)):
+        self.max_buffer = max_buffer
+        self.coalesce_interval = coalesce_ms / 1000
+        self.latest_wins = frozenset(latest_wins)
+        self.latest_wins_keys = latest_wins_keys
+        self.expendable = frozenset(expendable)
+
+    def apply(self, events: List[StreamEvent], counts: Dict[str, int]) -> List[StreamEvent]:
+        """Reduce a backlog to the frames to send, adding drops to ``counts``."""
+        events = self._latest_wins(events, counts)
+        events = self._merge_partials(events, counts)
+        if len(events) > self.max_buffer:
+            events = self._trim(events, counts)
+        return events
+
+    def _latest_wins(self, events: List[StreamEvent], counts: Dict[str, int]) -> List[StreamEvent]:
+        seen = set()
+        kept = []
+        for event in reversed(events):
+            if event.type in self.latest_wins:
+                key = (event.type,) + tuple(event.data.get(k) for k in self.latest_wins_keys)
+                if key in seen:
+                    counts["superseded"] += 1
+                    continue
+                seen.add(key)
+            kept.append(event)
+        kept.reverse()
+        return kept
+
+    def _merge_partials(self, events: List[StreamEvent], counts: Dict[str, int]) -> List[StreamEvent]:
+        merged: List[StreamEvent] = []
+        for event in events:
+            previous = merged[-1] if merged else None
+            if (previous is not None and is_partial_reasoning(event) and is_partial_reasoning(previous)
+                    and previous.data.get("game_num") == event.data.get("game_num")
+                    and previous.data.get("move_num") == event.data.get("move_num")):
+                # Partials are deltas: one frame carrying the concatenated text
+                data = dict(event.data, reasoning=(previous.data.get("reasoning") or "") + (event.data.get("reasoning") or ""))
+                merged[-1] = StreamEvent(event.id, event.type, event.timestamp, data)
+                counts["coalesced"] += 1
+            else:
+                merged.append(event)
+        return merged
+
+    def _trim(self, events: List[StreamEvent], counts: Dict[str, int]) -> List[StreamEvent]:
+        excess = len(events) - self.max_buffer
+        kept = []
+        # Drop the oldest expendable events first, then the oldest of the rest
+        for event in events:
+            if excess and event.type in self.expendable:
+                excess -= 1
+                counts["overflow"] += 1
+                continue
+            kept.append(event)
+        if excess:
+            counts["overflow"] += excess
+            kept = kept[excess:]
+        return kept
+
+
+class Subscription:
+    """A subscriber's cursor into a job stream."""
+
+    def __init__(self, hub: "EventHub", stream: JobStream, cursor: int,
+                 policy: Optional[DeliveryPolicy] = None):
+        self.hub = hub
+        self.stream = stream
+        self.cursor = cursor
+        self.policy = policy
+        self.closed = False
+        self.delivered = 0
+        self.drops = {reason: 0 for reason in DROP_REASONS}
+        self._last_partial_frame = 0.0
+
+    async def next_batch(self, timeout: float = 30.0) -> Tuple[List[StreamEvent], int]:
+        """Frames to send since the last batch (empty on timeout), and how many
+        events this subscriber lost (ring overrun or buffer overflow)."""
+        if not await self.stream.wait(self.cursor, timeout):
+            return [], 0
+
+        if self.policy and self.policy.coalesce_interval:
+            # Hold back a lone partial-reasoning frame until the interval passes,
+            # so token-by-token streaming becomes one frame per interval
+            wait = self._last_partial_frame + self.policy.coalesce_interval - time.monotonic()
+            if wait > 0:
+                pending, _ = self.stream.read_after(self.cursor)
+                if pending and all(is_partial_reasoning(e) for e in pending):
+                    await asyncio.sleep(wait)
+
+        events, missed = self.stream.read_after(self.cursor)
+        if events:
+            self.cursor = events[-1].id
+        counts = dict.fromkeys(DROP_REASONS, 0)
+        counts["ring_overrun"] = missed
+        if self.policy and events:
+            events = self.policy.apply(events, counts)
+            if events and is_partial_reasoning(events[-1]):
+                self._last_partial_frame = time.monotonic()
+
+        self.delivered += len(events)
+        for reason, count in counts.items():
+            self.drops[reason] += count
+        self.hub._record_delivery(len(events), counts)
+        return events, counts["ring_overrun"] + counts["overflow"]
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.hub._unsubscribe(self.stream)
+
+
+class EventHub:
+    """Per-job streams shared by all subscribers of the job."""
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE,
+                 linger_seconds: float = STREAM_LINGER_SECONDS,
+                 idle_seconds: float = STREAM_IDLE_SECONDS,
+                 policy: Optional[DeliveryPolicy] = None):
+        self.buffer_size = buffer_size
+        self.linger_seconds = linger_seconds
+        self.idle_seconds = idle_seconds
+        self.policy = policy
+        self.streams: Dict[str, JobStream] = {}
+        self._last_sweep = time.monotonic()
+        self.published = 0
+        self.delivered = 0
+        self.drops = {reason: 0 for reason in DROP_REASONS}
+
+    def _stream(self, job_id: str) -> JobStream:
+        stream = self.streams.get(job_id)
+        if stream is None:
+            stream = self.streams[job_id] = JobStream(job_id, self.buffer_size)
+            logger.debug(f"Created event stream for job {job_id}")
+        return stream
+
+    def publish(self, job_id: str, event_type: str, timestamp: str, data: Dict[str, Any]) -> StreamEvent:
+        """Append an event for a job; never waits on subscribers."""
+        self._sweep_idle()
+        self.published += 1
+        return self._stream(job_id).append(event_type, timestamp, data)
+
+    def subscribe(self, job_id: str, last_event_id: Optional[int] = None) -> Subscription:
+        """Subscribe to a job; resumes after ``last_event_id`` if given.
+
+        New subscribers without an ID get the buffered history first.
+        """
+        stream = self._stream(job_id)
+        stream.subscribers += 1
+        if stream._cleanup_handle is not None:
+            stream._cleanup_handle.cancel()
+            stream._cleanup_handle = None
+
+        cursor = last_event_id or 0
+        if cursor and not stream.first_id <= cursor <= stream.last_id:
+            # The ID belongs to an earlier incarnation of the stream (restart
+            # or cleanup); replay what we have
+            cursor = 0
+        return Subscription(self, stream, cursor, self.policy)
+
+    def _unsubscribe(self, stream: JobStream):
+        stream.subscribers -= 1
+        if stream.subscribers > 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._remove(stream)
+            return
+        stream._cleanup_handle = loop.call_later(self.linger_seconds, self._remove, stream)
+
+    def _remove(self, stream: JobStream):
+        stream._cleanup_handle = None
+        if stream.subscribers <= 0 and self.streams.get(stream.job_id) is stream:
+            del self.streams[stream.job_id]
+            logger.info(f"Cleaned up event stream for job {stream.job_id}")
+
+    def _sweep_idle(self):
+        """Drop streams that never had subscribers and went quiet."""
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        for job_id, stream in list(self.streams.items()):
+            if (stream.subscribers <= 0 and stream._cleanup_handle is None
+                    and now - stream.last_activity > self.idle_seconds):
+                del self.streams[job_id]
+
+    def _record_delivery(self, delivered: int, counts: Dict[str, int]):
+        self.delivered += delivered
+        for reason, count in counts.items():
+            self.drops[reason] += count
+
+    def subscriber_count(self, job_id: str) -> int:
+        stream = self.streams.get(job_id)
+        return stream.subscribers if stream else 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "streams": len(self.streams),
+            "subscribers": sum(s.subscribers for s in self.streams.values()),
+            "buffered_events": sum(len(s.events) for s in self.streams.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": dict(self.drops),
+        }
+
+
+# Process-wide hub used by event_streaming
+event_hub = EventHub(policy=DeliveryPolicy())
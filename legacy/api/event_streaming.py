@@ -4,22 +4,21 @@ import asyncio
 import json
 from typing import Dict, Optional, AsyncGenerator, Any
 from datetime import datetime, timezone
-from collections import defaultdict
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 
 from src.core.logging_config import get_logger
+from .event_hub import event_hub
+from .game_socket import game_logs
 
 logger = get_logger("api.event_streaming")
 
 router = APIRouter(prefix="/api/stream", tags=["streaming"])
 
-# Event queues for each game session
-game_event_queues: Dict[str, asyncio.Queue] = {}
-# Active connections per game
-game_connections: Dict[str, int] = defaultdict(int)
+# Seconds without events before a keepalive ping
+KEEPALIVE_SECONDS = 30.0
 
 
 class EventType:
@@ -40,39 +39,30 @@ class EventType:
 
 
 async def publish_event(job_id: str, event_type: str, data: Dict):
-    """Publish an event to all connected clients for a game."""
-    event = {
-        "type": event_type,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "data": data
-    }
-    
-    # Create queue if it doesn't exist
-    if job_id not in game_event_queues:
-        game_event_queues[job_id] = asyncio.Queue(maxsize=1000)
-        logger.debug(f"Created event queue for game {job_id}")
+    """Publish an event to all connected clients for a game.
     
-    queue = game_event_queues[job_id]
-    # Don't block if queue is full
+    The event is written once to the job's ring buffer; subscribers read it
+    at their own pace, so publishing never waits on a client. Game events
+    also go to the game's move log for ``/api/ws/games``.
+    """
+    event = event_hub.publish(job_id, event_type, datetime.now(timezone.utc).isoformat(), data)
+    # Per-game move logs for the WebSocket endpoint
+    game_logs.ingest(job_id, event_type, data)
+    logger.debug(f"Published {event_type} event {event.id} for game {job_id}")
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
     try:
-        await queue.put(event)
-        logger.debug(f"Published {event_type} event for game {job_id}")
-    except asyncio.QueueFull:
-        logger.warning(f"Event queue full for game {job_id}, dropping event")
+        return int(value) if value else None
+    except ValueError:
+        return None
 
 
-async def event_generator(request: Request, job_id: str) -> AsyncGenerator:
+async def event_generator(request: Request, job_id: str, last_event_id: Optional[int] = None) -> AsyncGenerator:
     """Generate events for SSE streaming."""
-    # Create queue if it doesn't exist
-    if job_id not in game_event_queues:
-        game_event_queues[job_id] = asyncio.Queue(maxsize=1000)
-        logger.debug(f"Created event queue for game {job_id} on client connect")
-    
-    # Register connection
-    game_connections[job_id] += 1
-    queue = game_event_queues[job_id]
+    subscription = event_hub.subscribe(job_id, last_event_id)
     
-    logger.info(f"Client connected to game stream {job_id} (total: {game_connections[job_id]})")
+    logger.info(f"Client connected to game stream {job_id} (total: {event_hub.subscriber_count(job_id)})")
     
     try:
         # Send initial connection event
@@ -80,6 +70,7 @@ async def event_generator(request: Request, job_id: str) -> AsyncGenerator:
             "event": "connected",
             "data": json.dumps({
                 "job_id": job_id,
+                "resumed_from": last_event_id,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             })
         }
@@ -89,21 +80,20 @@ async def event_generator(request: Request, job_id: str) -> AsyncGenerator:
             # Check if client disconnected
             if await request.is_disconnected():
                 break
-                
-            try:
-                # Wait for event with timeout
-                event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                
-                # Format event for SSE
+            
+            events, missed = await subscription.next_batch(timeout=KEEPALIVE_SECONDS)
+            
+            if missed:
+                # The client fell behind the ring buffer (or resumed too late)
                 yield {
-                    "event": event["type"],
+                    "event": "events_missed",
                     "data": json.dumps({
-                        "timestamp": event["timestamp"],
-                        **event["data"]
+                        "missed": missed,
+                        "timestamp": datetime.now(timezone.utc).isoformat()
                     })
                 }
-                
-            except asyncio.TimeoutError:
+            
+            if not events:
                 # Send keepalive ping
                 yield {
                     "event": "ping",
@@ -111,17 +101,23 @@ async def event_generator(request: Request, job_id: str) -> AsyncGenerator:
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     })
                 }
+                continue
+            
+            for event in events:
+                # Format event for SSE; the id lets EventSource resume via Last-Event-ID
+                yield {
+                    "id": str(event.id),
+                    "event": event.type,
+                    "data": json.dumps({
+                        "timestamp": event.timestamp,
+                        **event.data
+                    })
+                }
                 
     except asyncio.CancelledError:
         logger.info(f"Client disconnected from game stream {job_id}")
     finally:
-        # Cleanup connection
-        game_connections[job_id] -= 1
-        if game_connections[job_id] == 0:
-            # Remove queue if no more connections
-            if job_id in game_event_queues:
-                del game_event_queues[job_id]
-            logger.info(f"Cleaned up event queue for game {job_id}")
+        subscription.close()
 
 
 @router.get("/games/{job_id}/events")
@@ -129,9 +125,15 @@ async def stream_game_events(job_id: str, request: Request):
     """Stream live events for a game session using SSE."""
     logger.info(f"Starting event stream for game {job_id}")
     
+    # Browsers send Last-Event-ID on reconnect; the query parameter covers
+    # clients that open a fresh EventSource
+    last_event_id = _parse_event_id(
+        request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    )
+    
     # Create event source response
     return EventSourceResponse(
-        event_generator(request, job_id),
+        event_generator(request, job_id, last_event_id),
         headers={
             "Cache-Control": "no-cache",
             "X-Accel-Buffering": "no",  # Disable Nginx buffering
@@ -139,6 +141,12 @@ async def stream_game_events(job_id: str, request: Request):
     )
 
 
+@router.get("/stats")
+async def stream_stats():
+    """Hub metrics: streams, subscribers, delivered frames and drops by reason."""
+    return event_hub.stats()
+
+
 # Helper functions for publishing specific event types
 
 async def publish_game_started(job_id: str, model_name: str, num_games: int):
@@ -0,0 +1,444 @@
+"""WebSocket endpoint streaming game move logs as compact binary frames.
+
+One socket (``/api/ws/games``) can watch many games. For every game the
+server keeps a ``GameLog``: the current board as cell codes plus a ring of
+recently encoded frames (see ``move_protocol``). Frames are encoded once when
+an event is published and the same bytes go to every socket watching the
+game; board updates become deltas of the changed cells instead of full
+snapshots.
+
+Protocol (control messages are JSON text, data frames are binary):
+
+- the server greets with ``{"op": "hello", "session": ...}``
+- ``{"op": "subscribe", "job_id": ..., "game_num": ...}`` is answered with
+  ``{"op": "subscribed", "stream": <id>, "epoch": ..., "seq": ...}`` and a
+  keyframe of the current board, then deltas, moves and events follow
+- ``{"op": "ack", "acks": {"<stream>": <seq>}}`` acknowledges applied frames;
+  at most ``WS_ACK_WINDOW`` frames per game are sent ahead of the last ack,
+  and a client further behind than that gets a fresh keyframe instead of
+  the backlog
+- ``{"op": "unsubscribe", "stream": <id>}``
+
+Reconnecting with ``?session=<id>`` within ``WS_SESSION_RESUME_SECONDS``
+restores all subscriptions and resends every frame after the last ack (or a
+keyframe if they are no longer buffered). A single subscription can also be
+resumed with ``"resume": {"epoch": ..., "seq": ...}``.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import secrets
+import struct
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from src.core.logging_config import get_logger
+from . import move_protocol as protocol
+
+logger = get_logger("api.game_socket")
+
+router = APIRouter(tags=["streaming"])
+
+MOVE_LOG_BUFFER = int(os.environ.get("WS_MOVE_LOG_BUFFER", "512"))
+MOVE_LOG_LINGER_SECONDS = float(os.environ.get("WS_MOVE_LOG_LINGER_SECONDS", "300"))
+ACK_WINDOW = int(os.environ.get("WS_ACK_WINDOW", "64"))
+SESSION_RESUME_SECONDS = float(os.environ.get("WS_SESSION_RESUME_SECONDS", "60"))
+MAX_SUBSCRIPTIONS = int(os.environ.get("WS_MAX_SUBSCRIPTIONS", "32"))
+KEEPALIVE_SECONDS = 30.0
+
+# Event type names, as in event_streaming.EventType
+GAME_STARTED = "game_started"
+GAME_COMPLETED = "game_completed"
+GAME_WON = "game_won"
+GAME_LOST = "game_lost"
+MOVE_COMPLETED = "move_completed"
+MOVE_FAILED = "move_failed"
+BOARD_UPDATE = "board_update"
+ERROR = "error"
+
+TERMINAL_STATUS = {GAME_WON: "won", GAME_LOST: "lost"}
+LOGGED_EVENTS = {GAME_STARTED, GAME_COMPLETED, GAME_WON, GAME_LOST, MOVE_FAILED, ERROR}
+
+
+class GameLog:
+    """Board state and encoded frames of one game."""
+
+    def __init__(self, stream_id: int, job_id: str, game_num: int, size: int = MOVE_LOG_BUFFER):
+        self.stream_id = stream_id
+        self.job_id = job_id
+        self.game_num = game_num
+        # Identifies this incarnation of the log; seqs restart with a new epoch
+        self.epoch = secrets.token_hex(4)
+        self.seq = 0
+        self.rows = 0
+        self.cols = 0
+        self.cells = bytearray()
+        self.moves = 0
+        self.status = "pending"
+        self.frames: Deque[Tuple[int, bytes]] = deque(maxlen=size)
+        self.listeners: Set[asyncio.Event] = set()
+        self.finished_at: Optional[float] = None
+        self.last_activity = time.monotonic()
+        self._keyframe: Optional[Tuple[int, bytes]] = None
+        self.bytes_encoded = 0
+
+    def _append(self, data: bytes):
+        self.frames.append((self.seq, data))
+        self.bytes_encoded += len(data)
+        self.last_activity = time.monotonic()
+        for listener in self.listeners:
+            listener.set()
+
+    def _append_keyframe(self):
+        self.seq += 1
+        data = self._encode_keyframe()
+        self._keyframe = (self.seq, data)
+        self._append(data)
+
+    def _encode_keyframe(self) -> bytes:
+        return protocol.encode_keyframe(self.stream_id, self.seq, self.rows, self.cols,
+                                        self.cells, self.moves, self.status)
+
+    def update_board(self, board_data: Dict[str, Any]):
+        rows, cols, cells = protocol.board_cells(board_data)
+        if self.status == "pending":
+            self.status = "in_progress"
+        if (rows, cols) != (self.rows, self.cols):
+            self.rows, self.cols, self.cells = rows, cols, cells
+            self._append_keyframe()
+            return
+        changes = protocol.diff_cells(self.cells, cells)
+        if not changes:
+            return
+        self.cells = cells
+        # 3 bytes per changed cell against half a byte per cell
+        if len(changes) * 6 >= len(cells):
+            self._append_keyframe()
+            return
+        self.seq += 1
+        self._append(protocol.encode_delta(self.stream_id, self.seq, changes))
+
+    def record_move(self, move_num: int, action: str, row: int, col: int, success: bool):
+        # Encode before taking the seq so a rejected move leaves no gap in the log
+        frame = protocol.encode_move(self.stream_id, self.seq + 1, move_num, action, row, col, success)
+        self.moves = max(self.moves, move_num)
+        self.seq += 1
+        self._append(frame)
+
+    def record_event(self, event_type: str, data: Dict[str, Any], status: Optional[str] = None):
+        if status:
+            self.status = status
+            data = dict(data, status=status)
+            if status in ("won", "lost", "error"):
+                self.finished_at = time.monotonic()
+        self.seq += 1
+        self._append(protocol.encode_event(self.stream_id, self.seq, event_type, data))
+
+    def keyframe(self) -> Tuple[int, bytes]:
+        """Current board as a keyframe, encoded at most once per seq."""
+        if self._keyframe is None or self._keyframe[0] != self.seq:
+            self._keyframe = (self.seq, self._encode_keyframe())
+        return self._keyframe
+
+    def read_after(self, cursor: int) -> Optional[List[bytes]]:
+        """Frames after ``cursor``; None if some of them are no longer buffered."""
+        if cursor >= self.seq:
+            return []
+        if not self.frames or cursor < self.frames[0][0] - 1:
+            return None
+        start = cursor - self.frames[0][0] + 1
+        return [data for _, data in itertools.islice(self.frames, start, None)]
+
+
+class GameLogRegistry:
+    """Game logs by (job_id, game_num), fed from published events."""
+
+    def __init__(self, buffer_size: int = MOVE_LOG_BUFFER, linger_seconds: float = MOVE_LOG_LINGER_SECONDS):
+        self.buffer_size = buffer_size
+        self.linger_seconds = linger_seconds
+        self.logs: Dict[Tuple[str, int], GameLog] = {}
+        self.by_stream: Dict[int, GameLog] = {}
+        self._stream_ids = itertools.count(1)
+        self._last_sweep = time.monotonic()
+
+    def get(self, job_id: str, game_num: int) -> GameLog:
+        key = (job_id, game_num)
+        log = self.logs.get(key)
+        if log is None:
+            log = GameLog(next(self._stream_ids) & 0xFFFFFFFF, job_id, game_num, self.buffer_size)
+            self.logs[key] = log
+            self.by_stream[log.stream_id] = log
+        return log
+
+    def ingest(self, job_id: str, event_type: str, data: Dict[str, Any]):
+        """Turn a published job event into move-log frames."""
+        game_num = data.get("game_num")
+        if game_num is None:
+            return
+        self._sweep()
+        try:
+            log = self.get(job_id, int(game_num))
+            if event_type == BOARD_UPDATE and data.get("board_data"):
+                log.update_board(data["board_data"])
+            elif event_type == MOVE_COMPLETED:
+                position = (data.get("move_details") or {}).get("position") or {}
+                action = str(data.get("action") or "").split(" ", 1)[0].lower()
+                log.record_move(int(data.get("move_num") or 0), action,
+                                int(position.get("row", 0)), int(position.get("col", 0)),
+                                bool(data.get("success")))
+            elif event_type in LOGGED_EVENTS:
+                status = TERMINAL_STATUS.get(event_type)
+                if event_type == GAME_STARTED:
+                    status = "in_progress"
+                elif event_type == GAME_COMPLETED:
+                    status = "won" if data.get("won") else "lost"
+                log.record_event(event_type, data, status)
+        except (TypeError, ValueError, KeyError, IndexError, struct.error) as e:
+            logger.warning(f"Could not add {event_type} for job {job_id} game {game_num} to move log: {e}")
+
+    def _sweep(self):
+        """Drop finished games nobody watches after the linger period."""
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        for key, log in list(self.logs.items()):
+            idle_since = log.finished_at or log.last_activity
+            limit = self.linger_seconds if log.finished_at else self.linger_seconds * 4
+            if not log.listeners and now - idle_since > limit:
+                del self.logs[key]
+                self.by_stream.pop(log.stream_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "games": len(self.logs),
+            "watchers": sum(len(log.listeners) for log in self.logs.values()),
+            "buffered_frames": sum(len(log.frames) for log in self.logs.values()),
+            "bytes_encoded": sum(log.bytes_encoded for log in self.logs.values()),
+        }
+
+
+class _Subscription:
+    """A socket session's position in one game log."""
+
+    __slots__ = ("log", "sent", "acked", "base", "needs_keyframe")
+
+    def __init__(self, log: GameLog):
+        self.log = log
+        self.sent = 0
+        self.acked = 0  # last seq the client applied; resumption restarts here
+        self.base = 0  # seq of the last keyframe sent; the window counts from it too
+        self.needs_keyframe = True
+
+    def resume_from(self, seq: int):
+        """Continue after ``seq`` if those frames are still buffered."""
+        if seq <= 0 or self.log.read_after(seq) is None:
+            self.needs_keyframe = True
+        else:
+            self.sent = self.acked = self.base = seq
+            self.needs_keyframe = False
+
+    def pending(self, ack_window: int) -> List[bytes]:
+        """Frames to send now, within the ack window."""
+        log = self.log
+        in_flight = self.sent - max(self.acked, self.base)
+        if not self.needs_keyframe and in_flight >= ack_window:
+            return []  # wait for acks
+        frames = None if self.needs_keyframe or log.seq - self.sent > ack_window else log.read_after(self.sent)
+        if frames is None:
+            # New subscriber, or too far behind to replay: jump to the present
+            seq, data = log.keyframe()
+            self.needs_keyframe = False
+            self.sent = self.base = seq
+            return [data]
+        frames = frames[:ack_window - in_flight]
+        self.sent += len(frames)
+        return frames
+
+    def info(self) -> Dict[str, Any]:
+        log = self.log
+        return {"stream": log.stream_id, "job_id": log.job_id, "game_num": log.game_num,
+                "epoch": log.epoch, "seq": log.seq}
+
+
+class SocketSession:
+    """Subscriptions of one client, kept for a while after it disconnects."""
+
+    def __init__(self):
+        self.id = secrets.token_urlsafe(12)
+        self.subscriptions: Dict[int, _Subscription] = {}
+        self.wake = asyncio.Event()
+        self.outbox: List[Dict[str, Any]] = []
+        self.attached = False
+        self.expires_at = 0.0
+        self.frames_sent = 0
+        self.keyframes_sent = 0
+
+    def attach(self):
+        self.attached = True
+        self.wake = asyncio.Event()
+        for subscription in self.subscriptions.values():
+            # Everything after the last ack is resent
+            subscription.resume_from(subscription.acked)
+            subscription.log.listeners.add(self.wake)
+
+    def detach(self):
+        self.attached = False
+        self.expires_at = time.monotonic() + SESSION_RESUME_SECONDS
+        for subscription in self.subscriptions.values():
+            subscription.log.listeners.discard(self.wake)
+
+    def send(self, message: Dict[str, Any]):
+        self.outbox.append(message)
+        self.wake.set()
+
+    def subscribe(self, job_id: str, game_num: int, resume: Optional[Dict[str, Any]] = None):
+        if len(self.subscriptions) >= MAX_SUBSCRIPTIONS:
+            self.send({"op": "error", "error": f"At most {MAX_SUBSCRIPTIONS} games per socket",
+                       "job_id": job_id, "game_num": game_num})
+            return
+        log = game_logs.get(job_id, game_num)
+        subscription = self.subscriptions.get(log.stream_id)
+        if subscription is None:
+            subscription = self.subscriptions[log.stream_id] = _Subscription(log)
+            log.listeners.add(self.wake)
+        if resume and resume.get("epoch") == log.epoch and resume.get("seq") is not None:
+            subscription.resume_from(int(resume["seq"]))
+        else:
+            subscription.needs_keyframe = True
+        self.send({"op": "subscribed", **subscription.info()})
+
+    def unsubscribe(self, stream_id: int):
+        subscription = self.subscriptions.pop(stream_id, None)
+        if subscription:
+            subscription.log.listeners.discard(self.wake)
+            self.send({"op": "unsubscribed", "stream": stream_id})
+
+    def ack(self, acks: Dict[Any, Any]):
+        for stream_id, seq in acks.items():
+            subscription = self.subscriptions.get(int(stream_id))
+            if subscription is not None:
+                subscription.acked = max(subscription.acked, min(int(seq), subscription.sent))
+        self.wake.set()
+
+    def close(self):
+        for subscription in self.subscriptions.values():
+            subscription.log.listeners.discard(self.wake)
+        self.subscriptions.clear()
+
+
+class SessionRegistry:
+    """Live and recently disconnected socket sessions."""
+
+    def __init__(self):
+        self.sessions: Dict[str, SocketSession] = {}
+
+    def attach(self, session_id: Optional[str]) -> Tuple[SocketSession, bool]:
+        """Resume a detached session by ID, or start a new one."""
+        self._expire()
+        session = self.sessions.get(session_id) if session_id else None
+        resumed = session is not None and not session.attached
+        if not resumed:
+            session = SocketSession()
+            self.sessions[session.id] = session
+        session.attach()
+        return session, resumed
+
+    def _expire(self):
+        now = time.monotonic()
+        for session_id, session in list(self.sessions.items()):
+            if not session.attached and now > session.expires_at:
+                session.close()
+                del self.sessions[session_id]
+
+    def stats(self) -> Dict[str, Any]:
+        attached = [s for s in self.sessions.values() if s.attached]
+        return {
+            "connected": len(attached),
+            "resumable": len(self.sessions) - len(attached),
+            "subscriptions": sum(len(s.subscriptions) for s in attached),
+        }
+
+
+game_logs = GameLogRegistry()
+socket_sessions = SessionRegistry()
+
+
+async def _read_controls(websocket: WebSocket, session: SocketSession):
+    """Apply the client's control messages until it disconnects."""
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                op = message.get("op")
+                if op == "subscribe":
+                    session.subscribe(str(message["job_id"]), int(message["game_num"]), message.get("resume"))
+                elif op == "unsubscribe":
+                    session.unsubscribe(int(message["stream"]))
+                elif op == "ack":
+                    acks = message.get("acks") or {message["stream"]: message["seq"]}
+                    session.ack(acks)
+                elif op == "ping":
+                    session.send({"op": "pong"})
+                else:
+                    session.send({"op": "error", "error": f"Unknown op {op!r}"})
+            except (ValueError, KeyError, TypeError) as e:
+                session.send({"op": "error", "error": f"Invalid message: {e}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.wake.set()
+
+
+@router.websocket("/api/ws/games")
+async def games_socket(websocket: WebSocket):
+    """Stream the move logs of the subscribed games over one socket."""
+    await websocket.accept()
+    session, resumed = socket_sessions.attach(websocket.query_params.get("session"))
+    session.send({
+        "op": "hello",
+        "session": session.id,
+        "resumed": [s.info() for s in session.subscriptions.values()] if resumed else [],
+        "ack_window": ACK_WINDOW,
+    })
+    logger.info(f"Game socket {'resumed' if resumed else 'opened'}: session {session.id}")
+
+    reader = asyncio.create_task(_read_controls(websocket, session))
+    try:
+        while not reader.done():
+            session.wake.clear()
+            outbox, session.outbox = session.outbox, []
+            for message in outbox:
+                await websocket.send_text(json.dumps(message))
+            for subscription in list(session.subscriptions.values()):
+                frames = subscription.pending(ACK_WINDOW)
+                for data in frames:
+                    await websocket.send_bytes(data)
+                session.frames_sent += len(frames)
+                if frames and frames[0][0] == protocol.KEYFRAME:
+                    session.keyframes_sent += 1
+            if session.outbox or reader.done():
+                continue
+            try:
+                await asyncio.wait_for(session.wake.wait(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                session.send({"op": "ping"})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Game socket {session.id} failed: {e}")
+    finally:
+        reader.cancel()
+        session.detach()
+        logger.info(f"Game socket closed: session {session.id} ({session.frames_sent} frames sent)")
+
+
+@router.get("/api/ws/stats")
+async def game_socket_stats():
+    """Move logs and socket sessions."""
+    return {"games": game_logs.stats(), "sessions": socket_sessions.stats()}
@@ -0,0 +1,197 @@
+"""Binary frame format for the game WebSocket (``/api/ws/games``).
+
+Every data frame starts with a 9-byte header::
+
+    type (u8) | stream (u32) | seq (u32)
+
+``stream`` is the server-wide ID of a game's move log (announced in the
+``subscribed`` control message) and ``seq`` numbers the frames of that log
+contiguously, so one encoded frame can be sent unchanged to every socket
+watching the game.
+
+Payloads (network byte order):
+
+- KEYFRAME: rows (u16), cols (u16), moves (u32), status (u8), then the
+  board as 4-bit cell codes, two cells per byte, row-major
+- DELTA: count (u16), then count x (cell index (u16), code (u8))
+- MOVE: move_num (u16), action (u8), row (u16), col (u16), flags (u8,
+  bit 0 = success)
+- EVENT: UTF-8 JSON ``{"type": ..., "data": {...}}`` for low-volume
+  lifecycle events (game started/won/lost, errors)
+
+Control messages (subscribe, ack, hello, ...) are JSON text frames.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Frame types
+KEYFRAME = 1
+DELTA = 2
+MOVE = 3
+EVENT = 4
+
+# Cell codes; 0-8 are revealed cells with that many adjacent mines
+MINE = 9
+FLAGGED = 10
+HIDDEN = 11
+
+# Game status codes
+STATUS_CODES = {"pending": 0, "in_progress": 1, "won": 2, "lost": 3, "error": 4}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Action codes
+ACTION_CODES = {"reveal": 0, "flag": 1, "unflag": 2}
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+OTHER_ACTION = 255
+
+HEADER = struct.Struct("!BII")
+_KEYFRAME = struct.Struct("!HHIB")
+_DELTA_COUNT = struct.Struct("!H")
+_DELTA_ENTRY = struct.Struct("!HB")
+_MOVE = struct.Struct("!HBHHB")
+
+
+class Frame(NamedTuple):
+    """A decoded data frame."""
+    type: int
+    stream: int
+    seq: int
+    payload: Dict[str, Any]
+
+
+def pack_cells(cells: bytes) -> bytes:
+    """Pack cell codes (one per byte) into nibbles, two cells per byte."""
+    packed = bytearray((len(cells) + 1) // 2)
+    for i in range(0, len(cells) - 1, 2):
+        packed[i // 2] = (cells[i] << 4) | cells[i + 1]
+    if len(cells) % 2:
+        packed[-1] = cells[-1] << 4
+    return bytes(packed)
+
+
+def unpack_cells(packed: bytes, count: int) -> bytearray:
+    cells = bytearray(count)
+    for i in range(count):
+        byte = packed[i // 2]
+        cells[i] = (byte >> 4) if i % 2 == 0 else (byte & 0x0F)
+    return cells
+
+
+def board_cells(board_data: Dict[str, Any]) -> Tuple[int, int, bytearray]:
+    """Cell codes from a board's ``to_coordinate_list()``."""
+    size = board_data.get("board_size") or {}
+    rows, cols = int(size.get("rows", 0)), int(size.get("cols", 0))
+    cells = bytearray([HIDDEN]) * (rows * cols)
+    for cell in board_data.get("revealed", ()):
+        value = cell.get("value", 0)
+        cells[cell["row"] * cols + cell["col"]] = MINE if value is None or value < 0 else min(int(value), 8)
+    for cell in board_data.get("flagged", ()):
+        cells[cell["row"] * cols + cell["col"]] = FLAGGED
+    return rows, cols, cells
+
+
+def encode_keyframe(stream: int, seq: int, rows: int, cols: int, cells: bytes,
+                    moves: int = 0, status: str = "in_progress") -> bytes:
+    return (HEADER.pack(KEYFRAME, stream, seq)
+            + _KEYFRAME.pack(rows, cols, moves, STATUS_CODES.get(status, 0))
+            + pack_cells(cells))
+
+
+def encode_delta(stream: int, seq: int, changes: List[Tuple[int, int]]) -> bytes:
+    parts = [HEADER.pack(DELTA, stream, seq), _DELTA_COUNT.pack(len(changes))]
+    parts.extend(_DELTA_ENTRY.pack(index, code) for index, code in changes)
+    return b"".join(parts)
+
+
+def encode_move(stream: int, seq: int, move_num: int, action: str, row: int, col: int,
+                success: bool) -> bytes:
+    if not (0 <= row <= 0xFFFF and 0 <= col <= 0xFFFF):
+        raise ValueError(f"Move position ({row}, {col}) is outside the u16 range")
+    return HEADER.pack(MOVE, stream, seq) + _MOVE.pack(
+        min(max(move_num, 0), 0xFFFF), ACTION_CODES.get(action, OTHER_ACTION), row, col, 1 if success else 0
+    )
+
+
+def encode_event(stream: int, seq: int, event_type: str, data: Dict[str, Any]) -> bytes:
+    body = json.dumps({"type": event_type, "data": data}, default=str, separators=(",", ":"))
+    return HEADER.pack(EVENT, stream, seq) + body.encode()
+
+
+def diff_cells(old: bytes, new: bytes) -> List[Tuple[int, int]]:
+    return [(i, code) for i, (before, code) in enumerate(zip(old, new)) if before != code]
+
+
+def decode_frame(data: bytes) -> Frame:
+    """Decode a data frame (used by clients and tests)."""
+    frame_type, stream, seq = HEADER.unpack_from(data)
+    offset = HEADER.size
+
+    if frame_type == KEYFRAME:
+        rows, cols, moves, status = _KEYFRAME.unpack_from(data, offset)
+        cells = unpack_cells(data[offset + _KEYFRAME.size:], rows * cols)
+        payload = {"rows": rows, "cols": cols, "moves": moves,
+                   "status": STATUS_NAMES.get(status, "in_progress"), "cells": cells}
+    elif frame_type == DELTA:
+        (count,) = _DELTA_COUNT.unpack_from(data, offset)
+        offset += _DELTA_COUNT.size
+        payload = {"changes": [_DELTA_ENTRY.unpack_from(data, offset + i * _DELTA_ENTRY.size)
+                               for i in range(count)]}
+    elif frame_type == MOVE:
+        move_num, action, row, col, flags = _MOVE.unpack_from(data, offset)
+        payload = {"move_num": move_num, "action": ACTION_NAMES.get(action, "other"),
+                   "row": row, "col": col, "success": bool(flags & 1)}
+    elif frame_type == EVENT:
+        payload = json.loads(data[offset:])
+    else:
+        raise ValueError(f"Unknown frame type {frame_type}")
+    return Frame(frame_type, stream, seq, payload)
+
+
+class BoardView:
+    """Client-side reconstruction of one game from its frames."""
+
+    def __init__(self):
+        self.rows = 0
+        self.cols = 0
+        self.cells = bytearray()
+        self.moves = 0
+        self.status = "pending"
+        self.seq: Optional[int] = None
+        self.events: List[Dict[str, Any]] = []
+
+    def apply(self, frame: Frame) -> bool:
+        """Apply a frame; False if frames are missing before it.
+
+        Frames at or before the last applied seq (resent after a resume) are
+        skipped.
+        """
+        if frame.type == KEYFRAME:
+            payload = frame.payload
+            self.rows, self.cols = payload["rows"], payload["cols"]
+            self.cells = bytearray(payload["cells"])
+            self.moves, self.status = payload["moves"], payload["status"]
+            self.seq = frame.seq
+            return True
+        if self.seq is not None and frame.seq <= self.seq:
+            return True
+        if self.seq is None or frame.seq != self.seq + 1:
+            return False
+        self.seq = frame.seq
+        if frame.type == DELTA:
+            for index, code in frame.payload["changes"]:
+                self.cells[index] = code
+        elif frame.type == MOVE:
+            self.moves = max(self.moves, frame.payload["move_num"])
+        elif frame.type == EVENT:
+            self.events.append(frame.payload)
+            status = frame.payload.get("data", {}).get("status")
+            if status in STATUS_CODES:
+                self.status = status
+        return True
+
+    def render(self) -> List[str]:
+        symbols = "012345678*F?"
+        return ["".join(symbols[code] for code in self.cells[r * self.cols:(r + 1) * self.cols])
+                for r in range(self.rows)]
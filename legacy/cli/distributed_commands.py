@@ -0,0 +1,202 @@
+"""CLI commands for distributed evaluation (coordinator and workers)."""
+
+import click
+import asyncio
+import signal
+from pathlib import Path
+from typing import Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+from rich.progress import Progress, BarColumn, TextColumn
+
+from src.core.types import ModelConfig, Difficulty, TaskType
+from src.tasks import TaskRepository, TaskGenerator
+from src.evaluation.distributed import (
+    EvaluationCoordinator, EvaluationWorker, open_store, new_job_id,
+    DISTRIBUTED_STORE, DISTRIBUTED_DIR, SHARD_SIZE, POLL_INTERVAL
+)
+
+console = Console()
+
+
+def parse_model_spec(spec: str, temperature: float) -> ModelConfig:
+    """Build a model config from ``provider/model`` (or a bare gpt/claude model)."""
+    provider, _, model_id = spec.partition("/")
+    if not model_id:
+        model_id = spec
+        if "gpt" in spec.lower():
+            provider = "openai"
+        elif "claude" in spec.lower():
+            provider = "anthropic"
+        else:
+            raise click.BadParameter(f"Could not auto-detect provider for {spec}; use provider/model")
+    return ModelConfig(
+        name=f"{provider}/{model_id}",
+        provider=provider,
+        model_id=model_id,
+        temperature=temperature,
+    )
+
+
+def add_distributed_commands(cli_group):
+    """Add coordinator and worker commands to CLI."""
+
+    @cli_group.command()
+    @click.option(
+        "--model", "-m", "models",
+        multiple=True,
+        help="Model to evaluate as provider/model (repeat for several)"
+    )
+    @click.option("--num-games", "-n", default=10, help="Number of tasks per model")
+    @click.option(
+        "--difficulty", "-d",
+        type=click.Choice(["beginner", "intermediate", "expert"]),
+        default="expert",
+        help="Game difficulty"
+    )
+    @click.option(
+        "--task-type", "-t",
+        type=click.Choice(["interactive", "static"]),
+        default="interactive",
+        help="Type of tasks to run"
+    )
+    @click.option(
+        "--prompt-format",
+        type=click.Choice(["standard", "json", "cot"]),
+        default="standard",
+        help="Prompt format to use"
+    )
+    @click.option("--max-moves", default=500, help="Maximum moves per game")
+    @click.option("--temperature", default=0.7, help="Model temperature")
+    @click.option("--shard-size", default=SHARD_SIZE, help="Games per lease")
+    @click.option("--job-id", help="Job to create, or to re-attach to if it exists")
+    @click.option("--store", default=DISTRIBUTED_STORE, help="redis:// URL shared with the workers, or a SQLite file for workers on this host")
+    @click.option("--output-dir", type=click.Path(), default=str(DISTRIBUTED_DIR), help="Job directory root")
+    @click.option("--poll-interval", default=POLL_INTERVAL, help="Seconds between store polls")
+    @click.option("--no-wait", is_flag=True, help="Submit the shards and exit")
+    def coordinate(
+        models: Tuple[str, ...],
+        num_games: int,
+        difficulty: str,
+        task_type: str,
+        prompt_format: str,
+        max_moves: int,
+        temperature: float,
+        shard_size: int,
+        job_id: Optional[str],
+        store: str,
+        output_dir: str,
+        poll_interval: float,
+        no_wait: bool,
+    ):
+        """Shard an evaluation across workers and merge their results."""
+        coordinator = EvaluationCoordinator(open_store(store), Path(output_dir))
+        job_id = job_id or new_job_id()
+        manifest = coordinator.load_manifest(job_id)
+
+        if manifest is not None:
+            console.print(f"Re-attaching to job [cyan]{job_id}[/cyan] ({len(manifest['shards'])} shards)")
+        else:
+            if not models:
+                raise click.UsageError("--model is required when creating a job")
+            model_configs = [parse_model_spec(spec, temperature) for spec in models]
+
+            repo = TaskRepository()
+            tasks = repo.load_tasks(
+                task_type=TaskType(task_type),
+                difficulty=Difficulty(difficulty),
+                limit=num_games,
+            )
+            if len(tasks) < num_games:
+                console.print(f"Only found {len(tasks)} tasks. Generating {num_games - len(tasks)} more...")
+                new_tasks = TaskGenerator().generate_task_batch(
+                    num_tasks=num_games - len(tasks),
+                    task_type=TaskType(task_type),
+                    difficulty=Difficulty(difficulty),
+                )
+                repo.save_tasks(new_tasks)
+                tasks.extend(new_tasks)
+
+            manifest = coordinator.plan(job_id, model_configs, tasks, max_moves, prompt_format, shard_size)
+            console.print(
+                f"Job [cyan]{job_id}[/cyan]: {len(model_configs)} models x {len(tasks)} tasks "
+                f"in {len(manifest['shards'])} shards"
+            )
+
+        submitted = asyncio.run(coordinator.submit(manifest))
+        console.print(f"Submitted {submitted} shards to {store}")
+        if no_wait:
+            console.print(f"Start workers with: [bold]worker --store {store}[/bold]")
+            return
+
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("{task.completed}/{task.total} shards"),
+            console=console,
+        ) as progress:
+            bar = progress.add_task("Evaluating", total=len(manifest["shards"]))
+            summary = asyncio.run(coordinator.wait(
+                manifest, poll_interval,
+                on_progress=lambda s: progress.update(bar, completed=s["shards_finished"])
+            ))
+
+        table = Table(title=f"Job {job_id}")
+        table.add_column("Model", style="cyan")
+        table.add_column("Games", justify="right")
+        table.add_column("Win Rate", style="green", justify="right")
+        table.add_column("Valid Moves", justify="right")
+        table.add_column("Moves to Win", justify="right")
+        table.add_column("Coverage on Loss", justify="right")
+        for name, result in summary["models"].items():
+            metrics = result["metrics"]
+            moves_to_win = metrics["average_moves_to_win"]
+            table.add_row(
+                name,
+                str(result["games"]),
+                f"{metrics['win_rate']:.1%}",
+                f"{metrics['valid_move_rate']:.1%}",
+                f"{moves_to_win:.1f}" if moves_to_win is not None else "-",
+                f"{metrics['board_coverage_on_loss']:.1%}",
+            )
+        console.print(table)
+
+        if summary["shards_failed"]:
+            console.print(f"[red]{len(summary['shards_failed'])} shards failed[/red]")
+            for failure in summary["shards_failed"]:
+                console.print(f"  {failure['shard_id']}: {failure['status']} {failure['error'] or ''}")
+        console.print(f"\n[green]Summary saved to {Path(output_dir) / job_id / 'summary.json'}[/green]")
+
+    @cli_group.command()
+    @click.option("--store", default=DISTRIBUTED_STORE, help="SQLite file or redis:// URL of the coordinator")
+    @click.option("--output-dir", type=click.Path(), default=str(DISTRIBUTED_DIR), help="Where to write transcripts")
+    @click.option("--concurrency", "-c", default=2, help="Shards to play at once")
+    @click.option("--worker-id", help="Worker name (default: host-pid)")
+    @click.option("--exit-when-idle", is_flag=True, help="Exit once no shard is left to claim")
+    def worker(
+        store: str,
+        output_dir: str,
+        concurrency: int,
+        worker_id: Optional[str],
+        exit_when_idle: bool,
+    ):
+        """Claim evaluation shards from a coordinator's store and play them."""
+        evaluation_worker = EvaluationWorker(
+            open_store(store), Path(output_dir), worker_id=worker_id, concurrency=concurrency
+        )
+
+        async def serve():
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+            await evaluation_worker.run(stop, exit_when_idle)
+
+        console.print(f"Worker [cyan]{evaluation_worker.worker_id}[/cyan] on {store} ({concurrency} slots)")
+        asyncio.run(serve())
+        stats = evaluation_worker.stats
+        console.print(
+            f"Played {stats['games_played']} games: {stats['shards_completed']} shards completed, "
+            f"{stats['shards_failed']} failed"
+        )
@@ -4,6 +4,7 @@ import click
 import asyncio
 from pathlib import Path
 from typing import Optional
+from uuid import uuid4
 import json
 
 from rich.console import Console
@@ -13,12 +14,14 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from src.core.types import ModelConfig, Difficulty, TaskType, Action, ActionType, Position, GameStatus
 from src.core.config import settings
 from src.evaluation import EvaluationEngine
+from src.evaluation.checkpoint import JobCheckpoint
 from src.tasks import TaskRepository, TaskGenerator
 from src.games.tilts import TiltsGame
 from src.models import list_providers
 from .web_commands import add_web_commands
 from .prompt_commands import add_prompt_commands
 from .plugin_commands import add_plugin_commands
+from .distributed_commands import add_distributed_commands
 
 console = Console()
 
@@ -32,7 +35,6 @@ def cli():
 @cli.command()
 @click.option(
     "--model", "-m",
-    required=True,
     help="Model to evaluate (e.g., gpt-4, claude-3)"
 )
 @click.option(
@@ -83,8 +85,13 @@ def cli():
     type=click.Path(),
     help="Output file for results (JSON)"
 )
+@click.option(
+    "--resume",
+    "resume_job",
+    help="Resume an interrupted evaluation by its job ID"
+)
 def evaluate(
-    model: str,
+    model: Optional[str],
     provider: Optional[str],
     num_games: int,
     difficulty: str,
@@ -94,8 +101,47 @@ def evaluate(
     verbose: bool,
     temperature: float,
     output: Optional[str],
+    resume_job: Optional[str],
 ):
     """Evaluate a model on Minesweeper tasks."""
+    if resume_job:
+        try:
+            checkpoint = JobCheckpoint(resume_job)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--resume")
+        if not checkpoint.exists():
+            console.print(f"[red]No checkpoint found for job {resume_job}[/red]")
+            return
+        model_config, tasks, options = checkpoint.load_job()
+        done = len(checkpoint.finished_indexes())
+        console.print(
+            f"\n[bold]Resuming {resume_job}: {model_config.name}, "
+            f"{done}/{len(tasks)} games already finished[/bold]"
+        )
+        checkpoint.update_status("running")
+        results = asyncio.run(
+            EvaluationEngine().evaluate_model(
+                model_config=model_config,
+                tasks=tasks,
+                max_moves=options.get("max_moves", 500),
+                prompt_format=options.get("prompt_format", "standard"),
+                parallel_games=parallel if parallel > 1 else options.get("parallel_games", 1),
+                verbose=verbose,
+                checkpoint=checkpoint,
+            )
+        )
+        # Results are saved by the engine; the checkpoint has served its purpose
+        checkpoint.remove()
+        if output:
+            with open(output, "w") as f:
+                json.dump(results, f, indent=2)
+            console.print(f"\n[green]Results saved to {output}[/green]")
+        return
+    
+    if not model:
+        console.print("[red]Specify a model with --model (or --resume a job)[/red]")
+        return
+    
     # Auto-detect provider if not specified
     if not provider:
         if "gpt" in model.lower():
@@ -139,8 +185,13 @@ def evaluate(
         repo.save_tasks(new_tasks)
         tasks.extend(new_tasks)
     
+    # Checkpoint finished games and in-flight moves so the run can be resumed
+    checkpoint = JobCheckpoint(f"eval_{uuid4().hex[:8]}")
+    checkpoint.save_job(model_config, tasks, prompt_format=prompt_format, parallel_games=parallel)
+    
     # Run evaluation
     console.print(f"\n[bold]Evaluating {model} on {len(tasks)} tasks[/bold]")
+    console.print(f"Job {checkpoint.job_id} (resume with --resume {checkpoint.job_id})")
     
     engine = EvaluationEngine()
     
@@ -152,8 +203,10 @@ def evaluate(
             prompt_format=prompt_format,
             parallel_games=parallel,
             verbose=verbose,
+            checkpoint=checkpoint,
         )
     )
+    checkpoint.remove()
     
     # Save results if requested
     if output:
@@ -477,6 +530,9 @@ add_prompt_commands(cli)
 # Add plugin commands to CLI
 add_plugin_commands(cli)
 
+# Add distributed evaluation commands to CLI
+add_distributed_commands(cli)
+
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
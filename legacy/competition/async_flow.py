@@ -5,10 +5,24 @@ from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
+import os
+import socket
+import time
 import uuid
 from collections import defaultdict
 
+from src.core.types import ModelConfig
 from src.evaluation.generic_engine import GenericEvaluationEngine, GameEvaluationResult
+from src.games.base import GameConfig, GameMode
+from src.models.base import BaseModel, ModelResponse
+from src.models.factory import create_model
+from src.scoring.framework import ScoringProfile
+from src.competition.queue_backends import QueueBackend, Lease, call_backend, keep_lease
+from src.competition.realtime_queue import MemoryQueueBackend
+
+# Evaluations run at once per flow manager
+EVALUATION_CONCURRENCY = int(os.environ.get("FLOW_EVALUATION_CONCURRENCY", "3"))
+DEFAULT_EVALUATION_TIME = 10.0  # seconds, until evaluations have been timed
 
 
 class PlayerStatus(Enum):
@@ -43,6 +57,8 @@ class PlayerRoundState:
     result: Optional[GameEvaluationResult] = None
     error_message: Optional[str] = None
     engagement_score: float = 0.0  # Track engagement during wait times
+    item_id: Optional[str] = None  # Queue item of the current submission
+    submissions: int = 0
     
     @property
     def time_writing(self) -> Optional[timedelta]:
@@ -60,6 +76,54 @@ class PlayerRoundState:
         return None
 
 
+class PromptedModel(BaseModel):
+    """A model that plays with a player's prompt in front of every game prompt."""
+    
+    def __init__(self, model: BaseModel, player_prompt: str):
+        self.model = model
+        self.player_prompt = player_prompt
+        super().__init__(model.config)
+    
+    def __getattr__(self, name: str) -> Any:
+        # Provider capabilities (function calling support etc.) come from the wrapped model
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+    
+    async def generate(self, prompt: str, **kwargs) -> ModelResponse:
+        return await self.model.generate(f"{self.player_prompt}\n\n{prompt}", **kwargs)
+
+
+def create_player_model(player_id: str, prompt: str, game_config: Dict[str, Any]) -> BaseModel:
+    """Default model factory: the round's model playing with the player's prompt."""
+    model = game_config.get("model") or {}
+    return PromptedModel(create_model(ModelConfig(
+        name=model.get("name", f"{player_id}-model"),
+        provider=model.get("provider", "openai"),
+        model_id=model.get("model_id", "gpt-4"),
+        temperature=model.get("temperature", 0),
+        max_tokens=model.get("max_tokens", 1000),
+        additional_params=model.get("params", {})
+    )), prompt)
+
+
+def build_game_config(game_config: Dict[str, Any]) -> GameConfig:
+    return GameConfig(
+        difficulty=game_config.get("difficulty", "medium"),
+        mode=GameMode(game_config.get("mode", GameMode.MIXED.value)),
+        custom_settings=game_config.get("custom_settings", {}),
+        time_limit=game_config.get("time_limit")
+    )
+
+
+def build_scoring_profile(game_config: Dict[str, Any]) -> ScoringProfile:
+    return ScoringProfile(
+        name=(game_config.get("scoring_profile") or {}).get("name", "default"),
+        description="",
+        weights=[]  # Would be loaded from config
+    )
+
+
 @dataclass
 class WaitingActivity:
     """Activity for players while waiting for others."""
@@ -73,12 +137,21 @@ class WaitingActivity:
 
 
 class AsyncGameFlowManager:
-    """Manages asynchronous game flow with engagement during wait times."""
+    """Manages asynchronous game flow with engagement during wait times.
+    
+    Submitted prompts are evaluated by a fixed pool of workers. A player's
+    first submission in a round is queued ahead of every resubmission, and
+    resubmitting withdraws the previous attempt, cancelling it if it is
+    already running.
+    """
     
     def __init__(
         self,
         evaluation_engine: GenericEvaluationEngine,
-        flow_mode: FlowMode = FlowMode.SYNCHRONOUS
+        flow_mode: FlowMode = FlowMode.SYNCHRONOUS,
+        queue_backend: Optional[QueueBackend] = None,
+        model_factory: Optional[Callable[[str, str, Dict[str, Any]], BaseModel]] = None,
+        max_concurrent_evaluations: int = EVALUATION_CONCURRENCY
     ):
         self.evaluation_engine = evaluation_engine
         self.flow_mode = flow_mode
@@ -86,8 +159,15 @@ class AsyncGameFlowManager:
         self.round_timers: Dict[int, datetime] = {}
         self.waiting_activities: List[WaitingActivity] = self._initialize_activities()
         self.event_callbacks: Dict[str, List[Callable]] = defaultdict(list)
-        self.evaluation_queue: asyncio.Queue = asyncio.Queue()
-        self.active_evaluations: Dict[str, asyncio.Task] = {}
+        # Durable backends keep submissions across restarts
+        self.evaluation_queue: QueueBackend = queue_backend or MemoryQueueBackend()
+        self.active_evaluations: Dict[str, asyncio.Task] = {}  # "player_round" -> task
+        self.model_factory = model_factory or create_player_model
+        self.max_concurrent_evaluations = max_concurrent_evaluations
+        self.worker_id = f"flow-{socket.gethostname()}-{os.getpid()}"
+        self._evaluation_workers: List[asyncio.Task] = []
+        self._average_evaluation_time = DEFAULT_EVALUATION_TIME
+        self._closing = False
     
     def _initialize_activities(self) -> List[WaitingActivity]:
         """Initialize waiting activities for players."""
@@ -163,9 +243,12 @@ class AsyncGameFlowManager:
             "flow_mode": self.flow_mode.value
         })
         
-        # Start evaluation worker if not running
-        if not hasattr(self, '_evaluation_worker'):
-            self._evaluation_worker = asyncio.create_task(self._process_evaluation_queue())
+        # Start the evaluation workers if not running
+        if not self._evaluation_workers:
+            self._evaluation_workers = [
+                asyncio.create_task(self._evaluation_worker(index))
+                for index in range(self.max_concurrent_evaluations)
+            ]
     
     async def submit_prompt(
         self,
@@ -174,42 +257,56 @@ class AsyncGameFlowManager:
         prompt: str,
         game_config: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Submit a player's prompt for evaluation."""
+        """Submit a player's prompt for evaluation.
+        
+        Players may resubmit while their previous prompt is queued, being
+        evaluated or failed; the previous attempt is withdrawn.
+        """
         state = self.player_states[player_id].get(round_number)
         if not state:
             return {"error": "Player not in this round"}
         
-        if state.status != PlayerStatus.WRITING:
+        resubmission = state.status in (PlayerStatus.SUBMITTED, PlayerStatus.EVALUATING, PlayerStatus.ERROR)
+        if state.status != PlayerStatus.WRITING and not resubmission:
             return {"error": f"Cannot submit in status {state.status.value}"}
+        if resubmission:
+            await self._withdraw_submission(state)
         
         # Update state
         state.prompt = prompt
         state.submitted_at = datetime.utcnow()
         state.status = PlayerStatus.SUBMITTED
+        state.error_message = None
+        state.submissions += 1
+        state.item_id = f"{player_id}_{round_number}_{uuid.uuid4().hex[:8]}"
         
-        # Add to evaluation queue
-        await self.evaluation_queue.put({
+        # Add to evaluation queue; first submissions run before resubmissions
+        position = await call_backend(self.evaluation_queue, "enqueue", state.item_id, {
             "player_id": player_id,
             "round_number": round_number,
             "prompt": prompt,
             "game_config": game_config,
-            "submitted_at": state.submitted_at
-        })
+            "submitted_at": state.submitted_at.isoformat(),
+            "submission": state.submissions
+        }, min(state.submissions, 3))
         
         await self._emit_event("prompt_submitted", {
             "player_id": player_id,
             "round": round_number,
-            "queue_size": self.evaluation_queue.qsize()
+            "submission": state.submissions,
+            "position": position,
+            "queue_size": await call_backend(self.evaluation_queue, "qsize")
         })
+        await self._emit_queue_positions()
         
         # Return waiting activities based on flow mode
         if self.flow_mode == FlowMode.SYNCHRONOUS:
-            activities = self._get_waiting_activities(player_id, round_number)
+            activities = await self._get_waiting_activities(player_id, round_number)
             return {
                 "status": "submitted",
                 "message": "Prompt submitted successfully",
                 "waiting_activities": activities,
-                "estimated_wait": self._estimate_wait_time()
+                "estimated_wait": await self._estimate_wait_time()
             }
         else:
             return {
@@ -218,16 +315,50 @@ class AsyncGameFlowManager:
                 "next_action": "watch_evaluation"
             }
     
-    async def _process_evaluation_queue(self):
-        """Process prompts from the evaluation queue."""
+    async def _withdraw_submission(self, state: PlayerRoundState):
+        """Cancel a player's previous submission, queued or running.
+        
+        An attempt running in another process cannot be interrupted; its
+        result is ignored because the state no longer points at its item.
+        """
+        withdrawn = None
+        if state.item_id and await call_backend(self.evaluation_queue, "cancel", state.item_id):
+            withdrawn = "queued"
+        else:
+            task = self.active_evaluations.get(f"{state.player_id}_{state.round_number}")
+            if task and not task.done():
+                task.cancel()
+                withdrawn = "running"
+        
+        if withdrawn:
+            await self._emit_event("evaluation_cancelled", {
+                "player_id": state.player_id,
+                "round": state.round_number,
+                "submission": state.submissions,
+                "reason": "resubmitted",
+                "was": withdrawn
+            })
+    
+    async def _evaluation_worker(self, index: int):
+        """One of the pool's workers: lease a prompt, evaluate it, repeat."""
+        worker_id = f"{self.worker_id}-{index}"
+        task: Optional[asyncio.Task] = None
         while True:
             try:
-                # Get next prompt to evaluate
-                eval_request = await self.evaluation_queue.get()
+                # Lease the next prompt to evaluate
+                lease = await call_backend(self.evaluation_queue, "claim", worker_id)
+                if lease is None:
+                    await asyncio.sleep(1)
+                    continue
+                eval_request = lease.payload
                 
                 player_id = eval_request["player_id"]
                 round_number = eval_request["round_number"]
-                state = self.player_states[player_id][round_number]
+                state = self._state_for(eval_request, lease.item_id)
+                if state.item_id != lease.item_id:
+                    # Replaced by a resubmission after it was claimed
+                    await call_backend(self.evaluation_queue, "fail", lease, "Superseded by a resubmission", False)
+                    continue
                 
                 # Update status
                 state.status = PlayerStatus.EVALUATING
@@ -235,50 +366,102 @@ class AsyncGameFlowManager:
                 
                 await self._emit_event("evaluation_started", {
                     "player_id": player_id,
-                    "round": round_number
+                    "round": round_number,
+                    "submission": eval_request.get("submission", 1),
+                    "attempt": lease.attempts
                 })
+                await self._emit_queue_positions()
                 
-                # Create evaluation task
-                eval_task = asyncio.create_task(
-                    self._evaluate_prompt(eval_request)
-                )
-                self.active_evaluations[f"{player_id}_{round_number}"] = eval_task
-                
-                # Don't wait for completion in queue processor
+                # Run the evaluation as its own task so a resubmission can
+                # cancel it without stopping this worker
+                task = asyncio.create_task(self._evaluate_prompt(eval_request, lease))
+                self.active_evaluations[f"{player_id}_{round_number}"] = task
+                await asyncio.wait({task})
+                if not task.cancelled() and task.exception() is not None:
+                    # _evaluate_prompt settles the lease itself; this is whatever escaped it
+                    print(f"Evaluation {lease.item_id} failed in worker {index}: {task.exception()!r}")
+                task = None
                 
             except asyncio.CancelledError:
+                if task and not task.done():
+                    task.cancel()
+                    await asyncio.wait({task})
                 break
             except Exception as e:
-                print(f"Error in evaluation queue: {e}")
+                print(f"Error in evaluation worker {index}: {e}")
     
-    async def _evaluate_prompt(self, eval_request: Dict[str, Any]):
-        """Evaluate a single prompt."""
+    def _state_for(self, eval_request: Dict[str, Any], item_id: str) -> PlayerRoundState:
         player_id = eval_request["player_id"]
         round_number = eval_request["round_number"]
+        state = self.player_states[player_id].get(round_number)
+        if state is None:
+            # Submitted before a restart: rebuild the state from the queue
+            state = PlayerRoundState(
+                player_id=player_id,
+                round_number=round_number,
+                status=PlayerStatus.SUBMITTED,
+                prompt=eval_request["prompt"],
+                submitted_at=datetime.fromisoformat(eval_request["submitted_at"]),
+                item_id=item_id,
+                submissions=eval_request.get("submission", 1)
+            )
+            self.player_states[player_id][round_number] = state
+        return state
+    
+    async def _evaluate_prompt(self, eval_request: Dict[str, Any], lease: Lease):
+        """Evaluate a single prompt, holding its lease until done."""
+        player_id = eval_request["player_id"]
+        round_number = eval_request["round_number"]
+        game_config = eval_request["game_config"]
         state = self.player_states[player_id][round_number]
+        task_key = f"{player_id}_{round_number}"
+        started = time.monotonic()
         
         try:
-            # This would call the actual evaluation engine
-            # For now, simulate with a delay
-            await asyncio.sleep(5)  # Simulate AI evaluation time
+            ai_model = self.model_factory(player_id, eval_request["prompt"], game_config)
+            async with keep_lease(self.evaluation_queue, lease):
+                result = await self.evaluation_engine.evaluate_game(
+                    game_name=game_config.get("game_name", "minesweeper"),
+                    game_config=build_game_config(game_config),
+                    ai_model=ai_model,
+                    scoring_profile=build_scoring_profile(game_config),
+                    player_id=player_id,
+                    evaluation_id=lease.item_id,
+                    stream_callback=self._progress_callback(state, lease.item_id)
+                )
             
-            # In real implementation:
-            # result = await self.evaluation_engine.evaluate_game(...)
+            await call_backend(self.evaluation_queue, "ack", lease, {
+                "final_score": result.final_score,
+                "victory": result.game_result.victory,
+                "moves": result.game_result.moves_made
+            })
+            self._record_evaluation_time(time.monotonic() - started)
+            if state.item_id != lease.item_id:
+                return
             
             state.status = PlayerStatus.COMPLETED
             state.evaluation_completed_at = datetime.utcnow()
-            # state.result = result
+            state.result = result
             
             await self._emit_event("evaluation_completed", {
                 "player_id": player_id,
                 "round": round_number,
-                "success": True
+                "success": True,
+                "final_score": result.final_score
             })
             
-            # Check if round is complete
-            await self._check_round_completion(round_number)
-            
+        except asyncio.CancelledError:
+            if self._closing:
+                # Shutting down: hand the prompt back to the queue
+                await call_backend(self.evaluation_queue, "release", lease)
+            else:
+                await call_backend(self.evaluation_queue, "fail", lease, "Superseded by a resubmission", False)
+            raise
+        
         except Exception as e:
+            await call_backend(self.evaluation_queue, "fail", lease, str(e), False)
+            if state.item_id != lease.item_id:
+                return
             state.status = PlayerStatus.ERROR
             state.error_message = str(e)
             
@@ -290,11 +473,65 @@ class AsyncGameFlowManager:
         
         finally:
             # Remove from active evaluations
-            task_key = f"{player_id}_{round_number}"
-            if task_key in self.active_evaluations:
+            if self.active_evaluations.get(task_key) is asyncio.current_task():
                 del self.active_evaluations[task_key]
+        
+        # Check if round is complete (outside the handlers above, so a
+        # failing results broadcast does not mark the evaluation failed)
+        if state.status == PlayerStatus.COMPLETED and state.item_id == lease.item_id:
+            await self._check_round_completion(round_number)
+    
+    def _progress_callback(self, state: PlayerRoundState, item_id: str) -> Callable:
+        """Stream callback turning engine updates into progress events."""
+        async def on_update(update: Dict[str, Any]):
+            if state.item_id != item_id:
+                return
+            action = update.get("action")
+            await self._emit_event("evaluation_progress", {
+                "player_id": state.player_id,
+                "round": state.round_number,
+                "type": update.get("type"),
+                "move_number": update.get("move_number"),
+                "valid": update.get("valid"),
+                "action": {
+                    "action_type": action.action_type,
+                    "parameters": action.parameters
+                } if action is not None else None,
+                "error": update.get("error")
+            })
+        return on_update
+    
+    async def _emit_queue_positions(self):
+        """Tell waiting players where they are in the queue (if anyone listens)."""
+        if not self.event_callbacks.get("queue_positions"):
+            return
+        positions = await call_backend(self.evaluation_queue, "positions")
+        players = {
+            state.item_id: (player_id, round_number)
+            for player_id, rounds in self.player_states.items()
+            for round_number, state in rounds.items()
+            if state.item_id in positions
+        }
+        await self._emit_event("queue_positions", {
+            "positions": [
+                {"player_id": player_id, "round": round_number, "position": positions[item_id]}
+                for item_id, (player_id, round_number) in players.items()
+            ],
+            "queue_size": len(positions)
+        })
+    
+    def _record_evaluation_time(self, seconds: float):
+        self._average_evaluation_time += 0.2 * (seconds - self._average_evaluation_time)
+    
+    async def shutdown(self):
+        """Stop the workers; running evaluations go back to the queue."""
+        self._closing = True
+        for worker in self._evaluation_workers:
+            worker.cancel()
+        await asyncio.gather(*self._evaluation_workers, return_exceptions=True)
+        self._evaluation_workers = []
     
-    def _get_waiting_activities(
+    async def _get_waiting_activities(
         self,
         player_id: str,
         round_number: int
@@ -303,7 +540,7 @@ class AsyncGameFlowManager:
         state = self.player_states[player_id][round_number]
         
         # Filter activities based on estimated wait time
-        wait_time = self._estimate_wait_time()
+        wait_time = await self._estimate_wait_time()
         suitable_activities = [
             {
                 "id": activity.activity_id,
@@ -319,14 +556,14 @@ class AsyncGameFlowManager:
         
         return sorted(suitable_activities, key=lambda x: x["points"], reverse=True)
     
-    def _estimate_wait_time(self) -> int:
+    async def _estimate_wait_time(self) -> int:
         """Estimate wait time based on queue and evaluation times."""
         # Simple estimation - would be more sophisticated in practice
-        queue_size = self.evaluation_queue.qsize()
-        avg_eval_time = 10  # seconds, would track actual averages
+        queue_size = await call_backend(self.evaluation_queue, "qsize")
+        avg_eval_time = self._average_evaluation_time
         
         # Estimate based on queue position and parallel processing
-        parallel_workers = 3  # Number of concurrent evaluations
+        parallel_workers = self.max_concurrent_evaluations
         estimated_wait = (queue_size / parallel_workers) * avg_eval_time
         
         return int(estimated_wait)
@@ -419,7 +656,7 @@ class AsyncGameFlowManager:
                 "points": points
             })
     
-    def get_round_status(self, round_number: int) -> Dict[str, Any]:
+    async def get_round_status(self, round_number: int) -> Dict[str, Any]:
         """Get current status of a round."""
         round_states = [
             states[round_number]
@@ -435,7 +672,7 @@ class AsyncGameFlowManager:
             "round": round_number,
             "total_players": len(round_states),
             "status_breakdown": dict(status_counts),
-            "queue_size": self.evaluation_queue.qsize(),
+            "queue_size": await call_backend(self.evaluation_queue, "qsize"),
             "active_evaluations": len(self.active_evaluations),
             "estimated_completion": self._estimate_round_completion(round_number)
         }
@@ -453,9 +690,9 @@ class AsyncGameFlowManager:
             return datetime.utcnow()
         
         # Estimate based on evaluation rate
-        avg_eval_time = 10  # seconds
+        avg_eval_time = self._average_evaluation_time
         completion_time = datetime.utcnow() + timedelta(
-            seconds=pending_count * avg_eval_time / 3  # parallel processing
+            seconds=pending_count * avg_eval_time / self.max_concurrent_evaluations  # parallel processing
         )
         
         return completion_time
\ No newline at end of file
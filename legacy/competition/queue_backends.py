@@ -0,0 +1,676 @@
+"""Durable backends for the evaluation queues.
+
+A backend stores queued work outside the process so a restart does not lose
+it and several worker processes (or nodes) can pull from the same queue.
+Work is handed out as a ``Lease`` that expires after a visibility timeout:
+
+- ``claim`` leases the next item (expired leases of dead workers first)
+- ``extend`` pushes the deadline out while the worker is still busy
+- ``ack`` / ``fail`` finish the item; ``release`` hands it back unfinished
+- a lease that is not extended in time becomes claimable again, and the
+  late worker's ``ack`` is refused because its token is no longer current
+
+``SQLiteQueueBackend`` serves single-node deployments (any number of
+processes on one machine); ``RedisStreamsQueueBackend`` uses a consumer group
+per priority stream for multi-node deployments. The in-process
+``MemoryQueueBackend`` lives in ``realtime_queue``.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from src.core.logging_config import get_logger
+
+logger = get_logger("competition.queue_backends")
+
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    redis = None
+    HAS_REDIS = False
+
+VISIBILITY_TIMEOUT = float(os.environ.get("EVALUATION_QUEUE_VISIBILITY_TIMEOUT", "60"))
+FINISHED_RETENTION_SECONDS = float(os.environ.get("EVALUATION_QUEUE_RETENTION_SECONDS", "3600"))
+
+# Item states
+QUEUED = "queued"
+LEASED = "leased"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+DEAD = "dead"  # lease expired more often than max_attempts allows
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED, DEAD)
+
+
+@dataclass
+class Lease:
+    """A claimed item; ``token`` proves ownership to ack, fail or extend it."""
+    item_id: str
+    payload: Dict[str, Any]
+    priority: int
+    attempts: int
+    token: str
+    worker_id: str
+    expires_at: float
+    receipt: Optional[str] = None  # backend-specific handle (stream entry id)
+
+
+class QueueBackend:
+    """Interface of a leasing priority queue.
+
+    Methods are synchronous; ``blocking`` backends are called through
+    ``call_backend`` so the event loop is not held up by I/O.
+    """
+
+    blocking = True
+    _reclaimed = 0  # expired leases taken over since the last reclaim_expired()
+    _reclaimed_lock = threading.Lock()
+
+    def enqueue(self, item_id: str, payload: Dict[str, Any], priority: int = 2,
+                front: bool = False, max_attempts: int = 3) -> Optional[int]:
+        """Queue an item; returns its position where cheap to know."""
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, visibility_timeout: float = VISIBILITY_TIMEOUT) -> Optional[Lease]:
+        raise NotImplementedError
+
+    def extend(self, lease: Lease, visibility_timeout: float = VISIBILITY_TIMEOUT) -> bool:
+        raise NotImplementedError
+
+    def ack(self, lease: Lease, result: Optional[Dict[str, Any]] = None) -> bool:
+        raise NotImplementedError
+
+    def fail(self, lease: Lease, error: str, retry: bool = True) -> bool:
+        """Record a failure; ``retry`` queues the item again at the back."""
+        raise NotImplementedError
+
+    def release(self, lease: Lease) -> bool:
+        """Hand an unfinished item back at the front, without using up an attempt."""
+        raise NotImplementedError
+
+    def cancel(self, item_id: str) -> bool:
+        """Cancel an item that has not been claimed yet."""
+        raise NotImplementedError
+
+    def reclaim_expired(self) -> int:
+        """Make expired leases claimable again.
+
+        Returns:
+            Expired leases reclaimed (claimed again or dead-lettered) since
+            the previous call; each lease is counted once
+        """
+        raise NotImplementedError
+
+    def _count_reclaimed(self, count: int = 1):
+        with self._reclaimed_lock:
+            self._reclaimed += count
+
+    def _take_reclaimed(self) -> int:
+        with self._reclaimed_lock:
+            count, self._reclaimed = self._reclaimed, 0
+        return count
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Record of an item: status, attempts, payload, result, error, owner."""
+        raise NotImplementedError
+
+    def position(self, item_id: str) -> Optional[int]:
+        raise NotImplementedError
+
+    def positions(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def depth(self) -> Dict[int, int]:
+        """Queued items by priority."""
+        raise NotImplementedError
+
+    def in_flight(self) -> int:
+        raise NotImplementedError
+
+    def qsize(self) -> int:
+        return sum(self.depth().values())
+
+    def purge_finished(self, older_than: float = FINISHED_RETENTION_SECONDS) -> int:
+        """Forget finished items older than ``older_than`` seconds."""
+        return 0
+
+    def close(self):
+        pass
+
+
+async def call_backend(backend: QueueBackend, method: str, *args, **kwargs):
+    """Call a backend method, off the event loop if it does I/O."""
+    func = getattr(backend, method)
+    if backend.blocking:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+@asynccontextmanager
+async def keep_lease(backend: QueueBackend, lease: Lease,
+                     visibility_timeout: float = VISIBILITY_TIMEOUT,
+                     on_heartbeat: Optional[Callable[[], None]] = None):
+    """Extend a lease in the background while the block runs.
+
+    Yields a dict whose ``lost`` flag is set if the lease was taken over
+    (the item then belongs to another worker and must not be acked).
+    ``on_heartbeat`` is called after every successful extension.
+    """
+    state = {"lost": False}
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(visibility_timeout / 3)
+            try:
+                if not await call_backend(backend, "extend", lease, visibility_timeout):
+                    state["lost"] = True
+                    logger.warning(f"Lease on {lease.item_id} lost by {lease.worker_id}")
+                    return
+                if on_heartbeat:
+                    on_heartbeat()
+            except Exception as e:
+                logger.warning(f"Could not extend lease on {lease.item_id}: {e}")
+
+    task = asyncio.create_task(heartbeat())
+    try:
+        yield state
+    finally:
+        task.cancel()
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _loads(value: Optional[str]) -> Any:
+    return None if value in (None, "") else json.loads(value)
+
+
+class SQLiteQueueBackend(QueueBackend):
+    """Queue in a SQLite file; safe across processes on one host.
+
+    WAL (the default) keeps readers off the writer's lock but needs shared
+    memory, so it only works on a local disk. Pass ``journal_mode="DELETE"``
+    for a file other hosts open over a network filesystem; that still relies
+    on the filesystem's locks, which NFS and SMB do not always honour.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            item_id TEXT PRIMARY KEY,
+            priority INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            lease_owner TEXT,
+            lease_token TEXT,
+            lease_expires REAL,
+            result TEXT,
+            error TEXT,
+            enqueued_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{table}_waiting ON {table} (status, priority, seq);
+        CREATE INDEX IF NOT EXISTS idx_{table}_leases ON {table} (status, lease_expires);
+    """
+
+    def __init__(self, path: str, name: str = "evaluations", journal_mode: str = "WAL"):
+        if not name.isidentifier():
+            raise ValueError(f"Invalid queue name: {name}")
+        if journal_mode.upper() not in ("WAL", "DELETE", "TRUNCATE", "PERSIST"):
+            raise ValueError(f"Unsupported journal mode: {journal_mode}")
+        self.path = path
+        self.journal_mode = journal_mode.upper()
+        self.table = f"queue_{name}"
+        self._local = threading.local()
+        db = self._connection()
+        db.executescript(self.SCHEMA.format(table=self.table))
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            # NORMAL is only crash-safe with WAL; rollback journals keep FULL
+            db.execute(f"PRAGMA synchronous={'NORMAL' if self.journal_mode == 'WAL' else 'FULL'}")
+            self._local.db = db
+        return db
+
+    class _Transaction:
+        def __init__(self, db: sqlite3.Connection):
+            self.db = db
+
+        def __enter__(self) -> sqlite3.Connection:
+            # IMMEDIATE takes the write lock up front, so two claimers never
+            # pick the same row
+            self.db.execute("BEGIN IMMEDIATE")
+            return self.db
+
+        def __exit__(self, exc_type, exc, tb):
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+    def _transaction(self) -> "_Transaction":
+        return self._Transaction(self._connection())
+
+    def enqueue(self, item_id, payload, priority=2, front=False, max_attempts=3):
+        now = time.time()
+        with self._transaction() as db:
+            if front:
+                row = db.execute(f"SELECT MIN(seq) FROM {self.table} WHERE status = ? AND priority = ?",
+                                 (QUEUED, priority)).fetchone()
+                seq = min(row[0] or 0, 0) - 1
+            else:
+                seq = time.time_ns()
+            db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (item_id, priority, seq, payload, status, attempts, "
+                "max_attempts, enqueued_at, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (item_id, priority, seq, _dumps(payload), QUEUED, max_attempts, now, now)
+            )
+        return self.position(item_id)
+
+    def claim(self, worker_id, visibility_timeout=VISIBILITY_TIMEOUT):
+        now = time.time()
+        with self._transaction() as db:
+            while True:
+                # Work of dead workers first, then the queue in priority order
+                row = db.execute(
+                    f"SELECT * FROM {self.table} WHERE status = ? AND lease_expires <= ? "
+                    "ORDER BY lease_expires LIMIT 1", (LEASED, now)
+                ).fetchone() or db.execute(
+                    f"SELECT * FROM {self.table} WHERE status = ? ORDER BY priority, seq LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["status"] == LEASED:
+                    self._count_reclaimed()
+                if row["status"] == LEASED and row["attempts"] >= row["max_attempts"]:
+                    db.execute(f"UPDATE {self.table} SET status = ?, error = ?, updated_at = ? WHERE item_id = ?",
+                               (DEAD, "Lease expired on every attempt", now, row["item_id"]))
+                    continue
+                token = uuid.uuid4().hex
+                expires = now + visibility_timeout
+                db.execute(
+                    f"UPDATE {self.table} SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                    "lease_token = ?, lease_expires = ?, updated_at = ? WHERE item_id = ?",
+                    (LEASED, worker_id, token, expires, now, row["item_id"])
+                )
+                return Lease(row["item_id"], _loads(row["payload"]), row["priority"], row["attempts"] + 1,
+                             token, worker_id, expires)
+
+    def extend(self, lease, visibility_timeout=VISIBILITY_TIMEOUT):
+        expires = time.time() + visibility_timeout
+        with self._transaction() as db:
+            updated = db.execute(
+                f"UPDATE {self.table} SET lease_expires = ? WHERE item_id = ? AND status = ? AND lease_token = ?",
+                (expires, lease.item_id, LEASED, lease.token)
+            ).rowcount
+        if updated:
+            lease.expires_at = expires
+        return bool(updated)
+
+    def _finish(self, lease: Lease, status: str, result=None, error=None, requeue_front=False) -> bool:
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(f"SELECT attempts FROM {self.table} WHERE item_id = ? AND status = ? AND lease_token = ?",
+                             (lease.item_id, LEASED, lease.token)).fetchone()
+            if row is None:
+                return False
+            attempts = row["attempts"]
+            if status == QUEUED:
+                seq = time.time_ns()
+                if requeue_front:
+                    low = db.execute(f"SELECT MIN(seq) FROM {self.table} WHERE status = ? AND priority = ?",
+                                     (QUEUED, lease.priority)).fetchone()
+                    seq = min(low[0] or 0, 0) - 1
+                    attempts -= 1  # a release does not use up an attempt
+                db.execute(
+                    f"UPDATE {self.table} SET status = ?, seq = ?, attempts = ?, error = ?, lease_owner = NULL, "
+                    "lease_token = NULL, lease_expires = NULL, updated_at = ? WHERE item_id = ?",
+                    (QUEUED, seq, attempts, error, now, lease.item_id)
+                )
+            else:
+                db.execute(
+                    f"UPDATE {self.table} SET status = ?, result = ?, error = ?, lease_token = NULL, "
+                    "lease_expires = NULL, updated_at = ? WHERE item_id = ?",
+                    (status, _dumps(result), error, now, lease.item_id)
+                )
+        return True
+
+    def ack(self, lease, result=None):
+        return self._finish(lease, COMPLETED, result=result)
+
+    def fail(self, lease, error, retry=True):
+        return self._finish(lease, QUEUED if retry else FAILED, error=error)
+
+    def release(self, lease):
+        return self._finish(lease, QUEUED, requeue_front=True)
+
+    def cancel(self, item_id):
+        with self._transaction() as db:
+            return bool(db.execute(f"UPDATE {self.table} SET status = ?, updated_at = ? WHERE item_id = ? AND status = ?",
+                                   (CANCELLED, time.time(), item_id, QUEUED)).rowcount)
+
+    def reclaim_expired(self):
+        # Expired leases are picked up directly by claim(); dead-letter the
+        # ones that have used up their attempts
+        now = time.time()
+        with self._transaction() as db:
+            dead = db.execute(f"UPDATE {self.table} SET status = ?, error = ?, updated_at = ? "
+                              "WHERE status = ? AND lease_expires <= ? AND attempts >= max_attempts",
+                              (DEAD, "Lease expired on every attempt", now, LEASED, now)).rowcount
+        self._count_reclaimed(dead)
+        return self._take_reclaimed()
+
+    def get(self, item_id):
+        row = self._connection().execute(f"SELECT * FROM {self.table} WHERE item_id = ?", (item_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "item_id": row["item_id"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "attempts": row["attempts"],
+            "payload": _loads(row["payload"]),
+            "result": _loads(row["result"]),
+            "error": row["error"],
+            "worker_id": row["lease_owner"],
+            "updated_at": row["updated_at"],
+        }
+
+    def position(self, item_id):
+        db = self._connection()
+        row = db.execute(f"SELECT priority, seq FROM {self.table} WHERE item_id = ? AND status = ?",
+                         (item_id, QUEUED)).fetchone()
+        if row is None:
+            return None
+        ahead = db.execute(
+            f"SELECT COUNT(*) FROM {self.table} WHERE status = ? AND (priority < ? OR (priority = ? AND seq < ?))",
+            (QUEUED, row["priority"], row["priority"], row["seq"])
+        ).fetchone()[0]
+        return ahead + 1
+
+    def positions(self):
+        rows = self._connection().execute(
+            f"SELECT item_id FROM {self.table} WHERE status = ? ORDER BY priority, seq", (QUEUED,)
+        ).fetchall()
+        return {row[0]: i + 1 for i, row in enumerate(rows)}
+
+    def depth(self):
+        rows = self._connection().execute(
+            f"SELECT priority, COUNT(*) FROM {self.table} WHERE status = ? GROUP BY priority", (QUEUED,)
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def in_flight(self):
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table} WHERE status = ?",
+                                          (LEASED,)).fetchone()[0]
+
+    def purge_finished(self, older_than=FINISHED_RETENTION_SECONDS):
+        placeholders = ", ".join("?" * len(FINISHED_STATES))
+        with self._transaction() as db:
+            return db.execute(f"DELETE FROM {self.table} WHERE status IN ({placeholders}) AND updated_at < ?",
+                              (*FINISHED_STATES, time.time() - older_than)).rowcount
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class RedisStreamsQueueBackend(QueueBackend):
+    """Queue on Redis Streams for workers on several nodes.
+
+    Each priority has a stream read by one consumer group. Delivered entries
+    stay in the group's pending list until acked; entries idle longer than
+    the visibility timeout are taken over with XAUTOCLAIM. Item state lives
+    in a hash per item, and a sorted set of waiting items answers position
+    queries. The hash's lease token fences workers whose lease was taken over.
+    """
+
+    GROUP = "workers"
+    # Idle time forced on released entries so the next claim takes them first
+    RELEASED_IDLE_MS = 10 ** 12
+    PRIORITY_SCALE = 10 ** 15
+
+    # KEYS: stream, item hash, waiting zset
+    # ARGV: group, entry id, token, status, result, error, now, score, retention
+    _FINISH_SCRIPT = """
+        if redis.call('HGET', KEYS[2], 'token') ~= ARGV[3] then return 0 end
+        redis.call('XACK', KEYS[1], ARGV[1], ARGV[2])
+        redis.call('XDEL', KEYS[1], ARGV[2])
+        redis.call('HSET', KEYS[2], 'status', ARGV[4], 'result', ARGV[5], 'error', ARGV[6],
+                   'updated_at', ARGV[7], 'token', '', 'owner', '')
+        if ARGV[4] == 'queued' then
+            local entry = redis.call('XADD', KEYS[1], '*', 'item_id', redis.call('HGET', KEYS[2], 'item_id'))
+            redis.call('HSET', KEYS[2], 'entry_id', entry)
+            redis.call('ZADD', KEYS[3], ARGV[8], redis.call('HGET', KEYS[2], 'item_id'))
+        else
+            redis.call('EXPIRE', KEYS[2], ARGV[9])
+        end
+        return 1
+    """
+
+    # KEYS: stream, item hash; ARGV: group, entry id, token, consumer, expires
+    _EXTEND_SCRIPT = """
+        if redis.call('HGET', KEYS[2], 'token') ~= ARGV[3] then return 0 end
+        redis.call('XCLAIM', KEYS[1], ARGV[1], ARGV[4], 0, ARGV[2], 'JUSTID')
+        redis.call('HSET', KEYS[2], 'lease_expires', ARGV[5])
+        return 1
+    """
+
+    # KEYS: stream, item hash; ARGV: group, entry id, token, consumer
+    _RELEASE_SCRIPT = """
+        if redis.call('HGET', KEYS[2], 'token') ~= ARGV[3] then return 0 end
+        redis.call('XCLAIM', KEYS[1], ARGV[1], ARGV[4], 0, ARGV[2], 'IDLE', ARGV[5], 'JUSTID')
+        redis.call('HINCRBY', KEYS[2], 'attempts', -1)
+        redis.call('HSET', KEYS[2], 'status', 'queued', 'token', '', 'owner', '')
+        return 1
+    """
+
+    # KEYS: stream, item hash, waiting zset; ARGV: entry id, now
+    _CANCEL_SCRIPT = """
+        if redis.call('HGET', KEYS[2], 'status') ~= 'queued' then return 0 end
+        redis.call('XDEL', KEYS[1], ARGV[1])
+        redis.call('ZREM', KEYS[3], redis.call('HGET', KEYS[2], 'item_id'))
+        redis.call('HSET', KEYS[2], 'status', 'cancelled', 'updated_at', ARGV[2])
+        return 1
+    """
+
+    def __init__(self, url: str, name: str = "evaluations", priorities=(1, 2, 3),
+                 retention_seconds: float = FINISHED_RETENTION_SECONDS):
+        if not HAS_REDIS:
+            raise RuntimeError("The redis package is required for the Redis Streams queue backend")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = f"evalq:{name}"
+        self.priorities = tuple(sorted(priorities))
+        self.retention_seconds = int(retention_seconds)
+        self._finish_script = self.client.register_script(self._FINISH_SCRIPT)
+        self._extend_script = self.client.register_script(self._EXTEND_SCRIPT)
+        self._release_script = self.client.register_script(self._RELEASE_SCRIPT)
+        self._cancel_script = self.client.register_script(self._CANCEL_SCRIPT)
+        for priority in self.priorities:
+            try:
+                self.client.xgroup_create(self._stream(priority), self.GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    def _stream(self, priority: int) -> str:
+        return f"{self.prefix}:stream:{priority}"
+
+    def _item(self, item_id: str) -> str:
+        return f"{self.prefix}:item:{item_id}"
+
+    @property
+    def _waiting(self) -> str:
+        return f"{self.prefix}:waiting"
+
+    def _score(self, priority: int) -> int:
+        return priority * self.PRIORITY_SCALE + self.client.incr(f"{self.prefix}:seq")
+
+    def enqueue(self, item_id, payload, priority=2, front=False, max_attempts=3):
+        now = time.time()
+        score = self._score(priority)
+        if front:
+            score = priority * self.PRIORITY_SCALE - (score - priority * self.PRIORITY_SCALE)
+        pipe = self.client.pipeline()
+        pipe.hset(self._item(item_id), mapping={
+            "item_id": item_id, "payload": _dumps(payload), "priority": priority, "status": QUEUED,
+            "attempts": 0, "max_attempts": max_attempts, "enqueued_at": now, "updated_at": now,
+            "token": "", "owner": ""
+        })
+        pipe.zadd(self._waiting, {item_id: score})
+        pipe.xadd(self._stream(priority), {"item_id": item_id})
+        entry_id = pipe.execute()[-1]
+        self.client.hset(self._item(item_id), "entry_id", entry_id)
+        return self.position(item_id)
+
+    def claim(self, worker_id, visibility_timeout=VISIBILITY_TIMEOUT):
+        idle_ms = int(visibility_timeout * 1000)
+        for priority in self.priorities:
+            stream = self._stream(priority)
+            while True:
+                # Expired (or released) entries of this priority first
+                _, entries, *_ = self.client.xautoclaim(stream, self.GROUP, worker_id, idle_ms, "0-0", count=1)
+                if not entries:
+                    entries = (self.client.xreadgroup(self.GROUP, worker_id, {stream: ">"}, count=1) or [[None, []]])[0][1]
+                if not entries:
+                    break
+                entry_id, fields = entries[0]
+                lease = self._lease(stream, entry_id, (fields or {}).get("item_id"), priority,
+                                    worker_id, visibility_timeout)
+                if lease is not None:
+                    return lease
+        return None
+
+    def _lease(self, stream: str, entry_id: str, item_id: Optional[str], priority: int,
+               worker_id: str, visibility_timeout: float) -> Optional[Lease]:
+        item_key = self._item(item_id) if item_id else None
+        record = self.client.hgetall(item_key) if item_key else {}
+        if not record or record.get("status") in FINISHED_STATES:
+            # Cancelled or expired record: drop the entry
+            self.client.xack(stream, self.GROUP, entry_id)
+            self.client.xdel(stream, entry_id)
+            return None
+        if record.get("status") == LEASED:
+            # Taken over from a worker whose lease ran out (released items are queued)
+            self._count_reclaimed()
+        attempts = int(record.get("attempts", 0)) + 1
+        now = time.time()
+        if attempts > int(record.get("max_attempts", 3)):
+            self.client.xack(stream, self.GROUP, entry_id)
+            self.client.xdel(stream, entry_id)
+            self.client.hset(item_key, mapping={"status": DEAD, "error": "Lease expired on every attempt",
+                                                "updated_at": now, "token": ""})
+            self.client.expire(item_key, self.retention_seconds)
+            return None
+        token = uuid.uuid4().hex
+        expires = now + visibility_timeout
+        pipe = self.client.pipeline()
+        pipe.hset(item_key, mapping={"status": LEASED, "attempts": attempts, "token": token, "owner": worker_id,
+                                     "lease_expires": expires, "entry_id": entry_id, "updated_at": now})
+        pipe.zrem(self._waiting, item_id)
+        pipe.execute()
+        return Lease(item_id, _loads(record.get("payload")), priority, attempts, token, worker_id,
+                     expires, receipt=entry_id)
+
+    def extend(self, lease, visibility_timeout=VISIBILITY_TIMEOUT):
+        expires = time.time() + visibility_timeout
+        ok = self._extend_script(keys=[self._stream(lease.priority), self._item(lease.item_id)],
+                                 args=[self.GROUP, lease.receipt, lease.token, lease.worker_id, expires])
+        if ok:
+            lease.expires_at = expires
+        return bool(ok)
+
+    def _finish(self, lease: Lease, status: str, result=None, error=None) -> bool:
+        score = self._score(lease.priority) if status == QUEUED else 0
+        return bool(self._finish_script(
+            keys=[self._stream(lease.priority), self._item(lease.item_id), self._waiting],
+            args=[self.GROUP, lease.receipt, lease.token, status, _dumps(result) or "", error or "",
+                  time.time(), score, self.retention_seconds]
+        ))
+
+    def ack(self, lease, result=None):
+        return self._finish(lease, COMPLETED, result=result)
+
+    def fail(self, lease, error, retry=True):
+        return self._finish(lease, QUEUED if retry else FAILED, error=error)
+
+    def release(self, lease):
+        ok = self._release_script(keys=[self._stream(lease.priority), self._item(lease.item_id)],
+                                  args=[self.GROUP, lease.receipt, lease.token, lease.worker_id,
+                                        self.RELEASED_IDLE_MS])
+        if ok:
+            self.client.zadd(self._waiting, {lease.item_id: lease.priority * self.PRIORITY_SCALE})
+        return bool(ok)
+
+    def cancel(self, item_id):
+        entry_id = self.client.hget(self._item(item_id), "entry_id")
+        priority = self.client.hget(self._item(item_id), "priority")
+        if entry_id is None or priority is None:
+            return False
+        return bool(self._cancel_script(keys=[self._stream(int(priority)), self._item(item_id), self._waiting],
+                                        args=[entry_id, time.time()]))
+
+    def reclaim_expired(self):
+        # Claimers take expired entries over with XAUTOCLAIM and count them
+        return self._take_reclaimed()
+
+    def get(self, item_id):
+        record = self.client.hgetall(self._item(item_id))
+        if not record:
+            return None
+        return {
+            "item_id": item_id,
+            "status": record.get("status"),
+            "priority": int(record.get("priority", 2)),
+            "attempts": int(record.get("attempts", 0)),
+            "payload": _loads(record.get("payload")),
+            "result": _loads(record.get("result")),
+            "error": record.get("error") or None,
+            "worker_id": record.get("owner") or None,
+            "updated_at": float(record.get("updated_at", 0)),
+        }
+
+    def position(self, item_id):
+        rank = self.client.zrank(self._waiting, item_id)
+        return None if rank is None else rank + 1
+
+    def positions(self):
+        return {item_id: i + 1 for i, item_id in enumerate(self.client.zrange(self._waiting, 0, -1))}
+
+    def depth(self):
+        pipe = self.client.pipeline()
+        for priority in self.priorities:
+            pipe.zcount(self._waiting, priority * self.PRIORITY_SCALE - self.PRIORITY_SCALE // 2,
+                        priority * self.PRIORITY_SCALE + self.PRIORITY_SCALE // 2)
+        return {p: n for p, n in zip(self.priorities, pipe.execute()) if n}
+
+    def in_flight(self):
+        pipe = self.client.pipeline()
+        for priority in self.priorities:
+            pipe.xpending(self._stream(priority), self.GROUP)
+        return sum(info["pending"] for info in pipe.execute())
+
+    def close(self):
+        self.client.close()
+
+
+__all__ = [
+    "Lease", "QueueBackend", "SQLiteQueueBackend", "RedisStreamsQueueBackend", "call_backend", "keep_lease",
+    "VISIBILITY_TIMEOUT", "QUEUED", "LEASED", "COMPLETED", "FAILED", "CANCELLED", "DEAD", "FINISHED_STATES",
+]
@@ -1,14 +1,48 @@
 """Real-time evaluation queue and progress tracking system."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable, Set
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Set
 from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
+import heapq
+import math
+import os
+import socket
+import time
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
 import json
 
+from src.competition.queue_backends import (
+    Lease, QueueBackend, SQLiteQueueBackend, RedisStreamsQueueBackend, call_backend, keep_lease,
+    VISIBILITY_TIMEOUT, QUEUED, LEASED, COMPLETED, FAILED, CANCELLED, DEAD, FINISHED_STATES
+)
+
+# memory (single process), sqlite (single node) or redis (multi-node)
+QUEUE_BACKEND = os.environ.get("EVALUATION_QUEUE_BACKEND", "memory")
+QUEUE_SQLITE_PATH = os.environ.get("EVALUATION_QUEUE_SQLITE_PATH", "evaluation_queue.db")
+QUEUE_REDIS_URL = os.environ.get("EVALUATION_QUEUE_REDIS_URL") or os.environ.get("REDIS_URL", "redis://localhost:6379")
+
+# Service-time tracking
+SERVICE_TIME_ALPHA = float(os.environ.get("QUEUE_SERVICE_TIME_ALPHA", "0.2"))
+SERVICE_TIME_WINDOW = int(os.environ.get("QUEUE_SERVICE_TIME_WINDOW", "256"))
+SERVICE_TIME_MIN_SAMPLES = 5
+DEFAULT_SERVICE_TIME = 10.0  # seconds, before anything has completed
+
+# Autoscaling
+AUTOSCALE_INTERVAL = float(os.environ.get("QUEUE_AUTOSCALE_INTERVAL", "10"))
+AUTOSCALE_TARGET_WAIT = float(os.environ.get("QUEUE_AUTOSCALE_TARGET_WAIT", "60"))
+AUTOSCALE_COOLDOWN = float(os.environ.get("QUEUE_AUTOSCALE_COOLDOWN", "120"))
+
+# Model call limits per minute, e.g. "gpt-4:500,claude-3-opus:400"
+RATE_LIMITS = {
+    model.strip(): float(limit)
+    for model, _, limit in (
+        entry.rpartition(":") for entry in os.environ.get("EVALUATION_RATE_LIMITS", "").split(",") if ":" in entry
+    )
+}
+
 
 class QueuePriority(Enum):
     """Priority levels for queue items."""
@@ -69,6 +103,36 @@ class QueueItem:
         """Total time from submission to completion."""
         end_time = self.completed_at or datetime.utcnow()
         return end_time - self.submitted_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Queue payload; enough to rebuild the item in another process."""
+        return {
+            "item_id": self.item_id,
+            "player_id": self.player_id,
+            "session_id": self.session_id,
+            "round_number": self.round_number,
+            "game_name": self.game_name,
+            "prompt": self.prompt,
+            "priority": self.priority.value,
+            "submitted_at": self.submitted_at.isoformat(),
+            "max_retries": self.max_retries,
+            "metadata": self.metadata
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QueueItem":
+        return cls(
+            item_id=data["item_id"],
+            player_id=data["player_id"],
+            session_id=data["session_id"],
+            round_number=data["round_number"],
+            game_name=data["game_name"],
+            prompt=data["prompt"],
+            priority=QueuePriority(data["priority"]),
+            submitted_at=datetime.fromisoformat(data["submitted_at"]),
+            max_retries=data.get("max_retries", 3),
+            metadata=data.get("metadata") or {}
+        )
 
 
 @dataclass
@@ -92,20 +156,418 @@ class WorkerStats:
         return (datetime.utcnow() - self.last_heartbeat).seconds < 30
 
 
+class FenwickTree:
+    """Prefix sums over a growing list of counts."""
+    
+    def __init__(self):
+        self._tree = [0]  # 1-based
+    
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+    
+    def append(self, value: int):
+        """Add a value at the end in O(log n)."""
+        i = len(self._tree)
+        # Node i covers values (i - lowbit(i), i]
+        self._tree.append(value + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+    
+    def add(self, index: int, delta: int):
+        """Add ``delta`` to the value at 0-based ``index``."""
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+    
+    def prefix_sum(self, count: int) -> int:
+        """Sum of the first ``count`` values."""
+        total = 0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+
+class _QueueEntry:
+    """Heap entry; ``item`` is None once removed (lazy deletion)."""
+    
+    __slots__ = ("item", "priority", "seq", "front", "slot")
+    
+    def __init__(self, item: Any, priority: int, seq: int, front: bool):
+        self.item = item
+        self.priority = priority
+        self.seq = seq
+        self.front = front
+        self.slot = 0  # index in its run
+
+
+class _Run:
+    """Entries of one priority band in arrival order, with live counts."""
+    
+    # Rebuild once at most a quarter of the slots are live
+    COMPACT_MIN_SLOTS = 1024
+    
+    def __init__(self):
+        self.entries: List[Optional[_QueueEntry]] = []
+        self.counts = FenwickTree()
+        self.live = 0
+    
+    def append(self, entry: _QueueEntry):
+        entry.slot = len(self.entries)
+        self.entries.append(entry)
+        self.counts.append(1)
+        self.live += 1
+    
+    def remove(self, entry: _QueueEntry):
+        self.counts.add(entry.slot, -1)
+        self.entries[entry.slot] = None
+        self.live -= 1
+        if self.live == 0:
+            self.entries = []
+            self.counts = FenwickTree()
+        elif len(self.entries) >= self.COMPACT_MIN_SLOTS and self.live * 4 <= len(self.entries):
+            live_entries = [e for e in self.entries if e is not None]
+            self.entries = []
+            self.counts = FenwickTree()
+            self.live = 0
+            for e in live_entries:
+                self.append(e)
+    
+    def rank(self, entry: _QueueEntry) -> int:
+        """1-based rank among the live entries, in arrival order."""
+        return self.counts.prefix_sum(entry.slot + 1)
+    
+    def live_entries(self) -> List[_QueueEntry]:
+        return [e for e in self.entries if e is not None]
+
+
+class _Band:
+    """One priority level: requeued items (front) ahead of new submissions."""
+    
+    def __init__(self):
+        self.front = _Run()  # later requeues go further ahead
+        self.back = _Run()
+    
+    @property
+    def live(self) -> int:
+        return self.front.live + self.back.live
+    
+    def position(self, entry: _QueueEntry) -> int:
+        if entry.front:
+            return self.front.live - self.front.rank(entry) + 1
+        return self.front.live + self.back.rank(entry)
+    
+    def ordered(self) -> List[_QueueEntry]:
+        return self.front.live_entries()[::-1] + self.back.live_entries()
+
+
+class IndexedPriorityQueue:
+    """Priority queue with O(log n) updates and position queries.
+    
+    Holds anything with an ``item_id`` and a ``priority`` (a QueuePriority or
+    its int value).
+    
+    Items are ordered by (priority, submit sequence) in a heap; cancelled
+    items are only marked removed and skipped when they reach the top. Each
+    priority band counts its live items in a Fenwick tree over submit order,
+    so an item's position is the size of the higher bands plus its rank in
+    its own band.
+    """
+    
+    def __init__(self):
+        self._heap: List[tuple] = []  # (priority, seq, entry)
+        self._entries: Dict[str, _QueueEntry] = {}  # item_id -> entry
+        self._bands: Dict[int, _Band] = {}
+        self._seq = 0
+        self._front_seq = 0
+        self._removed = 0  # stale heap entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+    
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._entries
+    
+    def __iter__(self):
+        """Queued items in order."""
+        for priority in sorted(self._bands):
+            for entry in self._bands[priority].ordered():
+                yield entry.item
+    
+    def push(self, item: Any, front: bool = False) -> int:
+        """Queue an item (ahead of its band if ``front``); returns its position."""
+        priority = getattr(item.priority, "value", item.priority)
+        if front:
+            self._front_seq -= 1
+            seq = self._front_seq
+        else:
+            self._seq += 1
+            seq = self._seq
+        entry = _QueueEntry(item, priority, seq, front)
+        band = self._bands.get(priority)
+        if band is None:
+            band = self._bands[priority] = _Band()
+        (band.front if front else band.back).append(entry)
+        self._entries[item.item_id] = entry
+        heapq.heappush(self._heap, (priority, seq, entry))
+        return self._position(entry)
+    
+    def pop(self) -> Optional[Any]:
+        """Remove and return the first item, or None if empty."""
+        while self._heap:
+            _, _, entry = heapq.heappop(self._heap)
+            if entry.item is None:
+                self._removed -= 1
+                continue
+            return self._detach(entry)
+        return None
+    
+    def remove(self, item_id: str) -> Optional[Any]:
+        """Remove an item wherever it is; the heap entry is dropped lazily."""
+        entry = self._entries.get(item_id)
+        if entry is None:
+            return None
+        item = self._detach(entry)
+        self._removed += 1
+        if self._removed > 64 and self._removed > len(self._heap) // 2:
+            self._heap = [node for node in self._heap if node[2].item is not None]
+            heapq.heapify(self._heap)
+            self._removed = 0
+        return item
+    
+    def _detach(self, entry: _QueueEntry) -> Any:
+        item = entry.item
+        del self._entries[item.item_id]
+        band = self._bands[entry.priority]
+        (band.front if entry.front else band.back).remove(entry)
+        entry.item = None
+        return item
+    
+    def get(self, item_id: str) -> Optional[Any]:
+        entry = self._entries.get(item_id)
+        return entry.item if entry else None
+    
+    def position(self, item_id: str) -> Optional[int]:
+        """1-based queue position, or None if not queued."""
+        entry = self._entries.get(item_id)
+        return self._position(entry) if entry else None
+    
+    def _position(self, entry: _QueueEntry) -> int:
+        ahead = sum(band.live for priority, band in self._bands.items() if priority < entry.priority)
+        return ahead + self._bands[entry.priority].position(entry)
+    
+    def positions(self) -> Dict[str, int]:
+        """Positions of all queued items in one pass."""
+        return {item.item_id: i + 1 for i, item in enumerate(self)}
+    
+    def counts_by_priority(self) -> Dict[int, int]:
+        return {priority: band.live for priority, band in self._bands.items() if band.live}
+
+
+class _MemoryRecord:
+    """An item held by MemoryQueueBackend."""
+    
+    __slots__ = ("item_id", "priority", "payload", "status", "attempts", "max_attempts",
+                 "owner", "token", "expires_at", "result", "error", "updated_at")
+    
+    def __init__(self, item_id: str, priority: int, payload: Dict[str, Any], max_attempts: int):
+        self.item_id = item_id
+        self.priority = priority
+        self.payload = payload
+        self.status = QUEUED
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.owner: Optional[str] = None
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.updated_at = time.time()
+
+
+class MemoryQueueBackend(QueueBackend):
+    """In-process backend (the default); nothing survives a restart."""
+    
+    blocking = False
+    
+    def __init__(self):
+        self._waiting = IndexedPriorityQueue()
+        self._records: Dict[str, _MemoryRecord] = {}
+        self._leased: Dict[str, _MemoryRecord] = {}
+    
+    def enqueue(self, item_id, payload, priority=2, front=False, max_attempts=3):
+        record = _MemoryRecord(item_id, priority, payload, max_attempts)
+        self._records[item_id] = record
+        return self._waiting.push(record, front=front)
+    
+    def claim(self, worker_id, visibility_timeout=VISIBILITY_TIMEOUT):
+        self._requeue_expired()
+        record = self._waiting.pop()
+        if record is None:
+            return None
+        record.status = LEASED
+        record.attempts += 1
+        record.owner = worker_id
+        record.token = uuid.uuid4().hex
+        record.expires_at = time.time() + visibility_timeout
+        record.updated_at = time.time()
+        self._leased[record.item_id] = record
+        return Lease(record.item_id, record.payload, record.priority, record.attempts,
+                     record.token, worker_id, record.expires_at)
+    
+    def _owned(self, lease: Lease) -> Optional[_MemoryRecord]:
+        record = self._leased.get(lease.item_id)
+        return record if record is not None and record.token == lease.token else None
+    
+    def extend(self, lease, visibility_timeout=VISIBILITY_TIMEOUT):
+        record = self._owned(lease)
+        if record is None:
+            return False
+        record.expires_at = lease.expires_at = time.time() + visibility_timeout
+        return True
+    
+    def _finish(self, record: _MemoryRecord, status: str, front: bool = False):
+        del self._leased[record.item_id]
+        record.status = status
+        record.owner = record.token = None
+        record.updated_at = time.time()
+        if status == QUEUED:
+            self._waiting.push(record, front=front)
+    
+    def ack(self, lease, result=None):
+        record = self._owned(lease)
+        if record is None:
+            return False
+        record.result = result
+        self._finish(record, COMPLETED)
+        return True
+    
+    def fail(self, lease, error, retry=True):
+        record = self._owned(lease)
+        if record is None:
+            return False
+        record.error = error
+        self._finish(record, QUEUED if retry else FAILED)
+        return True
+    
+    def release(self, lease):
+        record = self._owned(lease)
+        if record is None:
+            return False
+        record.attempts -= 1
+        self._finish(record, QUEUED, front=True)
+        return True
+    
+    def cancel(self, item_id):
+        record = self._waiting.remove(item_id)
+        if record is None:
+            return False
+        record.status = CANCELLED
+        record.updated_at = time.time()
+        return True
+    
+    def reclaim_expired(self):
+        self._requeue_expired()
+        return self._take_reclaimed()
+    
+    def _requeue_expired(self):
+        now = time.time()
+        expired = [record for record in self._leased.values() if record.expires_at <= now]
+        for record in expired:
+            if record.attempts >= record.max_attempts:
+                record.error = "Lease expired on every attempt"
+                self._finish(record, DEAD)
+            else:
+                self._finish(record, QUEUED, front=True)
+        self._count_reclaimed(len(expired))
+    
+    def get(self, item_id):
+        record = self._records.get(item_id)
+        if record is None:
+            return None
+        return {
+            "item_id": item_id,
+            "status": record.status,
+            "priority": record.priority,
+            "attempts": record.attempts,
+            "payload": record.payload,
+            "result": record.result,
+            "error": record.error,
+            "worker_id": record.owner,
+            "updated_at": record.updated_at
+        }
+    
+    def position(self, item_id):
+        return self._waiting.position(item_id)
+    
+    def positions(self):
+        return self._waiting.positions()
+    
+    def depth(self):
+        return self._waiting.counts_by_priority()
+    
+    def in_flight(self):
+        return len(self._leased)
+    
+    def qsize(self):
+        return len(self._waiting)
+    
+    def purge_finished(self, older_than=3600.0):
+        cutoff = time.time() - older_than
+        old = [item_id for item_id, record in self._records.items()
+               if record.status in FINISHED_STATES and record.updated_at < cutoff]
+        for item_id in old:
+            del self._records[item_id]
+        return len(old)
+
+
+def create_queue_backend(kind: Optional[str] = None, name: str = "evaluations") -> QueueBackend:
+    """Backend named by ``kind`` or EVALUATION_QUEUE_BACKEND."""
+    kind = (kind or QUEUE_BACKEND).lower()
+    if kind == "memory":
+        return MemoryQueueBackend()
+    if kind == "sqlite":
+        return SQLiteQueueBackend(QUEUE_SQLITE_PATH, name=name)
+    if kind == "redis":
+        return RedisStreamsQueueBackend(QUEUE_REDIS_URL, name=name)
+    raise ValueError(f"Unknown queue backend: {kind}")
+
+
 class RealTimeEvaluationQueue:
-    """Manages real-time evaluation queue with progress tracking."""
+    """Manages real-time evaluation queue with progress tracking.
     
-    def __init__(self, max_workers: int = 5):
-        self.queue: List[QueueItem] = []
-        self.processing: Dict[str, QueueItem] = {}  # item_id -> QueueItem
+    Items live in a ``QueueBackend``: in process memory by default, or in
+    SQLite / Redis Streams so queued work survives a restart and workers in
+    other processes or on other nodes pull from the same queue. Workers hold
+    a lease on the item they process and keep extending it; the item of a
+    worker that dies becomes claimable again once its lease expires.
+    """
+    
+    def __init__(
+        self,
+        max_workers: int = 5,
+        backend: Optional[QueueBackend] = None,
+        processor: Optional[Callable[[QueueItem], Awaitable[Dict[str, Any]]]] = None,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+        autoscaler: Optional["QueueAutoscaler"] = None
+    ):
+        self.backend = backend or MemoryQueueBackend()
+        self.processor = processor
+        self.visibility_timeout = visibility_timeout
+        self.autoscaler = autoscaler
+        self.processing: Dict[str, QueueItem] = {}  # item_id -> QueueItem (this process)
         self.completed: Dict[str, QueueItem] = {}  # Limited history
         self.workers: Dict[str, WorkerStats] = {}
         self.max_workers = max_workers
         self.subscribers: Dict[str, Set[Callable]] = defaultdict(set)
         self.queue_metrics = QueueMetrics()
+        self._leases: Dict[str, Lease] = {}  # item_id -> lease held by a local worker
         self._lock: Optional[asyncio.Lock] = None
         self._worker_tasks: Dict[str, asyncio.Task] = {}
         self._maintenance_task: Optional[asyncio.Task] = None
+        self._autoscale_task: Optional[asyncio.Task] = None
         self._initialized = False
     
     async def _ensure_initialized(self):
@@ -113,6 +575,8 @@ class RealTimeEvaluationQueue:
         if not self._initialized:
             self._lock = asyncio.Lock()
             self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+            if self.autoscaler:
+                self._autoscale_task = asyncio.create_task(self._autoscale_loop())
             self._initialized = True
     
     async def submit(
@@ -139,56 +603,52 @@ class RealTimeEvaluationQueue:
             submitted_at=datetime.utcnow(),
             metadata=metadata or {}
         )
+        estimated_wait = self.predict_wait(
+            await call_backend(self.backend, "qsize"), game_name, item.metadata.get("model")
+        )
+        item.metadata["predicted_wait"] = estimated_wait["p50"]
         
-        async with self._lock:
-            # Insert based on priority
-            insert_pos = 0
-            for i, existing in enumerate(self.queue):
-                if existing.priority.value > item.priority.value:
-                    insert_pos = i
-                    break
-                insert_pos = i + 1
-            
-            self.queue.insert(insert_pos, item)
-            self.queue_metrics.record_submission(item)
+        # Ordered by priority, then submission
+        position = await call_backend(
+            self.backend, "enqueue", item.item_id, item.to_dict(), priority.value, False, item.max_retries
+        )
+        self.queue_metrics.record_submission(item)
         
         # Notify subscribers
         await self._publish_update("item_queued", {
             "item_id": item.item_id,
             "player_id": player_id,
-            "position": insert_pos + 1,
-            "queue_length": len(self.queue)
+            "position": position,
+            "queue_length": await call_backend(self.backend, "qsize"),
+            "estimated_wait": estimated_wait
         })
-        
-        # Try to assign to available worker
-        await self._try_assign_tasks()
+        await self._publish_positions()
         
         return item.item_id
     
     async def cancel(self, item_id: str) -> bool:
         """Cancel a queued evaluation."""
-        async with self._lock:
-            # Check if in queue
-            for i, item in enumerate(self.queue):
-                if item.item_id == item_id:
-                    item.status = EvaluationStatus.CANCELLED
-                    self.queue.pop(i)
-                    await self._publish_update("item_cancelled", {
-                        "item_id": item_id
-                    })
-                    return True
-            
+        await self._ensure_initialized()
+        
+        if not await call_backend(self.backend, "cancel", item_id):
             # Check if processing
             if item_id in self.processing:
-                item = self.processing[item_id]
-                item.status = EvaluationStatus.CANCELLED
+                self.processing[item_id].status = EvaluationStatus.CANCELLED
                 # Worker will handle cleanup
                 return True
+            return False
         
-        return False
+        self.queue_metrics.cancellations_total += 1
+        
+        await self._publish_update("item_cancelled", {
+            "item_id": item_id
+        })
+        await self._publish_positions()
+        return True
     
     async def register_worker(self, worker_id: str) -> bool:
         """Register a new evaluation worker."""
+        await self._ensure_initialized()
         if len(self.workers) >= self.max_workers:
             return False
         
@@ -210,6 +670,15 @@ class RealTimeEvaluationQueue:
         
         return True
     
+    async def run_workers(self, worker_prefix: str, count: Optional[int] = None):
+        """Register ``count`` workers and run until they are cancelled.
+        
+        Used by worker processes that only pull from a shared backend.
+        """
+        for index in range(count or self.max_workers):
+            await self.register_worker(f"{worker_prefix}-{index}")
+        await asyncio.gather(*self._worker_tasks.values(), return_exceptions=True)
+    
     async def _worker_loop(self, worker_id: str):
         """Main loop for a worker."""
         while worker_id in self.workers:
@@ -232,18 +701,21 @@ class RealTimeEvaluationQueue:
                 await asyncio.sleep(5)
     
     async def _get_next_item(self, worker_id: str) -> Optional[QueueItem]:
-        """Get next item from queue for worker."""
+        """Lease the next item (expired leases of dead workers first)."""
+        lease = await call_backend(self.backend, "claim", worker_id, self.visibility_timeout)
+        if lease is None:
+            return None
+        
+        item = QueueItem.from_dict(lease.payload)
+        item.retry_count = lease.attempts - 1
+        item.status = EvaluationStatus.ASSIGNED
+        item.assigned_to = worker_id
+        item.started_at = datetime.utcnow()
+        self.queue_metrics.record_start(item)
+        
         async with self._lock:
-            if not self.queue:
-                return None
-            
-            # Get highest priority item
-            item = self.queue.pop(0)
-            item.status = EvaluationStatus.ASSIGNED
-            item.assigned_to = worker_id
-            item.started_at = datetime.utcnow()
-            
             # Move to processing
+            self._leases[item.item_id] = lease
             self.processing[item.item_id] = item
             
             # Update worker status
@@ -253,13 +725,32 @@ class RealTimeEvaluationQueue:
         await self._publish_update("item_assigned", {
             "item_id": item.item_id,
             "worker_id": worker_id,
-            "wait_time": item.wait_time.total_seconds()
+            "wait_time": item.wait_time.total_seconds(),
+            "attempt": lease.attempts
         })
+        await self._publish_positions()
         
         return item
     
+    async def _evaluate(self, item: QueueItem) -> Dict[str, Any]:
+        """Run the evaluation for an item."""
+        if self.processor is not None:
+            return await self.processor(item)
+        
+        # Simulate evaluation (in real implementation, call evaluation engine)
+        await asyncio.sleep(5)  # Simulate processing time
+        
+        # Mock result
+        return {
+            "score": 0.85,
+            "moves": 12,
+            "success": True,
+            "details": "Evaluation completed successfully"
+        }
+    
     async def _process_item(self, worker_id: str, item: QueueItem):
         """Process an evaluation item."""
+        lease = self._leases[item.item_id]
         try:
             # Update status
             item.status = EvaluationStatus.PROCESSING
@@ -270,16 +761,19 @@ class RealTimeEvaluationQueue:
                 "game_name": item.game_name
             })
             
-            # Simulate evaluation (in real implementation, call evaluation engine)
-            await asyncio.sleep(5)  # Simulate processing time
+            worker = self.workers[worker_id]
+            async with keep_lease(self.backend, lease, self.visibility_timeout, worker.update_heartbeat):
+                result = await self._evaluate(item)
             
-            # Mock result
-            result = {
-                "score": 0.85,
-                "moves": 12,
-                "success": True,
-                "details": "Evaluation completed successfully"
-            }
+            if not await call_backend(self.backend, "ack", lease, result):
+                # Our lease expired and another worker took the item over
+                async with self._lock:
+                    self._finish_local(worker_id, item)
+                await self._publish_update("item_lease_lost", {
+                    "item_id": item.item_id,
+                    "worker_id": worker_id
+                })
+                return
             
             # Complete item
             async with self._lock:
@@ -288,14 +782,10 @@ class RealTimeEvaluationQueue:
                 item.result = result
                 
                 # Move to completed
-                if item.item_id in self.processing:
-                    del self.processing[item.item_id]
+                self._finish_local(worker_id, item)
                 self.completed[item.item_id] = item
                 
                 # Update worker stats
-                worker = self.workers[worker_id]
-                worker.status = "idle"
-                worker.current_task = None
                 worker.tasks_completed += 1
                 
                 # Update average processing time
@@ -317,54 +807,41 @@ class RealTimeEvaluationQueue:
             })
             
         except Exception as e:
-            # Handle failure
+            # Handle failure; a retry goes back to the end of the queue
+            item.retry_count = lease.attempts
+            will_retry = item.retry_count < item.max_retries
+            await call_backend(self.backend, "fail", lease, str(e), will_retry)
+            
             async with self._lock:
-                item.status = EvaluationStatus.FAILED
+                item.status = EvaluationStatus.QUEUED if will_retry else EvaluationStatus.FAILED
                 item.error = str(e)
-                item.retry_count += 1
-                
-                if item.retry_count < item.max_retries:
-                    # Requeue for retry
-                    item.status = EvaluationStatus.QUEUED
-                    self.queue.append(item)
-                    if item.item_id in self.processing:
-                        del self.processing[item.item_id]
-                else:
+                self._finish_local(worker_id, item)
+                if not will_retry:
                     # Max retries reached
-                    if item.item_id in self.processing:
-                        del self.processing[item.item_id]
                     self.completed[item.item_id] = item
+                    self.queue_metrics.failures_total += 1
                 
                 # Update worker stats
-                worker = self.workers[worker_id]
-                worker.status = "idle"
-                worker.current_task = None
-                worker.tasks_failed += 1
+                if worker_id in self.workers:
+                    self.workers[worker_id].tasks_failed += 1
             
             await self._publish_update("item_failed", {
                 "item_id": item.item_id,
                 "error": str(e),
                 "retry_count": item.retry_count,
-                "will_retry": item.retry_count < item.max_retries
+                "will_retry": will_retry
             })
     
-    async def _try_assign_tasks(self):
-        """Try to assign queued tasks to available workers."""
-        async with self._lock:
-            available_workers = [
-                w for w in self.workers.values()
-                if w.status == "idle" and w.is_healthy
-            ]
-            
-            # Assign tasks to available workers
-            for worker in available_workers:
-                if not self.queue:
-                    break
-                
-                # Worker will pick up task in its loop
-                pass
+    def _finish_local(self, worker_id: str, item: QueueItem):
+        """Drop an item from this process's in-flight state (under the lock)."""
+        self.processing.pop(item.item_id, None)
+        self._leases.pop(item.item_id, None)
+        worker = self.workers.get(worker_id)
+        if worker:
+            worker.status = "idle"
+            worker.current_task = None
     
-    def get_queue_status(self) -> Dict[str, Any]:
+    async def get_queue_status(self) -> Dict[str, Any]:
         """Get current queue status."""
         # Return basic status if not initialized
         if not self._initialized or self._lock is None:
@@ -377,11 +854,14 @@ class RealTimeEvaluationQueue:
                 "queue_by_priority": {}
             }
         
-        # Can't use async lock in sync context, so return current snapshot
-        # In production, use Redis or similar for thread-safe access
+        # Snapshot; with a shared backend the queue figures cover every node,
+        # the worker figures only this process
+        queue_length = await call_backend(self.backend, "qsize")
         status = {
-            "queue_length": len(self.queue),
+            "queue_length": queue_length,
             "processing_count": len(self.processing),
+            "in_flight_total": await call_backend(self.backend, "in_flight"),
+            "backend": type(self.backend).__name__,
             "workers": {
                 "total": len(self.workers),
                 "idle": sum(1 for w in self.workers.values() if w.status == "idle"),
@@ -389,36 +869,25 @@ class RealTimeEvaluationQueue:
                 "healthy": sum(1 for w in self.workers.values() if w.is_healthy)
             },
             "metrics": self.queue_metrics.get_summary(),
-            "estimated_wait_time": self._estimate_wait_time()
+            "estimated_wait_time": self._estimate_wait_time(queue_length),
+            "estimated_wait": self.predict_wait(queue_length),
+            "autoscaler": (
+                self.autoscaler.last_decision.to_dict()
+                if self.autoscaler and self.autoscaler.last_decision else None
+            )
         }
         
         # Add queue breakdown by priority
-        priority_counts = defaultdict(int)
-        for item in self.queue:
-            priority_counts[item.priority.value] += 1
-        status["queue_by_priority"] = dict(priority_counts)
+        status["queue_by_priority"] = await call_backend(self.backend, "depth")
         
         return status
     
-    def get_position(self, item_id: str) -> Optional[int]:
+    async def get_position(self, item_id: str) -> Optional[int]:
         """Get queue position for an item."""
-        for i, item in enumerate(self.queue):
-            if item.item_id == item_id:
-                return i + 1
-        return None
+        return await call_backend(self.backend, "position", item_id)
     
-    def get_item_status(self, item_id: str) -> Optional[Dict[str, Any]]:
+    async def get_item_status(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed status for a specific item."""
-        # Check queue
-        for i, item in enumerate(self.queue):
-            if item.item_id == item_id:
-                return {
-                    "status": item.status.value,
-                    "position": i + 1,
-                    "wait_time": item.wait_time.total_seconds(),
-                    "estimated_processing_time": self._estimate_processing_time(item.game_name)
-                }
-        
         # Check processing
         if item_id in self.processing:
             item = self.processing[item_id]
@@ -438,9 +907,47 @@ class RealTimeEvaluationQueue:
                 "error": item.error
             }
         
-        return None
+        # Check the backend (queued, or handled by another process)
+        record = await call_backend(self.backend, "get", item_id)
+        if record is None:
+            return None
+        
+        item = QueueItem.from_dict(record["payload"])
+        if record["status"] == QUEUED:
+            position = await call_backend(self.backend, "position", item_id)
+            return {
+                "status": EvaluationStatus.QUEUED.value,
+                "position": position,
+                "wait_time": item.wait_time.total_seconds(),
+                "estimated_wait": self.predict_wait(
+                    (position or 1) - 1, item.game_name, item.metadata.get("model")
+                ),
+                "estimated_processing_time": self._estimate_processing_time(
+                    item.game_name, item.metadata.get("model")
+                )
+            }
+        if record["status"] == LEASED:
+            return {
+                "status": EvaluationStatus.PROCESSING.value,
+                "worker_id": record["worker_id"]
+            }
+        return {
+            "status": EvaluationStatus.FAILED.value if record["status"] == DEAD else record["status"],
+            "result": record["result"],
+            "error": record["error"]
+        }
     
-    def _estimate_wait_time(self) -> float:
+    def predict_wait(self, ahead: int, game_name: Optional[str] = None,
+                     model: Optional[str] = None) -> Dict[str, float]:
+        """p50/p90 wait for an item (of ``game_name``/``model``) with ``ahead`` items in front of it."""
+        workers = sum(1 for w in self.workers.values() if w.is_healthy)
+        if not self.workers:
+            # Workers run in other processes; assume the configured pool
+            workers = self.max_workers
+        busy = sum(1 for w in self.workers.values() if w.status == "busy")
+        return self.queue_metrics.predict_wait(ahead, workers, busy, game_name, model)
+    
+    def _estimate_wait_time(self, queue_length: int) -> float:
         """Estimate wait time for new submissions."""
         if not self.workers:
             return 0
@@ -450,25 +957,11 @@ class RealTimeEvaluationQueue:
         if active_workers == 0:
             return float('inf')
         
-        # Average processing time across all workers
-        avg_processing_time = sum(
-            w.average_processing_time for w in self.workers.values()
-            if w.average_processing_time > 0
-        ) / max(1, sum(1 for w in self.workers.values() if w.average_processing_time > 0))
-        
-        if avg_processing_time == 0:
-            avg_processing_time = 10  # Default estimate
-        
-        # Simple estimation
-        queue_depth = len(self.queue)
-        estimated_wait = (queue_depth / active_workers) * avg_processing_time
-        
-        return estimated_wait
+        return self.predict_wait(queue_length)["p50"]
     
-    def _estimate_processing_time(self, game_name: str) -> float:
-        """Estimate processing time for a specific game."""
-        # In real implementation, track per-game statistics
-        return 10.0  # Default estimate
+    def _estimate_processing_time(self, game_name: str, model: Optional[str] = None) -> float:
+        """Estimate processing time for a specific game (and model)."""
+        return self.queue_metrics.estimate_service_time(game_name, model)["ewma"]
     
     def subscribe(self, event: str, callback: Callable):
         """Subscribe to queue events."""
@@ -492,6 +985,16 @@ class RealTimeEvaluationQueue:
             if tasks:
                 await asyncio.gather(*tasks, return_exceptions=True)
     
+    async def _publish_positions(self):
+        """Send every waiting item its position (only if anyone listens)."""
+        if not self.subscribers.get("positions_updated"):
+            return
+        positions = await call_backend(self.backend, "positions")
+        await self._publish_update("positions_updated", {
+            "positions": positions,
+            "queue_length": len(positions)
+        })
+    
     async def _maintenance_loop(self):
         """Periodic maintenance tasks."""
         while True:
@@ -507,6 +1010,14 @@ class RealTimeEvaluationQueue:
                     ]
                     for item_id in old_items:
                         del self.completed[item_id]
+                await call_backend(self.backend, "purge_finished")
+                
+                # Leases of workers that died (in any process) run out and
+                # their items become claimable again
+                reclaimed = await call_backend(self.backend, "reclaim_expired")
+                if reclaimed:
+                    self.queue_metrics.reclaims_total += reclaimed
+                    await self._publish_update("items_reclaimed", {"count": reclaimed})
                 
                 # Check worker health
                 unhealthy_workers = [
@@ -524,21 +1035,58 @@ class RealTimeEvaluationQueue:
             except Exception as e:
                 print(f"Maintenance error: {e}")
     
+    async def autoscale(self) -> "ScalingDecision":
+        """Grow or shrink the local worker pool to the autoscaler's target.
+        
+        Only idle workers are stopped when scaling down.
+        """
+        depth = await call_backend(self.backend, "qsize")
+        busy = sum(1 for w in self.workers.values() if w.status == "busy")
+        decision = self.autoscaler.decide(self.queue_metrics, depth, len(self.workers), busy)
+        desired = min(decision.desired, self.max_workers)
+        
+        started, stopped = [], []
+        while len(self.workers) < desired:
+            worker_id = f"{socket.gethostname()}-{os.getpid()}-auto-{uuid.uuid4().hex[:6]}"
+            if not await self.register_worker(worker_id):
+                break
+            started.append(worker_id)
+        if len(self.workers) > desired:
+            async with self._lock:
+                idle = [w.worker_id for w in self.workers.values() if w.status == "idle"]
+                for worker_id in idle[:len(self.workers) - desired]:
+                    del self.workers[worker_id]
+                    task = self._worker_tasks.pop(worker_id, None)
+                    if task:
+                        task.cancel()
+                    stopped.append(worker_id)
+        
+        if started or stopped:
+            await self._publish_update("workers_scaled", {
+                **decision.to_dict(),
+                "started": started,
+                "stopped": stopped,
+                "total_workers": len(self.workers)
+            })
+        return decision
+    
+    async def _autoscale_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(AUTOSCALE_INTERVAL)
+                await self.autoscale()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Autoscale error: {e}")
+    
     async def _handle_unhealthy_worker(self, worker_id: str):
-        """Handle an unhealthy worker."""
+        """Stop an unhealthy local worker and hand its lease back."""
         async with self._lock:
             worker = self.workers.get(worker_id)
             if not worker:
                 return
             
-            # Reassign current task if any
-            if worker.current_task and worker.current_task in self.processing:
-                item = self.processing[worker.current_task]
-                item.status = EvaluationStatus.QUEUED
-                item.assigned_to = None
-                self.queue.insert(0, item)  # Priority requeue
-                del self.processing[worker.current_task]
-            
             # Remove worker
             del self.workers[worker_id]
             
@@ -546,28 +1094,132 @@ class RealTimeEvaluationQueue:
             if worker_id in self._worker_tasks:
                 self._worker_tasks[worker_id].cancel()
                 del self._worker_tasks[worker_id]
+            
+            lease = self._leases.pop(worker.current_task, None) if worker.current_task else None
+            if lease:
+                self.processing.pop(lease.item_id, None)
+        
+        # Releasing puts the item back at the front now instead of after the
+        # visibility timeout
+        if lease:
+            await call_backend(self.backend, "release", lease)
         
         await self._publish_update("worker_removed", {
             "worker_id": worker_id,
             "reason": "unhealthy"
         })
+    
+    async def shutdown(self):
+        """Stop local workers and hand their leases back to the queue."""
+        for task in list(self._worker_tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks.values(), return_exceptions=True)
+        self._worker_tasks.clear()
+        self.workers.clear()
+        for lease in list(self._leases.values()):
+            await call_backend(self.backend, "release", lease)
+        self._leases.clear()
+        self.processing.clear()
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+        if self._autoscale_task:
+            self._autoscale_task.cancel()
+        self.backend.close()
+
+
+class ServiceTimeStats:
+    """EWMA and recent-window quantiles of one kind of duration."""
+    
+    def __init__(self, alpha: float = SERVICE_TIME_ALPHA, window: int = SERVICE_TIME_WINDOW):
+        self.alpha = alpha
+        self.count = 0
+        self.ewma = 0.0
+        self.ewm_var = 0.0
+        self.samples: deque = deque(maxlen=window)
+        self._sorted: Optional[List[float]] = None
+    
+    def record(self, value: float):
+        self.count += 1
+        if self.count == 1:
+            self.ewma = value
+        else:
+            delta = value - self.ewma
+            self.ewma += self.alpha * delta
+            self.ewm_var = (1 - self.alpha) * (self.ewm_var + self.alpha * delta * delta)
+        self.samples.append(value)
+        self._sorted = None
+    
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.ewm_var)
+    
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile of the recent window."""
+        if not self.samples:
+            return 0.0
+        if self._sorted is None:
+            self._sorted = sorted(self.samples)
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+    
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "ewma": round(self.ewma, 3),
+            "p50": round(self.quantile(0.5), 3),
+            "p90": round(self.quantile(0.9), 3),
+            "p99": round(self.quantile(0.99), 3)
+        }
 
 
 class QueueMetrics:
-    """Tracks metrics for the evaluation queue."""
+    """Tracks metrics for the evaluation queue.
     
-    def __init__(self):
+    Service times are kept overall, per game, per model and per (game,
+    model) pair; estimates use the most specific key with enough samples.
+    Model calls are counted per model so the autoscaler can see how much
+    rate-limit headroom is left.
+    """
+    
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None):
         self.submissions_total = 0
         self.completions_total = 0
         self.failures_total = 0
         self.cancellations_total = 0
+        self.reclaims_total = 0
         self.total_wait_time = 0.0
         self.total_processing_time = 0.0
         self.hourly_stats: List[Dict[str, Any]] = []
         
+        self.service_time = ServiceTimeStats()
+        self.service_by_game: Dict[str, ServiceTimeStats] = defaultdict(ServiceTimeStats)
+        self.service_by_model: Dict[str, ServiceTimeStats] = defaultdict(ServiceTimeStats)
+        self.service_by_pair: Dict[tuple, ServiceTimeStats] = defaultdict(ServiceTimeStats)
+        self.wait_time = ServiceTimeStats()
+        self.wait_prediction_error = ServiceTimeStats()  # actual - predicted p50
+        self.interarrival = ServiceTimeStats()
+        self._last_submission: Optional[float] = None
+        
+        # Rate limits in model calls per minute
+        self.rate_limits: Dict[str, float] = dict(RATE_LIMITS if rate_limits is None else rate_limits)
+        self.calls_per_item: Dict[str, ServiceTimeStats] = defaultdict(ServiceTimeStats)
+        self._calls: Dict[str, deque] = defaultdict(deque)  # model -> (time, calls)
+        self._reported_remaining: Dict[str, tuple] = {}  # model -> (remaining, reported at)
+        
     def record_submission(self, item: QueueItem):
         """Record a new submission."""
         self.submissions_total += 1
+        now = time.monotonic()
+        if self._last_submission is not None:
+            self.interarrival.record(now - self._last_submission)
+        self._last_submission = now
+    
+    def record_start(self, item: QueueItem):
+        """Record the wait of an item a worker has picked up."""
+        waited = item.wait_time.total_seconds()
+        self.wait_time.record(waited)
+        predicted = item.metadata.get("predicted_wait")
+        if predicted is not None:
+            self.wait_prediction_error.record(waited - predicted)
     
     def record_completion(self, item: QueueItem):
         """Record a completion."""
@@ -575,7 +1227,112 @@ class QueueMetrics:
         if item.wait_time:
             self.total_wait_time += item.wait_time.total_seconds()
         if item.processing_time:
-            self.total_processing_time += item.processing_time.total_seconds()
+            seconds = item.processing_time.total_seconds()
+            self.total_processing_time += seconds
+            model = item.metadata.get("model")
+            self.service_time.record(seconds)
+            self.service_by_game[item.game_name].record(seconds)
+            if model:
+                self.service_by_model[model].record(seconds)
+                self.service_by_pair[(item.game_name, model)].record(seconds)
+                calls = (item.result or {}).get("api_calls", (item.result or {}).get("moves", 1))
+                self.record_calls(model, calls)
+                self.calls_per_item[model].record(calls)
+    
+    def record_calls(self, model: str, calls: int = 1):
+        """Count model calls against the model's rate limit."""
+        now = time.monotonic()
+        window = self._calls[model]
+        window.append((now, calls))
+        while window and window[0][0] < now - 60:
+            window.popleft()
+    
+    def record_rate_limit(self, model: str, limit_per_minute: Optional[float] = None,
+                          remaining: Optional[float] = None):
+        """Update a model's limit or the remaining quota a provider reported."""
+        if limit_per_minute is not None:
+            self.rate_limits[model] = limit_per_minute
+        if remaining is not None:
+            self._reported_remaining[model] = (remaining, time.monotonic())
+    
+    def calls_last_minute(self, model: str) -> int:
+        now = time.monotonic()
+        window = self._calls.get(model)
+        if not window:
+            return 0
+        while window and window[0][0] < now - 60:
+            window.popleft()
+        return sum(calls for _, calls in window)
+    
+    def rate_headroom(self, model: str) -> Optional[float]:
+        """Model calls per second still available, or None without a limit."""
+        limit = self.rate_limits.get(model)
+        if limit is None:
+            return None
+        remaining = limit - self.calls_last_minute(model)
+        reported = self._reported_remaining.get(model)
+        if reported and time.monotonic() - reported[1] < 60:
+            remaining = min(remaining, reported[0])
+        return max(0.0, remaining) / 60
+    
+    def arrival_rate(self) -> float:
+        """Submissions per second (EWMA of inter-arrival times)."""
+        if self._last_submission is None or self.interarrival.count == 0:
+            return 0.0
+        # A quiet spell counts as a long gap even before the next submission
+        gap = max(self.interarrival.ewma, time.monotonic() - self._last_submission)
+        return 1 / gap if gap > 0 else 0.0
+    
+    def service_stats(self, game_name: Optional[str] = None, model: Optional[str] = None) -> Optional[ServiceTimeStats]:
+        """Most specific service-time stats with enough samples."""
+        candidates = []
+        if game_name and model:
+            candidates.append(self.service_by_pair.get((game_name, model)))
+        if game_name:
+            candidates.append(self.service_by_game.get(game_name))
+        if model:
+            candidates.append(self.service_by_model.get(model))
+        candidates.append(self.service_time)
+        for stats in candidates:
+            if stats is not None and stats.count >= SERVICE_TIME_MIN_SAMPLES:
+                return stats
+        return self.service_time if self.service_time.count else None
+    
+    def estimate_service_time(self, game_name: Optional[str] = None, model: Optional[str] = None) -> Dict[str, float]:
+        """EWMA, p50 and p90 service time in seconds."""
+        stats = self.service_stats(game_name, model)
+        if stats is None:
+            return {"ewma": DEFAULT_SERVICE_TIME, "p50": DEFAULT_SERVICE_TIME,
+                    "p90": DEFAULT_SERVICE_TIME, "samples": 0}
+        return {"ewma": stats.ewma, "p50": stats.quantile(0.5), "p90": stats.quantile(0.9),
+                "samples": stats.count}
+    
+    def predict_wait(self, ahead: int, workers: int, busy: int = 0,
+                     game_name: Optional[str] = None, model: Optional[str] = None) -> Dict[str, float]:
+        """p50/p90 wait of an item with ``ahead`` items in front of it.
+        
+        Items ahead start as workers free up: the item starts once
+        ``ahead - idle`` services have finished across ``workers`` workers,
+        plus the remaining part of the services already running. Summed
+        service times are treated as roughly normal. Service times come from
+        the item's (game, model) stats, falling back to broader ones.
+        """
+        if workers <= 0:
+            return {"p50": float("inf"), "p90": float("inf")}
+        idle = max(0, workers - busy)
+        if ahead < idle:
+            return {"p50": 0.0, "p90": 0.0}
+        
+        stats = self.service_stats(game_name, model)
+        mean = stats.ewma if stats else DEFAULT_SERVICE_TIME
+        stddev = stats.stddev if stats and stats.count >= SERVICE_TIME_MIN_SAMPLES else mean / 2
+        
+        queued = ahead - idle
+        rounds = queued / workers
+        # Half a service remains on average on the first worker to free up
+        expected = rounds * mean + mean / 2
+        spread = math.sqrt(queued * stddev ** 2 / workers ** 2 + (mean / 2) ** 2 / 3)
+        return {"p50": round(expected, 2), "p90": round(expected + 1.2816 * spread, 2)}
     
     def get_summary(self) -> Dict[str, Any]:
         """Get metrics summary."""
@@ -584,6 +1341,7 @@ class QueueMetrics:
             "completions_total": self.completions_total,
             "failures_total": self.failures_total,
             "cancellations_total": self.cancellations_total,
+            "reclaims_total": self.reclaims_total,
             "average_wait_time": (
                 self.total_wait_time / self.completions_total 
                 if self.completions_total > 0 else 0
@@ -595,10 +1353,105 @@ class QueueMetrics:
             "success_rate": (
                 self.completions_total / self.submissions_total
                 if self.submissions_total > 0 else 0
-            )
+            ),
+            "arrival_rate": round(self.arrival_rate(), 4),
+            "service_time": self.service_time.summary(),
+            "service_time_by_game": {game: s.summary() for game, s in self.service_by_game.items()},
+            "service_time_by_model": {model: s.summary() for model, s in self.service_by_model.items()},
+            "wait_time": self.wait_time.summary(),
+            "wait_prediction_bias": round(self.wait_prediction_error.ewma, 3),
+            "rate_limits": {
+                model: {"limit_per_minute": limit, "calls_last_minute": self.calls_last_minute(model)}
+                for model, limit in self.rate_limits.items()
+            }
         }
     
     def calculate_hourly_stats(self):
         """Calculate hourly statistics."""
         # In real implementation, track detailed hourly metrics
-        pass
\ No newline at end of file
+        pass
+
+
+@dataclass
+class ScalingDecision:
+    """Outcome of one autoscaler evaluation."""
+    current: int
+    desired: int
+    reason: str
+    demand: float  # workers needed for arrivals plus draining the backlog
+    rate_limit_cap: Optional[int] = None
+    decided_at: datetime = field(default_factory=datetime.utcnow)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "current": self.current,
+            "desired": self.desired,
+            "reason": self.reason,
+            "demand": round(self.demand, 2),
+            "rate_limit_cap": self.rate_limit_cap,
+            "decided_at": self.decided_at.isoformat()
+        }
+
+
+class QueueAutoscaler:
+    """Sizes the worker pool from queue depth, service times and rate limits.
+    
+    Demand follows Little's law: arrival rate x service time keeps up with
+    new work, and depth x service time / target_wait drains the backlog in
+    time. Growth is capped by the rate-limit headroom of the models in use
+    (each worker makes calls_per_item / service_time calls per second).
+    Scaling up is immediate; scaling down waits for ``cooldown`` seconds
+    since the last change so short lulls do not churn workers.
+    """
+    
+    def __init__(
+        self,
+        min_workers: int = 1,
+        max_workers: int = 20,
+        target_wait: float = AUTOSCALE_TARGET_WAIT,
+        cooldown: float = AUTOSCALE_COOLDOWN
+    ):
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.target_wait = target_wait
+        self.cooldown = cooldown
+        self.last_decision: Optional[ScalingDecision] = None
+        self._last_change = 0.0
+    
+    def decide(self, metrics: QueueMetrics, depth: int, current: int, busy: int = 0) -> ScalingDecision:
+        service = metrics.estimate_service_time()["ewma"]
+        demand = metrics.arrival_rate() * service + depth * service / self.target_wait
+        desired = max(self.min_workers, math.ceil(demand), busy)
+        reason = f"demand {demand:.1f} workers (depth {depth}, service {service:.1f}s)"
+        
+        cap = self._rate_limit_cap(metrics, current)
+        if cap is not None and desired > cap:
+            desired = cap
+            reason += f"; capped at {cap} by rate-limit headroom"
+        
+        desired = max(self.min_workers, min(self.max_workers, desired))
+        now = time.monotonic()
+        if desired < current and now - self._last_change < self.cooldown:
+            desired = current
+            reason += "; holding during scale-down cooldown"
+        if desired != current:
+            self._last_change = now
+        
+        self.last_decision = ScalingDecision(current, desired, reason, demand, cap)
+        return self.last_decision
+    
+    def _rate_limit_cap(self, metrics: QueueMetrics, current: int) -> Optional[int]:
+        """Most workers the tightest model's remaining quota can feed."""
+        cap = None
+        for model in metrics.rate_limits:
+            headroom = metrics.rate_headroom(model)
+            calls = metrics.calls_per_item.get(model)
+            if headroom is None or calls is None or calls.count == 0:
+                continue
+            service = metrics.estimate_service_time(model=model)["ewma"]
+            calls_per_worker = calls.ewma / max(service, 0.001)
+            if calls_per_worker <= 0:
+                continue
+            model_cap = current + math.floor(headroom / calls_per_worker)
+            cap = model_cap if cap is None else min(cap, model_cap)
+        return cap
@@ -1,11 +1,20 @@
 """Spectator mode with multi-view options for AI competitions."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Set, Callable
+from typing import Dict, List, Optional, Any, Set, Callable, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
 import json
+import os
+import time
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
 
 
 class ViewMode(Enum):
@@ -81,6 +90,289 @@ class HighlightMoment:
     importance_score: float  # 0-1, for auto-switching
 
 
+# Frame broadcasting
+#
+# Game updates are projected once per ViewMode and each projection is
+# serialized once; the resulting bytes are shared by every spectator watching
+# in that mode. Each mode's channel emits deltas (JSON merge patches against
+# the previous view) plus a full keyframe every KEYFRAME_INTERVAL updates or
+# KEYFRAME_SECONDS, so a spectator joining mid-game gets the latest keyframe
+# and the deltas since, and a spectator that falls behind resyncs the same way.
+#
+# Per-viewer display options (show_prompts, show_scores, show_reasoning and
+# the focus/split target players) are applied by the client on the shared
+# view; FOCUS and SPLIT frames carry the detailed entry of every player.
+
+KEYFRAME_INTERVAL = int(os.environ.get("SPECTATOR_KEYFRAME_INTERVAL", "30"))
+KEYFRAME_SECONDS = float(os.environ.get("SPECTATOR_KEYFRAME_SECONDS", "10"))
+
+# Player fields included per mode; None means the full player entry
+_PLAYER_FIELDS: Dict[ViewMode, Optional[tuple]] = {
+    ViewMode.OVERVIEW: ("name", "score", "status", "board"),
+    ViewMode.FOCUS: None,
+    ViewMode.SPLIT: None,
+    ViewMode.LEADERBOARD: ("name", "score", "status"),
+    ViewMode.COMMENTARY: None,
+    ViewMode.HIGHLIGHTS: ("name", "score", "status", "board"),
+}
+_VIEW_FIELDS = ("round", "status", "time_remaining")
+_LEADERBOARD_MODES = (ViewMode.OVERVIEW, ViewMode.LEADERBOARD, ViewMode.COMMENTARY)
+
+
+def project_view(mode: ViewMode, state: Dict[str, Any],
+                 highlight: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the view a mode shows from the full game state.
+
+    None values are left out: deltas are merge patches, where null deletes.
+    """
+    view = {key: state[key] for key in _VIEW_FIELDS if state.get(key) is not None}
+
+    fields = _PLAYER_FIELDS[mode]
+    players = {}
+    for player_id, player in (state.get("players") or {}).items():
+        keys = player.keys() if fields is None else fields
+        players[player_id] = {key: player[key] for key in keys if player.get(key) is not None}
+    view["players"] = players
+
+    if mode in _LEADERBOARD_MODES and state.get("leaderboard") is not None:
+        view["leaderboard"] = state["leaderboard"]
+    if mode == ViewMode.COMMENTARY and state.get("commentary") is not None:
+        view["commentary"] = state["commentary"]
+    if mode == ViewMode.HIGHLIGHTS and highlight is not None:
+        view["highlight"] = highlight
+    return view
+
+
+def diff_views(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON merge patch (RFC 7386) turning ``old`` into ``new``; empty if equal."""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        previous = old[key]
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_views(previous, value)
+            if nested:
+                patch[key] = nested
+        elif previous != value:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a merge patch (what a client does with a delta frame)."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def encode_frame(frame: Dict[str, Any]) -> bytes:
+    """Serialize a frame to compact JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(frame, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(frame, default=str, separators=(",", ":")).encode()
+
+
+@dataclass
+class _Frame:
+    """One encoded update of a view channel."""
+    seq: int
+    delta: bytes  # applies on top of seq - 1
+    keyframe: Optional[bytes] = None  # full view at seq, on keyframe updates
+
+
+class ViewChannel:
+    """Encoded frames of one ViewMode, shared by all of its spectators.
+
+    Frames are kept from the previous keyframe onward, so a spectator that is
+    at most one keyframe period behind catches up with deltas alone.
+    """
+
+    def __init__(self, mode: ViewMode, keyframe_interval: int = KEYFRAME_INTERVAL,
+                 keyframe_seconds: float = KEYFRAME_SECONDS):
+        self.mode = mode
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.keyframe_seconds = keyframe_seconds
+        self.view: Dict[str, Any] = {}
+        self.seq = 0
+        self.frames: List[_Frame] = []
+        self.subscribers = 0
+        self._keyframe_index = 0  # index in self.frames of the latest keyframe
+        self._keyframe_at = 0.0
+        self._changed = asyncio.Event()
+        self.stats = {"updates": 0, "unchanged": 0, "keyframes": 0, "encodes": 0, "bytes_encoded": 0}
+
+    def update(self, view: Dict[str, Any]) -> bool:
+        """Encode a new view; returns False if nothing changed."""
+        patch = diff_views(self.view, view)
+        if not patch and self.frames:
+            self.stats["unchanged"] += 1
+            return False
+
+        self.seq += 1
+        self.view = view
+        delta = self._encode({"type": "delta", "mode": self.mode.value, "seq": self.seq, "patch": patch})
+        frame = _Frame(self.seq, delta)
+
+        now = time.monotonic()
+        if (not self.frames
+                or len(self.frames) - self._keyframe_index >= self.keyframe_interval
+                or now - self._keyframe_at >= self.keyframe_seconds):
+            frame.keyframe = self._encode({"type": "keyframe", "mode": self.mode.value, "seq": self.seq, "view": view})
+            # Drop everything before the previous keyframe
+            self.frames = self.frames[self._keyframe_index:]
+            self._keyframe_index = len(self.frames)
+            self._keyframe_at = now
+            self.stats["keyframes"] += 1
+
+        self.frames.append(frame)
+        self.stats["updates"] += 1
+
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return True
+
+    def _encode(self, frame: Dict[str, Any]) -> bytes:
+        data = encode_frame(frame)
+        self.stats["encodes"] += 1
+        self.stats["bytes_encoded"] += len(data)
+        return data
+
+    def read(self, cursor: Optional[int]) -> Tuple[List[bytes], Optional[int]]:
+        """Frames after ``cursor`` (None to join) and the new cursor.
+
+        Joining, or a cursor older than the retained frames, gets the latest
+        keyframe followed by the deltas after it.
+        """
+        if not self.frames or cursor == self.seq:
+            return [], cursor
+        first = self.frames[0].seq
+        if cursor is not None and cursor >= first - 1:
+            start = cursor - first + 1
+            return [frame.delta for frame in self.frames[start:]], self.seq
+        keyframe = self.frames[self._keyframe_index]
+        frames = [keyframe.keyframe]
+        frames.extend(frame.delta for frame in self.frames[self._keyframe_index + 1:])
+        return frames, self.seq
+
+    async def wait(self, cursor: Optional[int], timeout: Optional[float] = None) -> bool:
+        """Wait until there is a frame after ``cursor``; False on timeout."""
+        if self.frames and cursor != self.seq:
+            return True
+        if timeout is None:
+            await self._changed.wait()
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "subscribers": self.subscribers,
+            "retained_frames": len(self.frames),
+            **self.stats
+        }
+
+
+class SpectatorFeed:
+    """One spectator's position in the channel of its current view mode."""
+
+    def __init__(self, broadcaster: "FrameBroadcaster", mode: ViewMode):
+        self._broadcaster = broadcaster
+        self.channel = broadcaster.channel(mode)
+        self.channel.subscribers += 1
+        self.cursor: Optional[int] = None
+        self.closed = False
+
+    @property
+    def mode(self) -> ViewMode:
+        return self.channel.mode
+
+    def switch(self, mode: ViewMode):
+        """Move to another mode; the next read starts with its keyframe."""
+        if mode == self.channel.mode:
+            return
+        self.channel.subscribers -= 1
+        self.channel = self._broadcaster.channel(mode)
+        self.channel.subscribers += 1
+        self.cursor = None
+
+    def poll(self) -> List[bytes]:
+        """Encoded frames available now (shared bytes, do not modify)."""
+        frames, self.cursor = self.channel.read(self.cursor)
+        return frames
+
+    async def next_frames(self, timeout: Optional[float] = None) -> List[bytes]:
+        """Wait for and return the next frames; empty on timeout or close."""
+        while not self.closed:
+            channel = self.channel
+            if not await channel.wait(self.cursor, timeout):
+                return []
+            if channel is self.channel:
+                return self.poll()
+        return []
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.channel.subscribers -= 1
+
+
+class FrameBroadcaster:
+    """Projects game updates per ViewMode and fans out the encoded frames."""
+
+    def __init__(self, session_id: str, keyframe_interval: int = KEYFRAME_INTERVAL,
+                 keyframe_seconds: float = KEYFRAME_SECONDS):
+        self.session_id = session_id
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_seconds = keyframe_seconds
+        self.state: Dict[str, Any] = {}
+        self.highlight: Optional[Dict[str, Any]] = None
+        self.channels: Dict[ViewMode, ViewChannel] = {}
+
+    def channel(self, mode: ViewMode) -> ViewChannel:
+        """Channel for a mode, created (with a keyframe of the current state) on first use."""
+        channel = self.channels.get(mode)
+        if channel is None:
+            channel = ViewChannel(mode, self.keyframe_interval, self.keyframe_seconds)
+            self.channels[mode] = channel
+            if self.state:
+                channel.update(project_view(mode, self.state, self.highlight))
+        return channel
+
+    def subscribe(self, mode: ViewMode) -> SpectatorFeed:
+        return SpectatorFeed(self, mode)
+
+    def publish(self, state: Dict[str, Any]):
+        """Publish the full game state; each watched mode encodes once."""
+        self.state = state
+        for mode, channel in self.channels.items():
+            channel.update(project_view(mode, state, self.highlight))
+
+    def set_highlight(self, highlight: Dict[str, Any]):
+        """Show a highlight to HIGHLIGHTS viewers."""
+        self.highlight = highlight
+        channel = self.channels.get(ViewMode.HIGHLIGHTS)
+        if channel is not None:
+            channel.update(project_view(ViewMode.HIGHLIGHTS, self.state, highlight))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {mode.value: channel.get_stats() for mode, channel in self.channels.items()}
+
+
 class SpectatorMode:
     """Manages spectator viewing experience."""
     
@@ -95,6 +387,8 @@ class SpectatorMode:
         self.view_stats: Dict[str, Dict[str, Any]] = {}  # Track what spectators watch
         self._event_handlers: Dict[str, List[Callable]] = {}
         self._highlight_detector = HighlightDetector()
+        self.frames = FrameBroadcaster(session_id)
+        self._feeds: Dict[str, SpectatorFeed] = {}  # spectator_id -> feed
         
     async def add_spectator(
         self,
@@ -126,6 +420,11 @@ class SpectatorMode:
             mode=ViewMode.OVERVIEW
         )
         
+        # Start in the overview channel; the first read is a keyframe
+        if spectator_id in self._feeds:
+            self._feeds[spectator_id].close()
+        self._feeds[spectator_id] = self.frames.subscribe(ViewMode.OVERVIEW)
+        
         # Initialize view stats
         self.view_stats[spectator_id] = {
             "views_by_player": {},
@@ -145,6 +444,38 @@ class SpectatorMode:
             "current_state": self._get_spectator_state()
         }
     
+    async def remove_spectator(self, spectator_id: str) -> bool:
+        """Remove a spectator and close its frame feed."""
+        if spectator_id not in self.spectators:
+            return False
+        
+        del self.spectators[spectator_id]
+        self.view_configs.pop(spectator_id, None)
+        feed = self._feeds.pop(spectator_id, None)
+        if feed:
+            feed.close()
+        
+        await self._emit_event("spectator_left", {
+            "spectator_id": spectator_id,
+            "total_spectators": len(self.spectators)
+        })
+        
+        return True
+    
+    def get_feed(self, spectator_id: str) -> Optional[SpectatorFeed]:
+        """Frame feed of a spectator (follows its view mode)."""
+        return self._feeds.get(spectator_id)
+    
+    def publish_game_update(self, state: Dict[str, Any]):
+        """Broadcast the current game state to all spectators.
+        
+        ``state`` is the full state: ``round``, ``status``, ``time_remaining``,
+        ``players`` (player_id -> name, score, status, board, prompt,
+        reasoning, ...), ``leaderboard`` and ``commentary``. It is projected
+        and encoded once per watched view mode, not once per spectator.
+        """
+        self.frames.publish(state)
+    
     def _is_approved(self, spectator_id: str, access_token: Optional[str]) -> bool:
         """Check if spectator is approved."""
         # In real implementation, check against approval list
@@ -215,6 +546,8 @@ class SpectatorMode:
         if "mode" in config_update:
             config.mode = ViewMode(config_update["mode"])
             self.view_stats[spectator_id]["favorite_mode"] = config.mode
+            if spectator_id in self._feeds:
+                self._feeds[spectator_id].switch(config.mode)
         
         if "target_players" in config_update:
             config.target_players = config_update["target_players"]
@@ -359,14 +692,29 @@ class SpectatorMode:
         return "An exciting moment in the competition"
     
     async def _notify_highlight_viewers(self, highlight: HighlightMoment):
-        """Notify spectators in highlights mode about new highlight."""
-        for spectator_id, config in self.view_configs.items():
-            if config.mode == ViewMode.HIGHLIGHTS:
-                await self._emit_event("highlight_switch", {
-                    "spectator_id": spectator_id,
-                    "highlight": highlight.__dict__,
-                    "auto_switch": True
-                })
+        """Switch spectators in highlights mode to a new highlight.
+        
+        The highlight goes out once in the HIGHLIGHTS channel frames rather
+        than as one event per viewer.
+        """
+        self.frames.set_highlight({
+            "moment_id": highlight.moment_id,
+            "timestamp": highlight.timestamp.isoformat(),
+            "round_number": highlight.round_number,
+            "player_id": highlight.player_id,
+            "moment_type": highlight.moment_type,
+            "title": highlight.title,
+            "description": highlight.description,
+            "clip_data": highlight.clip_data,
+            "importance_score": highlight.importance_score
+        })
+        
+        channel = self.frames.channels.get(ViewMode.HIGHLIGHTS)
+        await self._emit_event("highlight_switch", {
+            "highlight_id": highlight.moment_id,
+            "viewers": channel.subscribers if channel else 0,
+            "auto_switch": True
+        })
     
     async def send_spectator_message(
         self,
@@ -3,13 +3,15 @@
 import json
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, Boolean, ForeignKey, JSON, text
+from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, Boolean, ForeignKey, JSON, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
 from sqlalchemy.pool import NullPool
 from sqlalchemy import inspect
 import os
 
+from src.core.storage_codec import codec as storage_codec
+
 Base = declarative_base()
 
 class Game(Base):
@@ -27,10 +29,10 @@ class Game(Base):
     # Game state
     initial_board = Column(JSON, nullable=False)  # Store the initial mine positions
     final_board = Column(JSON, nullable=True)  # Final revealed board state
-    moves = Column(JSON, nullable=False)  # List of all moves made
+    moves = Column(JSON, nullable=False)  # List of all moves made (may be a storage_codec envelope)
     
     # Full transcript data (new)
-    full_transcript = Column(JSON, nullable=True)  # Complete game transcript including reasoning
+    full_transcript = Column(JSON, nullable=True)  # Complete game transcript including reasoning (may be a storage_codec envelope)
     task_id = Column(String, nullable=True)  # Reference to the task
     job_id = Column(String, nullable=True)  # Reference to the play session
     
@@ -48,6 +50,12 @@ class Game(Base):
     
     # Relationships
     evaluations = relationship("Evaluation", back_populates="game", cascade="all, delete-orphan")
+    
+    # Keyset pagination indexes for (created_at, id) ordered listings
+    __table_args__ = (
+        Index('idx_games_created_id', 'created_at', 'id'),
+        Index('idx_games_model_created_id', 'model_name', 'created_at', 'id'),
+    )
 
 
 class Evaluation(Base):
@@ -205,6 +213,10 @@ def init_db():
         # Create tables if they don't exist
         logger.info("Creating database tables if they don't exist...")
         Base.metadata.create_all(bind=_engine)
+        
+        # create_all skips indexes on tables that already exist
+        for index in Game.__table__.indexes:
+            index.create(bind=_engine, checkfirst=True)
         logger.info("✅ Database tables ready")
         
         # Log table information
@@ -246,7 +258,7 @@ def game_to_dict(game: Game) -> Dict[str, Any]:
             'cols': game.cols,
             'mines': game.mines
         },
-        'moves': game.moves,
+        'moves': storage_codec.decode(game.moves),
         'results': {
             'won': game.won,
             'num_moves': game.num_moves,
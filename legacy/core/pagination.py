@@ -0,0 +1 @@
+../../packages/api/pagination.py
\ No newline at end of file
@@ -2,11 +2,12 @@
 
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 from pathlib import Path
 import logging
 
+from sqlalchemy import and_, or_, text
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -15,10 +16,19 @@ from src.core.database import (
     LeaderboardEntry, game_to_dict
 )
 from src.core.types import GameTranscript, EvaluationMetrics, ModelConfig
+from src.core.storage_codec import codec as storage_codec
+from src.core.pagination import encode_cursor, decode_cursor
+
+GAME_FILE_SUFFIXES = (".json", ".json.zst", ".json.gz")
 
 logger = logging.getLogger(__name__)
 
 
+def _game_file_id(path: Path) -> str:
+    """Game ID of a game file, ignoring the .json / compression suffixes."""
+    return path.name.split('.', 1)[0]
+
+
 class StorageBackend:
     """Unified storage backend supporting both database and file storage."""
     
@@ -66,12 +76,34 @@ class StorageBackend:
         else:
             return self._load_game_from_file(game_id)
     
-    def list_games(self, model_name: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """List games, optionally filtered by model."""
+    def list_games(self, model_name: Optional[str] = None, limit: int = 100,
+                   cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List games newest first, optionally filtered by model."""
+        return self.list_games_page(model_name, limit, cursor)['games']
+    
+    def list_games_page(self, model_name: Optional[str] = None, limit: int = 100,
+                        cursor: Optional[str] = None,
+                        count: Optional[str] = None) -> Dict[str, Any]:
+        """List one page of games using keyset pagination.
+        
+        Args:
+            model_name: Optional model filter
+            limit: Page size
+            cursor: ``next_cursor`` from the previous page
+            count: None (default, no count), 'estimated' or 'exact'
+        
+        Returns:
+            Dict with ``games``, ``next_cursor`` and ``total`` (None unless counted)
+        """
+        if count not in (None, 'exact', 'estimated'):
+            raise ValueError(f"Unsupported count mode: {count}")
+        
+        # File listings page by game ID alone, so their cursors carry no timestamp
+        after = decode_cursor(cursor, require_timestamp=self.use_database) if cursor else None
         if self.use_database:
-            return self._list_games_from_db(model_name, limit)
+            return self._list_games_from_db(model_name, limit, after, count)
         else:
-            return self._list_games_from_files(model_name, limit)
+            return self._list_games_from_files(model_name, limit, after, count)
     
     # Evaluation Storage Methods
     def save_evaluation(self, game_id: str, metrics: EvaluationMetrics, 
@@ -144,7 +176,7 @@ class StorageBackend:
                 mines=game_result.mine_count,
                 initial_board=game_result.initial_board,
                 final_board=game_result.final_board,
-                moves=[move.to_dict() for move in game_result.moves],
+                moves=storage_codec.encode([move.to_dict() for move in game_result.moves]),
                 won=game_result.won,
                 num_moves=game_result.num_moves,
                 valid_moves=game_result.valid_moves,
@@ -153,7 +185,7 @@ class StorageBackend:
                 cells_revealed=game_result.cells_revealed,
                 completed_at=datetime.now(timezone.utc),
                 # Store full transcript
-                full_transcript=game_result.to_dict(),
+                full_transcript=storage_codec.encode(game_result.to_dict()),
                 task_id=getattr(game_result, 'task_id', None),
                 job_id=getattr(game_result, 'job_id', None)
             )
@@ -190,8 +222,10 @@ class StorageBackend:
         finally:
             db.close()
     
-    def _list_games_from_db(self, model_name: Optional[str], limit: int) -> List[Dict[str, Any]]:
-        """List games from database."""
+    def _list_games_from_db(self, model_name: Optional[str], limit: int,
+                            after: Optional[Tuple[str, str]] = None,
+                            count: Optional[str] = None) -> Dict[str, Any]:
+        """List games from database with (created_at, id) keyset pagination."""
         try:
             db = next(get_db())
             query = db.query(Game)
@@ -199,16 +233,50 @@ class StorageBackend:
             if model_name:
                 query = query.filter(Game.model_name == model_name)
             
-            games = query.order_by(Game.created_at.desc()).limit(limit).all()
+            total = None
+            if count == 'exact' or (count == 'estimated' and model_name):
+                total = query.count()
+            elif count == 'estimated':
+                total = self._estimate_games_count(db)
+            
+            if after:
+                created_at = datetime.fromisoformat(after[0])
+                last_id = after[1]
+                query = query.filter(or_(
+                    Game.created_at < created_at,
+                    and_(Game.created_at == created_at, Game.id < last_id)
+                ))
+            
+            rows = query.order_by(Game.created_at.desc(), Game.id.desc()).limit(limit + 1).all()
+            games = [game_to_dict(game) for game in rows[:limit]]
             
-            return [game_to_dict(game) for game in games]
+            next_cursor = None
+            if len(rows) > limit and games:
+                next_cursor = encode_cursor(games[-1]['created_at'], games[-1]['game_id'])
+            
+            return {'games': games, 'next_cursor': next_cursor, 'total': total}
             
         except SQLAlchemyError as e:
             logger.error(f"Database error listing games: {e}")
-            return []
+            return {'games': [], 'next_cursor': None, 'total': None}
         finally:
             db.close()
     
+    def _estimate_games_count(self, db: Session) -> Optional[int]:
+        """Cheap row-count estimate from table statistics instead of COUNT(*)."""
+        try:
+            if db.bind.dialect.name == 'postgresql':
+                result = db.execute(text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = 'games'"
+                )).scalar()
+            else:
+                # Rows are only ever appended, so the largest rowid tracks the row count
+                result = db.execute(text("SELECT MAX(_ROWID_) FROM games")).scalar()
+            return max(int(result or 0), 0)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not estimate games count: {e}")
+            return None
+    
     def _save_evaluation_to_db(self, game_id: str, metrics: EvaluationMetrics,
                                reasoning_analysis: Optional[Dict],
                                total_time: Optional[float]) -> bool:
@@ -249,48 +317,67 @@ class StorageBackend:
         data_dir = Path("data/games")
         data_dir.mkdir(parents=True, exist_ok=True)
         
-        file_path = data_dir / f"{game_result.game_id}.json"
-        
-        with open(file_path, 'w') as f:
-            json.dump(game_result.to_dict(), f, indent=2)
+        storage_codec.write_json_file(data_dir / f"{game_result.game_id}.json", game_result.to_dict())
         
         return game_result.game_id
     
     def _load_game_from_file(self, game_id: str) -> Optional[GameTranscript]:
         """Load game from file."""
-        file_path = Path(f"data/games/{game_id}.json")
+        file_path = next(
+            (path for path in (Path(f"data/games/{game_id}{suffix}") for suffix in GAME_FILE_SUFFIXES)
+             if path.exists()),
+            None
+        )
         
-        if not file_path.exists():
+        if file_path is None:
             return None
         
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            data = storage_codec.read_json_file(file_path)
             return GameTranscript.from_dict(data)
         except Exception as e:
             logger.error(f"Error loading game file: {e}")
             return None
     
-    def _list_games_from_files(self, model_name: Optional[str], limit: int) -> List[Dict[str, Any]]:
-        """List games from files."""
+    def _list_games_from_files(self, model_name: Optional[str], limit: int,
+                               after: Optional[Tuple[str, str]] = None,
+                               count: Optional[str] = None) -> Dict[str, Any]:
+        """List games from files, paging by game ID (file name) order."""
         games_dir = Path("data/games")
         if not games_dir.exists():
-            return []
+            return {'games': [], 'next_cursor': None, 'total': 0 if count else None}
+        
+        file_paths = sorted(
+            (p for p in games_dir.glob("*.json*") if p.name.endswith(GAME_FILE_SUFFIXES)),
+            key=_game_file_id, reverse=True
+        )
+        total = len(file_paths) if count and not model_name else None
+        if after:
+            file_paths = [p for p in file_paths if _game_file_id(p) < after[1]]
         
         games = []
-        for file_path in sorted(games_dir.glob("*.json"), reverse=True)[:limit]:
+        last_id = None
+        has_more = False
+        for file_path in file_paths:
             try:
-                with open(file_path, 'r') as f:
-                    game_data = json.load(f)
+                game_data = storage_codec.read_json_file(file_path)
                 
                 if model_name and game_data.get('model', {}).get('name') != model_name:
                     continue
                 
+                if len(games) == limit:
+                    has_more = True
+                    break
                 games.append(game_data)
+                last_id = _game_file_id(file_path)
             except Exception as e:
                 logger.error(f"Error reading game file {file_path}: {e}")
         
-        return games
+        next_cursor = None
+        if has_more and last_id:
+            next_cursor = encode_cursor(None, last_id)
+        
+        return {'games': games, 'next_cursor': next_cursor, 'total': total}
     
     def _save_task_to_file(self, task_data: Dict[str, Any]) -> str:
         """Save task to file."""
@@ -0,0 +1 @@
+../../packages/api/storage_codec.py
\ No newline at end of file
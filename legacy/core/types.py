@@ -182,6 +182,34 @@ class Task:
             metadata=metadata or {},
             created_at=datetime.utcnow(),
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert task to a JSON-serializable dictionary."""
+        return {
+            "task_id": self.task_id,
+            "task_type": self.task_type.value,
+            "difficulty": self.difficulty.value,
+            "board_config": self.board_config,
+            "description": self.description,
+            "metadata": self.metadata,
+            "created_at": (
+                self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at
+            ),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """Rebuild a task written by to_dict."""
+        created_at = data.get("created_at")
+        return cls(
+            task_id=data["task_id"],
+            task_type=TaskType(data["task_type"]),
+            difficulty=Difficulty(data["difficulty"]),
+            board_config=data["board_config"],
+            description=data.get("description", ""),
+            metadata=data.get("metadata", {}),
+            created_at=datetime.fromisoformat(created_at) if created_at else datetime.utcnow(),
+        )
 
 
 @dataclass
@@ -6,6 +6,7 @@ from .runner import GameRunner
 from .judge import ReasoningJudge, BatchJudge
 from .advanced_metrics import AdvancedMetricsCalculator, AdvancedMetrics
 from .episode_logger import EpisodeLogger, MineBenchFormatter
+from .columnar_store import ColumnarExporter, ColumnarReader
 
 __all__ = [
     "MetricsCalculator",
@@ -17,4 +18,6 @@ __all__ = [
     "AdvancedMetrics",
     "EpisodeLogger",
     "MineBenchFormatter",
+    "ColumnarExporter",
+    "ColumnarReader",
 ]
\ No newline at end of file
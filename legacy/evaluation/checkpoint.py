@@ -0,0 +1,318 @@
+"""Checkpoint log for evaluation jobs, so a crashed job can be resumed.
+
+Every game is recorded as its board seed plus the list of moves played.
+The board is deterministic given the seed, so replaying the moves without
+the model rebuilds the exact game state, and only the remaining moves cost
+API calls when a job resumes.
+
+Layout of a job directory::
+
+    <job_id>/job.json            what the job plays (model, tasks, options) and its status
+    <job_id>/transcripts.jsonl   one line per finished game, appended as games finish
+    <job_id>/games/<index>.jsonl in-flight game: a header line, then one line per
+                                 move or failed attempt that made no move
+
+Lines are appended and flushed one at a time; a line cut short by a crash
+is ignored when the log is read back.
+"""
+
+import json
+import os
+import re
+import secrets
+import shutil
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.types import Action, ActionType, GameStatus, GameTranscript, ModelConfig, Move, Position, Task
+from src.core.logging_config import get_logger
+from src.games.tilts import TiltsGame
+
+logger = get_logger("evaluation.checkpoint")
+
+CHECKPOINT_DIR = Path(os.environ.get("EVALUATION_CHECKPOINT_DIR", "data/checkpoints"))
+
+# Job IDs name directories, so they may not contain path separators or dots
+JOB_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# The game loop gives up after this many invalid moves in a row
+MAX_CONSECUTIVE_ERRORS = 3
+
+
+def build_game(
+    task: Task,
+    model_name: str,
+    seed: Optional[int] = None,
+    game_id: Optional[str] = None,
+) -> TiltsGame:
+    """Create the game for a task, including its scripted first move."""
+    board_config = task.board_config
+    game = TiltsGame(
+        rows=board_config.get("rows", 16),
+        cols=board_config.get("cols", 30),
+        mines=board_config.get("mines", 99),
+        seed=seed,
+        game_id=game_id,
+        task_id=task.task_id,
+        model_name=model_name,
+    )
+
+    if "first_move" in board_config:
+        first_pos = board_config["first_move"]
+        game.make_move(Action(ActionType.REVEAL, Position(first_pos["row"], first_pos["col"])))
+    return game
+
+
+def move_record(move: Move, consecutive_errors: int) -> Dict[str, Any]:
+    """Replayable form of a move."""
+    return {
+        "action": move.action.action_type.value,
+        "row": move.action.position.row,
+        "col": move.action.position.col,
+        "timestamp": move.timestamp.isoformat(),
+        "prompt_sent": move.prompt_sent,
+        "full_response": move.full_response,
+        "model_reasoning": move.model_reasoning,
+        "tokens_used": move.tokens_used,
+        "consecutive_errors": consecutive_errors,
+    }
+
+
+def replay_moves(game: TiltsGame, records: List[Dict[str, Any]]) -> int:
+    """
+    Apply recorded moves to a freshly built game.
+
+    Returns:
+        The consecutive invalid move count after the last move
+    """
+    for record in records:
+        action = Action(ActionType(record["action"]), Position(record["row"], record["col"]))
+        before = len(game.moves)
+        try:
+            game.make_move(action, ai_details=record)
+        except Exception:
+            pass  # the original move failed the same way and was recorded anyway
+        if len(game.moves) > before:
+            game.moves[-1].timestamp = datetime.fromisoformat(record["timestamp"])
+    return records[-1]["consecutive_errors"] if records else 0
+
+
+def _read_lines(path: Path) -> List[Dict[str, Any]]:
+    records = []
+    if not path.exists():
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn write at the end of the log
+                logger.warning(f"Skipping incomplete checkpoint line in {path}")
+    return records
+
+
+class GameCheckpoint:
+    """Move-by-move log of one in-flight game."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        records = _read_lines(path)
+        self.header: Optional[Dict[str, Any]] = records[0] if records else None
+        # Every attempt in order; ``moves`` are the ones that reached game.moves
+        self.log: List[Dict[str, Any]] = records[1:]
+        self.moves: List[Dict[str, Any]] = [record for record in self.log if "action" in record]
+        self._base_moves = 0
+        self._file = None
+
+    @property
+    def started(self) -> bool:
+        return self.header is not None
+
+    @property
+    def attempts(self) -> int:
+        """Moves the model was asked for, including failed ones."""
+        return len(self.log)
+
+    def start(self, game: TiltsGame, seed: int) -> None:
+        """Record the header of a new game."""
+        self.header = {
+            "seed": seed,
+            "game_id": game.game_id,
+            "start_time": game.start_time.isoformat(),
+        }
+        self.log = []
+        self.moves = []
+        self._base_moves = len(game.moves)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w")
+        self._append(self.header)
+
+    def restore(self, task: Task, model_name: str) -> Tuple[TiltsGame, int]:
+        """Rebuild the game from the log; returns it with its consecutive error count."""
+        game = build_game(task, model_name, self.header["seed"], self.header["game_id"])
+        game.start_time = datetime.fromisoformat(self.header["start_time"])
+        self._base_moves = len(game.moves)
+        replay_moves(game, self.moves)
+        consecutive_errors = self.log[-1]["consecutive_errors"] if self.log else 0
+        if consecutive_errors >= MAX_CONSECUTIVE_ERRORS and game.status == GameStatus.IN_PROGRESS:
+            game.mark_as_error("Too many consecutive invalid moves")
+        # Rewrite rather than append, dropping any line torn by the crash
+        self._file = open(self.path, "w")
+        for record in [self.header, *self.log]:
+            self._append(record)
+        return game, consecutive_errors
+
+    def sync(self, game: TiltsGame, consecutive_errors: int) -> None:
+        """Append the moves the game has made since the last sync."""
+        for move in game.moves[self._base_moves + len(self.moves):]:
+            record = move_record(move, consecutive_errors)
+            self.log.append(record)
+            self.moves.append(record)
+            self._append(record)
+
+    def record_failure(self, consecutive_errors: int) -> None:
+        """Log an attempt that produced no move, so resuming keeps the move and error counts."""
+        record = {
+            "failed_attempt": True,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "consecutive_errors": consecutive_errors,
+        }
+        self.log.append(record)
+        self._append(record)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JobCheckpoint:
+    """Checkpoint log of an evaluation job."""
+
+    def __init__(self, job_id: str, root: Path = CHECKPOINT_DIR):
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            raise ValueError(f"Invalid job ID: {job_id!r}")
+        self.job_id = job_id
+        self.dir = Path(root) / job_id
+        self.games_dir = self.dir / "games"
+
+    @property
+    def spec_path(self) -> Path:
+        return self.dir / "job.json"
+
+    @property
+    def transcripts_path(self) -> Path:
+        return self.dir / "transcripts.jsonl"
+
+    def exists(self) -> bool:
+        return self.spec_path.exists()
+
+    def save_spec(self, spec: Dict[str, Any]) -> None:
+        """Record what the job plays, so it can be resumed from the log alone."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        spec = {"job_id": self.job_id, "status": "running", **spec}
+        self._write_spec(spec)
+
+    def save_job(self, model_config: ModelConfig, tasks: List[Task], **options: Any) -> None:
+        """Record the model, tasks and run options of a new job (without API keys)."""
+        model = asdict(model_config)
+        model["additional_params"] = {
+            key: value for key, value in (model.get("additional_params") or {}).items() if key != "api_key"
+        }
+        self.save_spec({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "model": model,
+            "tasks": [task.to_dict() for task in tasks],
+            "options": options,
+        })
+
+    def load_job(self) -> Tuple[ModelConfig, List[Task], Dict[str, Any]]:
+        """Model config, tasks and run options recorded by save_job."""
+        spec = self.load_spec()
+        if spec is None:
+            raise FileNotFoundError(f"No checkpoint for job {self.job_id} in {self.dir.parent}")
+        tasks = [Task.from_dict(task) for task in spec["tasks"]]
+        return ModelConfig(**spec["model"]), tasks, spec.get("options", {})
+
+    def load_spec(self) -> Optional[Dict[str, Any]]:
+        if not self.exists():
+            return None
+        with open(self.spec_path) as f:
+            return json.load(f)
+
+    def update_status(self, status: str, **fields: Any) -> None:
+        spec = self.load_spec() or {"job_id": self.job_id}
+        spec.update(status=status, updated_at=datetime.now(timezone.utc).isoformat(), **fields)
+        self._write_spec(spec)
+
+    def _write_spec(self, spec: Dict[str, Any]) -> None:
+        tmp = self.spec_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(spec, f, indent=2)
+        os.replace(tmp, self.spec_path)
+
+    def game(self, index: int) -> GameCheckpoint:
+        """Log of the game for task ``index`` (possibly left over from a crash)."""
+        return GameCheckpoint(self.games_dir / f"{index}.jsonl")
+
+    def complete(self, index: int, game_checkpoint: GameCheckpoint, transcript: GameTranscript) -> None:
+        """Append a finished game to the transcript log and drop its in-flight log."""
+        record = {
+            "index": index,
+            "task_id": transcript.task_id,
+            **game_checkpoint.header,
+            "end_time": transcript.end_time.isoformat(),
+            "status": transcript.final_state.status.value,
+            "error_message": transcript.error_message,
+            "moves": game_checkpoint.moves,
+        }
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.transcripts_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        game_checkpoint.close()
+        game_checkpoint.path.unlink(missing_ok=True)
+
+    def remove(self) -> None:
+        """Delete the job's checkpoint once its results are saved."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def finished_indexes(self) -> List[int]:
+        return sorted({record["index"] for record in _read_lines(self.transcripts_path)})
+
+    def load_transcripts(self, tasks: List[Task], model_name: str) -> Dict[int, GameTranscript]:
+        """Rebuild the transcripts of finished games by replaying their moves."""
+        transcripts = {}
+        for record in _read_lines(self.transcripts_path):
+            index = record["index"]
+            task = tasks[index]
+            game = build_game(task, model_name, record["seed"], record["game_id"])
+            game.start_time = datetime.fromisoformat(record["start_time"])
+            replay_moves(game, record["moves"])
+            if record["status"] == GameStatus.ERROR.value:
+                game.mark_as_error(record["error_message"] or "Game failed")
+            elif record["error_message"]:
+                game.error_message = record["error_message"]
+            game.end_time = datetime.fromisoformat(record["end_time"])
+
+            if game.status.value != record["status"]:
+                logger.warning(
+                    f"Replayed game {record['game_id']} ended {game.status.value}, "
+                    f"checkpoint says {record['status']}",
+                    extra={"job_id": self.job_id, "task_index": index}
+                )
+            transcripts[index] = game.get_transcript()
+        return transcripts
+
+
+def new_seed() -> int:
+    """Seed for a board whose task leaves it random, so the game can be replayed."""
+    # Not the random module: boards reseed it, so its next value is predictable
+    return secrets.randbelow(2 ** 31)
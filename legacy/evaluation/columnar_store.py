@@ -0,0 +1,448 @@
+"""Columnar (Parquet) export and analytics path for game transcripts.
+
+Moves and games are written to Hive-style partitioned Parquet datasets::
+
+    data/columnar/games/model=<model>/date=<YYYY-MM-DD>/part-*.parquet
+    data/columnar/moves/model=<model>/date=<YYYY-MM-DD>/part-*.parquet
+
+The schemas below are versioned and append-only: new columns may be added at
+the end, existing columns are never renamed or retyped. Readers load only the
+columns they ask for, so cross-model analyses do not have to touch prompt or
+response text.
+"""
+
+import re
+import uuid
+from typing import Dict, List, Any, Optional, Iterable, Union
+from pathlib import Path
+from datetime import datetime, date, timezone
+from urllib.parse import quote
+
+from src.core.types import GameTranscript, GameStatus
+from src.core.logging_config import get_logger
+from src.core.storage_codec import read_json_file
+
+logger = get_logger("evaluation.columnar_store")
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+    HAS_PYARROW = False
+
+SCHEMA_VERSION = 1
+
+# Partition columns are encoded in the directory layout, not in the files
+PARTITION_FIELDS = ["model", "date"]
+
+_ACTION_PATTERN = re.compile(r"^\s*(\w+)\s*\(\s*(-?\d+)\s*,\s*(-?\d+)\s*\)")
+
+
+def _games_schema() -> "pa.Schema":
+    """Stable schema for the games table."""
+    return pa.schema(
+        [
+            ("game_id", pa.string()),
+            ("task_id", pa.string()),
+            ("model_name", pa.string()),
+            ("model_provider", pa.string()),
+            ("job_id", pa.string()),
+            ("start_time", pa.timestamp("us", tz="UTC")),
+            ("end_time", pa.timestamp("us", tz="UTC")),
+            ("duration_seconds", pa.float64()),
+            ("final_status", pa.string()),
+            ("won", pa.bool_()),
+            ("num_moves", pa.int32()),
+            ("valid_moves", pa.int32()),
+            ("invalid_moves", pa.int32()),
+            ("board_rows", pa.int32()),
+            ("board_cols", pa.int32()),
+            ("num_mines", pa.int32()),
+            ("flags_placed", pa.int32()),
+            ("correct_flags", pa.int32()),
+            ("cells_revealed", pa.int32()),
+            ("error_message", pa.string()),
+        ],
+        metadata={b"tilts.schema_version": str(SCHEMA_VERSION).encode()},
+    )
+
+
+def _moves_schema() -> "pa.Schema":
+    """Stable schema for the moves table."""
+    return pa.schema(
+        [
+            ("game_id", pa.string()),
+            ("task_id", pa.string()),
+            ("model_name", pa.string()),
+            ("move_number", pa.int32()),
+            ("action_type", pa.string()),
+            ("row", pa.int32()),
+            ("col", pa.int32()),
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("elapsed_ms", pa.int64()),
+            ("was_valid", pa.bool_()),
+            ("error_message", pa.string()),
+            ("tokens_used", pa.int32()),
+            ("reasoning", pa.string()),
+            ("prompt_sent", pa.string()),
+            ("full_response", pa.string()),
+        ],
+        metadata={b"tilts.schema_version": str(SCHEMA_VERSION).encode()},
+    )
+
+
+def _partition_schema() -> "pa.Schema":
+    return pa.schema([("model", pa.string()), ("date", pa.string())])
+
+
+def _require_pyarrow() -> None:
+    if not HAS_PYARROW:
+        raise ImportError(
+            "pyarrow is required for columnar export; install it with `pip install pyarrow`"
+        )
+
+
+def _as_utc(value: Union[datetime, str, None]) -> Optional[datetime]:
+    """Normalize datetimes (or ISO strings) to timezone-aware UTC."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_action(action: str) -> tuple:
+    """Split an action string like ``reveal (3, 4)`` into its parts."""
+    match = _ACTION_PATTERN.match(action or "")
+    if not match:
+        return action or None, None, None
+    return match.group(1), int(match.group(2)), int(match.group(3))
+
+
+def _rows_to_table(rows: List[Dict[str, Any]], schema: "pa.Schema") -> "pa.Table":
+    columns = {name: [row.get(name) for row in rows] for name in schema.names}
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+class ColumnarExporter:
+    """Writes transcripts to model/date partitioned Parquet datasets."""
+
+    def __init__(self, output_dir: Union[str, Path] = "data/columnar", compression: str = "zstd"):
+        """
+        Initialize exporter.
+
+        Args:
+            output_dir: Root directory of the columnar datasets
+            compression: Parquet compression codec
+        """
+        self.output_dir = Path(output_dir)
+        self.compression = compression
+
+    def export_transcripts(
+        self,
+        transcripts: List[GameTranscript],
+        model_name: str,
+        model_provider: Optional[str] = None,
+        job_id: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Export game transcripts to the games and moves datasets.
+
+        Args:
+            transcripts: Game transcripts to export
+            model_name: Model name used as the partition key
+            model_provider: Model provider
+            job_id: Optional job the games belong to
+
+        Returns:
+            Paths of the Parquet files written
+        """
+        _require_pyarrow()
+        game_rows = []
+        move_rows = []
+
+        for transcript in transcripts:
+            game_rows.append(self._game_row(transcript, model_name, model_provider, job_id))
+            move_rows.extend(self._move_rows(transcript, model_name))
+
+        return self._write(game_rows, move_rows, model_name)
+
+    def export_transcript_dicts(
+        self,
+        transcript_dicts: Iterable[Dict[str, Any]],
+        model_name: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Export serialized transcripts (the ``*_transcripts.json`` format).
+
+        Board-level fields that the JSON format does not carry are left null.
+
+        Args:
+            transcript_dicts: Serialized transcripts
+            model_name: Partition key; defaults to each transcript's model_name
+
+        Returns:
+            Paths of the Parquet files written
+        """
+        _require_pyarrow()
+        by_model: Dict[str, tuple] = {}
+
+        for t in transcript_dicts:
+            name = model_name or t.get("model_name") or "unknown"
+            game_rows, move_rows = by_model.setdefault(name, ([], []))
+            start_time = _as_utc(t.get("start_time"))
+            end_time = _as_utc(t.get("end_time"))
+            moves = t.get("moves", [])
+            valid_moves = sum(1 for m in moves if m.get("was_valid"))
+            status = t.get("final_status")
+
+            game_rows.append({
+                "game_id": t.get("game_id"),
+                "task_id": t.get("task_id"),
+                "model_name": t.get("model_name", name),
+                "start_time": start_time,
+                "end_time": end_time,
+                "duration_seconds": (end_time - start_time).total_seconds() if start_time and end_time else None,
+                "final_status": status,
+                "won": status == GameStatus.WON.value,
+                "num_moves": len(moves),
+                "valid_moves": valid_moves,
+                "invalid_moves": len(moves) - valid_moves,
+            })
+
+            for i, move in enumerate(moves):
+                action_type, row, col = _parse_action(move.get("action"))
+                timestamp = _as_utc(move.get("timestamp"))
+                move_rows.append({
+                    "game_id": t.get("game_id"),
+                    "task_id": t.get("task_id"),
+                    "model_name": t.get("model_name", name),
+                    "move_number": i + 1,
+                    "action_type": action_type,
+                    "row": row,
+                    "col": col,
+                    "timestamp": timestamp,
+                    "elapsed_ms": int((timestamp - start_time).total_seconds() * 1000) if timestamp and start_time else None,
+                    "was_valid": move.get("was_valid"),
+                    "error_message": move.get("error"),
+                    "tokens_used": move.get("tokens_used"),
+                    "reasoning": move.get("reasoning"),
+                    "prompt_sent": move.get("prompt_sent"),
+                    "full_response": move.get("full_response"),
+                })
+
+        written = []
+        for name, (game_rows, move_rows) in by_model.items():
+            written.extend(self._write(game_rows, move_rows, name))
+        return written
+
+    def export_results_file(self, transcripts_file: Union[str, Path]) -> List[str]:
+        """Backfill the columnar datasets from an existing ``*_transcripts.json[.zst|.gz]`` file."""
+        return self.export_transcript_dicts(read_json_file(transcripts_file))
+
+    def _game_row(
+        self,
+        transcript: GameTranscript,
+        model_name: str,
+        model_provider: Optional[str],
+        job_id: Optional[str],
+    ) -> Dict[str, Any]:
+        state = transcript.final_state
+        mine_positions = set(state.mine_positions)
+        flagged_positions = set(state.flagged_cells)
+        valid_moves = sum(1 for move in transcript.moves if move.was_valid)
+
+        return {
+            "game_id": transcript.game_id,
+            "task_id": transcript.task_id,
+            "model_name": transcript.model_name or model_name,
+            "model_provider": model_provider,
+            "job_id": job_id,
+            "start_time": _as_utc(transcript.start_time),
+            "end_time": _as_utc(transcript.end_time),
+            "duration_seconds": transcript.duration_seconds,
+            "final_status": state.status.value,
+            "won": state.status == GameStatus.WON,
+            "num_moves": len(transcript.moves),
+            "valid_moves": valid_moves,
+            "invalid_moves": len(transcript.moves) - valid_moves,
+            "board_rows": state.board_rows,
+            "board_cols": state.board_cols,
+            "num_mines": len(mine_positions),
+            "flags_placed": len(flagged_positions),
+            "correct_flags": len(mine_positions & flagged_positions),
+            "cells_revealed": len(state.revealed_cells),
+            "error_message": transcript.error_message,
+        }
+
+    def _move_rows(self, transcript: GameTranscript, model_name: str) -> List[Dict[str, Any]]:
+        start_time = _as_utc(transcript.start_time)
+        rows = []
+
+        for i, move in enumerate(transcript.moves):
+            timestamp = _as_utc(move.timestamp)
+            rows.append({
+                "game_id": transcript.game_id,
+                "task_id": transcript.task_id,
+                "model_name": transcript.model_name or model_name,
+                "move_number": i + 1,
+                "action_type": move.action.action_type.value,
+                "row": move.action.position.row,
+                "col": move.action.position.col,
+                "timestamp": timestamp,
+                "elapsed_ms": int((timestamp - start_time).total_seconds() * 1000) if timestamp and start_time else None,
+                "was_valid": move.was_valid,
+                "error_message": move.error_message,
+                "tokens_used": move.tokens_used,
+                "reasoning": move.model_reasoning,
+                "prompt_sent": move.prompt_sent,
+                "full_response": move.full_response,
+            })
+
+        return rows
+
+    def _write(
+        self,
+        game_rows: List[Dict[str, Any]],
+        move_rows: List[Dict[str, Any]],
+        model_name: str,
+    ) -> List[str]:
+        """Write rows into one file per (table, date) partition."""
+        written = []
+        part_name = f"part-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+
+        for table_name, rows, schema, time_field in (
+            ("games", game_rows, _games_schema(), "start_time"),
+            ("moves", move_rows, _moves_schema(), "timestamp"),
+        ):
+            by_date: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                row_time = row.get(time_field)
+                partition_date = (row_time.date() if row_time else date.today()).isoformat()
+                by_date.setdefault(partition_date, []).append(row)
+
+            for partition_date, partition_rows in by_date.items():
+                partition_dir = (
+                    self.output_dir / table_name
+                    / f"model={quote(model_name, safe='')}"
+                    / f"date={partition_date}"
+                )
+                partition_dir.mkdir(parents=True, exist_ok=True)
+                file_path = partition_dir / part_name
+
+                pq.write_table(
+                    _rows_to_table(partition_rows, schema),
+                    file_path,
+                    compression=self.compression,
+                )
+                written.append(str(file_path))
+
+        logger.info(f"Exported {len(game_rows)} games / {len(move_rows)} moves for {model_name} to Parquet")
+        return written
+
+
+class ColumnarReader:
+    """Loads the columnar datasets with column and partition pruning."""
+
+    def __init__(self, root_dir: Union[str, Path] = "data/columnar"):
+        """
+        Initialize reader.
+
+        Args:
+            root_dir: Root directory of the columnar datasets
+        """
+        self.root_dir = Path(root_dir)
+
+    def _dataset(self, table_name: str) -> Optional["ds.Dataset"]:
+        _require_pyarrow()
+        path = self.root_dir / table_name
+        if not path.exists():
+            return None
+
+        schema = _games_schema() if table_name == "games" else _moves_schema()
+        return ds.dataset(
+            str(path),
+            format="parquet",
+            schema=pa.unify_schemas([schema, _partition_schema()]),
+            partitioning=ds.partitioning(_partition_schema(), flavor="hive"),
+        )
+
+    def load_table(
+        self,
+        table_name: str,
+        columns: Optional[List[str]] = None,
+        models: Optional[List[str]] = None,
+        start_date: Optional[Union[date, str]] = None,
+        end_date: Optional[Union[date, str]] = None,
+    ) -> "pa.Table":
+        """
+        Load a table as an Arrow table.
+
+        Args:
+            table_name: "games" or "moves"
+            columns: Columns to read (None reads all); partition columns allowed
+            models: Restrict to these models
+            start_date: Inclusive lower bound on the date partition
+            end_date: Inclusive upper bound on the date partition
+
+        Returns:
+            Arrow table containing only the requested columns
+        """
+        if table_name not in ("games", "moves"):
+            raise ValueError(f"Unknown columnar table: {table_name}")
+
+        dataset = self._dataset(table_name)
+        if dataset is None:
+            schema = pa.unify_schemas([
+                _games_schema() if table_name == "games" else _moves_schema(),
+                _partition_schema(),
+            ])
+            if columns:
+                schema = pa.schema([schema.field(c) for c in columns])
+            return schema.empty_table()
+
+        expression = None
+        conditions = []
+        if models:
+            conditions.append(ds.field("model").isin(list(models)))
+        if start_date:
+            conditions.append(ds.field("date") >= str(start_date))
+        if end_date:
+            conditions.append(ds.field("date") <= str(end_date))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def load_games(self, columns: Optional[List[str]] = None, **filters) -> "Any":
+        """Load the games table as a pandas DataFrame."""
+        return self.load_table("games", columns=columns, **filters).to_pandas()
+
+    def load_moves(self, columns: Optional[List[str]] = None, **filters) -> "Any":
+        """Load the moves table as a pandas DataFrame."""
+        return self.load_table("moves", columns=columns, **filters).to_pandas()
+
+    def load_arrays(
+        self,
+        table_name: str,
+        columns: List[str],
+        **filters
+    ) -> Dict[str, Any]:
+        """
+        Load columns as NumPy arrays (no pandas required).
+
+        Returns:
+            Mapping of column name to NumPy array
+        """
+        table = self.load_table(table_name, columns=columns, **filters)
+        return {
+            name: table.column(name).to_numpy(zero_copy_only=False)
+            for name in table.column_names
+        }
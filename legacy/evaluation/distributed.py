@@ -0,0 +1,380 @@
+"""Distributed evaluation across any number of worker nodes.
+
+The coordinator splits the (model, task) pairs of a job into shards and
+enqueues each shard as a leased item in a shared store: Redis, or a SQLite
+file. Workers claim shards, play their games, write the transcripts and ack
+the shard with a ``MetricsAggregate`` of its games. The coordinator merges those aggregates per model as shards
+finish, so no process ever has to hold every transcript.
+
+Leases come from ``competition.queue_backends``: a worker that dies stops
+extending its lease and the shard is claimed again by another worker once
+the visibility timeout has passed.
+
+The SQLite store is meant for workers on the coordinator's host. It uses a
+rollback journal rather than WAL so the file can sit on a shared volume,
+but SQLite over NFS or SMB is only as safe as the filesystem's locking;
+spread workers across machines with a ``redis://`` store.
+
+Job layout under the output directory (shared, if transcripts should be
+collected in one place)::
+
+    <job_id>/manifest.json         shards of the job, written by the coordinator
+    <job_id>/shards.jsonl          finished shard results, appended as they land
+    <job_id>/summary.json          merged metrics, once every shard is finished
+    <job_id>/transcripts/<model>/  one file per game, written by the workers
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.competition.queue_backends import (
+    COMPLETED, FINISHED_STATES, VISIBILITY_TIMEOUT, Lease, QueueBackend,
+    RedisStreamsQueueBackend, SQLiteQueueBackend, call_backend, keep_lease
+)
+from src.core.logging_config import get_logger
+from src.core.storage_codec import codec as storage_codec
+from src.core.types import ModelConfig, Task
+from .engine import transcript_to_dict
+from .metrics import MetricsAggregate
+from .runner import GameRunner
+
+logger = get_logger("evaluation.distributed")
+
+DISTRIBUTED_STORE = os.environ.get("DISTRIBUTED_EVALUATION_STORE", "data/distributed/queue.db")
+DISTRIBUTED_DIR = Path(os.environ.get("DISTRIBUTED_EVALUATION_DIR", "data/distributed"))
+SHARD_SIZE = int(os.environ.get("DISTRIBUTED_SHARD_SIZE", "5"))
+POLL_INTERVAL = float(os.environ.get("DISTRIBUTED_POLL_INTERVAL", "5"))
+# Shard records outlive the job by a week so a coordinator can re-attach
+RETENTION_SECONDS = float(os.environ.get("DISTRIBUTED_RETENTION_SECONDS", str(7 * 24 * 3600)))
+QUEUE_NAME = "distributed"
+
+
+def open_store(store: str = DISTRIBUTED_STORE) -> QueueBackend:
+    """Open the shared lease store: a ``redis://`` URL or a SQLite file path.
+
+    The SQLite file uses a rollback journal (WAL needs shared memory, which
+    processes on different hosts cannot share).
+    """
+    if store.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStreamsQueueBackend(store, QUEUE_NAME, retention_seconds=RETENTION_SECONDS)
+    path = store[len("sqlite:///"):] if store.startswith("sqlite:///") else store
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return SQLiteQueueBackend(path, QUEUE_NAME, journal_mode="DELETE")
+
+
+def new_job_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+def _slug(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+@dataclass
+class Shard:
+    """A batch of tasks for one model, leased to one worker at a time."""
+    shard_id: str
+    job_id: str
+    model: Dict[str, Any]  # ModelConfig fields
+    tasks: List[Dict[str, Any]]
+    max_moves: int = 500
+    prompt_format: str = "standard"
+
+    @property
+    def model_name(self) -> str:
+        return self.model["name"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Shard":
+        return cls(**data)
+
+
+class EvaluationCoordinator:
+    """Shards a job into the shared store and merges what the workers report."""
+
+    def __init__(self, store: QueueBackend, output_dir: Path = DISTRIBUTED_DIR):
+        self.store = store
+        self.output_dir = Path(output_dir)
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.output_dir / job_id
+
+    def load_manifest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        path = self.job_dir(job_id) / "manifest.json"
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def plan(
+        self,
+        job_id: str,
+        model_configs: List[ModelConfig],
+        tasks: List[Task],
+        max_moves: int = 500,
+        prompt_format: str = "standard",
+        shard_size: int = SHARD_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Split every (model, task) pair into shards and write the job manifest.
+
+        An existing manifest for ``job_id`` is returned unchanged, so running
+        the coordinator again re-attaches to the job instead of re-planning it.
+        """
+        manifest = self.load_manifest(job_id)
+        if manifest is not None:
+            return manifest
+
+        shard_size = max(1, shard_size)
+        task_dicts = [task.to_dict() for task in tasks]
+        shards = []
+        for model_index, model_config in enumerate(model_configs):
+            for start in range(0, len(task_dicts), shard_size):
+                shards.append(Shard(
+                    shard_id=f"{job_id}:{model_index}:{start // shard_size}",
+                    job_id=job_id,
+                    model=asdict(model_config),
+                    tasks=task_dicts[start:start + shard_size],
+                    max_moves=max_moves,
+                    prompt_format=prompt_format,
+                ).to_dict())
+
+        manifest = {
+            "job_id": job_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "models": [asdict(model_config) for model_config in model_configs],
+            "num_tasks": len(tasks),
+            "max_moves": max_moves,
+            "prompt_format": prompt_format,
+            "shard_size": shard_size,
+            "shards": shards,
+        }
+        job_dir = self.job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        with open(job_dir / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    async def submit(self, manifest: Dict[str, Any]) -> int:
+        """Enqueue the shards that are neither finished nor in the store yet; returns how many."""
+        finished = self._load_finished(manifest["job_id"])
+        submitted = 0
+        for shard in manifest["shards"]:
+            if shard["shard_id"] in finished:
+                continue
+            if await call_backend(self.store, "get", shard["shard_id"]) is not None:
+                continue
+            await call_backend(self.store, "enqueue", shard["shard_id"], shard)
+            submitted += 1
+        logger.info(f"Submitted {submitted}/{len(manifest['shards'])} shards of job {manifest['job_id']}")
+        return submitted
+
+    def _load_finished(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        path = self.job_dir(job_id) / "shards.jsonl"
+        finished = {}
+        if path.exists():
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        finished[record["shard_id"]] = record
+        return finished
+
+    async def wait(
+        self,
+        manifest: Dict[str, Any],
+        poll_interval: float = POLL_INTERVAL,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Poll the store until every shard is finished and merge the results.
+
+        Finished shards are appended to ``shards.jsonl`` as they are seen, so
+        a restarted coordinator picks up where it stopped even after the
+        store has forgotten them.
+
+        Returns:
+            The job summary (also written to ``summary.json``)
+        """
+        job_id = manifest["job_id"]
+        finished = self._load_finished(job_id)
+        outstanding = [s["shard_id"] for s in manifest["shards"] if s["shard_id"] not in finished]
+
+        with open(self.job_dir(job_id) / "shards.jsonl", "a") as log:
+            while True:
+                for shard_id in list(outstanding):
+                    record = await call_backend(self.store, "get", shard_id)
+                    if record is None or record["status"] not in FINISHED_STATES:
+                        continue
+                    entry = {
+                        "shard_id": shard_id,
+                        "status": record["status"],
+                        "result": record["result"],
+                        "error": record["error"],
+                    }
+                    log.write(json.dumps(entry) + "\n")
+                    log.flush()
+                    finished[shard_id] = entry
+                    outstanding.remove(shard_id)
+
+                summary = self.summarize(manifest, finished)
+                if on_progress:
+                    on_progress(summary)
+                if not outstanding:
+                    break
+                # Dead-letter shards whose leases keep expiring
+                await call_backend(self.store, "reclaim_expired")
+                await asyncio.sleep(poll_interval)
+
+        with open(self.job_dir(job_id) / "summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def summarize(self, manifest: Dict[str, Any], finished: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge the aggregates of the finished shards, per model."""
+        aggregates = {model["name"]: MetricsAggregate() for model in manifest["models"]}
+        failed = []
+        for shard in manifest["shards"]:
+            entry = finished.get(shard["shard_id"])
+            if entry is None:
+                continue
+            if entry["status"] == COMPLETED and entry["result"]:
+                aggregates[shard["model"]["name"]].merge(
+                    MetricsAggregate.from_dict(entry["result"]["aggregate"])
+                )
+            else:
+                failed.append({"shard_id": shard["shard_id"], "status": entry["status"], "error": entry["error"]})
+
+        return {
+            "job_id": manifest["job_id"],
+            "shards_total": len(manifest["shards"]),
+            "shards_finished": len(finished),
+            "shards_failed": failed,
+            "models": {
+                name: {
+                    "games": aggregate.games,
+                    "metrics": aggregate.to_metrics().to_dict(),
+                    "aggregate": aggregate.to_dict(),
+                }
+                for name, aggregate in aggregates.items()
+            },
+        }
+
+
+class EvaluationWorker:
+    """Claims shards from the shared store and plays their games."""
+
+    def __init__(
+        self,
+        store: QueueBackend,
+        output_dir: Path = DISTRIBUTED_DIR,
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        visibility_timeout: float = VISIBILITY_TIMEOUT,
+        max_attempts: int = 3,
+    ):
+        self.store = store
+        self.output_dir = Path(output_dir)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = max(1, concurrency)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.stats = {"shards_completed": 0, "shards_failed": 0, "games_played": 0}
+        self._runners: Dict[str, GameRunner] = {}
+
+    async def run(self, stop: Optional[asyncio.Event] = None, exit_when_idle: bool = False):
+        """Process shards until ``stop`` is set (or the store is drained)."""
+        stop = stop or asyncio.Event()
+        slots = [
+            asyncio.create_task(self._slot(f"{self.worker_id}-{index}", stop, exit_when_idle))
+            for index in range(self.concurrency)
+        ]
+        stopped = asyncio.create_task(stop.wait())
+        pending = set(slots)
+        try:
+            while pending and not stop.is_set():
+                done, pending = await asyncio.wait(pending | {stopped}, return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(stopped)
+                for slot in done - {stopped}:
+                    if slot.exception() is not None:
+                        raise slot.exception()
+        finally:
+            stopped.cancel()
+            # Slots hand their leases back when cancelled
+            for slot in slots:
+                slot.cancel()
+            await asyncio.gather(*slots, return_exceptions=True)
+
+    async def _slot(self, slot_id: str, stop: asyncio.Event, exit_when_idle: bool):
+        while not stop.is_set():
+            lease = await call_backend(self.store, "claim", slot_id, self.visibility_timeout)
+            if lease is None:
+                if exit_when_idle:
+                    return
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            await self._process(lease)
+
+    async def _process(self, lease: Lease):
+        shard = Shard.from_dict(lease.payload)
+        try:
+            async with keep_lease(self.store, lease, self.visibility_timeout) as state:
+                result = await self.play_shard(shard)
+        except asyncio.CancelledError:
+            await asyncio.shield(call_backend(self.store, "release", lease))
+            raise
+        except Exception as e:
+            logger.error(f"Shard {shard.shard_id} failed on {lease.worker_id}: {e}", exc_info=True)
+            self.stats["shards_failed"] += 1
+            await call_backend(self.store, "fail", lease, str(e), lease.attempts < self.max_attempts)
+            return
+
+        if state["lost"] or not await call_backend(self.store, "ack", lease, result):
+            # Another worker has taken the shard over and will report it
+            logger.warning(f"Lease on shard {shard.shard_id} lost; result dropped")
+            return
+        self.stats["shards_completed"] += 1
+
+    def _runner(self, model: Dict[str, Any]) -> GameRunner:
+        runner = self._runners.get(model["name"])
+        if runner is None:
+            runner = self._runners[model["name"]] = GameRunner(ModelConfig(**model))
+        return runner
+
+    async def play_shard(self, shard: Shard) -> Dict[str, Any]:
+        """Play every game of a shard; returns its aggregate and transcript files."""
+        runner = self._runner(shard.model)
+        transcript_dir = self.output_dir / shard.job_id / "transcripts" / _slug(shard.model_name)
+        transcript_dir.mkdir(parents=True, exist_ok=True)
+
+        aggregate = MetricsAggregate()
+        files = []
+        started = time.monotonic()
+        for task_dict in shard.tasks:
+            task = Task.from_dict(task_dict)
+            transcript = await runner.run_game(task, shard.max_moves, shard.prompt_format)
+            aggregate.merge(MetricsAggregate.from_transcript(transcript))
+            path = storage_codec.write_json_file(
+                transcript_dir / f"{_slug(task.task_id)}.json", transcript_to_dict(transcript)
+            )
+            files.append(str(path))
+            self.stats["games_played"] += 1
+
+        return {
+            "aggregate": aggregate.to_dict(),
+            "model": shard.model_name,
+            "transcripts": files,
+            "worker_id": self.worker_id,
+            "seconds": time.monotonic() - started,
+        }
@@ -1,39 +1,100 @@
 """Main evaluation engine orchestrating the benchmark process."""
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime, timezone
 import json
 from pathlib import Path
 
-from src.core.types import ModelConfig, Task, EvaluationMetrics, TaskType
+from src.core.types import ModelConfig, Task, EvaluationMetrics, TaskType, GameTranscript
 from src.core.config import settings
 from src.core.logging_config import get_logger
+from src.core.storage_codec import codec as storage_codec
 from .runner import GameRunner
+from .checkpoint import JobCheckpoint
 from .metrics import MetricsCalculator
 from .advanced_metrics import AdvancedMetricsCalculator, AdvancedMetrics
 from .reasoning_judge import ReasoningJudge
 from .statistical_analysis import StatisticalAnalyzer
 from .episode_logger import EpisodeLogger, MineBenchFormatter
+from .columnar_store import ColumnarExporter, HAS_PYARROW
 
 logger = get_logger("evaluation.engine")
 
 
+def transcript_to_dict(transcript: GameTranscript) -> Dict[str, Any]:
+    """Convert a transcript to the serializable form saved with results."""
+    return {
+        "game_id": transcript.game_id,
+        "task_id": transcript.task_id,
+        "model_name": transcript.model_name,
+        "start_time": transcript.start_time.isoformat(),
+        "end_time": transcript.end_time.isoformat(),
+        "final_status": transcript.final_state.status.value,
+        "num_moves": len(transcript.moves),
+        "moves": [
+            {
+                "action": move.action.to_string(),
+                "timestamp": move.timestamp.isoformat(),
+                "was_valid": move.was_valid,
+                "reasoning": move.model_reasoning,
+                "error": move.error_message,
+                "prompt_sent": move.prompt_sent,
+                "full_response": move.full_response,
+                "tokens_used": move.tokens_used,
+            }
+            for move in transcript.moves
+        ],
+    }
+
+
 class EvaluationEngine:
     """Orchestrates model evaluation on benchmark tasks."""
     
-    def __init__(self, results_dir: Optional[Path] = None):
+    def __init__(self, results_dir: Optional[Path] = None, columnar_dir: Optional[Path] = None):
         """
         Initialize evaluation engine.
         
         Args:
             results_dir: Directory to save results (optional)
+            columnar_dir: Directory for the Parquet moves/games datasets (optional)
         """
         self.results_dir = results_dir or Path("data/results")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         self.metrics_calculator = MetricsCalculator()
         self.advanced_calculator = AdvancedMetricsCalculator()
         self.episode_logger = EpisodeLogger()
+        self.columnar_exporter = (
+            ColumnarExporter(columnar_dir or Path("data/columnar")) if HAS_PYARROW else None
+        )
+    
+    async def stream_games(
+        self,
+        model_config: ModelConfig,
+        tasks: List[Task],
+        max_moves: int = 500,
+        prompt_format: str = "standard",
+        parallel_games: int = 1,
+        verbose: bool = False,
+        stats: Optional[Dict[str, float]] = None,
+        checkpoint: Optional[JobCheckpoint] = None,
+    ) -> AsyncIterator[Tuple[int, GameTranscript]]:
+        """
+        Play the tasks and yield each transcript as its game finishes.
+        
+        Games run on ``parallel_games`` slots that are refilled as soon as a
+        game ends, so callers can report or store results while the rest
+        are still playing. With a ``checkpoint``, games finished in an
+        earlier run come from its log instead of being played again.
+        
+        Yields:
+            (task index, game transcript) in completion order
+        """
+        runner = GameRunner(model_config)
+        async for index, transcript in runner.iter_games(
+            tasks, max_moves, prompt_format, parallel_games, verbose, stats, checkpoint
+        ):
+            yield index, transcript
     
     async def evaluate_model(
         self,
@@ -46,6 +107,7 @@ class EvaluationEngine:
         verbose: bool = False,
         use_reasoning_judge: bool = False,
         calculate_advanced_metrics: bool = True,
+        checkpoint: Optional[JobCheckpoint] = None,
     ) -> Dict[str, Any]:
         """
         Evaluate a model on a set of tasks.
@@ -60,6 +122,8 @@ class EvaluationEngine:
             verbose: Whether to print progress
             use_reasoning_judge: Whether to use LLM judge for reasoning
             calculate_advanced_metrics: Whether to calculate advanced metrics
+            checkpoint: Job log that finished games and in-flight moves are
+                written to; games it already holds are not played again
         
         Returns:
             Evaluation results dictionary
@@ -70,17 +134,14 @@ class EvaluationEngine:
         
         start_time = datetime.now(timezone.utc)
         
-        # Create game runner
-        runner = GameRunner(model_config)
-        
-        # Run games
-        transcripts = await runner.run_multiple_games(
-            tasks=tasks,
-            max_moves=max_moves,
-            prompt_format=prompt_format,
-            parallel=parallel_games,
-            verbose=verbose,
-        )
+        # Run games, collected back into task order
+        transcripts: List[Optional[GameTranscript]] = [None] * len(tasks)
+        pool_stats: Dict[str, float] = {}
+        async for index, transcript in self.stream_games(
+            model_config, tasks, max_moves, prompt_format, parallel_games, verbose, pool_stats,
+            checkpoint
+        ):
+            transcripts[index] = transcript
         
         end_time = datetime.now(timezone.utc)
         duration = (end_time - start_time).total_seconds()
@@ -143,6 +204,9 @@ class EvaluationEngine:
                 "max_moves": max_moves,
                 "prompt_format": prompt_format,
                 "parallel_games": parallel_games,
+                "slot_utilization": pool_stats.get("utilization", 0.0),
+                "job_id": checkpoint.job_id if checkpoint else None,
+                "resumed_games": pool_stats.get("resumed_games", 0),
                 "start_time": start_time.isoformat(),
                 "end_time": end_time.isoformat(),
                 "duration_seconds": duration,
@@ -192,6 +256,10 @@ class EvaluationEngine:
         
         if save_results:
             self._save_results(results, model_config.name, transcripts)
+            self._export_columnar(model_config, transcripts)
+        
+        if checkpoint is not None:
+            checkpoint.update_status("completed", games_finished=len(transcripts))
         
         if verbose:
             self._print_summary(results)
@@ -247,38 +315,23 @@ class EvaluationEngine:
         with open(summary_file, "w") as f:
             json.dump(results, f, indent=2)
         
-        # Save transcripts (in a separate file due to size)
+        # Save transcripts (in a separate, compressed file due to size)
         transcripts_file = self.results_dir / f"{model_name}_{timestamp}_transcripts.json"
-        transcript_data = []
-        
-        for transcript in transcripts:
-            # Convert transcript to serializable format
-            t_dict = {
-                "game_id": transcript.game_id,
-                "task_id": transcript.task_id,
-                "model_name": transcript.model_name,
-                "start_time": transcript.start_time.isoformat(),
-                "end_time": transcript.end_time.isoformat(),
-                "final_status": transcript.final_state.status.value,
-                "num_moves": len(transcript.moves),
-                "moves": [
-                    {
-                        "action": move.action.to_string(),
-                        "timestamp": move.timestamp.isoformat(),
-                        "was_valid": move.was_valid,
-                        "reasoning": move.model_reasoning,
-                        "error": move.error_message,
-                        "prompt_sent": move.prompt_sent,
-                        "full_response": move.full_response,
-                        "tokens_used": move.tokens_used,
-                    }
-                    for move in transcript.moves
-                ],
-            }
-            transcript_data.append(t_dict)
-        
-        with open(transcripts_file, "w") as f:
-            json.dump(transcript_data, f, indent=2)
+        transcript_data = [transcript_to_dict(transcript) for transcript in transcripts]
+        storage_codec.write_json_file(transcripts_file, transcript_data)
+    
+    def _export_columnar(self, model_config: ModelConfig, transcripts: List[Any]) -> None:
+        """Append transcripts to the Parquet analytics datasets."""
+        if self.columnar_exporter is None or not transcripts:
+            return
+        
+        try:
+            self.columnar_exporter.export_transcripts(
+                transcripts, model_config.name, model_provider=model_config.provider
+            )
+        except Exception as e:
+            # The JSON results remain the source of truth
+            logger.warning(f"Columnar export failed for {model_config.name}: {e}")
     
     def _print_summary(self, results: Dict[str, Any]) -> None:
         """Print evaluation summary."""
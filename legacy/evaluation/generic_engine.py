@@ -6,7 +6,7 @@ from typing import Dict, Any, List, Optional, Tuple
 import uuid
 import logging
 
-from src.games.base import BaseGame, GameInstance, GameState, GameAction, GameResult, GameConfig
+from src.games.base import BaseGame, GameInstance, GameState, GameAction, GameResult, GameConfig, GameMode
 from src.games.registry import game_registry
 from src.scoring.framework import ScoringProfile, ScoringCalculator, CompetitionScoring
 from src.models.base import BaseModel
@@ -239,7 +239,8 @@ class GenericEvaluationEngine:
                         "move_number": move_count,
                         "error": str(e)
                     })
-                break
+                # A game cut short by an error has no meaningful score
+                raise
         
         # Get final result
         return game_instance.get_result(current_state)
@@ -272,19 +273,22 @@ class GenericEvaluationEngine:
         else:
             function_schema = None
         
-        # Call AI model
-        response = await ai_model.get_completion(
-            prompt=prompt,
-            function_schema=function_schema,
-            temperature=0.7 if game_config.mode == GameMode.CREATIVE else 0.1
+        # Call AI model (game tools replace the default Minesweeper ones)
+        response = await ai_model.generate(
+            prompt,
+            temperature=0.7 if game_config.mode == GameMode.CREATIVE else 0.1,
+            game_tools=function_schema,
+            use_game_functions=function_schema is not None,
+            use_functions=False,
+            use_tools=False
         )
         
         # Parse response
-        if ai_interface and isinstance(response, dict):
-            action = ai_interface.parse_ai_response(response)
+        if ai_interface and response.function_call:
+            action = ai_interface.parse_ai_response(response.function_call)
         else:
             # Fallback parsing - this would need to be game-specific
-            action = self._parse_text_response(response, state.possible_actions)
+            action = self._parse_text_response(response.content or "", state.possible_actions)
         
         return action
     
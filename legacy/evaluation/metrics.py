@@ -183,6 +183,77 @@ class MetricsCalculator:
         # A more sophisticated version would evaluate reasoning quality
         return moves_with_reasoning / total_moves
     
+    def calculate_metrics_from_columns(
+        self,
+        games: Dict[str, Any],
+        moves: Optional[Dict[str, Any]] = None,
+    ) -> EvaluationMetrics:
+        """
+        Calculate aggregate metrics from columnar game data.
+
+        Mirrors calculate_metrics, but works on arrays loaded by
+        ColumnarReader so large result sets never become transcript objects.
+
+        Args:
+            games: Column name -> array for the games table (needs final_status,
+                num_moves, valid_moves, board_rows, board_cols, num_mines,
+                flags_placed, correct_flags, cells_revealed)
+            moves: Optional column name -> array for the moves table (reasoning)
+
+        Returns:
+            Evaluation metrics
+        """
+        status = np.asarray(games.get("final_status", []), dtype=object)
+        if status.size == 0:
+            return self._empty_metrics()
+
+        num_moves = np.asarray(games["num_moves"], dtype=float)
+        valid_moves = np.asarray(games["valid_moves"], dtype=float)
+        flags_placed = np.nan_to_num(np.asarray(games["flags_placed"], dtype=float))
+        correct_flags = np.nan_to_num(np.asarray(games["correct_flags"], dtype=float))
+        num_mines = np.nan_to_num(np.asarray(games["num_mines"], dtype=float))
+
+        won = status == GameStatus.WON.value
+        lost = status == GameStatus.LOST.value
+        scored = status != GameStatus.ERROR.value
+
+        win_rate = float(won.sum() / scored.sum()) if scored.any() else 0.0
+        total_moves = num_moves.sum()
+        valid_move_rate = float(valid_moves.sum() / total_moves) if total_moves > 0 else 0.0
+        precision = float(correct_flags.sum() / flags_placed.sum()) if flags_placed.sum() > 0 else 0.0
+        recall = float(correct_flags.sum() / num_mines.sum()) if num_mines.sum() > 0 else 0.0
+
+        avg_moves_win = float(num_moves[won].mean()) if won.any() else None
+        avg_moves_loss = float(num_moves[lost].mean()) if lost.any() else None
+
+        non_mine_cells = (
+            np.asarray(games["board_rows"], dtype=float)
+            * np.asarray(games["board_cols"], dtype=float)
+            - num_mines
+        )
+        coverage_mask = lost & (non_mine_cells > 0)
+        board_coverage = (
+            float((np.asarray(games["cells_revealed"], dtype=float)[coverage_mask]
+                   / non_mine_cells[coverage_mask]).mean())
+            if coverage_mask.any() else 0.0
+        )
+
+        reasoning_score = None
+        if moves is not None and len(moves.get("reasoning", [])) > 0:
+            lengths = np.array([len(r) if r else 0 for r in moves["reasoning"]])
+            reasoning_score = float((lengths > 20).mean())
+
+        return EvaluationMetrics(
+            win_rate=win_rate,
+            valid_move_rate=valid_move_rate,
+            mine_identification_precision=precision,
+            mine_identification_recall=recall,
+            average_moves_to_win=avg_moves_win,
+            average_moves_to_loss=avg_moves_loss,
+            board_coverage_on_loss=board_coverage,
+            reasoning_quality_score=reasoning_score,
+        )
+
     def calculate_per_game_metrics(
         self, transcript: GameTranscript
     ) -> Dict[str, Any]:
@@ -234,4 +305,110 @@ class MetricsCalculator:
             "flag_recall": flag_recall,
             "board_coverage": board_coverage,
             "duration_seconds": transcript.duration_seconds,
-        }
\ No newline at end of file
+        }
+
+
+@dataclass
+class MetricsAggregate:
+    """
+    Running totals behind ``EvaluationMetrics`` that can be merged.
+    
+    Every metric is kept as sums and counts, so partial results from
+    different workers combine exactly: merging the aggregates of two sets
+    of games gives the same metrics as calculate_metrics on all of them.
+    """
+    games: int = 0
+    scored_games: int = 0  # games that did not end in a technical error
+    wins: int = 0
+    losses: int = 0
+    total_moves: int = 0
+    valid_moves: int = 0
+    reasoned_moves: int = 0
+    flags_placed: int = 0
+    correct_flags: int = 0
+    total_mines: int = 0
+    moves_to_win: int = 0
+    moves_to_loss: int = 0
+    loss_coverage_sum: float = 0.0
+    loss_coverage_games: int = 0
+    duration_seconds: float = 0.0
+    
+    @classmethod
+    def from_transcript(cls, transcript: GameTranscript) -> "MetricsAggregate":
+        """Aggregate of a single game."""
+        state = transcript.final_state
+        mine_positions = set(state.mine_positions)
+        flagged_positions = set(state.flagged_cells)
+        moves = len(transcript.moves)
+        won = state.status == GameStatus.WON
+        lost = state.status == GameStatus.LOST
+        
+        aggregate = cls(
+            games=1,
+            scored_games=int(state.status != GameStatus.ERROR),
+            wins=int(won),
+            losses=int(lost),
+            total_moves=moves,
+            valid_moves=sum(1 for move in transcript.moves if move.was_valid),
+            reasoned_moves=sum(
+                1 for move in transcript.moves
+                if move.model_reasoning and len(move.model_reasoning) > 20
+            ),
+            flags_placed=len(flagged_positions),
+            correct_flags=len(mine_positions & flagged_positions),
+            total_mines=len(mine_positions),
+            moves_to_win=moves if won else 0,
+            moves_to_loss=moves if lost else 0,
+            duration_seconds=transcript.duration_seconds,
+        )
+        
+        non_mine_cells = state.board_rows * state.board_cols - len(mine_positions)
+        if lost and non_mine_cells > 0:
+            aggregate.loss_coverage_sum = len(state.revealed_cells) / non_mine_cells
+            aggregate.loss_coverage_games = 1
+        return aggregate
+    
+    @classmethod
+    def from_transcripts(cls, transcripts: List[GameTranscript]) -> "MetricsAggregate":
+        """Aggregate of several games."""
+        aggregate = cls()
+        for transcript in transcripts:
+            aggregate.merge(cls.from_transcript(transcript))
+        return aggregate
+    
+    def merge(self, other: "MetricsAggregate") -> "MetricsAggregate":
+        """Add another aggregate's totals into this one."""
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+    
+    def to_metrics(self) -> EvaluationMetrics:
+        """Evaluation metrics of all games merged so far."""
+        return EvaluationMetrics(
+            win_rate=self.wins / self.scored_games if self.scored_games else 0.0,
+            valid_move_rate=self.valid_moves / self.total_moves if self.total_moves else 0.0,
+            mine_identification_precision=(
+                self.correct_flags / self.flags_placed if self.flags_placed else 0.0
+            ),
+            mine_identification_recall=(
+                self.correct_flags / self.total_mines if self.total_mines else 0.0
+            ),
+            average_moves_to_win=self.moves_to_win / self.wins if self.wins else None,
+            average_moves_to_loss=self.moves_to_loss / self.losses if self.losses else None,
+            board_coverage_on_loss=(
+                self.loss_coverage_sum / self.loss_coverage_games
+                if self.loss_coverage_games else 0.0
+            ),
+            reasoning_quality_score=(
+                self.reasoned_moves / self.total_moves if self.total_moves else None
+            ),
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert totals to a dictionary."""
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricsAggregate":
+        """Rebuild totals written by to_dict."""
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
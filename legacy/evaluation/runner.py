@@ -1,7 +1,8 @@
 """Game runner for model evaluation."""
 
 import asyncio
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Sequence, Tuple, TypeVar
 from datetime import datetime, timezone
 
 from src.core.types import (
@@ -11,13 +12,90 @@ from src.core.exceptions import (
     InvalidModelResponseError, GameAlreadyFinishedError,
     ModelTimeoutError
 )
-from src.games.tilts import TiltsGame
+from .checkpoint import GameCheckpoint, JobCheckpoint, build_game, new_seed
 from src.models import create_model, BaseModel
 from src.core.logging_config import get_logger
 
 # Initialize logger
 logger = get_logger("evaluation.runner")
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def run_bounded(
+    items: Sequence[T],
+    worker: Callable[[int, T], Awaitable[R]],
+    limit: int,
+    return_exceptions: bool = False,
+    stats: Optional[Dict[str, float]] = None,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Run ``worker(index, item)`` for every item with at most ``limit`` running.
+    
+    A slot is refilled as soon as any run finishes, so one slow game never
+    holds the others back the way fixed batches do. Results are yielded as
+    ``(index, result)`` in completion order. With ``return_exceptions`` a
+    failed run yields its exception instead of raising it. Work still running
+    is cancelled when the iterator is closed early (use ``contextlib.aclosing``
+    when breaking out of the loop).
+    
+    Args:
+        items: Work items, started in order
+        worker: Coroutine function called with the index and the item
+        limit: Maximum number of runs in flight
+        return_exceptions: Yield exceptions instead of raising them
+        stats: Optional dict filled with ``busy_seconds`` (time runs were in
+            flight, from start to completion), ``wall_seconds`` and
+            ``utilization`` (busy time over ``limit`` slots)
+    """
+    limit = max(1, limit)
+    pending: Dict[asyncio.Task, int] = {}
+    started: Dict[asyncio.Task, float] = {}
+    finished: Dict[asyncio.Task, float] = {}
+    remaining = iter(enumerate(items))
+    busy = 0.0
+    begin = time.monotonic()
+    
+    def start_next() -> None:
+        for index, item in remaining:
+            task = asyncio.create_task(worker(index, item))
+            pending[task] = index
+            started[task] = time.monotonic()
+            # Stamped by the loop when the run ends, even while the caller is
+            # still busy with an earlier result
+            task.add_done_callback(lambda done: finished.setdefault(done, time.monotonic()))
+            return
+    
+    try:
+        for _ in range(limit):
+            start_next()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                busy += finished.pop(task, time.monotonic()) - started.pop(task)
+                # Refill before handing the result over, so the slot keeps
+                # working while the caller processes it
+                start_next()
+                error = task.exception()
+                if error is None:
+                    yield index, task.result()
+                elif return_exceptions:
+                    yield index, error
+                else:
+                    raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if stats is not None:
+            wall = time.monotonic() - begin
+            stats["busy_seconds"] = busy
+            stats["wall_seconds"] = wall
+            stats["utilization"] = busy / (wall * limit) if wall > 0 else 0.0
+
 
 class GameRunner:
     """Runs individual games with models."""
@@ -38,6 +116,7 @@ class GameRunner:
         max_moves: int = 500,
         prompt_format: str = "standard",
         verbose: bool = False,
+        checkpoint: Optional[GameCheckpoint] = None,
     ) -> GameTranscript:
         """
         Run a single game with the model.
@@ -47,39 +126,39 @@ class GameRunner:
             max_moves: Maximum moves allowed
             prompt_format: Format for model prompts
             verbose: Whether to print progress
+            checkpoint: Move log to record the game in; a started log is
+                replayed first and the game continues from its last move
         
         Returns:
             Game transcript
         """
-        # Extract board configuration
-        board_config = task.board_config
-        game = TiltsGame(
-            rows=board_config.get("rows", 16),
-            cols=board_config.get("cols", 30),
-            mines=board_config.get("mines", 99),
-            seed=board_config.get("seed"),
-            task_id=task.task_id,
-            model_name=self.model_config.name,
-        )
+        move_count = 0
+        consecutive_errors = 0
+        
+        if checkpoint is not None and checkpoint.started:
+            # Resume an interrupted game: replay its moves, then carry on
+            game, consecutive_errors = checkpoint.restore(task, self.model_config.name)
+            move_count = checkpoint.attempts
+            logger.info(
+                f"Resumed game {game.game_id} at move {move_count}",
+                extra={"game_id": game.game_id, "model_name": self.model_config.name}
+            )
+        else:
+            seed = task.board_config.get("seed")
+            if checkpoint is not None and seed is None:
+                seed = new_seed()
+            game = build_game(task, self.model_config.name, seed)
+            if checkpoint is not None:
+                checkpoint.start(game, seed)
         
         if verbose:
             print(f"Starting game {game.game_id} with {self.model_config.name}")
             print(f"Board: {game.board.rows}x{game.board.cols}, {game.board.total_mines} mines")
         
-        # Make first move if specified
-        if "first_move" in board_config:
-            first_pos = board_config["first_move"]
-            first_action = Action(
-                ActionType.REVEAL,
-                Position(first_pos["row"], first_pos["col"])
-            )
-            game.make_move(first_action)
-        
         # Game loop
-        move_count = 0
-        consecutive_errors = 0
-        
         while game.status.value == "in_progress" and move_count < max_moves:
+            if checkpoint is not None:
+                checkpoint.sync(game, consecutive_errors)
             move_count += 1
             
             # Debug logging
@@ -299,10 +378,14 @@ class GameRunner:
                 }
                 
                 # Record the failed attempt
+                moves_before = len(game.moves)
                 try:
                     game.make_move(dummy_action, ai_details=ai_details)
                 except:
                     pass  # Ignore errors when recording failed moves
+                if checkpoint is not None and len(game.moves) == moves_before:
+                    # sync() only logs game moves; keep the attempt for resuming
+                    checkpoint.record_failure(consecutive_errors)
                 
                 if consecutive_errors >= 3:
                     if verbose:
@@ -336,6 +419,9 @@ class GameRunner:
             }
         )
         
+        if checkpoint is not None:
+            checkpoint.sync(game, consecutive_errors)
+        
         # Ensure game has end time
         if not game.end_time:
             game.end_time = datetime.now(timezone.utc)
@@ -364,6 +450,69 @@ class GameRunner:
         
         return transcript
     
+    async def iter_games(
+        self,
+        tasks: list[Task],
+        max_moves: int = 500,
+        prompt_format: str = "standard",
+        parallel: int = 1,
+        verbose: bool = False,
+        stats: Optional[Dict[str, float]] = None,
+        checkpoint: Optional[JobCheckpoint] = None,
+    ) -> AsyncIterator[Tuple[int, GameTranscript]]:
+        """
+        Run multiple games, yielding each transcript as its game finishes.
+        
+        Up to ``parallel`` games run at once and a new game starts whenever
+        one ends.
+        
+        Args:
+            tasks: List of tasks to run
+            max_moves: Maximum moves per game
+            prompt_format: Format for model prompts
+            parallel: Number of games to run in parallel
+            verbose: Whether to print progress
+            stats: Optional dict that receives slot utilization
+            checkpoint: Job log; games it has finished are yielded from the
+                log first, interrupted ones resume from their last move
+        
+        Yields:
+            (task index, game transcript) in completion order
+        """
+        # Per-move output only makes sense when games run one at a time
+        verbose_games = verbose and parallel <= 1
+        
+        finished = checkpoint.load_transcripts(tasks, self.model_config.name) if checkpoint else {}
+        if stats is not None:
+            stats["resumed_games"] = len(finished)
+        for index in sorted(finished):
+            yield index, finished[index]
+        
+        async def play(_: int, item: Tuple[int, Task]) -> Tuple[int, GameTranscript]:
+            index, task = item
+            if verbose_games:
+                print(f"\nGame {index + 1}/{len(tasks)}")
+            if checkpoint is None:
+                return index, await self.run_game(task, max_moves, prompt_format, verbose_games)
+            
+            game_checkpoint = checkpoint.game(index)
+            try:
+                transcript = await self.run_game(
+                    task, max_moves, prompt_format, verbose_games, game_checkpoint
+                )
+                checkpoint.complete(index, game_checkpoint, transcript)
+            finally:
+                game_checkpoint.close()
+            return index, transcript
+        
+        remaining = [(index, task) for index, task in enumerate(tasks) if index not in finished]
+        completed = len(finished)
+        async for _, (index, transcript) in run_bounded(remaining, play, parallel, stats=stats):
+            completed += 1
+            if verbose and not verbose_games:
+                print(f"Game {index + 1} finished ({completed}/{len(tasks)}): {transcript.final_state.status.value}")
+            yield index, transcript
+    
     async def run_multiple_games(
         self,
         tasks: list[Task],
@@ -383,32 +532,18 @@ class GameRunner:
             verbose: Whether to print progress
         
         Returns:
-            List of game transcripts
+            List of game transcripts, in task order
         """
-        if parallel <= 1:
-            # Run sequentially
-            transcripts = []
-            for i, task in enumerate(tasks):
-                if verbose:
-                    print(f"\nGame {i + 1}/{len(tasks)}")
-                transcript = await self.run_game(
-                    task, max_moves, prompt_format, verbose
-                )
-                transcripts.append(transcript)
-            return transcripts
+        transcripts: list[Optional[GameTranscript]] = [None] * len(tasks)
+        stats: Dict[str, float] = {}
+        async for index, transcript in self.iter_games(
+            tasks, max_moves, prompt_format, parallel, verbose, stats
+        ):
+            transcripts[index] = transcript
         
-        # Run in parallel batches
-        transcripts = []
-        for i in range(0, len(tasks), parallel):
-            batch = tasks[i:i + parallel]
-            if verbose:
-                print(f"\nRunning batch {i // parallel + 1}/{(len(tasks) + parallel - 1) // parallel}")
-            
-            batch_tasks = [
-                self.run_game(task, max_moves, prompt_format, False)
-                for task in batch
-            ]
-            batch_results = await asyncio.gather(*batch_tasks)
-            transcripts.extend(batch_results)
-        
-        return transcripts
\ No newline at end of file
+        if parallel > 1:
+            logger.info(
+                f"Ran {len(tasks)} games on {parallel} slots, "
+                f"slot utilization {stats.get('utilization', 0.0):.0%}"
+            )
+        return transcripts
@@ -2,7 +2,7 @@
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 
 from src.core.types import ModelConfig, Task, GameTranscript, Action, ActionType, Position
 from src.core.exceptions import (
@@ -13,6 +13,7 @@ from src.core.logging_config import get_logger
 from src.games.tilts import TiltsGame
 from src.games.registry import GameRegistry
 from src.models import create_model
+from src.evaluation.runner import run_bounded
 from src.api.event_streaming import (
     publish_game_started, publish_move_thinking, publish_move_reasoning,
     publish_move_completed, publish_game_completed, publish_metrics_update,
@@ -21,6 +22,9 @@ from src.api.event_streaming import (
 
 logger = get_logger("evaluation.streaming_runner")
 
+# Pause between games when they run one at a time, so viewers can follow along
+GAME_DELAY_SECONDS = 3.0
+
 
 class StreamingGameRunner:
     """Runs games with live event streaming."""
@@ -468,6 +472,38 @@ class StreamingGameRunner:
         
         return game.get_transcript()
     
+    async def iter_games(
+        self,
+        tasks: List[Task],
+        job_id: str,
+        max_moves: int = 500,
+        prompt_format: str = "auto",
+        verbose: bool = False,
+        game_name: str = "minesweeper",
+        parallel: int = 1,
+        stats: Optional[Dict[str, float]] = None,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Run games with live streaming, yielding each one as it finishes.
+        
+        Up to ``parallel`` games run at once and a new game starts as soon as
+        one ends. A game that fails yields its exception instead of a
+        transcript, so the other games carry on.
+        
+        Yields:
+            (game number, transcript or exception) in completion order
+        """
+        async def play(index: int, task: Task) -> GameTranscript:
+            if parallel <= 1 and index > 0:
+                await asyncio.sleep(GAME_DELAY_SECONDS)
+            return await self.run_single_game(
+                task, job_id, index + 1,
+                max_moves, prompt_format, verbose, game_name
+            )
+        
+        async for index, result in run_bounded(tasks, play, parallel, return_exceptions=True, stats=stats):
+            yield index + 1, result
+    
     async def run_multiple_games(
         self,
         tasks: List[Task],
@@ -475,7 +511,8 @@ class StreamingGameRunner:
         max_moves: int = 500,
         prompt_format: str = "auto",
         verbose: bool = False,
-        game_name: str = "minesweeper"
+        game_name: str = "minesweeper",
+        parallel: int = 1
     ) -> Dict[str, Any]:
         """
         Run multiple games with live streaming.
@@ -486,54 +523,31 @@ class StreamingGameRunner:
             max_moves: Maximum moves per game
             prompt_format: Prompt format to use
             verbose: Whether to print verbose output
+            parallel: Number of games to run at once
             
         Returns:
             Dictionary with results and metrics
         """
-        transcripts = []
+        finished = {}
         total_games = len(tasks)
+        completed = 0
         games_won = 0
         total_moves = 0
+        stats: Dict[str, float] = {}
         
         # Publish session started
         await publish_event(job_id, EventType.STATUS_UPDATE, {
             "status": "started",
             "total_games": total_games,
+            "parallel_games": parallel,
             "message": f"Starting {total_games} games with {self.model_config.name}"
         })
         
-        for i, task in enumerate(tasks):
-            game_num = i + 1
-            
-            try:
-                # Run single game
-                transcript = await self.run_single_game(
-                    task, job_id, game_num,
-                    max_moves, prompt_format, verbose, game_name
-                )
-                
-                transcripts.append(transcript)
-                
-                # Update metrics
-                if transcript.final_state.status.value == "won":
-                    games_won += 1
-                total_moves += len(transcript.moves)
-                
-                # Publish metrics update
-                win_rate = games_won / game_num
-                avg_moves = total_moves / game_num
-                
-                await publish_metrics_update(
-                    job_id, game_num, total_games,
-                    win_rate, avg_moves
-                )
-                
-                # Add delay between games (except after last game)
-                if game_num < total_games:
-                    await asyncio.sleep(3.0)  # 3 second delay
-                
-            except Exception as e:
-                logger.error(f"Failed to complete game {game_num}", exc_info=True, extra={
+        async for game_num, result in self.iter_games(
+            tasks, job_id, max_moves, prompt_format, verbose, game_name, parallel, stats
+        ):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to complete game {game_num}", exc_info=result, extra={
                     "model_name": self.model_config.name,
                     "model_provider": self.model_config.provider,
                     "game_num": game_num
@@ -541,8 +555,32 @@ class StreamingGameRunner:
                 await publish_event(job_id, EventType.ERROR, {
                     "game_num": game_num,
                     "error": "Game failed",
-                    "message": str(e)
+                    "message": str(result)
                 })
+                continue
+            
+            finished[game_num] = result
+            completed += 1
+            
+            # Update metrics over the games finished so far
+            if result.final_state.status.value == "won":
+                games_won += 1
+            total_moves += len(result.moves)
+            
+            await publish_metrics_update(
+                job_id, completed, total_games,
+                games_won / completed, total_moves / completed
+            )
+        
+        if parallel > 1:
+            logger.info(
+                f"Ran {total_games} games on {parallel} slots, "
+                f"slot utilization {stats.get('utilization', 0.0):.0%}",
+                extra={"job_id": job_id, "model_name": self.model_config.name}
+            )
+        
+        # Keep transcripts in game order regardless of finishing order
+        transcripts = [finished[num] for num in sorted(finished)]
         
         # Calculate final metrics
         from src.evaluation.metrics import MetricsCalculator
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Run evaluation workers that pull from a shared evaluation queue.
+
+Starts one process per core (or --processes), each running --workers
+concurrent workers against the SQLite or Redis Streams backend. Run the
+script on several nodes against the same Redis to scale out during large
+events. Workers lease items and keep extending the lease while they work;
+if a process dies, its items are picked up by the others once the
+visibility timeout (EVALUATION_QUEUE_VISIBILITY_TIMEOUT) has passed.
+
+Usage:
+    EVALUATION_QUEUE_BACKEND=redis REDIS_URL=redis://queue:6379 \\
+        python scripts/run_queue_workers.py --processes 8 --workers 4
+
+    python scripts/run_queue_workers.py --backend sqlite \\
+        --processor mypackage.evaluation:evaluate_item
+"""
+
+import argparse
+import asyncio
+import importlib
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.competition.realtime_queue import RealTimeEvaluationQueue, create_queue_backend, QUEUE_BACKEND
+
+
+def load_processor(path):
+    """Import ``module:function``; None keeps the queue's built-in evaluation."""
+    if not path:
+        return None
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+async def serve(args, index):
+    queue = RealTimeEvaluationQueue(
+        max_workers=args.workers,
+        backend=create_queue_backend(args.backend),
+        processor=load_processor(args.processor)
+    )
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    workers = asyncio.create_task(queue.run_workers(prefix, args.workers))
+    print(f"process {index}: {args.workers} workers ({prefix}) on {type(queue.backend).__name__}")
+    await stop.wait()
+
+    # Hand leases back so other workers pick the items up right away
+    await queue.shutdown()
+    workers.cancel()
+    summary = queue.queue_metrics.get_summary()
+    print(f"process {index}: completed {summary['completions_total']}, failed {summary['failures_total']}")
+
+
+def run_process(args, index):
+    asyncio.run(serve(args, index))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default=QUEUE_BACKEND, choices=["sqlite", "redis"],
+                        help="Shared queue backend (default: EVALUATION_QUEUE_BACKEND)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent workers per process")
+    parser.add_argument("--processor", default=None,
+                        help="Evaluation coroutine as module:function, called with each QueueItem")
+    args = parser.parse_args()
+    if args.backend not in ("sqlite", "redis"):
+        parser.error("worker processes need a shared backend: set --backend sqlite or redis")
+
+    processes = [
+        multiprocessing.Process(target=run_process, args=(args, index), name=f"queue-worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        # A supervisor only signals this process; pass the stop on to the workers
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Load test for spectator frame broadcasting.
+
+Simulates a tournament final: a session with a few players publishes game
+updates while thousands of spectators watch across all view modes. A share
+of the spectators joins mid-game (keyframe + deltas) and some switch modes
+while watching. A sample of spectators decodes and applies every frame and
+is checked against the server's view at the end.
+
+Reported: publish cost per update, encodes per update (bounded by the
+number of view modes, independent of the number of spectators), bytes
+fanned out, wake-up latency, and what per-spectator serialization of the
+same views would have cost.
+
+Usage: python scripts/spectator_load_test.py [--spectators 5000] [--updates 200]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.competition.spectator_mode import (
+    SpectatorMode, ViewMode, project_view, apply_merge_patch, encode_frame, HAS_ORJSON
+)
+
+MODES = list(ViewMode)
+
+
+def make_state(rng: random.Random, players: int, board_size: int, update: int, previous=None):
+    """Full game state after ``update``; each update changes one player's board."""
+    if previous is None:
+        previous = {
+            "round": 1,
+            "status": "in_progress",
+            "players": {
+                f"player_{i}": {
+                    "name": f"Player {i}",
+                    "score": 0.0,
+                    "status": "playing",
+                    "board": [["?"] * board_size for _ in range(board_size)],
+                    "prompt": f"Strategy of player {i}: reveal corners first, then flag pairs.",
+                    "reasoning": "",
+                    "moves": 0,
+                }
+                for i in range(players)
+            },
+        }
+    state = {**previous, "players": dict(previous["players"])}
+    player_id = f"player_{update % players}"
+    player = dict(state["players"][player_id])
+    board = [row[:] for row in player["board"]]
+    board[rng.randrange(board_size)][rng.randrange(board_size)] = str(rng.randint(0, 8))
+    player.update(
+        board=board,
+        score=round(player["score"] + rng.random() * 5, 2),
+        moves=player["moves"] + 1,
+        reasoning=f"Move {player['moves'] + 1}: the number pattern implies a safe cell nearby.",
+    )
+    state["players"][player_id] = player
+    state["time_remaining"] = max(0, 600 - update)
+    state["leaderboard"] = sorted(
+        ({"player_id": pid, "score": p["score"]} for pid, p in state["players"].items()),
+        key=lambda entry: entry["score"], reverse=True
+    )
+    state["commentary"] = f"Update {update}: {player['name']} moves to {player['score']:.1f}"
+    return state
+
+
+class SimulatedSpectator:
+    def __init__(self, spectator_id: str, verify: bool):
+        self.spectator_id = spectator_id
+        self.verify = verify
+        self.view = None
+        self.frames = 0
+        self.bytes = 0
+        self.keyframes = 0
+        self.latencies = []
+
+    def apply(self, frames):
+        self.frames += len(frames)
+        self.bytes += sum(len(frame) for frame in frames)
+        if not self.verify:
+            return
+        for data in frames:
+            frame = json.loads(data)
+            if frame["type"] == "keyframe":
+                self.keyframes += 1
+                self.view = frame["view"]
+            else:
+                self.view = apply_merge_patch(self.view, frame["patch"])
+
+
+async def watch(spectator: SimulatedSpectator, feed, clock):
+    while True:
+        frames = await feed.next_frames()
+        if frames:
+            spectator.latencies.append(time.perf_counter() - clock["published_at"])
+            spectator.apply(frames)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    session = SpectatorMode("load_test_final")
+    clock = {"published_at": time.perf_counter()}
+    spectators = {}
+    tasks = []
+
+    async def join(index: int):
+        spectator_id = f"spectator_{index}"
+        await session.add_spectator(spectator_id, f"Viewer {index}")
+        mode = MODES[index % len(MODES)]
+        if mode != ViewMode.OVERVIEW:
+            await session.update_view_config(spectator_id, {"mode": mode.value})
+        spectator = SimulatedSpectator(spectator_id, rng.random() < args.verify_fraction)
+        spectators[spectator_id] = spectator
+        tasks.append(asyncio.create_task(watch(spectator, session.get_feed(spectator_id), clock)))
+
+    early = int(args.spectators * (1 - args.late_fraction))
+    for index in range(early):
+        await join(index)
+
+    state = None
+    publish_times = []
+    late_joined = early
+    for update in range(args.updates):
+        state = make_state(rng, args.players, args.board_size, update, state)
+
+        start = time.perf_counter()
+        clock["published_at"] = start
+        session.publish_game_update(state)
+        publish_times.append(time.perf_counter() - start)
+
+        if update % 25 == 10:
+            await session.record_highlight(
+                1, f"player_{update % args.players}", "comeback", {"update": update},
+                {"player_name": "Player", "from_pos": 5, "to_pos": 1}
+            )
+
+        # Mid-game joins spread over the first half of the game
+        if update < args.updates // 2 and late_joined < args.spectators:
+            batch = (args.spectators - early) // max(1, args.updates // 2) + 1
+            for index in range(late_joined, min(args.spectators, late_joined + batch)):
+                await join(index)
+            late_joined = min(args.spectators, late_joined + batch)
+
+        # A few spectators change mode while watching
+        if update % 20 == 5:
+            for spectator_id in rng.sample(list(spectators), min(args.switches, len(spectators))):
+                await session.update_view_config(spectator_id, {"mode": rng.choice(MODES).value})
+
+        await asyncio.sleep(args.interval)
+
+    # Let every spectator drain before stopping
+    await asyncio.sleep(max(0.2, args.interval * 5))
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Verify sampled spectators reconstructed their mode's current view
+    mismatches = 0
+    verified = 0
+    for spectator_id, spectator in spectators.items():
+        if not spectator.verify:
+            continue
+        verified += 1
+        feed = session.get_feed(spectator_id)
+        expected = json.loads(json.dumps(feed.channel.view, default=str))
+        if spectator.view != expected:
+            mismatches += 1
+
+    # What serializing each spectator's view separately would have cost
+    views = {mode: project_view(mode, state, session.frames.highlight) for mode in MODES}
+    start = time.perf_counter()
+    sample = min(500, len(spectators))
+    for index in range(sample):
+        encode_frame({"type": "keyframe", "view": views[MODES[index % len(MODES)]]})
+    per_viewer_encode = (time.perf_counter() - start) / sample
+
+    stats = session.frames.get_stats()
+    encodes = sum(channel["encodes"] for channel in stats.values())
+    encoded_bytes = sum(channel["bytes_encoded"] for channel in stats.values())
+    delivered_bytes = sum(s.bytes for s in spectators.values())
+    delivered_frames = sum(s.frames for s in spectators.values())
+    latencies = [lat for s in spectators.values() for lat in s.latencies]
+
+    print(f"spectators:            {len(spectators)} ({len(spectators) - early} joined mid-game)")
+    print(f"updates published:     {args.updates} (encoder: {'orjson' if HAS_ORJSON else 'json'})")
+    print(f"publish time / update: p50 {statistics.median(publish_times) * 1e3:.2f} ms, "
+          f"p99 {percentile(publish_times, 99) * 1e3:.2f} ms")
+    print(f"encodes:               {encodes} total, {encodes / args.updates:.1f} per update")
+    print(f"bytes encoded:         {encoded_bytes / 1024:.0f} KiB")
+    print(f"frames fanned out:     {delivered_frames} ({delivered_bytes / 1024 / 1024:.1f} MiB shared bytes)")
+    print(f"wake-up latency:       p50 {percentile(latencies, 50) * 1e3:.1f} ms, "
+          f"p99 {percentile(latencies, 99) * 1e3:.1f} ms")
+    print(f"per-viewer encoding:   would be ~{per_viewer_encode * len(spectators) * 1e3:.0f} ms per update "
+          f"({per_viewer_encode * 1e6:.0f} us x {len(spectators)} viewers)")
+    print(f"verified spectators:   {verified - mismatches}/{verified} reconstructed the current view")
+    for mode, channel in stats.items():
+        print(f"  {mode:12} subscribers={channel['subscribers']:5} updates={channel['updates']:4} "
+              f"keyframes={channel['keyframes']:3} retained={channel['retained_frames']}")
+
+    return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spectators", type=int, default=5000)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--board-size", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between updates")
+    parser.add_argument("--late-fraction", type=float, default=0.3, help="Share of spectators joining mid-game")
+    parser.add_argument("--switches", type=int, default=50, help="Mode switches every 20 updates")
+    parser.add_argument("--verify-fraction", type=float, default=0.05, help="Share of spectators decoding frames")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Train a zstd dictionary for the storage codec from stored move records.
+
+Samples are the move lists of games in the database (when DATABASE_URL is set)
+and of the transcript files in data/results/. Point STORAGE_CODEC_DICTIONARY at
+the output directory to use the newest dictionary for new writes; rows written
+with older dictionaries stay readable as long as their files are kept.
+"""
+
+import argparse
+from pathlib import Path
+import logging
+
+# Add src to path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.database import get_db, Game
+from src.core.storage import get_storage
+from src.core.storage_codec import codec, train_dictionary, read_json_file, HAS_ZSTD
+from src.core.logging_config import setup_logging
+
+# Setup logging
+setup_logging(log_level="INFO")
+logger = logging.getLogger("train_codec_dictionary")
+
+
+def collect_samples(limit: int) -> list:
+    """Collect up to ``limit`` move lists from the database and result files."""
+    samples = []
+
+    if get_storage().use_database:
+        db = next(get_db())
+        try:
+            for (moves,) in db.query(Game.moves).order_by(Game.created_at.desc()).limit(limit):
+                samples.append(codec.decode(moves))
+        finally:
+            db.close()
+
+    for transcripts_file in sorted(Path("data/results").glob("*_transcripts.json*"), reverse=True):
+        if len(samples) >= limit:
+            break
+        try:
+            for transcript in read_json_file(transcripts_file):
+                samples.append(transcript.get("moves", []))
+        except Exception as e:
+            logger.warning(f"Skipping {transcripts_file.name}: {e}")
+
+    return [s for s in samples[:limit] if s]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output-dir", default="data/codec", help="Directory for .dict files")
+    parser.add_argument("--samples", type=int, default=5000, help="Maximum number of games to sample")
+    parser.add_argument("--size", type=int, default=16 * 1024, help="Dictionary size in bytes")
+    args = parser.parse_args()
+
+    if not HAS_ZSTD:
+        logger.error("zstandard is not installed (pip install zstandard)")
+        sys.exit(1)
+
+    samples = collect_samples(args.samples)
+    if len(samples) < 10:
+        logger.error(f"Need at least 10 games to train a dictionary, found {len(samples)}")
+        sys.exit(1)
+
+    dictionary = train_dictionary(samples, dict_size=args.size)
+    dict_id = codec.add_dictionary(dictionary)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"moves-{dict_id}.dict"
+    output_file.write_bytes(dictionary)
+
+    logger.info(f"Trained dictionary {dict_id} from {len(samples)} games -> {output_file}")
+    logger.info(f"Set STORAGE_CODEC_DICTIONARY={output_dir} to use it")
+
+
+if __name__ == "__main__":
+    main()
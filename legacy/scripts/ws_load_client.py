@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Reference client and load generator for the game WebSocket (/api/ws/games).
+
+Each simulated dashboard opens one socket, subscribes to several games of a
+job, rebuilds every board from keyframes, deltas and moves, and acknowledges
+what it applied. With --reconnect-every, sockets are dropped and resumed with
+their session ID to exercise ack-based resumption.
+
+Usage:
+    python scripts/ws_load_client.py --url ws://localhost:8000/api/ws/games \\
+        --job-id JOB --games 16 --clients 200 --duration 60
+
+Requires the ``websockets`` package.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import websockets
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.api.move_protocol import BoardView, KEYFRAME, decode_frame
+
+
+class GameSocketClient:
+    """Watches several games over one socket, with acks and session resume."""
+
+    def __init__(self, url: str, ack_interval: float = 0.1):
+        self.url = url
+        self.ack_interval = ack_interval
+        self.session: Optional[str] = None
+        self.boards: Dict[int, BoardView] = {}  # stream -> board
+        self.games: Dict[int, tuple] = {}  # stream -> (job_id, game_num)
+        self.wanted: List[tuple] = []
+        self.stats = {"frames": 0, "keyframes": 0, "bytes": 0, "gaps": 0, "resumes": 0, "connects": 0}
+        self._acked: Dict[int, int] = {}
+        self._socket = None
+
+    def watch(self, job_id: str, game_num: int):
+        self.wanted.append((job_id, game_num))
+
+    async def run(self, duration: float, reconnect_every: Optional[float] = None):
+        """Stay connected for ``duration`` seconds, reconnecting as configured."""
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            connect_for = deadline - time.monotonic()
+            if reconnect_every:
+                connect_for = min(connect_for, reconnect_every * random.uniform(0.5, 1.5))
+            try:
+                await asyncio.wait_for(self._connect_once(), connect_for)
+            except asyncio.TimeoutError:
+                pass
+            except (OSError, websockets.WebSocketException) as e:
+                print(f"connection failed: {e}", file=sys.stderr)
+                await asyncio.sleep(1)
+
+    async def _connect_once(self):
+        url = self.url + (f"?session={self.session}" if self.session else "")
+        async with websockets.connect(url, max_size=None) as socket:
+            self._socket = socket
+            self.stats["connects"] += 1
+            ack_task = asyncio.create_task(self._ack_loop())
+            try:
+                async for message in socket:
+                    if isinstance(message, bytes):
+                        self._on_frame(message)
+                    else:
+                        await self._on_control(json.loads(message))
+            finally:
+                ack_task.cancel()
+                self._socket = None
+
+    async def _on_control(self, message: Dict):
+        op = message.get("op")
+        if op == "hello":
+            resumed = {(s["job_id"], s["game_num"]) for s in message.get("resumed", [])}
+            if self.session and message["session"] == self.session:
+                self.stats["resumes"] += 1
+            self.session = message["session"]
+            for job_id, game_num in self.wanted:
+                if (job_id, game_num) not in resumed:
+                    await self._socket.send(json.dumps({"op": "subscribe", "job_id": job_id, "game_num": game_num}))
+        elif op == "subscribed":
+            self.games[message["stream"]] = (message["job_id"], message["game_num"])
+            self.boards.setdefault(message["stream"], BoardView())
+        elif op == "ping":
+            await self._socket.send(json.dumps({"op": "pong"}))
+        elif op == "error":
+            print(f"server error: {message.get('error')}", file=sys.stderr)
+
+    def _on_frame(self, data: bytes):
+        frame = decode_frame(data)
+        self.stats["frames"] += 1
+        self.stats["bytes"] += len(data)
+        if frame.type == KEYFRAME:
+            self.stats["keyframes"] += 1
+        board = self.boards.setdefault(frame.stream, BoardView())
+        if not board.apply(frame):
+            # Should not happen: the server resends from the last ack or sends a keyframe
+            self.stats["gaps"] += 1
+
+    async def _ack_loop(self):
+        while True:
+            await asyncio.sleep(self.ack_interval)
+            acks = {str(stream): board.seq for stream, board in self.boards.items()
+                    if board.seq is not None and board.seq != self._acked.get(stream)}
+            if acks and self._socket is not None:
+                await self._socket.send(json.dumps({"op": "ack", "acks": acks}))
+                self._acked.update({int(stream): seq for stream, seq in acks.items()})
+
+
+async def run(args):
+    clients = []
+    for _ in range(args.clients):
+        client = GameSocketClient(args.url, args.ack_interval)
+        for game_num in range(1, args.games + 1):
+            client.watch(args.job_id, game_num)
+        clients.append(client)
+
+    start = time.monotonic()
+    await asyncio.gather(*(client.run(args.duration, args.reconnect_every) for client in clients))
+    elapsed = time.monotonic() - start
+
+    totals = {key: sum(c.stats[key] for c in clients) for key in clients[0].stats}
+    print(f"clients:     {args.clients} x {args.games} games over {elapsed:.0f}s")
+    print(f"connects:    {totals['connects']} ({totals['resumes']} session resumes)")
+    print(f"frames:      {totals['frames']} ({totals['keyframes']} keyframes), "
+          f"{totals['frames'] / elapsed:.0f}/s")
+    print(f"bytes:       {totals['bytes'] / 1024:.0f} KiB, {totals['bytes'] / max(1, totals['frames']):.0f} B/frame")
+    print(f"seq gaps:    {totals['gaps']}")
+
+    if args.show_board and clients[0].boards:
+        stream, board = next(iter(clients[0].boards.items()))
+        print(f"\ngame {clients[0].games.get(stream)} seq={board.seq} status={board.status} moves={board.moves}")
+        print("\n".join(board.render()))
+    return 1 if totals["gaps"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://localhost:8000/api/ws/games")
+    parser.add_argument("--job-id", required=True)
+    parser.add_argument("--games", type=int, default=16, help="Games watched per client (1..N)")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--ack-interval", type=float, default=0.1)
+    parser.add_argument("--reconnect-every", type=float, default=None,
+                        help="Drop and resume each socket about this often (seconds)")
+    parser.add_argument("--show-board", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Scheduled archival endpoint: moves old games to cold storage and sweeps realtime_events."""
+from http.server import BaseHTTPRequestHandler
+import json
+import os
+import sys
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from auth import require_admin
+from db_optimized import archive_games, sweep_realtime_events, get_db_stats
+
+# Vercel cron sends "Authorization: Bearer $CRON_SECRET"
+CRON_SECRET = os.environ.get('CRON_SECRET', '')
+
+# Batches per invocation, sized to finish well inside the function time limit
+ARCHIVE_MAX_BATCHES = int(os.environ.get('ARCHIVE_MAX_BATCHES', '10'))
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        """Run one archival pass."""
+        if not self._authorized():
+            self.send_json_response({"error": "Unauthorized"}, 401)
+            return
+
+        try:
+            query = parse_qs(urlparse(self.path).query)
+            older_than_days = query.get('older_than_days', [None])[0]
+
+            swept = sweep_realtime_events()
+            archived = archive_games(
+                older_than_days=int(older_than_days) if older_than_days else None,
+                max_batches=ARCHIVE_MAX_BATCHES
+            )
+
+            self.send_json_response({
+                "games_archived": archived,
+                "realtime_events_swept": swept,
+                "archive": get_db_stats()['archive']
+            })
+        except Exception as e:
+            self.send_json_response({
+                "error": f"Error in archive: {str(e)}",
+                "type": type(e).__name__
+            }, 500)
+
+    def _authorized(self) -> bool:
+        if CRON_SECRET and self.headers.get('Authorization', '') == f"Bearer {CRON_SECRET}":
+            return True
+        return require_admin(self)
+
+    def send_json_response(self, data, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(data).encode())
@@ -0,0 +1,159 @@
+"""Serializers for values stored in the shared (Redis) cache.
+
+Every stored value starts with one tag byte naming its encoding, so formats
+can change without flushing the cache::
+
+    0x01 orjson   0x02 msgpack   0x03 json (stdlib)
+    | 0x10 if the payload is zstd-compressed, | 0x20 if zlib-compressed
+
+Values are JSON-like (dicts, lists, strings, numbers, datetimes); tuples come
+back as lists and datetimes as ISO strings. Entries written by the old pickle
+format start with 0x80 and are treated as misses unless CACHE_ALLOW_PICKLE is
+set, since unpickling data from a shared cache can execute code.
+"""
+
+import os
+import json
+import zlib
+import pickle
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    HAS_MSGPACK = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+TAG_ORJSON = 0x01
+TAG_MSGPACK = 0x02
+TAG_JSON = 0x03
+FLAG_ZSTD = 0x10
+FLAG_ZLIB = 0x20
+FORMAT_MASK = 0x0F
+PICKLE_TAG = 0x80  # first byte of pickle protocol >= 2
+
+CACHE_SERIALIZER = os.environ.get('CACHE_SERIALIZER', 'orjson')
+CACHE_COMPRESS_THRESHOLD = int(os.environ.get('CACHE_COMPRESS_THRESHOLD', str(16 * 1024)))
+CACHE_COMPRESS_LEVEL = int(os.environ.get('CACHE_COMPRESS_LEVEL', '3'))
+CACHE_ALLOW_PICKLE = os.environ.get('CACHE_ALLOW_PICKLE', '').lower() in ('1', 'true', 'yes')
+
+
+class SerializationError(ValueError):
+    """Raised when a cached value cannot be decoded."""
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types the JSON encoders do not know (sets, objects)."""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class CacheSerializer:
+    """Tagged cache serializer with optional compression of large payloads."""
+
+    def __init__(self, format: str = CACHE_SERIALIZER,
+                 compress_threshold: int = CACHE_COMPRESS_THRESHOLD,
+                 compress_level: int = CACHE_COMPRESS_LEVEL,
+                 allow_pickle: bool = CACHE_ALLOW_PICKLE):
+        if format == 'orjson' and not HAS_ORJSON:
+            format = 'json'
+        if format == 'msgpack' and not HAS_MSGPACK:
+            format = 'orjson' if HAS_ORJSON else 'json'
+        if format not in ('orjson', 'msgpack', 'json'):
+            raise ValueError(f"Unsupported cache serializer: {format}")
+
+        self.format = format
+        self.tag = {'orjson': TAG_ORJSON, 'msgpack': TAG_MSGPACK, 'json': TAG_JSON}[format]
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.allow_pickle = allow_pickle
+        if HAS_ZSTD:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=compress_level)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value with its tag byte."""
+        tag = self.tag
+        if tag == TAG_ORJSON:
+            payload = orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        elif tag == TAG_MSGPACK:
+            payload = msgpack.packb(value, default=_default, use_bin_type=True)
+        else:
+            payload = json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+
+        if self.compress_threshold and len(payload) >= self.compress_threshold:
+            if HAS_ZSTD:
+                payload = self._zstd_compressor.compress(payload)
+                tag |= FLAG_ZSTD
+            else:
+                payload = zlib.compress(payload, self.compress_level)
+                tag |= FLAG_ZLIB
+
+        return bytes((tag,)) + payload
+
+    def loads(self, data: bytes) -> Any:
+        """Decode bytes produced by ``dumps`` (any format, not just the active one)."""
+        if not data:
+            raise SerializationError("Empty cache value")
+
+        tag = data[0]
+        if tag == PICKLE_TAG:
+            if not self.allow_pickle:
+                raise SerializationError("Legacy pickle cache entry (set CACHE_ALLOW_PICKLE to read)")
+            return pickle.loads(data)
+
+        payload = memoryview(data)[1:]
+        if tag & FLAG_ZSTD:
+            if not HAS_ZSTD:
+                raise SerializationError("zstandard is required to read this cache entry")
+            payload = self._zstd_decompressor.decompress(payload)
+        elif tag & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+
+        fmt = tag & FORMAT_MASK
+        if fmt == TAG_ORJSON:
+            if not HAS_ORJSON:
+                return json.loads(bytes(payload))
+            return orjson.loads(payload)
+        if fmt == TAG_MSGPACK:
+            if not HAS_MSGPACK:
+                raise SerializationError("msgpack is required to read this cache entry")
+            return msgpack.unpackb(payload, raw=False)
+        if fmt == TAG_JSON:
+            return json.loads(bytes(payload))
+        raise SerializationError(f"Unknown cache format tag: {tag:#x}")
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'format': self.format,
+            'compression': 'zstd' if HAS_ZSTD else 'zlib',
+            'compress_threshold': self.compress_threshold,
+            'allow_pickle': self.allow_pickle
+        }
+
+
+# Default serializer for CacheService
+serializer = CacheSerializer()
+
+__all__ = ['CacheSerializer', 'SerializationError', 'serializer']
@@ -4,17 +4,40 @@ Since Vercel serverless functions are stateless, we implement:
 1. In-memory cache for the function lifetime
 2. Optional Redis support if REDIS_URL is provided
 3. Fallback to no caching if neither is available
+
+With Redis the two are tiers: reads check the in-process L1 first and only go
+to Redis (L2) on a miss, filling L1 for the rest of the entry's Redis TTL.
+
+Invalidation is namespace-based: keys built with ``namespace_key`` embed the
+namespace's generation counter, and ``invalidate_namespace`` bumps it with a
+single INCR. Old entries are never looked up again and expire on their own,
+so invalidating never walks the keyspace. Instances re-read generations at
+most once per ``NAMESPACE_VERSION_TTL``.
+
+Explicit ``delete``/``delete_pattern``/``clear`` calls (and ``set`` with
+``broadcast=True``) are broadcast on a
+capped Redis stream that every instance polls at most once per
+``L1_INVALIDATION_POLL_INTERVAL`` (and on pub/sub for long-lived processes
+that start ``start_invalidation_listener``), so each drops its L1 copies.
 """
 
 import os
 import json
 import time
-import pickle
+import uuid
 import logging
+from threading import Event, Lock, Thread
 from typing import Any, Optional, Dict, List, Callable
 from functools import wraps
 from datetime import datetime, timedelta
 
+try:
+    from .memory_cache import memory_cache as shared_memory_cache
+    from .cache_serializer import serializer as default_serializer, SerializationError
+except ImportError:
+    from memory_cache import memory_cache as shared_memory_cache
+    from cache_serializer import serializer as default_serializer, SerializationError
+
 logger = logging.getLogger(__name__)
 
 # Check for Redis configuration
@@ -22,6 +45,30 @@ REDIS_URL = os.environ.get('REDIS_URL', '')
 CACHE_PREFIX = os.environ.get('CACHE_PREFIX', 'tilts:')
 DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', '300'))  # 5 minutes
 
+# How long an instance trusts its copy of a namespace generation; bounds how
+# late other instances see an invalidation
+NAMESPACE_VERSION_TTL = float(os.environ.get('CACHE_NAMESPACE_VERSION_TTL', '1.0'))
+SCAN_BATCH_SIZE = 500
+
+# L1 invalidation broadcast
+L1_INVALIDATION_POLL_INTERVAL = float(os.environ.get('CACHE_L1_POLL_INTERVAL', '1.0'))
+L1_INVALIDATION_STREAM_MAXLEN = 1000
+L1_INVALIDATION_BATCH = 500
+
+# Compare-and-delete so a lock is only released by the holder that set it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Namespaces with versioned invalidation
+LEADERBOARD_NAMESPACE = 'leaderboard'
+GAMES_NAMESPACE = 'games'
+SESSIONS_NAMESPACE = 'sessions'
+PROMPTS_NAMESPACE = 'prompts'
+
 # Try to import Redis
 HAS_REDIS = False
 redis_client = None
@@ -37,61 +84,185 @@ if REDIS_URL:
         logger.warning(f"Failed to initialize Redis: {e}")
         HAS_REDIS = False
 
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+    
+    The first caller for a key runs the function; callers arriving while it
+    runs wait and share its result (or its exception).
+    """
+    
+    class _Call:
+        __slots__ = ('done', 'result', 'error')
+        
+        def __init__(self):
+            self.done = Event()
+            self.result = None
+            self.error = None
+    
+    def __init__(self):
+        self._calls: Dict[str, 'SingleFlight._Call'] = {}
+        self._lock = Lock()
+        self.coalesced = 0
+    
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
 class CacheService:
     """Unified cache service with Redis and in-memory fallback."""
     
-    def __init__(self):
-        self.memory_cache = {}
+    def __init__(self, memory_cache=None, serializer=None):
+        # Bounded LRU/TTL tier, shared with db_optimized unless one is passed in
+        self.memory_cache = memory_cache if memory_cache is not None else shared_memory_cache
         self.has_redis = HAS_REDIS
         self.redis = redis_client
+        self.serializer = serializer or default_serializer
+        # namespace -> (generation, fetched_at)
+        self._namespace_versions: Dict[str, tuple] = {}
+        # Last invalidation stream entry applied to L1, and when we last looked
+        self._invalidation_cursor: Optional[str] = None
+        self._invalidation_checked_at = 0.0
+        self._invalidation_lock = Lock()
+        self._listener: Optional[Thread] = None
+        self.tier_stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'invalidations_applied': 0, 'l1_resets': 0}
         
     def _make_key(self, key: str) -> str:
         """Create namespaced cache key."""
         return f"{CACHE_PREFIX}{key}"
     
+    def _namespace_version_key(self, namespace: str) -> str:
+        return self._make_key(f"ns:{namespace}")
+    
+    def namespace_version(self, namespace: str) -> int:
+        """Current generation of a namespace."""
+        cached_version = self._namespace_versions.get(namespace)
+        now = time.time()
+        if cached_version and (not self.has_redis or now - cached_version[1] < NAMESPACE_VERSION_TTL):
+            return cached_version[0]
+        
+        # Generations start at the current time in ms, so a counter that was
+        # evicted or lost restarts above every generation used before it
+        version = int(now * 1000)
+        if self.has_redis:
+            try:
+                version_key = self._namespace_version_key(namespace)
+                stored = self.redis.get(version_key)
+                if stored is None:
+                    self.redis.set(version_key, version, nx=True)
+                    stored = self.redis.get(version_key)
+                version = int(stored)
+            except Exception as e:
+                logger.error(f"Redis namespace version error: {e}")
+                if cached_version:
+                    version = cached_version[0]
+        
+        self._namespace_versions[namespace] = (version, now)
+        return version
+    
+    def namespace_key(self, namespace: str, key: str) -> str:
+        """Key within a namespace, tagged with the namespace generation."""
+        return f"{namespace}:v{self.namespace_version(namespace)}:{key}"
+    
+    def invalidate_namespace(self, namespace: str) -> int:
+        """Invalidate every key of a namespace by bumping its generation (O(1))."""
+        now = time.time()
+        version = max(int(now * 1000), self._namespace_versions.get(namespace, (0, 0))[0] + 1)
+        if self.has_redis:
+            try:
+                version_key = self._namespace_version_key(namespace)
+                pipe = self.redis.pipeline()
+                pipe.set(version_key, version, nx=True)
+                pipe.incr(version_key)
+                version = int(pipe.execute()[1])
+            except Exception as e:
+                logger.error(f"Redis namespace invalidation error: {e}")
+        
+        self._namespace_versions[namespace] = (version, now)
+        return version
+    
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+        """Get value from cache (L1 first, then Redis)."""
         full_key = self._make_key(key)
+        self._poll_invalidations()
+        
+        value = self.memory_cache.get(full_key)
+        if value is not None:
+            self.tier_stats['l1_hits'] += 1
+            return value
         
-        # Try Redis first
         if self.has_redis:
             try:
-                value = self.redis.get(full_key)
-                if value:
-                    return pickle.loads(value)
+                pipe = self.redis.pipeline()
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                raw, pttl = pipe.execute()
+                if raw:
+                    value = self.serializer.loads(raw)
+                    self._fill_l1(full_key, value, pttl)
+                    self.tier_stats['l2_hits'] += 1
+                    return value
+            except SerializationError as e:
+                logger.debug(f"Ignoring undecodable cache entry {full_key}: {e}")
             except Exception as e:
                 logger.error(f"Redis get error: {e}")
         
-        # Fallback to memory cache
-        if full_key in self.memory_cache:
-            value, expiry = self.memory_cache[full_key]
-            if time.time() < expiry:
-                return value
-            else:
-                del self.memory_cache[full_key]
-        
+        self.tier_stats['misses'] += 1
         return None
     
-    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> bool:
-        """Set value in cache with TTL."""
+    def _fill_l1(self, full_key: str, value: Any, pttl: Optional[int]):
+        """Copy an L2 value into L1 for no longer than it lives in Redis."""
+        if pttl is None or pttl == -2:
+            return
+        ttl = DEFAULT_TTL if pttl == -1 else pttl / 1000
+        if ttl > 0:
+            self.memory_cache.set(full_key, value, ttl)
+    
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL, broadcast: bool = False) -> bool:
+        """Set value in cache with TTL (Redis and L1).
+        
+        Overwrites are not broadcast by default: other instances keep their L1
+        copy until it expires. Pass ``broadcast=True`` when replacing a value
+        other instances may hold (they drop it and re-read Redis), or use
+        versioned namespace keys for values that change.
+        """
         full_key = self._make_key(key)
         
-        # Try Redis first
         if self.has_redis:
             try:
-                serialized = pickle.dumps(value)
+                serialized = self.serializer.dumps(value)
                 self.redis.setex(full_key, ttl, serialized)
-                return True
             except Exception as e:
                 logger.error(f"Redis set error: {e}")
         
-        # Always set in memory cache as fallback
-        expiry = time.time() + ttl
-        self.memory_cache[full_key] = (value, expiry)
-        
-        # Cleanup old entries if memory cache gets too large
-        if len(self.memory_cache) > 1000:
-            self._cleanup_memory_cache()
+        self.memory_cache.set(full_key, value, ttl)
+        if broadcast:
+            self._broadcast_invalidation('key', full_key)
         
         return True
     
@@ -106,32 +277,46 @@ class CacheService:
             except Exception as e:
                 logger.error(f"Redis delete error: {e}")
         
-        # Remove from memory cache
-        self.memory_cache.pop(full_key, None)
+        # Remove from memory cache, here and on every other instance
+        self.memory_cache.delete(full_key)
+        self._broadcast_invalidation('key', full_key)
         return True
     
     def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern."""
+        """Delete all keys starting with pattern.
+        
+        For ad hoc cleanup only: this walks the keyspace with an incremental
+        SCAN. Regular invalidation should use ``invalidate_namespace``.
+        """
         count = 0
         full_pattern = self._make_key(pattern)
         
         # Redis pattern deletion
         if self.has_redis:
             try:
-                keys = self.redis.keys(f"{full_pattern}*")
-                if keys:
-                    count = self.redis.delete(*keys)
+                count = self._scan_delete(f"{full_pattern}*")
             except Exception as e:
                 logger.error(f"Redis delete pattern error: {e}")
         
         # Memory cache pattern deletion
-        keys_to_delete = [k for k in self.memory_cache.keys() if k.startswith(full_pattern)]
-        for key in keys_to_delete:
-            del self.memory_cache[key]
-            count += 1
+        count += self.memory_cache.delete_prefix(full_pattern)
+        self._broadcast_invalidation('prefix', full_pattern)
         
         return count
     
+    def _scan_delete(self, match: str) -> int:
+        """Delete matching Redis keys in SCAN-sized batches with non-blocking UNLINK."""
+        deleted = 0
+        batch = []
+        for key in self.redis.scan_iter(match=match, count=SCAN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                deleted += self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self.redis.unlink(*batch)
+        return deleted
+    
     def increment(self, key: str, amount: int = 1) -> int:
         """Increment a counter in cache."""
         full_key = self._make_key(key)
@@ -143,38 +328,72 @@ class CacheService:
                 logger.error(f"Redis increment error: {e}")
         
         # Fallback to memory
-        if full_key in self.memory_cache:
-            value, expiry = self.memory_cache[full_key]
-            if isinstance(value, int) and time.time() < expiry:
-                new_value = value + amount
-                self.memory_cache[full_key] = (new_value, expiry)
-                return new_value
-        
-        # Initialize counter
-        self.memory_cache[full_key] = (amount, time.time() + DEFAULT_TTL)
-        return amount
+        return self.memory_cache.incr(full_key, amount, DEFAULT_TTL)
+    
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Try to take a short-lived lock shared by all instances.
+        
+        Returns a token for ``release_lock``, or None if another holder has
+        it. Without Redis there is nothing to coordinate with and the lock is
+        always granted. The lock expires after ``ttl`` seconds so a crashed
+        holder cannot wedge it.
+        """
+        token = uuid.uuid4().hex
+        if not self.has_redis:
+            return token
+        try:
+            if self.redis.set(self._make_key(f"lock:{key}"), token, nx=True, px=max(1, int(ttl * 1000))):
+                return token
+            return None
+        except Exception as e:
+            logger.error(f"Redis lock error: {e}")
+            return token
+    
+    def release_lock(self, key: str, token: str):
+        """Release a lock taken with ``acquire_lock``."""
+        if not self.has_redis:
+            return
+        try:
+            self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, self._make_key(f"lock:{key}"), token)
+        except Exception as e:
+            logger.error(f"Redis unlock error: {e}")
     
     def get_many(self, keys: List[str]) -> Dict[str, Any]:
-        """Get multiple values at once."""
+        """Get multiple values at once (L1 first, one Redis round trip for the rest)."""
         result = {}
+        self._poll_invalidations()
         
-        if self.has_redis:
+        missing = []
+        for key in keys:
+            value = self.memory_cache.get(self._make_key(key))
+            if value is not None:
+                result[key] = value
+                self.tier_stats['l1_hits'] += 1
+            else:
+                missing.append(key)
+        
+        if self.has_redis and missing:
             try:
-                full_keys = [self._make_key(k) for k in keys]
-                values = self.redis.mget(full_keys)
-                for key, value in zip(keys, values):
-                    if value:
-                        result[key] = pickle.loads(value)
+                pipe = self.redis.pipeline()
+                for key in missing:
+                    pipe.get(self._make_key(key))
+                    pipe.pttl(self._make_key(key))
+                replies = pipe.execute()
+                for i, key in enumerate(missing):
+                    raw, pttl = replies[2 * i], replies[2 * i + 1]
+                    if not raw:
+                        continue
+                    try:
+                        result[key] = self.serializer.loads(raw)
+                    except SerializationError as e:
+                        logger.debug(f"Ignoring undecodable cache entry {key}: {e}")
+                        continue
+                    self._fill_l1(self._make_key(key), result[key], pttl)
+                    self.tier_stats['l2_hits'] += 1
             except Exception as e:
-                logger.error(f"Redis mget error: {e}")
-        
-        # Fill missing values from memory cache
-        for key in keys:
-            if key not in result:
-                value = self.get(key)
-                if value is not None:
-                    result[key] = value
+                logger.error(f"Redis get_many error: {e}")
         
+        self.tier_stats['misses'] += len(keys) - len(result)
         return result
     
     def set_many(self, mapping: Dict[str, Any], ttl: int = DEFAULT_TTL) -> bool:
@@ -184,44 +403,127 @@ class CacheService:
                 pipe = self.redis.pipeline()
                 for key, value in mapping.items():
                     full_key = self._make_key(key)
-                    serialized = pickle.dumps(value)
+                    serialized = self.serializer.dumps(value)
                     pipe.setex(full_key, ttl, serialized)
                 pipe.execute()
             except Exception as e:
                 logger.error(f"Redis set_many error: {e}")
         
         # Always set in memory cache
-        expiry = time.time() + ttl
         for key, value in mapping.items():
-            full_key = self._make_key(key)
-            self.memory_cache[full_key] = (value, expiry)
+            self.memory_cache.set(self._make_key(key), value, ttl)
         
         return True
     
-    def _cleanup_memory_cache(self):
-        """Remove expired entries from memory cache."""
-        current_time = time.time()
-        expired_keys = [k for k, (_, exp) in self.memory_cache.items() if exp < current_time]
-        for key in expired_keys:
-            del self.memory_cache[key]
-    
     def clear(self):
         """Clear all cache entries (use with caution)."""
         if self.has_redis:
             try:
-                keys = self.redis.keys(f"{CACHE_PREFIX}*")
-                if keys:
-                    self.redis.delete(*keys)
+                self._scan_delete(f"{CACHE_PREFIX}*")
             except Exception as e:
                 logger.error(f"Redis clear error: {e}")
         
-        self.memory_cache.clear()
+        self.memory_cache.delete_prefix(CACHE_PREFIX)
+        self._namespace_versions.clear()
+        self._broadcast_invalidation('prefix', CACHE_PREFIX)
+    
+    def _invalidation_stream_key(self) -> str:
+        return self._make_key("l1:invalidations")
+    
+    def _broadcast_invalidation(self, op: str, target: str):
+        """Tell other instances to drop a key (op 'key') or prefix (op 'prefix') from L1."""
+        if not self.has_redis:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.xadd(self._invalidation_stream_key(), {'op': op, 'target': target},
+                      maxlen=L1_INVALIDATION_STREAM_MAXLEN, approximate=True)
+            pipe.publish(self._invalidation_stream_key(), f"{op}:{target}")
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis invalidation broadcast error: {e}")
+    
+    def _apply_invalidation(self, op: str, target: str):
+        if op == 'key':
+            self.memory_cache.delete(target)
+        elif op == 'prefix':
+            self.memory_cache.delete_prefix(target)
+        self.tier_stats['invalidations_applied'] += 1
+    
+    def _reset_l1(self):
+        """Drop every L1 entry; used when broadcasts may have been missed."""
+        self.memory_cache.delete_prefix(CACHE_PREFIX)
+        self.tier_stats['l1_resets'] += 1
+    
+    def _poll_invalidations(self, force: bool = False):
+        """Apply invalidations other instances broadcast since the last poll."""
+        if not self.has_redis:
+            return
+        now = time.time()
+        if not force and now - self._invalidation_checked_at < L1_INVALIDATION_POLL_INTERVAL:
+            return
+        if not self._invalidation_lock.acquire(blocking=False):
+            return  # another thread is already polling
+        try:
+            self._invalidation_checked_at = now
+            stream = self._invalidation_stream_key()
+            if self._invalidation_cursor is None:
+                # First poll: start from the newest entry; L1 was filled after it anyway
+                latest = self.redis.xrevrange(stream, count=1)
+                self._invalidation_cursor = _stream_id(latest[0][0]) if latest else '0-0'
+                return
+            
+            pipe = self.redis.pipeline()
+            pipe.xrange(stream, count=1)
+            pipe.xrange(stream, min=f"({self._invalidation_cursor}", count=L1_INVALIDATION_BATCH)
+            oldest, entries = pipe.execute()
+            
+            trimmed = bool(oldest) and self._invalidation_cursor != '0-0' and (
+                _stream_id_tuple(_stream_id(oldest[0][0])) > _stream_id_tuple(self._invalidation_cursor)
+            )
+            if trimmed or len(entries) >= L1_INVALIDATION_BATCH:
+                # Entries after our cursor were trimmed, or too many to replay
+                self._reset_l1()
+                latest = self.redis.xrevrange(stream, count=1)
+                if latest:
+                    self._invalidation_cursor = _stream_id(latest[0][0])
+                return
+            
+            for entry_id, fields in entries:
+                self._apply_invalidation(_decode(fields.get(b'op', b'')), _decode(fields.get(b'target', b'')))
+                self._invalidation_cursor = _stream_id(entry_id)
+        except Exception as e:
+            logger.error(f"Redis invalidation poll error: {e}")
+        finally:
+            self._invalidation_lock.release()
+    
+    def start_invalidation_listener(self) -> bool:
+        """Apply broadcasts as they are published (for long-running processes).
+        
+        Serverless instances rely on the stream poll instead; a subscriber
+        thread would be frozen between invocations.
+        """
+        if not self.has_redis or self._listener is not None:
+            return False
+        
+        def listen():
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(self._invalidation_stream_key())
+            for message in pubsub.listen():
+                op, _, target = _decode(message.get('data', b'')).partition(':')
+                self._apply_invalidation(op, target)
+        
+        self._listener = Thread(target=listen, name='cache-invalidation-listener', daemon=True)
+        self._listener.start()
+        return True
     
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         stats = {
             'has_redis': self.has_redis,
-            'memory_cache_size': len(self.memory_cache),
+            'tiers': dict(self.tier_stats),
+            'memory_cache': self.memory_cache.stats(),
+            'serializer': self.serializer.describe(),
             'cache_prefix': CACHE_PREFIX
         }
         
@@ -238,26 +540,44 @@ class CacheService:
         
         return stats
 
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+def _stream_id(value: Any) -> str:
+    return _decode(value)
+
+def _stream_id_tuple(stream_id: str) -> tuple:
+    ms, _, seq = stream_id.partition('-')
+    return int(ms), int(seq or 0)
+
 # Global cache instance
 cache = CacheService()
+if os.environ.get('CACHE_L1_PUBSUB', '').lower() in ('1', 'true', 'yes'):
+    cache.start_invalidation_listener()
 
 # Decorator for caching function results
-def cached(ttl: int = DEFAULT_TTL, key_func: Optional[Callable] = None):
+def cached(ttl: int = DEFAULT_TTL, key_func: Optional[Callable] = None,
+           namespace: Optional[str] = None):
     """Decorator to cache function results.
     
     Args:
         ttl: Time to live in seconds
         key_func: Optional function to generate cache key from arguments
+        namespace: Invalidation namespace (defaults to the function's name);
+            ``cache.invalidate_namespace(namespace)`` drops all its results
     """
     def decorator(func):
+        cache_namespace = namespace or f"{func.__module__}.{func.__name__}"
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
             if key_func:
-                cache_key = key_func(*args, **kwargs)
+                key = key_func(*args, **kwargs)
             else:
                 # Default key generation
-                cache_key = f"{func.__module__}.{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
+                key = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
+            cache_key = cache.namespace_key(cache_namespace, key)
             
             # Try to get from cache
             cached_value = cache.get(cache_key)
@@ -270,7 +590,7 @@ def cached(ttl: int = DEFAULT_TTL, key_func: Optional[Callable] = None):
             
             return result
         
-        wrapper.cache_clear = lambda: cache.delete_pattern(f"{func.__module__}.{func.__name__}:")
+        wrapper.cache_clear = lambda: cache.invalidate_namespace(cache_namespace)
         return wrapper
     return decorator
 
@@ -281,16 +601,20 @@ def model_cache_key(model_name: str) -> str:
 
 def session_cache_key(session_id: str) -> str:
     """Generate cache key for session data."""
-    return f"session:{session_id}"
+    return cache.namespace_key(SESSIONS_NAMESPACE, session_id)
 
 def leaderboard_cache_key(game_type: str = "all") -> str:
     """Generate cache key for leaderboard data."""
-    return f"leaderboard:{game_type}"
+    return cache.namespace_key(LEADERBOARD_NAMESPACE, game_type)
+
+def games_cache_key(*parts: Any) -> str:
+    """Generate cache key for a game listing."""
+    return cache.namespace_key(GAMES_NAMESPACE, ":".join(str(p) for p in parts))
 
 def prompt_search_cache_key(query: str, game_type: Optional[str], tags: Optional[List[str]]) -> str:
     """Generate cache key for prompt search results."""
     tags_str = ",".join(sorted(tags)) if tags else ""
-    return f"prompts:{query}:{game_type or 'all'}:{tags_str}"
+    return cache.namespace_key(PROMPTS_NAMESPACE, f"{query}:{game_type or 'all'}:{tags_str}")
 
 # Export everything
 __all__ = [
@@ -299,6 +623,12 @@ __all__ = [
     'model_cache_key',
     'session_cache_key',
     'leaderboard_cache_key',
+    'games_cache_key',
     'prompt_search_cache_key',
-    'CacheService'
+    'CacheService',
+    'SingleFlight',
+    'LEADERBOARD_NAMESPACE',
+    'GAMES_NAMESPACE',
+    'SESSIONS_NAMESPACE',
+    'PROMPTS_NAMESPACE'
 ]
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""Bounded pool of database clients.
+
+Clients are created on demand up to ``max_size`` (after an optional lazy
+warm-up of ``min_size`` on first use, never at import). When every client is
+checked out, callers wait up to ``wait_timeout`` for one to be returned and
+then get ``PoolTimeout`` instead of an unpooled throwaway client.
+
+Clients are recycled after ``max_lifetime`` seconds or ``max_uses``
+checkouts, checked with ``health_check`` when they have been idle longer than
+``health_check_interval``, and discarded if the caller's block raised one of
+``discard_on`` (typically transport errors).
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from threading import Condition
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(TimeoutError):
+    """Raised when no client became available within the wait timeout."""
+
+
+class _PooledClient:
+    __slots__ = ('client', 'created_at', 'last_used', 'uses')
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+
+class ClientPool:
+    """Thread-safe client pool with an asyncio-friendly acquire."""
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 5, min_size: int = 0,
+                 wait_timeout: float = 5.0, max_lifetime: float = 300.0, max_uses: int = 0,
+                 health_check: Optional[Callable[[Any], bool]] = None,
+                 health_check_interval: float = 30.0,
+                 discard_on: Tuple[Type[BaseException], ...] = (),
+                 monitor=None, name: str = 'pool'):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.min_size = min(min_size, self.max_size)
+        self.wait_timeout = wait_timeout
+        self.max_lifetime = max_lifetime
+        self.max_uses = max_uses
+        self.health_check = health_check
+        self.health_check_interval = health_check_interval
+        self.discard_on = discard_on
+        self.monitor = monitor
+        self.name = name
+
+        self._idle: "deque[_PooledClient]" = deque()
+        self._size = 0  # idle + checked out
+        self._in_use = 0
+        self._warmed = False
+        self._condition = Condition()
+        self.stats = {
+            'created': 0, 'recycled': 0, 'unhealthy': 0, 'discarded': 0,
+            'checkouts': 0, 'waits': 0, 'timeouts': 0, 'peak_in_use': 0
+        }
+
+    # Checkout / checkin
+
+    def _expired(self, pooled: _PooledClient, now: float) -> bool:
+        if self.max_lifetime and now - pooled.created_at > self.max_lifetime:
+            return True
+        return bool(self.max_uses and pooled.uses >= self.max_uses)
+
+    def _healthy(self, pooled: _PooledClient, now: float) -> bool:
+        if not self.health_check or now - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            return bool(self.health_check(pooled.client))
+        except Exception as e:
+            logger.debug(f"{self.name}: health check failed: {e}")
+            return False
+
+    def _create(self) -> _PooledClient:
+        pooled = _PooledClient(self.factory())
+        self.stats['created'] += 1
+        return pooled
+
+    def _warm_up(self):
+        """Create ``min_size`` clients the first time the pool is used."""
+        with self._condition:
+            if self._warmed:
+                return  # another thread got here first
+            self._warmed = True
+            needed = max(0, self.min_size - self._size)
+            self._size += needed  # reserve the slots, create outside the lock
+        created = []
+        try:
+            for _ in range(needed):
+                created.append(self._create())
+        except Exception as e:
+            logger.warning(f"{self.name}: warm-up stopped early: {e}")
+        with self._condition:
+            self._idle.extend(created)
+            self._size -= needed - len(created)
+            self._condition.notify_all()
+
+    def checkout(self, timeout: Optional[float] = None) -> _PooledClient:
+        """Take a client, creating one if below max_size, else waiting for one."""
+        if not self._warmed and self.min_size:
+            self._warm_up()
+
+        timeout = self.wait_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        while True:
+            create = False
+            pooled = None
+            with self._condition:
+                while True:
+                    if self._idle:
+                        pooled = self._idle.pop()  # most recently used first
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1  # reserve the slot, create outside the lock
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        self._record_wait(time.monotonic() - start)
+                        raise PoolTimeout(
+                            f"{self.name}: no client available within {timeout:.1f}s "
+                            f"({self._in_use}/{self.max_size} in use)"
+                        )
+                    if not waited:
+                        waited = True
+                        self.stats['waits'] += 1
+                    self._condition.wait(remaining)
+
+            now = time.monotonic()
+            if create:
+                try:
+                    pooled = self._create()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            elif self._expired(pooled, now):
+                self.stats['recycled'] += 1
+                self._drop(pooled)
+                continue
+            elif not self._healthy(pooled, now):
+                self.stats['unhealthy'] += 1
+                self._drop(pooled)
+                continue
+
+            with self._condition:
+                self._in_use += 1
+                self.stats['checkouts'] += 1
+                self.stats['peak_in_use'] = max(self.stats['peak_in_use'], self._in_use)
+                in_use = self._in_use
+            pooled.uses += 1
+            self._record_wait(time.monotonic() - start, in_use)
+            return pooled
+
+    def checkin(self, pooled: _PooledClient, discard: bool = False):
+        """Return a client; discarded or expired clients free their slot."""
+        pooled.last_used = time.monotonic()
+        with self._condition:
+            self._in_use -= 1
+            if discard or self._expired(pooled, pooled.last_used):
+                self._size -= 1
+                self.stats['discarded' if discard else 'recycled'] += 1
+                self._close(pooled)
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+    def _drop(self, pooled: _PooledClient):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        self._close(pooled)
+
+    @staticmethod
+    def _close(pooled: _PooledClient):
+        close = getattr(pooled.client, 'close', None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _record_wait(self, wait: float, in_use: Optional[int] = None):
+        if self.monitor is None:
+            return
+        self.monitor.record(f"{self.name}_wait", wait)
+        if in_use is not None:
+            self.monitor.record_pool_usage(self.name, in_use, self.max_size)
+
+    # Context managers
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        pooled = self.checkout(timeout)
+        discard = False
+        try:
+            yield pooled.client
+        except self.discard_on:
+            discard = True
+            raise
+        finally:
+            self.checkin(pooled, discard)
+
+    def _checkout_idle(self) -> Optional[_PooledClient]:
+        """Take an idle client that needs no recycling or health check, else None."""
+        if not self._warmed and self.min_size:
+            return None
+        now = time.monotonic()
+        with self._condition:
+            if not self._idle:
+                return None
+            pooled = self._idle[-1]  # most recently used first, as in checkout
+            if self._expired(pooled, now) or (
+                    self.health_check and now - pooled.last_used >= self.health_check_interval):
+                return None
+            self._idle.pop()
+            self._in_use += 1
+            self.stats['checkouts'] += 1
+            self.stats['peak_in_use'] = max(self.stats['peak_in_use'], self._in_use)
+            in_use = self._in_use
+        pooled.uses += 1
+        self._record_wait(0.0, in_use)
+        return pooled
+
+    @asynccontextmanager
+    async def acquire_async(self, timeout: Optional[float] = None):
+        """Async acquire: waits for a free client without blocking the event loop.
+
+        Only a ready idle client is taken inline; creating a client, health
+        checks and waiting run in a worker thread.
+        """
+        pooled = self._checkout_idle()
+        if pooled is None:
+            checkout = asyncio.ensure_future(asyncio.to_thread(self.checkout, timeout))
+            try:
+                pooled = await asyncio.shield(checkout)
+            except asyncio.CancelledError:
+                # The worker thread may still check a client out; return it when it does
+                checkout.add_done_callback(self._checkin_abandoned)
+                raise
+        discard = False
+        try:
+            yield pooled.client
+        except self.discard_on:
+            discard = True
+            raise
+        finally:
+            self.checkin(pooled, discard)
+
+    def _checkin_abandoned(self, checkout: "asyncio.Future"):
+        if not checkout.cancelled() and checkout.exception() is None:
+            self.checkin(checkout.result())
+
+    def close(self):
+        """Close idle clients; checked-out clients are closed when returned."""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for pooled in idle:
+            self._close(pooled)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                **self.stats
+            }
+
+
+__all__ = ['ClientPool', 'PoolTimeout']
@@ -5,12 +5,37 @@ import time
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 from functools import lru_cache, wraps
 import uuid
-from contextlib import contextmanager
+import heapq
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 
+try:
+    from .storage_codec import codec as storage_codec
+    from .pagination import encode_cursor, decode_cursor
+    from .client_pool import ClientPool, PoolTimeout
+    from .memory_cache import memory_cache
+    from .cache_service import (
+        cache as shared_cache, SingleFlight, LEADERBOARD_NAMESPACE, GAMES_NAMESPACE, SESSIONS_NAMESPACE, PROMPTS_NAMESPACE
+    )
+    from .game_archive import (
+        get_cold_store, archive_key, ARCHIVE_AFTER_DAYS, ARCHIVED_GAME_FIELDS, SLIM_GAME_VALUES
+    )
+except ImportError:
+    from storage_codec import codec as storage_codec
+    from pagination import encode_cursor, decode_cursor
+    from client_pool import ClientPool, PoolTimeout
+    from memory_cache import memory_cache
+    from cache_service import (
+        cache as shared_cache, SingleFlight, LEADERBOARD_NAMESPACE, GAMES_NAMESPACE, SESSIONS_NAMESPACE, PROMPTS_NAMESPACE
+    )
+    from game_archive import (
+        get_cold_store, archive_key, ARCHIVE_AFTER_DAYS, ARCHIVED_GAME_FIELDS, SLIM_GAME_VALUES
+    )
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,76 +49,42 @@ HAS_SUPABASE = bool(SUPABASE_URL and SUPABASE_ANON_KEY)
 
 # Connection pool settings
 CONNECTION_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+CONNECTION_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', '1'))  # created on first use
 CONNECTION_TIMEOUT = int(os.environ.get('DB_TIMEOUT', '30'))
+POOL_WAIT_TIMEOUT = float(os.environ.get('DB_POOL_WAIT_TIMEOUT', '5'))
+POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME', '300'))
+POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))
 
 # Cache settings
 CACHE_TTL = int(os.environ.get('CACHE_TTL', '300'))  # 5 minutes default
 LEADERBOARD_CACHE_TTL = int(os.environ.get('LEADERBOARD_CACHE_TTL', '60'))  # 1 minute for leaderboard
+GAMES_CACHE_TTL = int(os.environ.get('GAMES_CACHE_TTL', '10'))  # game listings change while games run
+
+# How long past its TTL a cached result may still be served while it refreshes
+LEADERBOARD_STALE_TTL = int(os.environ.get('LEADERBOARD_STALE_TTL', '300'))
+GAMES_STALE_TTL = int(os.environ.get('GAMES_STALE_TTL', '30'))
+PROMPTS_STALE_TTL = int(os.environ.get('PROMPTS_STALE_TTL', '600'))
+
+# Upper bound on how long one instance waits for another to fill a key
+CACHE_FILL_TIMEOUT = float(os.environ.get('CACHE_FILL_TIMEOUT', '5'))
 
-# Initialize connection pool
-supabase_pool = []
-pool_lock = Lock()
+# Game columns stored through the compression codec (decoded transparently on read)
+COMPRESSED_GAME_FIELDS = ('moves', 'full_transcript')
+
+# realtime_events rows are only needed while a game is being watched
+REALTIME_EVENTS_TTL = int(os.environ.get('REALTIME_EVENTS_TTL', '300'))
 
 if HAS_SUPABASE:
     try:
         from supabase import create_client, Client
-        
-        # Create connection pool
-        for _ in range(CONNECTION_POOL_SIZE):
-            client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-            supabase_pool.append(client)
-            
-        logger.info(f"Initialized Supabase connection pool with {CONNECTION_POOL_SIZE} connections")
     except ImportError:
         HAS_SUPABASE = False
         logger.warning("Supabase client not available, falling back to JSON storage")
 else:
     logger.info("Supabase not configured, using JSON storage")
 
-# In-memory cache
-class Cache:
-    """Simple in-memory cache with TTL support."""
-    
-    def __init__(self):
-        self._cache = {}
-        self._lock = Lock()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired."""
-        with self._lock:
-            if key in self._cache:
-                value, expiry = self._cache[key]
-                if time.time() < expiry:
-                    return value
-                else:
-                    del self._cache[key]
-        return None
-    
-    def set(self, key: str, value: Any, ttl: int = CACHE_TTL):
-        """Set value in cache with TTL."""
-        with self._lock:
-            expiry = time.time() + ttl
-            self._cache[key] = (value, expiry)
-    
-    def delete(self, key: str):
-        """Delete key from cache."""
-        with self._lock:
-            self._cache.pop(key, None)
-    
-    def clear(self):
-        """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-    
-    def invalidate_pattern(self, pattern: str):
-        """Invalidate all keys matching pattern."""
-        with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if pattern in k]
-            for key in keys_to_delete:
-                del self._cache[key]
-
-# Initialize cache
-cache = Cache()
+# In-memory cache: the bounded LRU/TTL tier shared with cache_service
+cache = memory_cache
 
 # Performance monitoring
 class QueryMonitor:
@@ -101,6 +92,7 @@ class QueryMonitor:
     
     def __init__(self):
         self.queries = defaultdict(list)
+        self.pool_usage = {}
         self._lock = Lock()
     
     def record(self, query_type: str, duration: float):
@@ -115,6 +107,20 @@ class QueryMonitor:
             if len(self.queries[query_type]) > 1000:
                 self.queries[query_type] = self.queries[query_type][-1000:]
     
+    def record_pool_usage(self, pool_name: str, in_use: int, max_size: int):
+        """Record connection pool occupancy at checkout."""
+        with self._lock:
+            usage = self.pool_usage.setdefault(pool_name, {'in_use': 0, 'peak_in_use': 0, 'max_size': max_size})
+            usage['in_use'] = in_use
+            usage['peak_in_use'] = max(usage['peak_in_use'], in_use)
+            usage['max_size'] = max_size
+            usage['utilization'] = in_use / max_size if max_size else None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Pool occupancy recorded by ``record_pool_usage``."""
+        with self._lock:
+            return {name: dict(usage) for name, usage in self.pool_usage.items()}
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get query performance statistics."""
         with self._lock:
@@ -134,26 +140,142 @@ class QueryMonitor:
 # Initialize monitor
 query_monitor = QueryMonitor()
 
+def _supabase_client_healthy(client) -> bool:
+    """Cheap local check that the client's HTTP session is still open."""
+    session = getattr(getattr(client, 'postgrest', None), 'session', None)
+    return not getattr(session, 'is_closed', False)
+
+def _transport_errors() -> tuple:
+    try:
+        import httpx
+        return (httpx.TransportError,)
+    except ImportError:
+        return (ConnectionError,)
+
+# Clients are created lazily on first use, never at import (cold starts)
+supabase_pool = ClientPool(
+    lambda: create_client(SUPABASE_URL, SUPABASE_ANON_KEY),
+    max_size=CONNECTION_POOL_SIZE,
+    min_size=CONNECTION_POOL_MIN_SIZE,
+    wait_timeout=POOL_WAIT_TIMEOUT,
+    max_lifetime=POOL_MAX_LIFETIME,
+    health_check=_supabase_client_healthy,
+    health_check_interval=POOL_HEALTH_CHECK_INTERVAL,
+    discard_on=_transport_errors(),
+    monitor=query_monitor,
+    name='supabase_pool'
+) if HAS_SUPABASE else None
+
 # Decorators
-def with_cache(ttl: int = CACHE_TTL):
-    """Cache decorator for database queries."""
+
+# Marks a cache entry written with stale-while-revalidate metadata
+SWR_MARKER = '__swr_fresh_until__'
+
+_single_flight = SingleFlight()
+# Stale entries are refreshed off the request path by a small pool
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+cache_fill_stats = {'computed': 0, 'stale_served': 0, 'refreshes': 0, 'lock_waits': 0}
+
+def with_cache(ttl: int = CACHE_TTL, namespace: Optional[str] = None,
+               key_func: Optional[Any] = None, single_flight: bool = False,
+               stale_ttl: int = 0):
+    """Cache decorator for database queries.
+    
+    Results are stored in the shared cache under a versioned namespace
+    (defaults to the function name); writers invalidate the whole namespace
+    with ``shared_cache.invalidate_namespace``.
+    
+    Args:
+        ttl: Seconds a result is fresh
+        namespace: Invalidation namespace
+        key_func: Builds the cache key from the call arguments
+        single_flight: On a miss, let only one caller compute the result.
+            Concurrent callers in this process wait for it; other instances
+            wait on a Redis lock and then read the filled entry
+        stale_ttl: Seconds past ``ttl`` an expired result is still served
+            while a single background refresh recomputes it
+    """
     def decorator(func):
+        cache_namespace = namespace or func.__name__
+        
+        def store(cache_key: str, result: Any, broadcast: bool = False):
+            if result is None:
+                return
+            if stale_ttl:
+                shared_cache.set(cache_key, {SWR_MARKER: time.time() + ttl, 'value': result},
+                                 ttl + stale_ttl, broadcast=broadcast)
+            else:
+                shared_cache.set(cache_key, result, ttl, broadcast=broadcast)
+        
+        def lookup(cache_key: str) -> Tuple[Any, bool]:
+            """Cached value and whether it is still fresh."""
+            cached_value = shared_cache.get(cache_key)
+            if isinstance(cached_value, dict) and SWR_MARKER in cached_value:
+                return cached_value['value'], cached_value[SWR_MARKER] > time.time()
+            return cached_value, True
+        
+        def compute(cache_key: str, args, kwargs, broadcast: bool = False) -> Any:
+            result = func(*args, **kwargs)
+            cache_fill_stats['computed'] += 1
+            store(cache_key, result, broadcast)
+            return result
+        
+        def fill(cache_key: str, args, kwargs) -> Any:
+            """Compute a missing entry, coordinating with other instances."""
+            token = shared_cache.acquire_lock(cache_key, CACHE_FILL_TIMEOUT)
+            if token is None:
+                # Another instance is computing; wait for it to store the result
+                cache_fill_stats['lock_waits'] += 1
+                deadline = time.time() + CACHE_FILL_TIMEOUT
+                while time.time() < deadline:
+                    time.sleep(0.05)
+                    value, _ = lookup(cache_key)
+                    if value is not None:
+                        return value
+                logger.warning(f"Timed out waiting for {cache_key} to be filled, computing locally")
+                return compute(cache_key, args, kwargs)
+            try:
+                return compute(cache_key, args, kwargs)
+            finally:
+                shared_cache.release_lock(cache_key, token)
+        
+        def refresh(cache_key: str, args, kwargs):
+            """Recompute a stale entry unless someone else already is."""
+            token = shared_cache.acquire_lock(cache_key, CACHE_FILL_TIMEOUT)
+            if token is None:
+                return
+            try:
+                cache_fill_stats['refreshes'] += 1
+                # Replaces an entry other instances hold in L1: have them drop it
+                compute(cache_key, args, kwargs, broadcast=True)
+            except Exception as e:
+                logger.warning(f"Background refresh of {cache_key} failed: {e}")
+            finally:
+                shared_cache.release_lock(cache_key, token)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Create cache key from function name and arguments
-            cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
+            key = key_func(*args, **kwargs) if key_func else f"{func.__name__}:{str(args)}:{str(kwargs)}"
+            cache_key = shared_cache.namespace_key(cache_namespace, key)
             
             # Try to get from cache
-            cached_value = cache.get(cache_key)
+            cached_value, fresh = lookup(cache_key)
             if cached_value is not None:
+                if not fresh:
+                    cache_fill_stats['stale_served'] += 1
+                    refresh_key = f"refresh:{cache_key}"
+                    if not _single_flight.in_flight(refresh_key):
+                        _refresh_executor.submit(
+                            _single_flight.do, refresh_key, lambda: refresh(cache_key, args, kwargs)
+                        )
                 return cached_value
             
             # Execute function and cache result
-            result = func(*args, **kwargs)
-            if result is not None:
-                cache.set(cache_key, result, ttl)
-            
-            return result
+            if single_flight:
+                return _single_flight.do(cache_key, lambda: fill(cache_key, args, kwargs))
+            return compute(cache_key, args, kwargs)
+        wrapper.cache_clear = lambda: shared_cache.invalidate_namespace(cache_namespace)
         return wrapper
     return decorator
 
@@ -181,28 +303,30 @@ def with_monitoring(query_type: str):
 
 @contextmanager
 def get_supabase_client():
-    """Get a Supabase client from the pool."""
-    if not HAS_SUPABASE or not supabase_pool:
+    """Get a Supabase client from the pool.
+    
+    Waits up to DB_POOL_WAIT_TIMEOUT for a free client when all are in use
+    and raises ``PoolTimeout`` after that.
+    """
+    if not HAS_SUPABASE or supabase_pool is None:
         yield None
         return
     
-    client = None
-    try:
-        with pool_lock:
-            if supabase_pool:
-                client = supabase_pool.pop()
-        
-        if client:
-            yield client
-        else:
-            # All connections in use, create a temporary one
-            logger.warning("Connection pool exhausted, creating temporary connection")
-            temp_client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-            yield temp_client
-    finally:
-        if client and supabase_pool is not None:
-            with pool_lock:
-                supabase_pool.append(client)
+    with supabase_pool.acquire() as client:
+        yield client
+
+@asynccontextmanager
+async def get_supabase_client_async():
+    """Async variant of ``get_supabase_client`` for FastAPI handlers.
+    
+    Waiting for a free client happens off the event loop.
+    """
+    if not HAS_SUPABASE or supabase_pool is None:
+        yield None
+        return
+    
+    async with supabase_pool.acquire_async() as client:
+        yield client
 
 # JSON fallback storage (optimized)
 from pathlib import Path
@@ -219,11 +343,13 @@ TASKS_FILE = DB_PATH / "benchmark_tasks.json"
 EVALUATIONS_FILE = DB_PATH / "evaluations.json"
 PROMPTS_FILE = DB_PATH / "prompts.json"
 SETTINGS_FILE = DB_PATH / "settings.json"
+# Cold store for archived games when no bucket is configured
+ARCHIVE_DIR = DB_PATH / "archive"
 
 # JSON operations with caching
 @lru_cache(maxsize=10)
-def load_json_cached(file_path: str, default: Any = None) -> Any:
-    """Load JSON file with caching."""
+def _load_json_file(file_path: str) -> Any:
+    """Load and cache a JSON file (None if missing or unreadable)."""
     file_path = Path(file_path)
     if file_path.exists():
         try:
@@ -231,8 +357,18 @@ def load_json_cached(file_path: str, default: Any = None) -> Any:
                 return json.load(f)
         except:
             pass
+    return None
+
+def load_json_cached(file_path: str, default: Any = None) -> Any:
+    """Load JSON file with caching."""
+    # Defaults are often dicts/lists, which cannot be part of an lru_cache key
+    data = _load_json_file(file_path)
+    if data is not None:
+        return data
     return default if default is not None else {}
 
+load_json_cached.cache_clear = _load_json_file.cache_clear
+
 def save_json(file_path: Path, data: Any):
     """Save data to JSON file and invalidate cache."""
     with open(file_path, 'w') as f:
@@ -242,6 +378,12 @@ def save_json(file_path: Path, data: Any):
     load_json_cached.cache_clear()
 
 # Session Management (Optimized)
+def update_session(session_id: str, updates: Dict[str, Any]) -> bool:
+    """Update a session and invalidate cached session lookups."""
+    result = _update_session(session_id, updates)
+    shared_cache.invalidate_namespace(SESSIONS_NAMESPACE)
+    return result
+
 @with_monitoring("create_session")
 def create_session(session_data: Dict[str, Any]) -> str:
     """Create a new session."""
@@ -274,11 +416,11 @@ def create_session(session_data: Dict[str, Any]) -> str:
         result = client.table('sessions').insert(data).execute()
         
         # Invalidate sessions cache
-        cache.invalidate_pattern('list_sessions')
+        shared_cache.invalidate_namespace(SESSIONS_NAMESPACE)
         
         return result.data[0]['id'] if result.data else session_id
 
-@with_cache(ttl=60)
+@with_cache(ttl=60, namespace=SESSIONS_NAMESPACE)
 @with_monitoring("get_session")
 def get_session(session_id: str) -> Optional[Dict[str, Any]]:
     """Get session by ID or join code."""
@@ -349,7 +491,7 @@ def batch_update_leaderboard(game_results: List[Dict[str, Any]]):
                 entry['mine_identification_precision'] = entry['mines_identified'] / entry['mines_total']
         
         save_json(LEADERBOARD_FILE, leaderboard)
-        cache.delete('get_leaderboard')
+        shared_cache.invalidate_namespace(LEADERBOARD_NAMESPACE)
         return
     
     with get_supabase_client() as client:
@@ -436,9 +578,17 @@ def batch_update_leaderboard(game_results: List[Dict[str, Any]]):
             client.table('leaderboard_entries').insert(inserts_to_perform).execute()
         
         # Invalidate leaderboard cache
-        cache.delete('get_leaderboard')
+        shared_cache.invalidate_namespace(LEADERBOARD_NAMESPACE)
+
+def update_leaderboard(model_name: str, game_result: Dict[str, Any]):
+    """Update a single leaderboard entry and invalidate the cached leaderboard."""
+    result = _update_leaderboard(model_name, game_result)
+    shared_cache.invalidate_namespace(LEADERBOARD_NAMESPACE)
+    return result
 
-@with_cache(ttl=LEADERBOARD_CACHE_TTL)
+# Same key as cache_service.leaderboard_cache_key()
+@with_cache(ttl=LEADERBOARD_CACHE_TTL, namespace=LEADERBOARD_NAMESPACE, key_func=lambda: 'all',
+            single_flight=True, stale_ttl=LEADERBOARD_STALE_TTL)
 @with_monitoring("get_leaderboard")
 def get_leaderboard() -> List[Dict[str, Any]]:
     """Get leaderboard entries sorted by win rate."""
@@ -452,49 +602,568 @@ def get_leaderboard() -> List[Dict[str, Any]]:
         return result.data or []
 
 # Game Management (Optimized)
+def _next_cursor(page: List[Dict[str, Any]], has_more: bool) -> Optional[str]:
+    """Cursor pointing just past the last row of a page."""
+    if not has_more or not page:
+        return None
+    last = page[-1]
+    return encode_cursor(last.get('created_at'), last.get('id'))
+
+def encode_game_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a game row with its large JSON columns compressed."""
+    return storage_codec.encode_fields(row, COMPRESSED_GAME_FIELDS)
+
+def decode_game_row(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Decompress a game row's JSON columns in place (plain rows pass through)."""
+    return storage_codec.decode_fields(row, COMPRESSED_GAME_FIELDS)
+
+@with_monitoring("get_game")
+def get_game(game_id: str) -> Optional[Dict[str, Any]]:
+    """Get a game by ID with its moves and transcript decompressed."""
+    if not HAS_SUPABASE:
+        game = load_json_cached(str(GAMES_FILE), {}).get(game_id)
+        return rehydrate_game(decode_game_row(dict(game))) if game else None
+    
+    with get_supabase_client() as client:
+        result = client.table('games').select('*').eq('id', game_id).limit(1).execute()
+        return rehydrate_game(decode_game_row(result.data[0])) if result.data else None
+
+def rehydrate_game(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the archived columns of a game from cold storage."""
+    if not game.get('archived_at'):
+        return game
+    
+    store = get_cold_store(local_fallback=None if HAS_SUPABASE else ARCHIVE_DIR)
+    if store is None:
+        logger.error(f"Archived game {game['id']} cannot be rehydrated: no cold store configured")
+        return game
+    
+    document = store.get(archive_key(game['id']))
+    if document is None:
+        logger.error(f"Archived game {game['id']} is missing from cold storage")
+        return game
+    
+    game.update(document)
+    archive_stats['games_rehydrated'] += 1
+    return game
+
+def create_game(game_data: Dict[str, Any]) -> str:
+    """Create a new in-progress game."""
+    return create_games([{**game_data, 'status': 'in_progress'}])[0]
+
+def update_game(game_id: str, updates: Dict[str, Any]) -> bool:
+    """Update a single game; moves and transcript are compressed."""
+    return update_games({game_id: updates}) > 0
+
+@with_cache(ttl=GAMES_CACHE_TTL, namespace=GAMES_NAMESPACE, single_flight=True, stale_ttl=GAMES_STALE_TTL)
 @with_monitoring("list_games")
 def list_games(session_id: Optional[str] = None, job_id: Optional[str] = None, 
-               limit: int = 100, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
-    """List games with pagination and total count."""
+               limit: int = 100, offset: int = 0, cursor: Optional[str] = None,
+               count: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+    """List games newest first using keyset pagination.
+    
+    Pages are ordered by (created_at, id) descending. Pass the returned
+    ``next_cursor`` back as ``cursor`` to get the following page; ``offset``
+    is only honoured when no cursor is given and is kept for old callers.
+    
+    Counting is off by default. ``count='estimated'`` returns the planner
+    estimate (cheap), ``count='exact'`` runs a full count.
+    
+    Returns:
+        Tuple of (games, total or None, next_cursor or None)
+    """
+    if count not in (None, 'exact', 'estimated'):
+        raise ValueError(f"Unsupported count mode: {count}")
+    
+    after = decode_cursor(cursor) if cursor else None
+    
     if not HAS_SUPABASE:
         games = load_json_cached(str(GAMES_FILE), {})
-        games_list = list(games.values())
         
-        # Filter
-        if session_id:
-            games_list = [g for g in games_list if g.get('session_id') == session_id]
-        if job_id:
-            games_list = [g for g in games_list if g.get('job_id') == job_id]
+        def sort_key(game):
+            return (str(game.get('created_at', '')), str(game.get('id', '')))
+        
+        # Single pass: filter and keep only the top rows instead of sorting everything
+        total = 0
+        candidates = []
+        for game in games.values():
+            if session_id and game.get('session_id') != session_id:
+                continue
+            if job_id and game.get('job_id') != job_id:
+                continue
+            total += 1
+            if after and sort_key(game) >= after:
+                continue
+            candidates.append(game)
         
-        # Sort by created_at
-        games_list.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        window = heapq.nlargest(offset + limit + 1 if not after else limit + 1, candidates, key=sort_key)
+        if not after:
+            window = window[offset:]
+        page = [decode_game_row(dict(game)) for game in window[:limit]]
         
-        total = len(games_list)
-        return games_list[offset:offset + limit], total
+        return page, (total if count else None), _next_cursor(page, len(window) > limit)
     
     with get_supabase_client() as client:
-        # Build query
-        count_query = client.table('games').select('*', count='exact')
-        data_query = client.table('games').select('*')
+        total = None
+        if count:
+            count_query = client.table('games').select('id', count=count)
+            if session_id:
+                count_query = count_query.eq('session_id', session_id)
+            if job_id:
+                count_query = count_query.eq('job_id', job_id)
+            count_result = count_query.limit(1).execute()
+            total = getattr(count_result, 'count', None)
         
+        data_query = client.table('games').select('*')
         if session_id:
-            count_query = count_query.eq('session_id', session_id)
             data_query = data_query.eq('session_id', session_id)
         if job_id:
-            count_query = count_query.eq('job_id', job_id)
             data_query = data_query.eq('job_id', job_id)
         
-        # Get total count
-        count_result = count_query.execute()
-        total = count_result.count if hasattr(count_result, 'count') else 0
+        data_query = data_query.order('created_at', desc=True).order('id', desc=True)
+        
+        if after:
+            created_at, last_id = after
+            # Row-value comparison (created_at, id) < (cursor) expressed for PostgREST;
+            # served by the (created_at DESC, id DESC) indexes without scanning skipped rows
+            data_query = data_query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt."{last_id}")'
+            ).limit(limit + 1)
+        else:
+            data_query = data_query.range(offset, offset + limit)
+        
+        rows = data_query.execute().data or []
+        page = [decode_game_row(row) for row in rows[:limit]]
+        
+        return page, total, _next_cursor(page, len(rows) > limit)
+
+# Status groups reported by the evaluation status endpoints
+GAME_STATUS_GROUPS = {
+    'completed': ('won', 'lost', 'error'),
+    'in_progress': ('running', 'in_progress'),
+    'queued': ('queued',),
+}
+
+@with_cache(ttl=GAMES_CACHE_TTL, namespace=GAMES_NAMESPACE, single_flight=True)
+@with_monitoring("count_games_by_status")
+def count_games_by_status(job_id: str) -> Dict[str, int]:
+    """Exact number of a job's games, in total and per GAME_STATUS_GROUPS group.
+    
+    Counted by the database (one count per group), so the result covers
+    every game of the job rather than one listing page.
+    """
+    if not HAS_SUPABASE:
+        statuses = [
+            game.get('status') for game in load_json_cached(str(GAMES_FILE), {}).values()
+            if game.get('job_id') == job_id
+        ]
+        counts = {group: sum(status in members for status in statuses)
+                  for group, members in GAME_STATUS_GROUPS.items()}
+        return {'total': len(statuses), **counts}
+    
+    with get_supabase_client() as client:
+        def count(members: Optional[Tuple[str, ...]] = None) -> int:
+            query = client.table('games').select('id', count='exact').eq('job_id', job_id)
+            if members:
+                query = query.in_('status', list(members))
+            return getattr(query.limit(1).execute(), 'count', None) or 0
+        
+        return {'total': count(), **{group: count(members) for group, members in GAME_STATUS_GROUPS.items()}}
+
+@with_cache(ttl=GAMES_CACHE_TTL, namespace=GAMES_NAMESPACE, single_flight=True)
+@with_monitoring("summarize_completed_games")
+def summarize_completed_games(job_id: str) -> Dict[str, int]:
+    """Wins and total moves over every completed game of a job.
+    
+    Reads only the ``won`` and ``total_moves`` columns of the completed games,
+    so job summaries don't depend on which listing page was requested.
+    """
+    completed = GAME_STATUS_GROUPS['completed']
+    if not HAS_SUPABASE:
+        rows = [
+            game for game in load_json_cached(str(GAMES_FILE), {}).values()
+            if game.get('job_id') == job_id and game.get('status') in completed
+        ]
+    else:
+        with get_supabase_client() as client:
+            rows = (
+                client.table('games').select('won,total_moves')
+                .eq('job_id', job_id).in_('status', list(completed))
+                .execute().data or []
+            )
+    return {
+        'wins': sum(1 for row in rows if row.get('won')),
+        'total_moves': sum(row.get('total_moves') or 0 for row in rows)
+    }
+
+@with_monitoring("create_games")
+def create_games(games_data: List[Dict[str, Any]]) -> List[str]:
+    """Create several games in one round-trip.
+    
+    With Supabase only the games table's columns are inserted (see
+    ``build_game_row``); keys such as ``scenario`` are dropped.
+    
+    Returns:
+        Game IDs in input order
+    """
+    if not games_data:
+        return []
+    
+    rows = [
+        encode_game_row({**game_data, 'id': game_data.get('id') or str(uuid.uuid4())})
+        for game_data in games_data
+    ]
+    
+    if not HAS_SUPABASE:
+        games = load_json_cached(str(GAMES_FILE), {})
+        now = datetime.utcnow().isoformat()
+        for row in rows:
+            row.setdefault('status', 'in_progress')
+            row.setdefault('created_at', now)
+            games[row['id']] = row
+        save_json(GAMES_FILE, games)
+    else:
+        with get_supabase_client() as client:
+            insert_game_rows(client, [build_game_row(row) for row in rows])
+    
+    shared_cache.invalidate_namespace(GAMES_NAMESPACE)
+    return [row['id'] for row in rows]
+
+@with_monitoring("update_games")
+def update_games(updates: Dict[str, Dict[str, Any]]) -> int:
+    """Apply per-game updates; games sharing a payload are updated together.
+    
+    Args:
+        updates: Mapping of game ID to the columns to update
+    
+    Returns:
+        Number of games updated
+    """
+    if not updates:
+        return 0
+    
+    updates = {game_id: encode_game_row(payload) for game_id, payload in updates.items()}
+    
+    updated = 0
+    if not HAS_SUPABASE:
+        games = load_json_cached(str(GAMES_FILE), {})
+        for game_id, payload in updates.items():
+            if game_id in games:
+                games[game_id].update(payload)
+                updated += 1
+        save_json(GAMES_FILE, games)
+    else:
+        updates = {game_id: game_columns(payload) for game_id, payload in updates.items()}
+        with get_supabase_client() as client:
+            for payload, game_ids in group_game_updates(updates):
+                if not payload:
+                    continue
+                result = client.table('games').update(payload).in_('id', game_ids).execute()
+                updated += len(result.data or [])
+    
+    shared_cache.invalidate_namespace(GAMES_NAMESPACE)
+    return updated
+
+archive_stats = {
+    'games_archived': 0,
+    'games_rehydrated': 0,
+    'realtime_events_swept': 0,
+    'last_archive_run': None,
+    'last_sweep_run': None
+}
+
+@with_monitoring("archive_games")
+def archive_games(older_than_days: Optional[int] = None, batch_size: int = 200,
+                  max_batches: Optional[int] = None) -> int:
+    """Move completed games older than ``older_than_days`` to cold storage.
+    
+    Each game's heavy columns are written to the cold store first; only then
+    is the row slimmed down and stamped with ``archived_at``, so an interrupted
+    run leaves at worst a duplicate archive document, never a lost game.
+    Nothing is archived unless a durable cold store is configured (see
+    ``get_cold_store``).
+    
+    Args:
+        older_than_days: Minimum age in days (defaults to ARCHIVE_AFTER_DAYS)
+        batch_size: Games archived per round-trip
+        max_batches: Stop after this many batches (keeps serverless runs bounded)
+    
+    Returns:
+        Number of games archived
+    """
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    store = get_cold_store(local_fallback=None if HAS_SUPABASE else ARCHIVE_DIR)
+    if store is None:
+        logger.warning("No cold store configured (GAME_ARCHIVE_BUCKET); skipping game archival")
+        archive_stats['last_archive_run'] = datetime.utcnow().isoformat()
+        return 0
+    archived = 0
+    batches = 0
+    
+    def archive_rows(rows: List[Dict[str, Any]]) -> List[str]:
+        for row in rows:
+            decode_game_row(row)
+            store.put(archive_key(row['id']), {field: row.get(field) for field in ARCHIVED_GAME_FIELDS})
+        return [row['id'] for row in rows]
+    
+    if not HAS_SUPABASE:
+        games = load_json_cached(str(GAMES_FILE), {})
+        candidates = [
+            game for game in games.values()
+            if game.get('status') in ('won', 'lost') and not game.get('archived_at')
+            and str(game.get('created_at', '')) < cutoff
+        ]
+        if max_batches is not None:
+            candidates = candidates[:batch_size * max_batches]
+        archived_at = datetime.utcnow().isoformat()
+        for game_id in archive_rows([dict(game) for game in candidates]):
+            games[game_id].update(SLIM_GAME_VALUES, archived_at=archived_at)
+            archived += 1
+        if archived:
+            save_json(GAMES_FILE, games)
+    else:
+        with get_supabase_client() as client:
+            while max_batches is None or batches < max_batches:
+                rows = (
+                    client.table('games').select('*')
+                    .in_('status', ['won', 'lost'])
+                    .is_('archived_at', 'null')
+                    .lt('created_at', cutoff)
+                    .order('created_at')
+                    .limit(batch_size)
+                    .execute().data or []
+                )
+                if not rows:
+                    break
+                
+                game_ids = archive_rows(rows)
+                # Same payload for every game in the batch: one UPDATE
+                client.table('games').update(
+                    {**SLIM_GAME_VALUES, 'archived_at': datetime.utcnow().isoformat()}
+                ).in_('id', game_ids).execute()
+                
+                archived += len(game_ids)
+                batches += 1
+                if len(rows) < batch_size:
+                    break
+    
+    if archived:
+        shared_cache.invalidate_namespace(GAMES_NAMESPACE)
+    archive_stats['games_archived'] += archived
+    archive_stats['last_archive_run'] = datetime.utcnow().isoformat()
+    logger.info(f"Archived {archived} games older than {days} days")
+    return archived
+
+@with_monitoring("sweep_realtime_events")
+def sweep_realtime_events(ttl_seconds: Optional[int] = None) -> int:
+    """Delete realtime_events older than ``ttl_seconds`` (defaults to REALTIME_EVENTS_TTL).
+    
+    The database clamps the TTL to at least 300 seconds.
+    
+    Returns:
+        Number of events deleted
+    """
+    if not HAS_SUPABASE:
+        return 0
+    
+    ttl = REALTIME_EVENTS_TTL if ttl_seconds is None else ttl_seconds
+    with get_supabase_client() as client:
+        # Runs server-side (SECURITY DEFINER) so the anon key needs no DELETE policy
+        result = client.rpc('cleanup_old_realtime_events', {'ttl_seconds': ttl}).execute()
+    
+    deleted = result.data if isinstance(result.data, int) else 0
+    archive_stats['realtime_events_swept'] += deleted
+    archive_stats['last_sweep_run'] = datetime.utcnow().isoformat()
+    return deleted
+
+class GameWriteBuffer:
+    """Write-behind buffer for game rows.
+    
+    Creates and updates are merged per game until the next flush: a game that
+    is created, marked ``in_progress`` and then finished before a flush costs
+    one row in a single bulk insert, and status transitions for existing games
+    collapse to their latest value. A flush happens when ``max_pending`` games
+    are staged, when the oldest staged write is ``max_delay`` seconds old (checked
+    on the next write), or when ``flush()`` is called explicitly - handlers
+    must flush before returning since serverless instances may be frozen.
+    
+    A batch rejected by the database (rather than lost in transport) is retried
+    one game at a time, so a single bad row cannot block the others; a game
+    whose write has failed ``max_attempts`` times is dropped and kept in
+    ``dead_letters`` for inspection.
+    """
+    
+    def __init__(self, max_pending: int = 100, max_delay: float = 2.0, max_attempts: int = 3):
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._creates: Dict[str, Dict[str, Any]] = {}
+        self._updates: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Dict[str, int] = defaultdict(int)
+        self._first_staged_at: Optional[float] = None
+        self._lock = Lock()
+        self.dead_letters: deque = deque(maxlen=100)
+        self.stats = {
+            'staged': 0, 'coalesced': 0, 'flushes': 0, 'rows_written': 0, 'errors': 0, 'dropped': 0
+        }
+    
+    def create(self, game_data: Dict[str, Any]) -> str:
+        """Stage a new game; returns its (pre-assigned) ID."""
+        game_id = game_data.get('id') or str(uuid.uuid4())
+        with self._lock:
+            self._creates[game_id] = {**game_data, 'id': game_id}
+            self._mark_staged()
+        self._maybe_flush()
+        return game_id
+    
+    def update(self, game_id: str, updates: Dict[str, Any]):
+        """Stage an update, merging it with anything already pending for the game."""
+        with self._lock:
+            if game_id in self._creates:
+                self._creates[game_id].update(updates)
+                self.stats['coalesced'] += 1
+            elif game_id in self._updates:
+                self._updates[game_id].update(updates)
+                self.stats['coalesced'] += 1
+            else:
+                self._updates[game_id] = dict(updates)
+            self._mark_staged()
+        self._maybe_flush()
+    
+    def pending(self) -> int:
+        """Number of games with unflushed writes."""
+        with self._lock:
+            return len(self._creates) + len(self._updates)
+    
+    def flush(self) -> int:
+        """Write all staged games; returns the number of games written.
+        
+        Raises when the database could not be reached; the writes stay staged.
+        """
+        with self._lock:
+            creates, self._creates = self._creates, {}
+            updates, self._updates = self._updates, {}
+            self._first_staged_at = None
+        
+        if not creates and not updates:
+            return 0
         
-        # Get paginated data
-        result = data_query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+        game_ids = set(creates) | set(updates)
+        written = 0
+        try:
+            if creates:
+                create_games(list(creates.values()))
+                # Inserted: retrying these would hit primary key conflicts
+                written, creates = len(creates), {}
+            if updates:
+                update_games(updates)
+                written, updates = written + len(updates), {}
+        except _transport_errors() + (PoolTimeout,) as e:
+            logger.error(f"Game write buffer flush failed: {e}")
+            self._clear_attempts(game_ids - set(creates) - set(updates))
+            self._restage(creates, updates)
+            with self._lock:
+                self.stats['errors'] += 1
+                self.stats['rows_written'] += written
+            raise
+        except Exception as e:
+            logger.error(f"Game write buffer batch rejected, retrying games one at a time: {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+            written += self._write_each(creates, updates)
+        else:
+            self._clear_attempts(game_ids)
         
-        return result.data or [], total
+        self._record(written)
+        return written
+    
+    def _write_each(self, creates: Dict[str, Dict[str, Any]], updates: Dict[str, Dict[str, Any]]) -> int:
+        """Write games individually, re-staging or dropping the ones that fail."""
+        written = 0
+        failed_creates, failed_updates = {}, {}
+        for game_id, row in creates.items():
+            try:
+                create_games([row])
+                written += 1
+            except Exception as e:
+                logger.warning(f"Failed to create game {game_id}: {e}")
+                failed_creates[game_id] = row
+        for game_id, payload in updates.items():
+            try:
+                update_games({game_id: payload})
+                written += 1
+            except Exception as e:
+                logger.warning(f"Failed to update game {game_id}: {e}")
+                failed_updates[game_id] = payload
+        self._clear_attempts((set(creates) | set(updates)) - set(failed_creates) - set(failed_updates))
+        self._restage(failed_creates, failed_updates)
+        return written
+    
+    def _restage(self, creates: Dict[str, Dict[str, Any]], updates: Dict[str, Dict[str, Any]]):
+        """Put unwritten games back for the next flush unless they are out of attempts."""
+        with self._lock:
+            # Updates staged for a not-yet-inserted game while the flush ran belong to its row
+            for game_id in creates:
+                creates[game_id] = {**creates[game_id], **self._updates.pop(game_id, {})}
+            for kind, failed, staged in (('create', creates, self._creates), ('update', updates, self._updates)):
+                for game_id, data in failed.items():
+                    self._attempts[game_id] += 1
+                    if self._attempts[game_id] >= self.max_attempts:
+                        # Anything staged for the game since the flush began goes with it
+                        data = {**data, **staged.pop(game_id, {})}
+                        del self._attempts[game_id]
+                        self.dead_letters.append({'game_id': game_id, 'op': kind, 'data': data})
+                        self.stats['dropped'] += 1
+                        logger.error(f"Dropping {kind} for game {game_id} after {self.max_attempts} failed writes")
+                        continue
+                    staged[game_id] = {**data, **staged.get(game_id, {})}
+            if self._creates or self._updates:
+                self._mark_staged()
+    
+    def _clear_attempts(self, game_ids):
+        with self._lock:
+            for game_id in game_ids:
+                self._attempts.pop(game_id, None)
+    
+    def _record(self, written: int):
+        with self._lock:
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += written
+    
+    def _mark_staged(self):
+        self.stats['staged'] += 1
+        if self._first_staged_at is None:
+            self._first_staged_at = time.time()
+    
+    def _maybe_flush(self):
+        with self._lock:
+            pending = len(self._creates) + len(self._updates)
+            age = time.time() - self._first_staged_at if self._first_staged_at else 0
+        if pending >= self.max_pending or age >= self.max_delay:
+            try:
+                self.flush()
+            except Exception as e:
+                # Writes stay staged for the next flush; don't fail the caller's write
+                logger.warning(f"Deferred game writes after failed flush: {e}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+# Shared write-behind buffer for play handlers
+game_write_buffer = GameWriteBuffer(
+    max_pending=int(os.environ.get('GAME_WRITE_BATCH_SIZE', '100')),
+    max_delay=float(os.environ.get('GAME_WRITE_MAX_DELAY', '2.0')),
+    max_attempts=int(os.environ.get('GAME_WRITE_MAX_ATTEMPTS', '3'))
+)
 
 # Search Optimization
-@with_cache(ttl=300)
+@with_cache(ttl=300, namespace=PROMPTS_NAMESPACE, single_flight=True, stale_ttl=PROMPTS_STALE_TTL)
 @with_monitoring("search_prompts")
 def search_prompts(query: str = "", game_type: Optional[str] = None, 
                   tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -546,13 +1215,21 @@ def get_db_stats() -> Dict[str, Any]:
     return {
         'query_stats': query_monitor.get_stats(),
         'cache_info': {
-            'size': len(cache._cache),
+            **cache.stats(),
             'ttl': CACHE_TTL,
-            'leaderboard_ttl': LEADERBOARD_CACHE_TTL
+            'leaderboard_ttl': LEADERBOARD_CACHE_TTL,
+            'fills': {**cache_fill_stats, 'coalesced': _single_flight.coalesced}
         },
         'connection_pool': {
             'size': CONNECTION_POOL_SIZE,
-            'available': len(supabase_pool) if HAS_SUPABASE else 0
+            **(supabase_pool.get_stats() if supabase_pool is not None else {}),
+            'usage': query_monitor.get_pool_stats()
+        },
+        'storage_codec': storage_codec.get_stats(),
+        'archive': dict(archive_stats, archive_after_days=ARCHIVE_AFTER_DAYS),
+        'game_write_buffer': {
+            'pending': game_write_buffer.pending(),
+            **game_write_buffer.stats
         },
         'has_supabase': HAS_SUPABASE
     }
@@ -565,9 +1242,23 @@ __all__ = [
     'update_session',
     'list_sessions',
     'create_game',
+    'create_games',
     'get_game',
     'update_game',
+    'update_games',
+    'encode_game_row',
+    'decode_game_row',
+    'rehydrate_game',
+    'archive_games',
+    'sweep_realtime_events',
+    'GameWriteBuffer',
+    'game_write_buffer',
     'list_games',
+    'count_games_by_status',
+    'summarize_completed_games',
+    'GAME_STATUS_GROUPS',
+    'encode_cursor',
+    'decode_cursor',
     'batch_update_leaderboard',
     'get_leaderboard',
     'create_evaluation',
@@ -583,9 +1274,19 @@ __all__ = [
 ]
 
 # Import remaining functions from original module for compatibility
-from .supabase_db import (
-    update_session, list_sessions, create_game, get_game, update_game,
-    create_evaluation, get_evaluation, list_evaluations,
-    save_prompt, get_settings, update_settings,
-    update_leaderboard  # Keep for single updates
-)
\ No newline at end of file
+try:
+    from .supabase_db import (
+        update_session as _update_session, list_sessions,
+        create_evaluation, get_evaluation, list_evaluations,
+        save_prompt, get_settings, update_settings,
+        update_leaderboard as _update_leaderboard,  # Keep for single updates
+        build_game_row, game_columns, group_game_updates, insert_game_rows
+    )
+except ImportError:
+    from supabase_db import (
+        update_session as _update_session, list_sessions,
+        create_evaluation, get_evaluation, list_evaluations,
+        save_prompt, get_settings, update_settings,
+        update_leaderboard as _update_leaderboard,  # Keep for single updates
+        build_game_row, game_columns, group_game_updates, insert_game_rows
+    )
@@ -1,32 +1,34 @@
 """Status endpoint for SDK evaluations."""
 from http.server import BaseHTTPRequestHandler
-import json
 import sys
 from pathlib import Path
+from urllib.parse import urlparse, parse_qs
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from http_response import send_json
+
 # Try to import database functions
 try:
-    from db_optimized import list_games, HAS_SUPABASE
+    from db_optimized import list_games, count_games_by_status, HAS_SUPABASE
 except:
     HAS_SUPABASE = False
     def list_games(**kwargs):
-        return [], 0
+        return [], None, None
+    def count_games_by_status(job_id):
+        return {'total': 0, 'completed': 0, 'in_progress': 0, 'queued': 0}
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Get evaluation status."""
         try:
             # Extract evaluation ID from path
-            path_parts = self.path.strip('/').split('/')
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            path_parts = parsed.path.strip('/').split('/')
             if len(path_parts) < 3:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Invalid path"}).encode())
+                send_json(self, {"error": "Invalid path"}, status=400)
                 return
             
             evaluation_id = path_parts[2]  # /api/evaluation/{id}/status
@@ -34,20 +36,26 @@ class handler(BaseHTTPRequestHandler):
             # Try to get real game data
             if HAS_SUPABASE:
                 try:
-                    # Get games for this evaluation
-                    games, total = list_games(job_id=evaluation_id, limit=100)
+                    # Status counts cover the whole evaluation; games are one keyset page
+                    counts = count_games_by_status(evaluation_id)
+                    cursor = query.get('cursor', [None])[0]
+                    try:
+                        games, _, next_cursor = list_games(job_id=evaluation_id, limit=10, cursor=cursor)
+                    except ValueError as e:
+                        send_json(self, {"error": str(e)}, status=400)
+                        return
                     
-                    # Calculate statistics
-                    completed = [g for g in games if g['status'] in ['won', 'lost', 'error']]
-                    in_progress = [g for g in games if g['status'] in ['running', 'in_progress']]
-                    queued = [g for g in games if g['status'] == 'queued']
+                    total = counts['total']
+                    completed = counts['completed']
+                    in_progress = counts['in_progress']
+                    queued = counts['queued']
                     
                     # Determine overall status
-                    if len(completed) == total and total > 0:
+                    if total and completed == total:
                         status = "completed"
-                    elif len(in_progress) > 0:
+                    elif in_progress > 0:
                         status = "running"
-                    elif len(queued) > 0:
+                    elif queued > 0:
                         status = "queued"
                     else:
                         status = "unknown"
@@ -55,12 +63,13 @@ class handler(BaseHTTPRequestHandler):
                     response = {
                         "evaluation_id": evaluation_id,
                         "status": status,
-                        "progress": len(completed) / total if total > 0 else 0,
+                        "progress": completed / total if total else 0,
                         "games_total": total,
-                        "games_completed": len(completed),
-                        "games_in_progress": len(in_progress),
-                        "games_queued": len(queued),
-                        "games": games[:10]  # Return first 10
+                        "games_completed": completed,
+                        "games_in_progress": in_progress,
+                        "games_queued": queued,
+                        "games": games,
+                        "next_cursor": next_cursor
                     }
                 except Exception as e:
                     print(f"[Status] Database error: {e}")
@@ -84,26 +93,19 @@ class handler(BaseHTTPRequestHandler):
                     "message": "Database not configured, showing placeholder data"
                 }
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            # Pollers get 304 until the job's games change
+            send_json(self, response, cache_policy='evaluation_status')
             
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            send_json(self, {
                 "error": f"Error in evaluation_status: {str(e)}",
                 "type": type(e).__name__
-            }).encode())
+            }, status=500)
     
     def do_OPTIONS(self):
         """Handle CORS preflight."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
\ No newline at end of file
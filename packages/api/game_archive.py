@@ -0,0 +1,132 @@
+"""Cold storage for archived games.
+
+Completed games older than ``ARCHIVE_AFTER_DAYS`` keep a slim summary row in
+the ``games`` table; their heavy columns (moves, transcript, board state) are
+written here as one compressed JSON document per game. Documents are keyed by
+game ID, so a row only needs its ``archived_at`` marker to be rehydrated.
+
+Two stores are available:
+
+- ``SupabaseColdStore``: a Supabase Storage bucket (``GAME_ARCHIVE_BUCKET``),
+  written with the service-role key
+- ``FileColdStore``: local directory (``GAME_ARCHIVE_DIR``), for servers with a
+  persistent disk, development and tests
+
+With neither configured there is no cold store and games are not archived:
+serverless instance disks are discarded, and the slimmed rows would be all
+that is left of the games. The JSON-file database is the exception: it
+archives into a directory next to its own files, which share its fate.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from .storage_codec import codec as storage_codec
+except ImportError:
+    from storage_codec import codec as storage_codec
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '30'))
+GAME_ARCHIVE_DIR = os.environ.get('GAME_ARCHIVE_DIR', '')
+DEFAULT_ARCHIVE_DIR = 'data/archive'
+GAME_ARCHIVE_BUCKET = os.environ.get('GAME_ARCHIVE_BUCKET', '')
+
+# Columns moved to cold storage; everything else stays in the summary row
+ARCHIVED_GAME_FIELDS = ('moves', 'full_transcript', 'reasoning_scores', 'final_board_state')
+
+# Values written to the summary row in place of the archived columns
+SLIM_GAME_VALUES = {'moves': [], 'full_transcript': None, 'reasoning_scores': None, 'final_board_state': None}
+
+
+def archive_key(game_id: str) -> str:
+    """Object key for a game; sharded by ID prefix to keep directories small."""
+    return f"games/{game_id[:2]}/{game_id}.json"
+
+
+class FileColdStore:
+    """Cold store on the local filesystem."""
+
+    def __init__(self, root: str = GAME_ARCHIVE_DIR or DEFAULT_ARCHIVE_DIR):
+        self.root = Path(root)
+
+    def put(self, key: str, document: Dict[str, Any]):
+        path = self.root / (key + storage_codec.file_suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a crash never leaves a truncated archive behind
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(storage_codec.dump_json_bytes(document))
+        tmp_path.replace(path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        for suffix in ('.zst', '.gz', ''):
+            path = self.root / (key + suffix)
+            if path.exists():
+                return storage_codec.read_json_file(path)
+        return None
+
+    def delete(self, key: str):
+        for suffix in ('.zst', '.gz', ''):
+            (self.root / (key + suffix)).unlink(missing_ok=True)
+
+
+class SupabaseColdStore:
+    """Cold store in a Supabase Storage bucket."""
+
+    def __init__(self, bucket: str = GAME_ARCHIVE_BUCKET):
+        self.bucket = bucket
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            url = os.environ.get('SUPABASE_URL', '')
+            key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY', '')
+            if not url or not key:
+                raise RuntimeError(
+                    f"Cold store bucket {self.bucket} needs SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY"
+                )
+            from supabase import create_client
+            self._client = create_client(url, key)
+        return self._client
+
+    def put(self, key: str, document: Dict[str, Any]):
+        self.client.storage.from_(self.bucket).upload(
+            key, storage_codec.dump_json_bytes(document),
+            {'content-type': 'application/octet-stream', 'upsert': 'true'}
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = self.client.storage.from_(self.bucket).download(key)
+        except Exception as e:
+            logger.warning(f"Archived game {key} not found in bucket {self.bucket}: {e}")
+            return None
+        return storage_codec.load_json_bytes(data, source=key)
+
+    def delete(self, key: str):
+        self.client.storage.from_(self.bucket).remove([key])
+
+
+_cold_store = None
+
+def get_cold_store(local_fallback: Optional[Path] = None):
+    """Configured cold store, or None if there is no durable one.
+    
+    Args:
+        local_fallback: Directory used when nothing is configured; the
+            JSON-file database passes a directory next to its own files, so
+            archived columns stay on the same volume as the rows
+    """
+    global _cold_store
+    if _cold_store is None:
+        if GAME_ARCHIVE_BUCKET:
+            _cold_store = SupabaseColdStore(GAME_ARCHIVE_BUCKET)
+        elif GAME_ARCHIVE_DIR:
+            _cold_store = FileColdStore(GAME_ARCHIVE_DIR)
+    if _cold_store is None and local_fallback:
+        return FileColdStore(local_fallback)
+    return _cold_store
@@ -0,0 +1,177 @@
+"""Shared response helper for the BaseHTTPRequestHandler endpoints.
+
+``send_json`` / ``send_body`` add what every endpoint needs for clients that
+poll the same URL every few seconds:
+
+- a content-hash ETag, answering ``If-None-Match`` with 304 and no body
+- gzip (or brotli, if installed) chosen from ``Accept-Encoding``
+- a named Cache-Control policy per endpoint; ``s-maxage`` lets the CDN absorb
+  polling while ``max-age`` keeps browsers revalidating
+"""
+
+import gzip
+import json
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    brotli = None
+    HAS_BROTLI = False
+
+# Cache-Control per endpoint family
+CACHE_POLICIES = {
+    # Changes when a game finishes; the CDN serves most polls
+    'leaderboard': 'public, max-age=10, s-maxage=30, stale-while-revalidate=60',
+    # Job progress: a short shared window coalesces many pollers
+    'evaluation_status': 'public, max-age=0, s-maxage=2, stale-while-revalidate=5',
+    'sessions': 'public, max-age=0, s-maxage=5, stale-while-revalidate=10',
+    # Fixed catalogs (available games, difficulties)
+    'catalog': 'public, max-age=300, s-maxage=3600',
+    # Always revalidate; unchanged responses come back as 304
+    'revalidate': 'no-cache',
+    'no-store': 'no-store',
+}
+
+# Smaller bodies are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Recently compressed bodies by (etag, encoding); polled responses repeat
+_COMPRESSED_CACHE_SIZE = 64
+_compressed_cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_compressed_lock = Lock()
+
+
+def content_etag(body: bytes) -> str:
+    """Weak ETag from the uncompressed body, valid for every encoding of it."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    def weight(name: str) -> float:
+        return weights.get(name, weights.get('*', 0.0))
+
+    candidates = (['br'] if HAS_BROTLI else []) + ['gzip']
+    best = max(candidates, key=lambda name: (weight(name), name == 'br'))
+    return best if weight(best) > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with 'gzip' or 'br'."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compressed(body: bytes, etag: str, encoding: str) -> bytes:
+    key = (etag, encoding)
+    with _compressed_lock:
+        data = _compressed_cache.get(key)
+        if data is not None:
+            _compressed_cache.move_to_end(key)
+            return data
+    data = compress(body, encoding)
+    with _compressed_lock:
+        _compressed_cache[key] = data
+        while len(_compressed_cache) > _COMPRESSED_CACHE_SIZE:
+            _compressed_cache.popitem(last=False)
+    return data
+
+
+def send_body(handler, body: bytes, content_type: str, status: int = 200,
+              cache_policy: Optional[str] = None, headers: Optional[Dict[str, str]] = None):
+    """Send a response with ETag/304, compression and Cache-Control.
+
+    Args:
+        handler: The BaseHTTPRequestHandler serving the request
+        body: Uncompressed response body
+        content_type: Content-Type header value
+        status: HTTP status; only 200 responses get an ETag
+        cache_policy: Key of CACHE_POLICIES (or a literal Cache-Control value);
+            defaults to no-store
+        headers: Extra headers
+    """
+    cache_control = CACHE_POLICIES.get(cache_policy or 'no-store', cache_policy)
+    etag = content_etag(body) if status == 200 else None
+
+    if etag and handler.command in ('GET', 'HEAD') and etag_matches(handler.headers.get('If-None-Match'), etag):
+        handler.send_response(304)
+        handler.send_header('ETag', etag)
+        handler.send_header('Cache-Control', cache_control)
+        handler.send_header('Vary', 'Accept-Encoding')
+        handler.send_header('Access-Control-Allow-Origin', '*')
+        handler.end_headers()
+        return
+
+    encoding = None
+    if len(body) >= COMPRESS_MIN_SIZE:
+        encoding = negotiate_encoding(handler.headers.get('Accept-Encoding'))
+    if encoding:
+        body = _compressed(body, etag, encoding) if etag else compress(body, encoding)
+
+    handler.send_response(status)
+    handler.send_header('Content-Type', content_type)
+    handler.send_header('Content-Length', str(len(body)))
+    handler.send_header('Cache-Control', cache_control)
+    handler.send_header('Vary', 'Accept-Encoding')
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    if etag:
+        handler.send_header('ETag', etag)
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.send_header('Access-Control-Expose-Headers', 'ETag')
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    if handler.command != 'HEAD':
+        handler.wfile.write(body)
+
+
+def send_json(handler, data: Any, status: int = 200, cache_policy: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None):
+    """Serialize ``data`` as JSON and send it with ``send_body``."""
+    body = json.dumps(data, default=str, separators=(',', ':')).encode()
+    send_body(handler, body, 'application/json', status, cache_policy, headers)
+
+
+__all__ = [
+    'CACHE_POLICIES', 'HAS_BROTLI', 'content_etag', 'etag_matches', 'negotiate_encoding',
+    'compress', 'send_body', 'send_json'
+]
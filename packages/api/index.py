@@ -2,8 +2,13 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from static_assets import web_assets, page_assets
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         path = self.path.split('?')[0]
@@ -73,6 +78,15 @@ class handler(BaseHTTPRequestHandler):
         else:
             self.send_error(404)
     
+    def do_HEAD(self):
+        path = self.path.split('?')[0]
+        if path == '/' or path == '/index.html':
+            self.serve_static_file('index.html')
+        elif path.startswith('/static/'):
+            self.serve_static_file(path[8:])
+        else:
+            self.send_error(404)
+    
     def do_POST(self):
         path = self.path.split('?')[0]
         
@@ -94,49 +108,16 @@ class handler(BaseHTTPRequestHandler):
     
     def serve_page(self, filename):
         """Serve HTML pages from the pages directory."""
-        page_path = Path(__file__).parent / 'pages' / filename
-        
-        if page_path.exists():
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            
-            with open(page_path, 'rb') as f:
-                self.wfile.write(f.read())
-        else:
+        if not page_assets.serve(self, filename):
             self.send_error(404, f"Page not found: {filename}")
     
-    def serve_file(self, filename, content_type):
-        """Serve static files."""
-        static_path = Path(__file__).parent.parent / 'web' / filename
-        
-        if static_path.exists():
-            self.send_response(200)
-            self.send_header('Content-type', content_type)
-            self.end_headers()
-            
-            with open(static_path, 'rb') as f:
-                self.wfile.write(f.read())
-        else:
+    def serve_file(self, filename):
+        """Serve static files (loaded once per instance, see static_assets)."""
+        if not web_assets.serve(self, filename):
             self.send_error(404)
     
     def serve_static_file(self, filename):
-        # Determine content type
-        content_type = 'text/plain'
-        if filename.endswith('.css'):
-            content_type = 'text/css'
-        elif filename.endswith('.js'):
-            content_type = 'application/javascript'
-        elif filename.endswith('.html'):
-            content_type = 'text/html'
-        elif filename.endswith('.svg'):
-            content_type = 'image/svg+xml'
-        elif filename.endswith('.png'):
-            content_type = 'image/png'
-        elif filename.endswith('.jpg') or filename.endswith('.jpeg'):
-            content_type = 'image/jpeg'
-        
-        self.serve_file(filename, content_type)
+        self.serve_file(filename)
     
     def send_json(self, data):
         self.send_response(200)
@@ -1,6 +1,5 @@
 """Optimized leaderboard endpoint with caching and connection pooling."""
 from http.server import BaseHTTPRequestHandler
-import json
 import sys
 import os
 from pathlib import Path
@@ -8,6 +7,8 @@ from pathlib import Path
 # Add the current directory to the path to import our modules
 sys.path.insert(0, str(Path(__file__).parent))
 
+from http_response import send_json
+
 try:
     from db_optimized import get_leaderboard, get_db_stats, HAS_SUPABASE
     from cache_service import cache, leaderboard_cache_key
@@ -41,21 +42,13 @@ class handler(BaseHTTPRequestHandler):
                 # Fallback to direct query or demo data
                 entries = self.get_leaderboard_fallback()
             
-            # Add cache headers for client-side caching
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'public, max-age=60')  # Cache for 1 minute
-            self.send_header('ETag', str(hash(str(entries))))
-            self.end_headers()
-            
-            # Send response
             response = {
                 "entries": entries,
                 "cached": USE_OPTIMIZED and cache.get(leaderboard_cache_key()) is not None,
                 "total_entries": len(entries)
             }
-            self.wfile.write(json.dumps(response).encode())
+            # ETag/304 for unchanged boards, compression and CDN caching
+            send_json(self, response, cache_policy='leaderboard')
             
         except Exception as e:
             self.send_error_response(500, str(e))
@@ -76,11 +69,7 @@ class handler(BaseHTTPRequestHandler):
         else:
             stats = {"error": "Optimized database not available"}
         
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(stats).encode())
+        send_json(self, stats)
     
     def get_leaderboard_fallback(self):
         """Fallback method to get leaderboard data."""
@@ -157,8 +146,4 @@ class handler(BaseHTTPRequestHandler):
     
     def send_error_response(self, code, message):
         """Send error response."""
-        self.send_response(code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps({"error": message}).encode())
\ No newline at end of file
+        send_json(self, {"error": message}, status=code)
\ No newline at end of file
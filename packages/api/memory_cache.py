@@ -0,0 +1,209 @@
+"""Bounded in-process cache tier shared by CacheService and db_optimized.
+
+Entries live in an OrderedDict kept in LRU order (O(1) touch and eviction),
+each with its own TTL. Expired entries are removed lazily: a min-heap of
+expiry times is drained on writes and on ``purge_expired()``, and a read of an
+expired entry treats it as a miss. Memory is bounded by an approximate byte
+size per entry rather than an entry count, so one large leaderboard payload
+counts for more than many small session lookups.
+"""
+
+import os
+import sys
+import time
+import heapq
+import logging
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CACHE_MAX_BYTES = int(os.environ.get('MEMORY_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+MEMORY_CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', '300'))
+
+_MISSING = object()
+
+# Stop walking a value after this many nested objects and extrapolate
+_SIZE_NODE_BUDGET = 5000
+
+
+def approximate_size(value: Any) -> int:
+    """Approximate memory footprint of a value in bytes.
+
+    Walks dicts, lists, tuples and sets summing ``sys.getsizeof``; very large
+    values are sampled and extrapolated so sizing stays cheap.
+    """
+    total = 0
+    seen = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        total += sys.getsizeof(item)
+        seen += 1
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        if seen >= _SIZE_NODE_BUDGET and stack:
+            # Assume the unvisited objects look like the visited ones
+            return int(total + len(stack) * (total / seen))
+    return total
+
+
+class MemoryCache:
+    """LRU cache with per-entry TTL and an approximate byte limit."""
+
+    def __init__(self, max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+                 default_ttl: int = MEMORY_CACHE_DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a live value and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a value; returns False if it alone exceeds the byte limit."""
+        size = approximate_size(key) + approximate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds the memory cache limit")
+            with self._lock:
+                self._remove(key)
+            return False
+
+        expiry = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, expiry, size)
+            self._bytes += size
+            heapq.heappush(self._expiry_heap, (expiry, key))
+            self._purge_expired_locked()
+            self._evict_locked()
+        return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        """Increment an integer entry, keeping its expiry; starts from 0 if missing."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time() and isinstance(entry[0], int):
+                value = entry[0] + amount
+                self._entries[key] = (value, entry[1], entry[2])
+                self._entries.move_to_end(key)
+                return value
+            self.set(key, amount, ttl)
+            return amount
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with ``prefix``."""
+        return self._delete_where(lambda k: k.startswith(prefix))
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Delete every key containing ``pattern``."""
+        return self._delete_where(lambda k: pattern in k)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expiry_heap.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Remove all expired entries now; returns how many were removed."""
+        with self._lock:
+            return self._purge_expired_locked()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        # The matching heap item becomes stale and is skipped when popped
+        self._bytes -= entry[2]
+        return True
+
+    def _delete_where(self, predicate) -> int:
+        with self._lock:
+            matching = [k for k in self._entries if predicate(k)]
+            for key in matching:
+                self._remove(key)
+            return len(matching)
+
+    def _purge_expired_locked(self) -> int:
+        now = time.time()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expiry:
+                self._remove(key)
+                removed += 1
+        self.expirations += removed
+
+        # Overwrites and deletes leave stale heap items; rebuild when they dominate
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(entry[1], key) for key, entry in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+        return removed
+
+    def _evict_locked(self):
+        while self._bytes > self.max_bytes and self._entries:
+            key, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+# Process-wide memory tier
+memory_cache = MemoryCache()
+
+__all__ = ['MemoryCache', 'memory_cache', 'approximate_size']
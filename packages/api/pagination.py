@@ -0,0 +1,50 @@
+"""Opaque cursors for (created_at, id) keyset pagination.
+
+Shared by the API handlers and the legacy storage backend
+(``legacy/core/pagination.py`` is a symlink to this file), so cursors have
+one format and one set of checks everywhere.
+"""
+
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+# Row IDs are UUIDs or similar tokens; anything else could alter the
+# PostgREST filter the cursor is interpolated into
+_ROW_ID = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def encode_cursor(created_at: Optional[Any], row_id: str) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor string."""
+    raw = json.dumps([str(created_at or ''), str(row_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, require_timestamp: bool = True) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor string
+        require_timestamp: Reject cursors without a ``created_at`` (only
+            listings ordered by ID alone may accept them)
+
+    Raises:
+        ValueError: If the cursor is malformed or its id is not made of
+            letters, digits, ``_`` and ``-``
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(created_at, str) or not isinstance(row_id, str) or not row_id:
+            raise ValueError("expected a [created_at, id] pair of strings")
+        if not _ROW_ID.fullmatch(row_id):
+            raise ValueError("invalid id")
+        if created_at:
+            datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        elif require_timestamp:
+            raise ValueError("missing created_at")
+        return created_at, row_id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
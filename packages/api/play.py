@@ -18,14 +18,24 @@ sys.path.append(os.path.dirname(__file__))
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_ANON_KEY = os.environ.get('SUPABASE_ANON_KEY', '')
 
+from http_response import send_json
+
 # Import HTTP-based realtime broadcasting
 try:
-    from supabase_realtime_http import broadcast_to_channel
+    from supabase_realtime_http import broadcast_to_channel, flush_realtime_events
     print("[PLAY] Supabase HTTP realtime available")
 except ImportError:
     broadcast_to_channel = None
+    flush_realtime_events = None
     print("[PLAY] Supabase realtime not available")
 
+# Bulk game writes (one insert per job instead of one per game)
+try:
+    from supabase_db import create_games
+except ImportError:
+    create_games = None
+    print("[PLAY] Bulk game creation not available")
+
 # Simple in-memory game state storage
 GAME_STATES = {}
 
@@ -49,7 +59,7 @@ class handler(BaseHTTPRequestHandler):
                     "difficulties": ["easy", "medium", "hard"]
                 }
             ]
-            self.send_json_response({"games": games})
+            self.send_json_response({"games": games}, cache_policy='catalog')
             
         elif path.startswith('/api/play/games/') and len(path.split('/')) == 5:
             # Get job status
@@ -67,7 +77,7 @@ class handler(BaseHTTPRequestHandler):
                     "total_moves": 5,
                     "game_type": "minesweeper"
                 }]
-            })
+            }, cache_policy='revalidate')
         
         elif path.startswith('/api/benchmark/jobs/'):
             # Get benchmark job status
@@ -85,7 +95,7 @@ class handler(BaseHTTPRequestHandler):
                     "win_rate": 0.0,
                     "avg_moves": 1
                 }
-            })
+            }, cache_policy='revalidate')
             
         else:
             self.send_error(404)
@@ -111,10 +121,11 @@ class handler(BaseHTTPRequestHandler):
             # Create game records
             num_games = play_config.get("num_games", 1)
             games_created = []
+            games_data = []
             
             for i in range(num_games):
                 game_id = str(uuid.uuid4())
-                game_data = {
+                games_data.append({
                     "id": game_id,
                     "job_id": job_id,
                     "game_type": play_config.get("game", "minesweeper"),
@@ -124,16 +135,7 @@ class handler(BaseHTTPRequestHandler):
                     "model_provider": play_config.get("provider", "openai"),
                     "status": "queued",
                     "created_at": datetime.utcnow().isoformat()
-                }
-                
-                # Try to save to Supabase
-                if SUPABASE_URL and SUPABASE_ANON_KEY:
-                    try:
-                        from supabase import create_client
-                        supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-                        supabase.table('games').insert(game_data).execute()
-                    except:
-                        pass
+                })
                 
                 games_created.append({
                     "game_id": game_id,
@@ -142,8 +144,23 @@ class handler(BaseHTTPRequestHandler):
             
             # Start first game immediately (simplified approach)
             # In production, this would be handled by a queue worker
-            if games_created:
-                self.run_single_game(games_created[0]['game_id'], play_config)
+            if games_data:
+                self.run_single_game(games_data[0], play_config)
+            
+            # Save all games to Supabase in one round-trip
+            if SUPABASE_URL and SUPABASE_ANON_KEY and games_data:
+                try:
+                    if create_games:
+                        # Inserts only the games table's columns
+                        create_games(games_data)
+                    else:
+                        from supabase import create_client
+                        supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+                        # scenario is not a games column
+                        rows = [{k: v for k, v in game.items() if k != 'scenario'} for game in games_data]
+                        supabase.table('games').insert(rows).execute()
+                except Exception as e:
+                    print(f"[PLAY] Failed to save games for job {job_id}: {e}")
             
             self.send_json_response({
                 "job_id": job_id,
@@ -278,23 +295,15 @@ class handler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
     
-    def run_single_game(self, game_id, config):
+    def run_single_game(self, game_data, config):
         """Run a single game (simplified for demo)."""
         # This would normally call the game_runner endpoint
-        # For now, just update status to in_progress
-        if SUPABASE_URL and SUPABASE_ANON_KEY:
-            try:
-                from supabase import create_client
-                supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-                supabase.table('games').update({
-                    'status': 'in_progress',
-                    'started_at': datetime.utcnow().isoformat()
-                }).eq('id', game_id).execute()
-            except:
-                pass
+        # For now, just mark it in_progress; the row is not inserted yet, so the
+        # transition is written by the bulk insert instead of a separate update
+        game_data['status'] = 'in_progress'
     
     def run_benchmark_game(self, config):
         """Run a single benchmark game with AI."""
@@ -424,9 +433,8 @@ class handler(BaseHTTPRequestHandler):
                             'game_state': move_data['game_state']
                         }
                         
-                        # Use HTTP broadcasting
+                        # Queued for the background publisher; does not wait on the network
                         broadcast_to_channel(channel_name, 'move', broadcast_data)
-                        print(f"[GAME] Broadcasted move {move_num + 1} to channel {channel_name}")
                     except Exception as e:
                         print(f"[GAME] Failed to broadcast move: {e}")
                 
@@ -446,9 +454,7 @@ class handler(BaseHTTPRequestHandler):
                                 'final_state': move_data['game_state']
                             }
                             
-                            # Use HTTP broadcasting
                             broadcast_to_channel(channel_name, 'complete', completion_data)
-                            print(f"[GAME] Broadcasted game completion to channel {channel_name}")
                         except Exception as e:
                             print(f"[GAME] Failed to broadcast completion: {e}")
                     
@@ -459,6 +465,10 @@ class handler(BaseHTTPRequestHandler):
             import traceback
             traceback.print_exc()
         
+        # The function may be frozen once it responds; deliver queued events first
+        if can_broadcast:
+            flush_realtime_events()
+        
         # Calculate duration
         duration = (datetime.utcnow() - start_time).total_seconds()
         
@@ -473,9 +483,5 @@ class handler(BaseHTTPRequestHandler):
             'duration': duration
         }
     
-    def send_json_response(self, data, status_code=200):
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, default=str).encode())
\ No newline at end of file
+    def send_json_response(self, data, status_code=200, cache_policy=None):
+        send_json(self, data, status=status_code, cache_policy=cache_policy)
\ No newline at end of file
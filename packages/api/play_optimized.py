@@ -7,15 +7,18 @@ import uuid
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from http_response import send_json
+
 try:
     from db_optimized import (
-        create_game, update_game, batch_update_leaderboard,
-        get_game, list_games, HAS_SUPABASE
+        batch_update_leaderboard, get_game, list_games, count_games_by_status,
+        summarize_completed_games, game_write_buffer, HAS_SUPABASE
     )
     from cache_service import cache
     USE_OPTIMIZED = True
@@ -65,39 +68,49 @@ class handler(BaseHTTPRequestHandler):
                     "difficulties": ["easy", "medium", "hard"]
                 }
             ]
-            self.send_json_response({"games": games})
+            self.send_json_response({"games": games}, cache_policy='catalog')
             
         elif path.startswith('/api/play/games/') and len(path.split('/')) == 5:
             # Get job status with optimized queries
             job_id = path.split('/')[-1]
             
             if USE_OPTIMIZED:
-                # Use optimized list_games with pagination
-                games, total = list_games(job_id=job_id, limit=100)
+                # Keyset pagination: ?cursor=<next_cursor>&limit=N
+                query = parse_qs(urlparse(self.path).query)
+                cursor = query.get('cursor', [None])[0]
+                
+                try:
+                    limit = min(max(int(query.get('limit', ['100'])[0]), 1), 500)
+                    games, _, next_cursor = list_games(job_id=job_id, limit=limit, cursor=cursor)
+                except ValueError as e:
+                    self.send_json_response({"error": str(e)}, 400)
+                    return
                 
-                # Calculate summary statistics
-                completed_games = [g for g in games if g['status'] in ['won', 'lost', 'error']]
-                wins = sum(1 for g in completed_games if g.get('won', False))
-                total_moves = sum(g.get('total_moves', 0) for g in completed_games)
+                # Status and summary cover the whole job; only the games array is paginated
+                counts = count_games_by_status(job_id)
+                summary = summarize_completed_games(job_id)
+                completed = counts['completed']
+                wins = summary['wins']
                 
-                # Include error information if any games failed
+                # Include error information if any games on this page failed
                 error_games = [g for g in games if g.get('status') == 'error']
                 errors = [g.get('error', 'Unknown error') for g in error_games if g.get('error')]
                 
                 response = {
                     "job_id": job_id,
-                    "status": "completed" if len(completed_games) == total else "in_progress",
-                    "total_games": total,
-                    "completed_games": len(completed_games),
-                    "games": games[:10],  # Only return first 10 for performance
+                    "status": "completed" if counts['total'] and completed == counts['total'] else "in_progress",
+                    "total_games": counts['total'],
+                    "completed_games": completed,
+                    "games": games,
+                    "next_cursor": next_cursor,
+                    "has_more": next_cursor is not None,
                     "summary": {
                         "wins": wins,
-                        "losses": len(completed_games) - wins,
-                        "win_rate": wins / len(completed_games) if completed_games else 0,
-                        "avg_moves": total_moves / len(completed_games) if completed_games else 0
+                        "losses": completed - wins,
+                        "win_rate": wins / completed if completed else 0,
+                        "avg_moves": summary['total_moves'] / completed if completed else 0
                     }
                 }
-                
                 # Add errors if any
                 if errors:
                     response["errors"] = errors
@@ -111,7 +124,8 @@ class handler(BaseHTTPRequestHandler):
                     "games": []
                 }
             
-            self.send_json_response(response)
+            # Polled while the job runs; unchanged responses come back as 304
+            self.send_json_response(response, cache_policy='evaluation_status')
             
         elif path == '/api/play/batch-status':
             # Return batch processing status
@@ -149,6 +163,7 @@ class handler(BaseHTTPRequestHandler):
             
             for i in range(num_games):
                 game_data = {
+                    "id": str(uuid.uuid4()),
                     "job_id": job_id,
                     "game_type": play_config.get("game", "minesweeper"),
                     "difficulty": play_config.get("difficulty", "medium"),
@@ -158,13 +173,12 @@ class handler(BaseHTTPRequestHandler):
                     "status": "queued"
                 }
                 
+                # Staged only; all rows go out in one bulk insert on the next flush
                 if USE_OPTIMIZED:
-                    game_id = create_game(game_data)
-                else:
-                    game_id = str(uuid.uuid4())
+                    game_write_buffer.create(game_data)
                 
                 games_created.append({
-                    "game_id": game_id,
+                    "game_id": game_data["id"],
                     "game_number": i + 1
                 })
             
@@ -203,36 +217,46 @@ class handler(BaseHTTPRequestHandler):
             
         # For Vercel, we need to run games synchronously within the request
         # In production, this would be handled by a background worker
-        for game_info in games[:1]:  # Run first game only to avoid timeout
-            game_id = game_info['game_id']
-            
-            try:
-                # Mark as in_progress
-                if USE_OPTIMIZED:
-                    update_game(game_id, {
-                        'status': 'in_progress',
-                        'started_at': datetime.utcnow().isoformat()
-                    })
+        try:
+            for game_info in games[:1]:  # Run first game only to avoid timeout
+                game_id = game_info['game_id']
                 
-                # Actually run the game
-                print(f"[PLAY] Running game {game_id}")
-                print(f"[PLAY] Config: provider={config.get('provider')}, model={config.get('model')}")
+                try:
+                    # Mark as in_progress; merges into the pending insert, so the
+                    # transition costs no write of its own
+                    if USE_OPTIMIZED:
+                        game_write_buffer.update(game_id, {
+                            'status': 'in_progress',
+                            'started_at': datetime.utcnow().isoformat()
+                        })
                 
-                result = self.run_single_game(game_id, config)
+                    # Actually run the game
+                    print(f"[PLAY] Running game {game_id}")
+                    print(f"[PLAY] Config: provider={config.get('provider')}, model={config.get('model')}")
                 
-                print(f"[PLAY] Game completed: won={result.get('won')}, moves={result.get('total_moves')}")
+                    result = self.run_single_game(game_id, config)
                 
-                # Handle completion
-                self.handle_game_completion(game_id, result)
-                print(f"[PLAY] Game {game_id} results saved")
+                    print(f"[PLAY] Game completed: won={result.get('won')}, moves={result.get('total_moves')}")
                 
-            except Exception as e:
-                print(f"[PLAY] Error running game {game_id}: {e}")
-                if USE_OPTIMIZED:
-                    update_game(game_id, {
-                        'status': 'error',
-                        'error': str(e)
-                    })
+                    # Handle completion
+                    self.handle_game_completion(game_id, result)
+                    print(f"[PLAY] Game {game_id} results saved")
+                
+                except Exception as e:
+                    print(f"[PLAY] Error running game {game_id}: {e}")
+                    if USE_OPTIMIZED:
+                        game_write_buffer.update(game_id, {
+                            'status': 'error',
+                            'error': str(e)
+                        })
+        finally:
+            # One batched write for the whole request: inserts, status
+            # transitions and results, before the response is sent
+            if USE_OPTIMIZED:
+                try:
+                    game_write_buffer.flush()
+                except Exception as e:
+                    print(f"[PLAY] Failed to write game updates: {e}")
     
     def run_single_game(self, game_id: str, config: Dict) -> Dict[str, Any]:
         """Run a single game with AI."""
@@ -398,9 +422,9 @@ class handler(BaseHTTPRequestHandler):
     
     def handle_game_completion(self, game_id: str, result: Dict[str, Any]):
         """Handle game completion with optimized updates."""
-        # Update game record
+        # Stage the final game record; flushed by queue_games_for_processing
         if USE_OPTIMIZED:
-            update_game(game_id, {
+            game_write_buffer.update(game_id, {
                 'status': 'won' if result.get('won') else 'lost',
                 'won': result.get('won', False),
                 'total_moves': result.get('total_moves', 0),
@@ -422,20 +446,16 @@ class handler(BaseHTTPRequestHandler):
             'mines_total': result.get('mines_total', 0)
         })
     
-    def send_json_response(self, data: Dict[str, Any], status_code: int = 200):
-        """Send JSON response with proper headers."""
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+    def send_json_response(self, data: Dict[str, Any], status_code: int = 200, cache_policy: Optional[str] = None):
+        """Send JSON with ETag/304, compression and Cache-Control (see http_response)."""
+        send_json(self, data, status=status_code, cache_policy=cache_policy)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
 
 # Background task to process batch updates periodically
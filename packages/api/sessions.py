@@ -4,9 +4,15 @@ import json
 import os
 import random
 import string
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 import uuid
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_response import send_json
+
 # Supabase configuration
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_ANON_KEY = os.environ.get('SUPABASE_ANON_KEY', '')
@@ -68,7 +74,7 @@ class handler(BaseHTTPRequestHandler):
                 }
             ] if not active_only else []
         
-        self.send_json_response({'sessions': sessions})
+        self.send_json_response({'sessions': sessions}, cache_policy='sessions')
     
     def handle_create_session(self):
         """Create a new session."""
@@ -144,7 +150,7 @@ class handler(BaseHTTPRequestHandler):
                 "join_code": "DEMO01",
                 "status": "waiting",
                 "players": [{"name": "Alice", "model": "gpt-4"}]
-            })
+            }, cache_policy='sessions')
         else:
             self.send_error(404, "Session not found")
     
@@ -152,12 +158,8 @@ class handler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
     
-    def send_json_response(self, data):
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, default=str).encode())
\ No newline at end of file
+    def send_json_response(self, data, cache_policy=None):
+        send_json(self, data, cache_policy=cache_policy)
\ No newline at end of file
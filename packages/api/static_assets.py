@@ -0,0 +1,281 @@
+"""Static asset layer for the index handler.
+
+The web assets are read once per warm instance. For each file we keep the
+raw bytes, precompressed gzip/brotli variants, a content-hash ETag per
+variant and a fingerprinted URL (``/static/tilts-viz.<hash>.js``). HTML pages
+are rewritten at load time to reference the fingerprinted URLs, so the pages
+themselves are revalidated on every load while the JS/CSS they reference is
+cached as immutable until its content changes.
+
+Range requests are answered from the uncompressed bytes.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import mimetypes
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+try:
+    from .http_response import HAS_BROTLI, compress, etag_matches, negotiate_encoding
+except ImportError:
+    from http_response import HAS_BROTLI, compress, etag_matches, negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+STATIC_URL_PREFIX = '/static/'
+
+# Fingerprinted assets never change under the same URL
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Pages and unfingerprinted URLs are revalidated (cheap 304s via ETag)
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+FINGERPRINT_LENGTH = 10
+
+# Compressing tiny files or already-compressed formats is not worth it
+COMPRESS_MIN_SIZE = 512
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+# Files in the web directory that are not assets
+IGNORED_SUFFIXES = ('.backup', '.map')
+
+CONTENT_TYPES = {
+    '.js': 'application/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.html': 'text/html; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.json': 'application/json',
+    '.txt': 'text/plain; charset=utf-8',
+}
+
+# name.<fingerprint>.ext
+_FINGERPRINTED = re.compile(r'^(?P<stem>.+)\.(?P<fingerprint>[0-9a-f]{%d})(?P<suffix>\.[^./]+)$' % FINGERPRINT_LENGTH)
+# /static/name.ext with an optional ?v=N cache buster
+_STATIC_REFERENCE = re.compile(r'(["\'])/static/([\w./-]+?)(\?v=[\w.]+)?(["\'])')
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def content_type_for(name: str) -> str:
+    suffix = Path(name).suffix.lower()
+    if suffix in CONTENT_TYPES:
+        return CONTENT_TYPES[suffix]
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def fingerprinted_name(name: str, fingerprint: str) -> str:
+    path = Path(name)
+    return str(path.with_name(f"{path.stem}.{fingerprint}{path.suffix}"))
+
+
+class StaticAsset:
+    """One file with its precomputed representations."""
+
+    def __init__(self, name: str, body: bytes):
+        self.name = name
+        self.content_type = content_type_for(name)
+        self.set_body(body)
+
+    def set_body(self, body: bytes):
+        self.body = body
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.fingerprint = digest[:FINGERPRINT_LENGTH]
+        # Strong validators, one per representation (required for If-Range)
+        self.etags = {None: f'"{digest}"'}
+        self.variants: Dict[str, bytes] = {}
+
+        if len(body) >= COMPRESS_MIN_SIZE and self.content_type.startswith(COMPRESSIBLE_TYPES):
+            encodings = ['gzip'] + (['br'] if HAS_BROTLI else [])
+            for encoding in encodings:
+                data = compress(body, encoding)
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+                    self.etags[encoding] = f'"{digest}-{encoding}"'
+
+    @property
+    def url(self) -> str:
+        return STATIC_URL_PREFIX + fingerprinted_name(self.name, self.fingerprint)
+
+    def representation(self, encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        if encoding in self.variants:
+            return encoding, self.variants[encoding]
+        return None, self.body
+
+
+class StaticAssets:
+    """All assets under one directory, loaded on first use."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._assets: Optional[Dict[str, StaticAsset]] = None
+        self._lock = Lock()
+
+    @property
+    def assets(self) -> Dict[str, StaticAsset]:
+        if self._assets is None:
+            with self._lock:
+                if self._assets is None:
+                    self._assets = self._load()
+        return self._assets
+
+    def _load(self) -> Dict[str, StaticAsset]:
+        assets = {}
+        if not self.root.is_dir():
+            logger.warning(f"Static asset directory {self.root} not found")
+            return assets
+        for path in sorted(self.root.rglob('*')):
+            if not path.is_file() or path.name.startswith('.') or path.name.endswith(IGNORED_SUFFIXES):
+                continue
+            name = path.relative_to(self.root).as_posix()
+            assets[name] = StaticAsset(name, path.read_bytes())
+
+        # Point pages at fingerprinted URLs once every fingerprint is known
+        for asset in assets.values():
+            if asset.content_type.startswith(('text/html', 'text/css')):
+                asset.set_body(self._rewrite_references(asset.body, assets))
+
+        logger.info(f"Loaded {len(assets)} static assets from {self.root}")
+        return assets
+
+    @staticmethod
+    def _rewrite_references(body: bytes, assets: Dict[str, StaticAsset]) -> bytes:
+        text = body.decode('utf-8', errors='surrogateescape')
+
+        def replace(match):
+            asset = assets.get(match.group(2))
+            if asset is None:
+                return match.group(0)
+            return f"{match.group(1)}{asset.url}{match.group(4)}"
+
+        return _STATIC_REFERENCE.sub(replace, text).encode('utf-8', errors='surrogateescape')
+
+    def resolve(self, name: str) -> Tuple[Optional[StaticAsset], bool]:
+        """Find the asset for a request path; the flag is True for a current fingerprinted URL."""
+        name = name.lstrip('/')
+        asset = self.assets.get(name)
+        if asset is not None:
+            return asset, False
+        match = _FINGERPRINTED.match(name)
+        if match:
+            asset = self.assets.get(match.group('stem') + match.group('suffix'))
+            if asset is not None:
+                # An outdated fingerprint still gets the current file, just not cached forever
+                return asset, match.group('fingerprint') == asset.fingerprint
+        return None, False
+
+    def url_for(self, name: str) -> str:
+        """Fingerprinted URL for an asset (the plain URL if it is unknown)."""
+        asset = self.assets.get(name)
+        return asset.url if asset else STATIC_URL_PREFIX + name
+
+    def serve(self, handler, name: str) -> bool:
+        """Send an asset; returns False if there is no such asset."""
+        asset, immutable = self.resolve(name)
+        if asset is None:
+            return False
+        send_asset(handler, asset, IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL)
+        return True
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end inclusive) for a single byte range, or None if unsatisfiable.
+
+    Raises ValueError for headers we do not handle (multiple ranges), which
+    are answered with the full body.
+    """
+    match = _RANGE.match(header.strip())
+    if not match:
+        raise ValueError(header)
+    first, last = match.groups()
+    if not first:
+        if not last:
+            raise ValueError(header)
+        length = int(last)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def send_asset(handler, asset: StaticAsset, cache_control: str):
+    """Send an asset honouring If-None-Match, Range and Accept-Encoding."""
+    headers = handler.headers
+    range_header = headers.get('Range')
+    if range_header and headers.get('If-Range') not in (None, asset.etags[None]):
+        range_header = None  # the client's partial copy is outdated
+
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, len(asset.body))
+        except ValueError:
+            byte_range = False
+        if byte_range is None:
+            handler.send_response(416)
+            handler.send_header('Content-Range', f"bytes */{len(asset.body)}")
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+        if byte_range:
+            start, end = byte_range
+            handler.send_response(206)
+            handler.send_header('Content-Type', asset.content_type)
+            handler.send_header('Content-Range', f"bytes {start}-{end}/{len(asset.body)}")
+            handler.send_header('Content-Length', str(end - start + 1))
+            handler.send_header('Accept-Ranges', 'bytes')
+            handler.send_header('ETag', asset.etags[None])
+            handler.send_header('Cache-Control', cache_control)
+            handler.end_headers()
+            if handler.command != 'HEAD':
+                handler.wfile.write(asset.body[start:end + 1])
+            return
+
+    encoding, body = asset.representation(negotiate_encoding(headers.get('Accept-Encoding')))
+    etag = asset.etags[encoding]
+
+    if etag_matches(headers.get('If-None-Match'), etag):
+        handler.send_response(304)
+        handler.send_header('ETag', etag)
+        handler.send_header('Cache-Control', cache_control)
+        handler.send_header('Vary', 'Accept-Encoding')
+        handler.end_headers()
+        return
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', asset.content_type)
+    handler.send_header('Content-Length', str(len(body)))
+    if encoding:
+        handler.send_header('Content-Encoding', encoding)
+    handler.send_header('Vary', 'Accept-Encoding')
+    handler.send_header('Accept-Ranges', 'bytes')
+    handler.send_header('ETag', etag)
+    handler.send_header('Cache-Control', cache_control)
+    handler.end_headers()
+    if handler.command != 'HEAD':
+        handler.wfile.write(body)
+
+
+def _default_web_root() -> Path:
+    configured = os.environ.get('STATIC_ROOT')
+    if configured:
+        return Path(configured)
+    here = Path(__file__).resolve().parent
+    for candidate in (here.parent / 'web', Path(__file__).parent.parent / 'web', Path.cwd() / 'packages' / 'web'):
+        if candidate.is_dir():
+            return candidate
+    return here.parent / 'web'
+
+
+# Per-instance registries, loaded lazily on the first request
+web_assets = StaticAssets(_default_web_root())
+page_assets = StaticAssets(Path(__file__).parent / 'pages')
+
+__all__ = [
+    'StaticAsset', 'StaticAssets', 'send_asset', 'web_assets', 'page_assets',
+    'IMMUTABLE_CACHE_CONTROL', 'REVALIDATE_CACHE_CONTROL'
+]
@@ -0,0 +1,315 @@
+"""Compression codec for stored transcripts and move records.
+
+JSON values such as a game's move list or full transcript are stored as a
+compressed envelope::
+
+    {"__codec__": "zstd", "dict_id": 2381457813, "size": 5120, "data": "<base64>"}
+
+zstd with a shared dictionary is used when ``zstandard`` is installed; the
+fallback is deflate (the gzip algorithm) with the same dictionary as preset.
+Move records are small and repetitive across games, so the dictionary is what
+makes per-row compression worthwhile. ``decode`` returns anything that is not
+an envelope unchanged, so rows written before compression keep working.
+
+Whole files (results, game files) are written as standard ``.zst``/``.gz``
+files and detected by their magic bytes on read.
+
+A dictionary trained on real move records can be supplied through
+``STORAGE_CODEC_DICTIONARY`` (a ``.dict`` file or a directory of them; the
+newest file is used for writing, all of them stay readable). The built-in
+dictionary below is always available for decoding and must never change -
+add a new dictionary instead.
+
+This is the only copy of the codec: ``legacy/core/storage_codec.py`` is a
+symlink to this file, so both trees read and write the same format.
+"""
+
+import os
+import io
+import gzip
+import json
+import zlib
+import base64
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+ENVELOPE_KEY = "__codec__"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Values smaller than this are stored as-is; the envelope would not pay for itself
+DEFAULT_MIN_SIZE = int(os.environ.get("STORAGE_CODEC_MIN_SIZE", "256"))
+DEFAULT_LEVEL = int(os.environ.get("STORAGE_CODEC_LEVEL", "6"))
+
+# Version 1 raw-content dictionary: fragments that recur in every move record
+# and transcript. Frozen - stored rows reference it by its CRC32.
+BUILTIN_DICTIONARY = (
+    b'{"move_number":1,"action":{"action":"reveal","row":0,"col":0},"valid":true,'
+    b'"message":"Revealed cell","reasoning":"","timestamp":"2025-01-01T00:00:00"}'
+    b'{"action":"reveal(0, 0)","timestamp":"2025-01-01T00:00:00.000000","was_valid":true,'
+    b'"reasoning":null,"error":null,"prompt_sent":"","full_response":"","tokens_used":0}'
+    b'{"action":{"action":"flag","row":1,"col":1},"valid":false,"message":"Invalid move"}'
+    b'"board_state_before":"","board_state_after":"","model_reasoning":"","error_message":null,'
+    b'"game_id":"","task_id":"","model_name":"","final_status":"won","num_moves":0,"moves":[]'
+    b'"final_state":{"status":"lost","board_rows":9,"board_cols":9,"num_mines":10,'
+    b'"mine_positions":[],"revealed_cells":[],"flagged_cells":[]},"start_time":"","end_time":""'
+    b"You are playing Minesweeper. The board is shown below. Cells are labeled: "
+    b"? = unrevealed, F = flagged, . = empty, 1-8 = number of adjacent mines. "
+    b"Analyze the board and choose your next move. Use the make_move function to "
+    b"reveal a cell or flag a mine. I will reveal the cell at row , column because "
+    b"it is safe. Looking at the numbers around this cell, the adjacent mines must be "
+    b"flagged. This cell must be a mine so I will flag it. Current board state:\n"
+    b"  0 1 2 3 4 5 6 7 8\n0 ? ? ? ? ? ? ? ? ?\n1 ? ? ? ? ? ? ? ? ?\n2 . . 1 ? ? ? ? ? ?\n"
+)
+
+
+def _dictionary_id(data: bytes) -> int:
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+class StorageCodec:
+    """Encode JSON values and files with zstd (or deflate) plus a shared dictionary."""
+
+    def __init__(self, level: int = DEFAULT_LEVEL, min_size: int = DEFAULT_MIN_SIZE,
+                 dictionary_path: Optional[Union[str, Path]] = None):
+        self.level = level
+        self.min_size = min_size
+        self.codec = "zstd" if HAS_ZSTD else "deflate"
+        self._dictionaries: Dict[int, bytes] = {}
+        self._zstd_dicts: Dict[int, Any] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {
+            "values_encoded": 0,
+            "values_skipped": 0,
+            "values_decoded": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0,
+        }
+
+        self.dict_id = self.add_dictionary(BUILTIN_DICTIONARY, raw_content=True)
+        dictionary_path = dictionary_path or os.environ.get("STORAGE_CODEC_DICTIONARY")
+        if dictionary_path:
+            self.load_dictionaries(dictionary_path)
+
+    # Dictionaries
+    def add_dictionary(self, data: bytes, raw_content: bool = False) -> int:
+        """Register a dictionary for decoding and return its ID."""
+        dict_id = _dictionary_id(data)
+        self._dictionaries[dict_id] = data
+        if HAS_ZSTD:
+            dict_type = zstandard.DICT_TYPE_RAWCONTENT if raw_content else zstandard.DICT_TYPE_AUTO
+            self._zstd_dicts[dict_id] = zstandard.ZstdCompressionDict(data, dict_type=dict_type)
+        return dict_id
+
+    def load_dictionaries(self, path: Union[str, Path]) -> Optional[int]:
+        """Load trained dictionaries; the newest one becomes the write dictionary."""
+        path = Path(path)
+        files = sorted(path.glob("*.dict"), key=lambda p: p.stat().st_mtime) if path.is_dir() else [path]
+        for file_path in files:
+            try:
+                self.dict_id = self.add_dictionary(file_path.read_bytes())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load codec dictionary {file_path}: {e}")
+        return self.dict_id
+
+    def _compressor(self, dict_id: int):
+        compressors = getattr(self._local, "compressors", None)
+        if compressors is None:
+            compressors = self._local.compressors = {}
+        if dict_id not in compressors:
+            compressors[dict_id] = zstandard.ZstdCompressor(
+                level=self.level, dict_data=self._zstd_dicts[dict_id]
+            )
+        return compressors[dict_id]
+
+    def _decompressor(self, dict_id: Optional[int]):
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        if dict_id not in decompressors:
+            dict_data = self._zstd_dicts.get(dict_id) if dict_id is not None else None
+            decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return decompressors[dict_id]
+
+    def _dictionary(self, dict_id: Optional[int]) -> Optional[bytes]:
+        if dict_id is None:
+            return None
+        if dict_id not in self._dictionaries:
+            raise ValueError(f"Unknown codec dictionary {dict_id}")
+        return self._dictionaries[dict_id]
+
+    # Bytes
+    def compress(self, data: bytes, dict_id: Optional[int] = None) -> bytes:
+        """Compress bytes with the active codec and the given dictionary."""
+        if self.codec == "zstd":
+            if dict_id is None:
+                return zstandard.ZstdCompressor(level=self.level).compress(data)
+            return self._compressor(dict_id).compress(data)
+        zdict = self._dictionary(dict_id)
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS,
+                                      **({"zdict": zdict} if zdict else {}))
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes, codec: str, dict_id: Optional[int] = None) -> bytes:
+        """Decompress bytes written by ``compress`` with any supported codec."""
+        if codec == "zstd":
+            if not HAS_ZSTD:
+                raise RuntimeError("zstandard is required to read zstd-compressed data")
+            self._dictionary(dict_id)
+            return self._decompressor(dict_id).decompress(data)
+        if codec == "deflate":
+            zdict = self._dictionary(dict_id)
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS, **({"zdict": zdict} if zdict else {}))
+            return decompressor.decompress(data) + decompressor.flush()
+        raise ValueError(f"Unsupported codec: {codec}")
+
+    # JSON values
+    def encode(self, value: Any) -> Any:
+        """Return a compressed envelope for ``value``, or ``value`` if it is small."""
+        if value is None or is_encoded(value):
+            return value
+        raw = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+        if len(raw) < self.min_size:
+            self._record(values_skipped=1)
+            return value
+
+        dict_id = self.dict_id
+        payload = self.compress(raw, dict_id)
+        self._record(values_encoded=1, raw_bytes=len(raw), stored_bytes=len(payload))
+        return {
+            ENVELOPE_KEY: self.codec,
+            "dict_id": dict_id,
+            "size": len(raw),
+            "data": base64.b64encode(payload).decode("ascii"),
+        }
+
+    def decode(self, value: Any) -> Any:
+        """Inverse of ``encode``; values that are not envelopes pass through."""
+        if not is_encoded(value):
+            return value
+        raw = self.decompress(base64.b64decode(value["data"]), value[ENVELOPE_KEY], value.get("dict_id"))
+        self._record(values_decoded=1)
+        return json.loads(raw)
+
+    def encode_fields(self, row: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """Copy of ``row`` with the given fields encoded."""
+        row = dict(row)
+        for field in fields:
+            if field in row:
+                row[field] = self.encode(row[field])
+        return row
+
+    def decode_fields(self, row: Optional[Dict[str, Any]], fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Decode the given fields of ``row`` in place and return it."""
+        if row:
+            for field in fields:
+                if field in row:
+                    row[field] = self.decode(row[field])
+        return row
+
+    # Files
+    def dump_json_bytes(self, value: Any, indent: Optional[int] = None) -> bytes:
+        """Serialize ``value`` as a standard zstd (or gzip) compressed JSON document."""
+        raw = json.dumps(value, indent=indent, default=str).encode("utf-8")
+        if self.codec == "zstd":
+            payload = zstandard.ZstdCompressor(level=self.level).compress(raw)
+        else:
+            payload = gzip.compress(raw, compresslevel=self.level)
+        self._record(raw_bytes=len(raw), stored_bytes=len(payload))
+        return payload
+
+    def load_json_bytes(self, data: bytes, source: Any = "data") -> Any:
+        """Parse a JSON document that may be plain, gzip or zstd compressed."""
+        if data.startswith(ZSTD_MAGIC):
+            if not HAS_ZSTD:
+                raise RuntimeError(f"zstandard is required to read {source}")
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                data = reader.read()
+        elif data.startswith(GZIP_MAGIC):
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    @property
+    def file_suffix(self) -> str:
+        return ".zst" if self.codec == "zstd" else ".gz"
+
+    def write_json_file(self, path: Union[str, Path], value: Any, indent: Optional[int] = None) -> Path:
+        """Write ``value`` as a compressed JSON file; returns the path with its codec suffix."""
+        path = Path(path)
+        path = path.with_name(path.name + self.file_suffix)
+        path.write_bytes(self.dump_json_bytes(value, indent=indent))
+        return path
+
+    def read_json_file(self, path: Union[str, Path]) -> Any:
+        """Read a JSON file that may be plain, gzip or zstd compressed."""
+        return self.load_json_bytes(Path(path).read_bytes(), source=path)
+
+    # Stats
+    def _record(self, **counts: int):
+        with self._lock:
+            for key, amount in counts.items():
+                self.stats[key] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus the overall compression ratio (raw / stored bytes)."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["compression_ratio"] = (
+            round(stats["raw_bytes"] / stats["stored_bytes"], 2) if stats["stored_bytes"] else None
+        )
+        stats["codec"] = self.codec
+        stats["dict_id"] = self.dict_id
+        return stats
+
+
+def is_encoded(value: Any) -> bool:
+    """Whether ``value`` is a compressed envelope."""
+    return isinstance(value, dict) and ENVELOPE_KEY in value and "data" in value
+
+
+def train_dictionary(samples: Iterable[Any], dict_size: int = 16 * 1024) -> bytes:
+    """
+    Train a zstd dictionary from sample values (e.g. move lists of stored games).
+
+    Args:
+        samples: JSON-serializable values or raw bytes
+        dict_size: Target dictionary size in bytes
+
+    Returns:
+        Dictionary bytes, suitable for ``STORAGE_CODEC_DICTIONARY``
+    """
+    if not HAS_ZSTD:
+        raise RuntimeError("zstandard is required to train a dictionary")
+    encoded = [
+        s if isinstance(s, bytes) else json.dumps(s, separators=(",", ":"), default=str).encode("utf-8")
+        for s in samples
+    ]
+    return zstandard.train_dictionary(dict_size, encoded).as_bytes()
+
+
+# Global codec instance
+codec = StorageCodec()
+
+
+def encode(value: Any) -> Any:
+    return codec.encode(value)
+
+
+def decode(value: Any) -> Any:
+    return codec.decode(value)
+
+
+def read_json_file(path: Union[str, Path]) -> Any:
+    return codec.read_json_file(path)
@@ -145,27 +145,91 @@ def list_sessions(active_only: bool = False) -> List[Dict[str, Any]]:
     return result.data or []
 
 # Game Management
-def create_game(game_data: Dict[str, Any]) -> str:
-    """Create a new game record."""
-    if not HAS_SUPABASE:
-        return json_db.create_game(game_data)
-    
-    game_id = _ensure_uuid(game_data.get('id', ''))
-    
-    data = {
-        'id': game_id,
+# Optional games columns copied into inserted rows when the game data sets them;
+# left out otherwise so the table defaults apply
+GAME_OPTIONAL_COLUMNS = (
+    'created_at', 'updated_at', 'won', 'total_moves', 'valid_moves', 'mines_identified',
+    'mines_total', 'duration', 'full_transcript', 'reasoning_scores', 'final_board_state',
+    'archived_at'
+)
+
+# Every column of the games table (001_initial_schema.sql plus later migrations)
+GAME_COLUMNS = frozenset((
+    'id', 'job_id', 'session_id', 'game_type', 'difficulty', 'model_name',
+    'model_provider', 'status', 'moves'
+) + GAME_OPTIONAL_COLUMNS)
+
+def build_game_row(game_data: Dict[str, Any], default_status: str = 'in_progress') -> Dict[str, Any]:
+    """Build a games table row from game data; keys that are not games columns are dropped."""
+    row = {
+        'id': _ensure_uuid(game_data.get('id', '')),
         'job_id': game_data.get('job_id'),
         'session_id': game_data.get('session_id'),
         'game_type': game_data.get('game_type', 'minesweeper'),
         'difficulty': game_data.get('difficulty', 'medium'),
         'model_name': game_data.get('model_name'),
         'model_provider': game_data.get('model_provider'),
-        'status': 'in_progress',
+        'status': game_data.get('status', default_status),
         'moves': game_data.get('moves', [])
     }
+    row.update((column, game_data[column]) for column in GAME_OPTIONAL_COLUMNS if column in game_data)
+    return row
+
+def game_columns(updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the keys of an update payload that are games columns."""
+    return {column: value for column, value in updates.items() if column in GAME_COLUMNS}
+
+def group_game_updates(updates: Dict[str, Dict[str, Any]]) -> List[tuple]:
+    """Group per-game updates that share the same payload.
+    
+    Returns:
+        List of (payload, [game_ids]) so each distinct payload is one UPDATE
+    """
+    groups: Dict[str, tuple] = {}
+    for game_id, payload in updates.items():
+        key = json.dumps(payload, sort_keys=True, default=str)
+        groups.setdefault(key, (payload, []))[1].append(game_id)
+    return list(groups.values())
+
+def create_game(game_data: Dict[str, Any]) -> str:
+    """Create a new game record."""
+    if not HAS_SUPABASE:
+        return json_db.create_game(game_data)
+    
+    data = build_game_row({**game_data, 'status': 'in_progress'})
     
     result = supabase.table('games').insert(data).execute()
-    return result.data[0]['id'] if result.data else game_id
+    return result.data[0]['id'] if result.data else data['id']
+
+def insert_game_rows(client, rows: List[Dict[str, Any]]):
+    """Bulk insert game rows, one request per distinct column set.
+    
+    PostgREST takes the column list of a bulk insert from its rows, so rows
+    with different keys are inserted separately instead of padding them with
+    NULLs that would override column defaults.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row.keys())), []).append(row)
+    for group in groups.values():
+        client.table('games').insert(group).execute()
+
+def create_games(games_data: List[Dict[str, Any]]) -> List[str]:
+    """Create several game records with a single insert.
+    
+    Unlike create_game, an explicit ``status`` in the game data is kept
+    (e.g. ``queued``), defaulting to ``in_progress``. Result columns such as
+    ``won`` or ``created_at`` are inserted when set; keys that are not games
+    columns (``scenario``, ``started_at``, ...) are dropped.
+    """
+    if not games_data:
+        return []
+    if not HAS_SUPABASE:
+        return [create_game(game_data) for game_data in games_data]
+    
+    rows = [build_game_row(game_data) for game_data in games_data]
+    insert_game_rows(supabase, rows)
+    return [row['id'] for row in rows]
 
 def get_game(game_id: str) -> Optional[Dict[str, Any]]:
     """Get game by ID."""
@@ -183,6 +247,29 @@ def update_game(game_id: str, updates: Dict[str, Any]) -> bool:
     result = supabase.table('games').update(updates).eq('id', game_id).execute()
     return bool(result.data)
 
+def update_games(updates: Dict[str, Dict[str, Any]]) -> int:
+    """Apply per-game updates, issuing one UPDATE per distinct payload.
+    
+    Args:
+        updates: Mapping of game ID to the columns to update
+    
+    Returns:
+        Number of games updated
+    """
+    if not updates:
+        return 0
+    if not HAS_SUPABASE:
+        return sum(1 for game_id, payload in updates.items() if update_game(game_id, payload))
+    
+    updated = 0
+    updates = {game_id: game_columns(payload) for game_id, payload in updates.items()}
+    for payload, game_ids in group_game_updates(updates):
+        if not payload:
+            continue
+        result = supabase.table('games').update(payload).in_('id', game_ids).execute()
+        updated += len(result.data or [])
+    return updated
+
 def list_games(session_id: Optional[str] = None, job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
     """List games with optional filters."""
     if not HAS_SUPABASE:
@@ -399,8 +486,10 @@ __all__ = [
     'update_session',
     'list_sessions',
     'create_game',
+    'create_games',
     'get_game',
     'update_game',
+    'update_games',
     'list_games',
     'update_leaderboard',
     'get_leaderboard',
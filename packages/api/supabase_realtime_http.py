@@ -1,16 +1,39 @@
-"""HTTP-based Supabase Realtime implementation for Vercel."""
+"""HTTP-based Supabase Realtime implementation for Vercel.
+
+Events are stored in the ``realtime_events`` table, which the frontend
+subscribes to. ``broadcast_to_channel`` does not write them inline: it hands
+them to a background ``RealtimePublisher`` that buffers events per channel
+and writes them in one bulk insert every ``REALTIME_FLUSH_INTERVAL_MS`` or
+``REALTIME_MAX_BATCH`` events. While a move is still buffered, a newer move
+for the same game supersedes its board snapshot, so only the latest snapshot
+per game is sent. The game loop never waits on the network; call
+``flush_realtime_events`` before a serverless handler returns.
+
+Set ``REALTIME_SINK=memory`` to collect events in a ``MemoryEventSink``
+instead of Supabase (tests and local runs).
+"""
 import json
+import time
+import atexit
 import urllib.request
 import urllib.error
 import os
+from collections import OrderedDict, deque
+from threading import Condition, Thread
 
-def broadcast_to_channel(channel_name, event, payload):
-    """Broadcast a message to a Supabase Realtime channel using HTTP.
-    
-    Note: This is a simplified approach. Supabase Realtime typically uses WebSockets,
-    but for serverless environments, we'll use the Postgres NOTIFY approach or
-    store events in a table that clients can poll.
-    """
+REALTIME_FLUSH_INTERVAL_MS = int(os.environ.get('REALTIME_FLUSH_INTERVAL_MS', '100'))
+REALTIME_MAX_BATCH = int(os.environ.get('REALTIME_MAX_BATCH', '50'))
+REALTIME_MAX_PENDING = int(os.environ.get('REALTIME_MAX_PENDING', '5000'))
+REALTIME_SINK = os.environ.get('REALTIME_SINK', 'supabase')
+
+# Payload fields that are full snapshots; a newer one makes older ones redundant
+SNAPSHOT_FIELDS = ('board_state', 'game_state')
+# Events that end a game are flushed without waiting for the interval
+TERMINAL_EVENTS = ('complete', 'error')
+
+
+def post_realtime_events(rows):
+    """Insert event rows into realtime_events with a single bulk POST."""
     supabase_url = os.environ.get('SUPABASE_URL', '')
     supabase_key = os.environ.get('SUPABASE_ANON_KEY', '')
     
@@ -18,17 +41,7 @@ def broadcast_to_channel(channel_name, event, payload):
         print("[REALTIME] Supabase not configured, skipping broadcast")
         return False
     
-    # For serverless, we'll store realtime events in a table
-    # that the frontend can subscribe to via Supabase client
     try:
-        # Create event record
-        event_data = {
-            "channel": channel_name,
-            "event": event,
-            "payload": payload
-        }
-        
-        # Store in realtime_events table
         url = f"{supabase_url}/rest/v1/realtime_events"
         headers = {
             'apikey': supabase_key,
@@ -37,18 +50,14 @@ def broadcast_to_channel(channel_name, event, payload):
             'Prefer': 'return=minimal'
         }
         
-        print(f"[REALTIME] Posting to {url}")
-        print(f"[REALTIME] Event data: {json.dumps(event_data)[:200]}...")
-        
         req = urllib.request.Request(
             url,
-            data=json.dumps(event_data).encode('utf-8'),
+            data=json.dumps(rows, default=str).encode('utf-8'),
             headers=headers,
             method='POST'
         )
         
         with urllib.request.urlopen(req) as response:
-            print(f"[REALTIME] Successfully broadcasted {event} to channel {channel_name}")
             return True
             
     except urllib.error.HTTPError as e:
@@ -58,6 +67,196 @@ def broadcast_to_channel(channel_name, event, payload):
         print(f"[REALTIME] Error broadcasting: {e}")
         return False
 
+
+class HttpEventSink:
+    """Writes batches to the realtime_events table."""
+    
+    def send(self, rows):
+        return post_realtime_events(rows)
+
+
+class MemoryEventSink:
+    """Local stand-in for realtime_events; keeps every batch it receives."""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def send(self, rows):
+        self.batches.append([dict(row) for row in rows])
+        return True
+    
+    @property
+    def events(self):
+        return [row for batch in self.batches for row in batch]
+    
+    def clear(self):
+        self.batches.clear()
+
+
+class RealtimePublisher:
+    """Buffers realtime events and writes them from a background thread."""
+    
+    def __init__(self, sink, flush_interval_ms=REALTIME_FLUSH_INTERVAL_MS,
+                 max_batch=REALTIME_MAX_BATCH, max_pending=REALTIME_MAX_PENDING):
+        self.sink = sink
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        
+        # channel -> deque of rows, channels in first-pending order
+        self._buffers = OrderedDict()
+        # (channel, game_id) -> buffered row that holds the latest snapshot
+        self._latest_snapshot = {}
+        self._pending = 0
+        self._urgent = False
+        self._flushing = False
+        self._condition = Condition()
+        self._thread = None
+        self.stats = {'published': 0, 'sent': 0, 'batches': 0, 'coalesced': 0, 'dropped': 0, 'failed': 0}
+    
+    def publish(self, channel, event, payload):
+        """Queue an event; returns immediately."""
+        row = {'channel': channel, 'event': event, 'payload': dict(payload or {})}
+        game_id = row['payload'].get('game_id')
+        
+        with self._condition:
+            if self._pending >= self.max_pending:
+                self._drop_oldest()
+            
+            if game_id is not None and any(field in row['payload'] for field in SNAPSHOT_FIELDS):
+                previous = self._latest_snapshot.get((channel, game_id))
+                if previous is not None:
+                    # The older move stays in the stream; only its snapshot is superseded
+                    for field in SNAPSHOT_FIELDS:
+                        previous['payload'].pop(field, None)
+                    previous['payload']['snapshot_superseded'] = True
+                    self.stats['coalesced'] += 1
+                self._latest_snapshot[(channel, game_id)] = row
+            
+            self._buffers.setdefault(channel, deque()).append(row)
+            self._pending += 1
+            self.stats['published'] += 1
+            if event in TERMINAL_EVENTS or self._pending >= self.max_batch:
+                self._urgent = True
+                self._condition.notify_all()
+            elif self._pending == 1:
+                self._condition.notify_all()  # start the flush interval
+        
+        self._ensure_thread()
+        return True
+    
+    def _drop_oldest(self):
+        """Make room by dropping the oldest buffered event (caller holds the lock)."""
+        channel, buffer = next(iter(self._buffers.items()))
+        row = buffer.popleft()
+        if not buffer:
+            del self._buffers[channel]
+        game_id = row['payload'].get('game_id')
+        if self._latest_snapshot.get((channel, game_id)) is row:
+            del self._latest_snapshot[(channel, game_id)]
+        self._pending -= 1
+        self.stats['dropped'] += 1
+    
+    def _take_batch(self):
+        """Remove and return everything buffered (caller holds the lock)."""
+        rows = []
+        for buffer in self._buffers.values():
+            rows.extend(buffer)
+        self._buffers.clear()
+        self._latest_snapshot.clear()
+        self._pending = 0
+        self._urgent = False
+        return rows
+    
+    def _send(self, rows):
+        for start in range(0, len(rows), self.max_batch):
+            chunk = rows[start:start + self.max_batch]
+            try:
+                ok = self.sink.send(chunk)
+            except Exception as e:
+                print(f"[REALTIME] Sink error: {e}")
+                ok = False
+            if ok:
+                self.stats['sent'] += len(chunk)
+                self.stats['batches'] += 1
+            else:
+                self.stats['failed'] += len(chunk)
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                if not self._urgent:
+                    # Let the batch fill for one interval
+                    self._condition.wait(self.flush_interval)
+                rows = self._take_batch()
+                self._flushing = bool(rows)
+            try:
+                if rows:
+                    self._send(rows)
+            finally:
+                with self._condition:
+                    self._flushing = False
+                    self._condition.notify_all()
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._condition:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = Thread(target=self._run, name='realtime-publisher', daemon=True)
+                    self._thread.start()
+    
+    def flush(self, timeout=5.0):
+        """Send everything buffered so far; returns False if it timed out."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._urgent = True
+            self._condition.notify_all()
+            while self._pending or self._flushing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def pending(self):
+        with self._condition:
+            return self._pending
+
+
+_publisher = None
+
+def get_publisher():
+    """Process-wide publisher (memory sink when REALTIME_SINK=memory)."""
+    global _publisher
+    if _publisher is None:
+        sink = MemoryEventSink() if REALTIME_SINK == 'memory' else HttpEventSink()
+        _publisher = RealtimePublisher(sink)
+        atexit.register(_publisher.flush)
+    return _publisher
+
+def realtime_configured():
+    return REALTIME_SINK == 'memory' or bool(
+        os.environ.get('SUPABASE_URL', '') and os.environ.get('SUPABASE_ANON_KEY', '')
+    )
+
+def broadcast_to_channel(channel_name, event, payload):
+    """Queue a message for a Supabase Realtime channel.
+    
+    Returns immediately; the background publisher writes it to the
+    realtime_events table with the other buffered events.
+    """
+    if not realtime_configured():
+        return False
+    return get_publisher().publish(channel_name, event, payload)
+
+def flush_realtime_events(timeout=5.0):
+    """Wait for buffered events to be written (call before a handler returns)."""
+    if _publisher is None:
+        return True
+    return _publisher.flush(timeout)
+
 def create_realtime_table_if_needed():
     """Create the realtime_events table if it doesn't exist.
     
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Benchmark cache serializers against pickle on the payloads we actually cache.
+
+Payload shapes mirror the cached results in api/db_optimized.py:
+leaderboard entries (get_leaderboard), a page of game rows with move lists
+(list_games) and a session row (get_session).
+
+Usage: python scripts/benchmark_cache_serializer.py [--iterations N]
+"""
+
+import argparse
+import pickle
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.cache_serializer import CacheSerializer, HAS_MSGPACK, HAS_ORJSON
+
+
+def leaderboard_payload(models: int = 40):
+    rng = random.Random(1)
+    entries = []
+    for i in range(models):
+        games = rng.randint(10, 500)
+        wins = rng.randint(0, games)
+        entries.append({
+            'id': i + 1,
+            'model_name': f"provider/model-{i}",
+            'games_played': games,
+            'wins': wins,
+            'losses': games - wins,
+            'win_rate': wins / games,
+            'valid_move_rate': rng.random(),
+            'mine_identification_precision': rng.random(),
+            'mine_identification_recall': rng.random(),
+            'coverage_ratio': rng.random(),
+            'reasoning_score': rng.random(),
+            'composite_score': rng.random(),
+            'total_moves': games * 30,
+            'valid_moves': games * 28,
+            'created_at': (datetime(2025, 1, 1) + timedelta(days=i)).isoformat(),
+            'updated_at': datetime(2025, 3, 1).isoformat(),
+        })
+    return entries
+
+
+def games_page_payload(games: int = 100, moves_per_game: int = 40):
+    rng = random.Random(2)
+    rows = []
+    for i in range(games):
+        rows.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'job_id': 'job_' + 'a' * 8,
+            'session_id': None,
+            'game_type': 'minesweeper',
+            'difficulty': 'medium',
+            'model_name': 'gpt-4o',
+            'model_provider': 'openai',
+            'status': rng.choice(['won', 'lost']),
+            'won': rng.random() < 0.4,
+            'total_moves': moves_per_game,
+            'valid_moves': moves_per_game - 2,
+            'mines_identified': rng.randint(0, 10),
+            'mines_total': 10,
+            'duration': rng.random() * 300,
+            'moves': [
+                {
+                    'move_number': m + 1,
+                    'action': {'action': rng.choice(['reveal', 'flag']), 'row': rng.randint(0, 15), 'col': rng.randint(0, 15)},
+                    'valid': True,
+                    'message': 'Revealed cell',
+                }
+                for m in range(moves_per_game)
+            ],
+            'created_at': (datetime(2025, 3, 1) + timedelta(minutes=i)).isoformat(),
+        })
+    return [rows, None, 'eyJjcmVhdGVkX2F0IjoiMjAyNS0wMy0wMSJ9']
+
+
+def session_payload():
+    return {
+        'id': str(uuid.uuid4()),
+        'join_code': 'ABCD1234',
+        'name': 'Friday tournament',
+        'description': '',
+        'game_type': 'minesweeper',
+        'format': 'single_round',
+        'max_players': 10,
+        'difficulty': 'medium',
+        'config': {'rounds': 3, 'time_limit': 300},
+        'status': 'waiting',
+        'created_at': datetime(2025, 3, 1).isoformat(),
+    }
+
+
+class PickleSerializer:
+    format = 'pickle'
+
+    def dumps(self, value):
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+def bench(serializer, payload, iterations):
+    data = serializer.dumps(payload)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = serializer.dumps(payload)
+    dump_us = (time.perf_counter() - start) / iterations * 1e6
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serializer.loads(data)
+    load_us = (time.perf_counter() - start) / iterations * 1e6
+    return len(data), dump_us, load_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    serializers = [('pickle', PickleSerializer())]
+    serializers.append(('json', CacheSerializer('json', compress_threshold=0)))
+    if HAS_ORJSON:
+        serializers.append(('orjson', CacheSerializer('orjson', compress_threshold=0)))
+        serializers.append(('orjson+compress', CacheSerializer('orjson', compress_threshold=16 * 1024)))
+    if HAS_MSGPACK:
+        serializers.append(('msgpack', CacheSerializer('msgpack', compress_threshold=0)))
+
+    payloads = [
+        ('leaderboard (40 models)', leaderboard_payload()),
+        ('list_games page (100 x 40 moves)', games_page_payload()),
+        ('session', session_payload()),
+    ]
+
+    print(f"{'payload':34} {'serializer':16} {'bytes':>9} {'dumps us':>10} {'loads us':>10}")
+    for payload_name, payload in payloads:
+        for name, serializer in serializers:
+            size, dump_us, load_us = bench(serializer, payload, args.iterations)
+            print(f"{payload_name:34} {name:16} {size:>9} {dump_us:>10.1f} {load_us:>10.1f}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+-- Keyset pagination indexes for game listings
+-- list_games pages by (created_at, id) DESC; these indexes let each page
+-- start directly at the cursor instead of scanning past skipped rows.
+
+CREATE INDEX IF NOT EXISTS idx_games_created_id_desc ON games(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_games_job_created_id ON games(job_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_games_session_created_id ON games(session_id, created_at DESC, id DESC);
+
+-- Superseded by the keyset indexes above
+DROP INDEX IF EXISTS idx_games_created_desc;
+DROP INDEX IF EXISTS idx_games_job_created;
+DROP INDEX IF EXISTS idx_games_session_created;
+
+-- Keep planner statistics fresh for count='estimated'
+ANALYZE games;
@@ -0,0 +1,15 @@
+-- Compressed game columns
+-- games.moves and games.full_transcript may now hold a compressed envelope
+-- ({"__codec__": ..., "data": ...}) written by storage_codec instead of the
+-- raw JSON, so a GIN index over their contents no longer matches anything.
+
+DROP INDEX IF EXISTS idx_games_moves_gin;
+
+-- Rough on-disk footprint of the compressed columns, for monitoring
+CREATE OR REPLACE VIEW game_storage_stats AS
+SELECT
+    COUNT(*) AS games,
+    COUNT(*) FILTER (WHERE moves ? '__codec__') AS compressed_games,
+    SUM(pg_column_size(moves)) AS moves_bytes,
+    SUM(pg_column_size(full_transcript)) AS transcript_bytes
+FROM games;
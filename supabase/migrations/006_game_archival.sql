@@ -0,0 +1,33 @@
+-- Hot/cold tiering for games and TTL cleanup for realtime_events
+-- Completed games older than ARCHIVE_AFTER_DAYS keep a slim summary row; their
+-- moves, transcript and board state live in cold storage (see game_archive.py).
+
+ALTER TABLE games ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ;
+
+-- Archive candidates: completed, not yet archived, oldest first
+CREATE INDEX IF NOT EXISTS idx_games_archive_candidates
+ON games(created_at) WHERE status IN ('won', 'lost') AND archived_at IS NULL;
+
+-- The sweeper deletes by age across all channels
+CREATE INDEX IF NOT EXISTS idx_realtime_events_created ON realtime_events(created_at);
+
+-- Replace the fixed 5 minute cleanup with a configurable TTL that reports
+-- how many rows it removed. The function runs as its owner so the sweeper
+-- works with the anon key; the TTL is clamped to 5 minutes so an RPC caller
+-- cannot use it to wipe events that subscribers still need.
+DROP FUNCTION IF EXISTS cleanup_old_realtime_events();
+
+CREATE OR REPLACE FUNCTION cleanup_old_realtime_events(ttl_seconds integer DEFAULT 300)
+RETURNS integer AS $$
+DECLARE
+    deleted integer;
+BEGIN
+    DELETE FROM realtime_events
+    WHERE created_at < now() - make_interval(secs => GREATEST(COALESCE(ttl_seconds, 300), 300));
+    GET DIAGNOSTICS deleted = ROW_COUNT;
+    RETURN deleted;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Optional: run the sweep in the database as well (requires pg_cron)
+-- SELECT cron.schedule('sweep-realtime-events', '*/5 * * * *', 'SELECT cleanup_old_realtime_events(300)');